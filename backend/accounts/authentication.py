@@ -0,0 +1,112 @@
+"""
+JWT authentication with a short-lived cache of the resolved user.
+
+simplejwt's JWTAuthentication loads the user row on every request, and most
+of our traffic is small polling requests (unread counts, dashboard, queues),
+so that lookup was a large share of all queries. CachedJWTAuthentication
+keeps the user (with its company) in the cache for AUTH_USER_CACHE_TTL
+seconds, keyed by user id and the user's auth version:
+
+    REST_FRAMEWORK = {'DEFAULT_AUTHENTICATION_CLASSES': [
+        'accounts.authentication.CachedJWTAuthentication', ...]}
+
+    user = get_auth_user(token['user_id'])     # WebSocket consumers
+
+Saving or deleting a user bumps its auth version, and any company change
+bumps the version of every user (accounts.signals), so deactivation, role
+and company moves and company deactivation apply to the next request. Code
+that changes users or companies with ``.update()`` calls
+``invalidate_auth_user()``. Versions live in the Django cache: with a
+per-process cache, other processes see a change after at most
+AUTH_USER_CACHE_TTL seconds.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+AUTH_USER_CACHE_TTL = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+ALL_USERS = 'all'
+
+
+def _version_key(ident):
+    return f'accounts:auth_version:{ident}'
+
+
+def _fresh_version():
+    # Time based, so an evicted counter never restarts at an old value
+    return int(time.time() * 1000)
+
+
+def _auth_version(user_id):
+    keys = [_version_key(ALL_USERS), _version_key(user_id)]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _fresh_version(), None)
+            found[key] = cache.get(key)
+    return '.'.join(str(found[key]) for key in keys)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def invalidate_auth_user(user_id=None):
+    """
+    Drop the cached user ``user_id`` (every user when None). Bumped now and
+    again after commit, so a request racing the transaction cannot keep the
+    old row cached under the new version.
+    """
+    key = _version_key(ALL_USERS if user_id is None else user_id)
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def get_auth_user(user_id):
+    """The user with ``user_id`` (company selected), or None if missing."""
+    User = get_user_model()
+    key = f'accounts:auth_user:{user_id}:v{_auth_version(user_id)}'
+    user = cache.get(key)
+    if user is None:
+        try:
+            user = User.objects.select_related('company').get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            return None
+        cache.set(key, user, AUTH_USER_CACHE_TTL)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication resolving the user through get_auth_user()."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_auth_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
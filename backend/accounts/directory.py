@@ -0,0 +1,206 @@
+"""
+Process-wide user directory.
+
+Display names (and the role/team/manager facts used for contact masking)
+are needed for nearly every row a list endpoint returns, but users change
+rarely. The directory loads one small entry per user once per process and
+answers from memory, so serializers no longer need a join or a query per
+row just to print a name:
+
+    from accounts.directory import user_directory
+
+    user_directory.name(lead.assigned_to_id)
+    entries = user_directory.get_many(row['created_by'] for row in rows)
+
+Users missing from the index (created by another process, or with
+``bulk_create``) are fetched on first lookup, several at a time with
+``get_many``. Entries are invalidated by the User/Team signals
+(accounts.signals); code that changes users with ``.update()`` calls
+``user_directory.invalidate()``. Signals only reach the process that made
+the change, so each process also reloads its index after
+USER_DIRECTORY_MAX_AGE seconds; with USER_DIRECTORY_SHARED_VERSION enabled,
+invalidation also bumps a version stamp in the shared cache, so every
+worker process reloads on its next lookup. Entries are dropped when the
+signal fires and again after commit, so a lookup made while the transaction
+was open does not keep the uncommitted state; a change that is rolled back is
+only forgotten on the next reload.
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+VERSION_CACHE_KEY = 'accounts:user_directory:version'
+
+ENTRY_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'role', 'team_id', 'team__name',
+    'manager_id', 'company_id', 'is_active',
+)
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """What the directory knows about one user."""
+    id: int
+    username: str
+    first_name: str
+    last_name: str
+    role: str
+    team_id: int | None
+    team_name: str | None
+    manager_id: int | None
+    company_id: int | None
+    is_active: bool
+
+    @property
+    def name(self):
+        """Full name, or the username when no name is set."""
+        return f"{self.first_name} {self.last_name}".strip() or self.username
+
+
+def _user_ids(values):
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def _fetch(user_ids=None):
+    from accounts.models import User
+
+    users = User.objects.all() if user_ids is None else User.objects.filter(id__in=user_ids)
+    return {row[0]: DirectoryEntry(*row) for row in users.values_list(*ENTRY_FIELDS)}
+
+
+class UserDirectory:
+    """In-memory id index over accounts.User."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    # ── Lookups ───────────────────────────────────────────────────────────
+
+    def get(self, user_id):
+        """Entry for this user id (int or numeric string), or None."""
+        ids = _user_ids([user_id])
+        return self.get_many(ids).get(ids.pop()) if ids else None
+
+    def get_many(self, user_ids):
+        """``{user_id: entry}`` for the given ids; unknown ids are left out."""
+        ids = _user_ids(user_ids)
+        if not ids:
+            return {}
+
+        found = {}
+        entries = self._index()
+        missing = ids - entries.keys()
+        if missing:
+            fetched = _fetch(missing)
+            # Rows read inside a transaction may be rolled back (bulk_create)
+            if not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+                with self._lock:
+                    if self._entries is entries:
+                        entries.update(fetched)
+            found.update(fetched)
+        found.update((user_id, entries[user_id]) for user_id in ids if user_id in entries)
+        return found
+
+    def name(self, user_id, default=None):
+        """Display name of this user, or ``default``."""
+        entry = self.get(user_id)
+        return entry.name if entry else default
+
+    def all(self):
+        """
+        Entries for every user, ordered by id. Always one query, since users
+        created in other processes are not in the index yet; the result
+        refreshes it.
+        """
+        entries = _fetch()
+        if not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            with self._lock:
+                self._entries = dict(entries)
+                self._version = self._shared_version()
+                self._loaded_at = time.monotonic()
+        return sorted(entries.values(), key=lambda entry: entry.id)
+
+    # ── Loading / invalidation ────────────────────────────────────────────
+
+    def _shared_version(self):
+        if not getattr(settings, 'USER_DIRECTORY_SHARED_VERSION', False):
+            return None
+        return cache.get(VERSION_CACHE_KEY, 0)
+
+    def _is_current(self, version):
+        max_age = getattr(settings, 'USER_DIRECTORY_MAX_AGE', 300)
+        return (
+            self._entries is not None
+            and version == self._version
+            and time.monotonic() - self._loaded_at < max_age
+        )
+
+    def _index(self):
+        version = self._shared_version()
+        entries = self._entries
+        if self._is_current(version):
+            return entries
+        with self._lock:
+            if not self._is_current(version):
+                self._entries = _fetch()
+                self._version = version
+                self._loaded_at = time.monotonic()
+            return self._entries
+
+    def invalidate(self, shared=True):
+        """Drop the in-process index (and bump the shared version stamp)."""
+        with self._lock:
+            self._entries = None
+        if shared:
+            self._bump_shared_version()
+
+    def _bump_shared_version(self):
+        if not getattr(settings, 'USER_DIRECTORY_SHARED_VERSION', False):
+            return
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(VERSION_CACHE_KEY, 1, None)
+
+    def _evict(self, user_id):
+        with self._lock:
+            if self._entries is not None:
+                self._entries.pop(user_id, None)
+
+    def user_changed(self, user_id, deleted=False, using=DEFAULT_DB_ALIAS):
+        """
+        Signal hook: a user row was saved or deleted. Forgets the entry now
+        (for this transaction) and again after commit, when the other workers
+        are told to reload too. Deleting a user also clears the manager of
+        their reports (in SQL), so it drops the whole index.
+        """
+        def forget():
+            if deleted:
+                self.invalidate(shared=False)
+            else:
+                self._evict(user_id)
+
+        def committed():
+            forget()
+            # Other workers only need to reload once the change is committed
+            self._bump_shared_version()
+
+        forget()
+        transaction.on_commit(committed, using=using)
+
+
+user_directory = UserDirectory()
@@ -7,6 +7,9 @@ Usage:
 """
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from accounts.authentication import invalidate_auth_user
+from accounts.directory import user_directory
+from accounts.scopes import invalidate_scopes
 from accounts.models import Company
 
 User = get_user_model()
@@ -100,6 +103,9 @@ class Command(BaseCommand):
         
         # Perform assignment
         users.update(company=company)
+        user_directory.invalidate()
+        invalidate_auth_user()
+        invalidate_scopes()
         
         self.stdout.write(
             self.style.SUCCESS(
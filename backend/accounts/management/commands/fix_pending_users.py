@@ -4,6 +4,8 @@ This ensures they cannot log in until approved by admin.
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from accounts.directory import user_directory
+from accounts.scopes import invalidate_scopes
 
 User = get_user_model()
 
@@ -22,6 +24,8 @@ class Command(BaseCommand):
         
         # Mark them as inactive
         updated = pending_users.update(is_active=False)
+        user_directory.invalidate()
+        invalidate_scopes()
         
         self.stdout.write(
             self.style.SUCCESS(
@@ -7,13 +7,16 @@ and manager-employee hierarchies.
 
 Role Hierarchy:
 - Admin: Can see all data
-- Manager: Can see their own data + data of employees under them
+- Manager: Can see their own data + data of everyone reporting to them
 - Employee: Can only see their own data
 """
 
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 
+from .directory import user_directory
+from .scopes import access_scope
+
 User = get_user_model()
 
 
@@ -68,7 +71,7 @@ def filter_by_user_access(queryset, user, assigned_to_field='assigned_to', creat
     - Admins see all data across all companies
     - HR see all data within their company
     - Team Leads see data for all members in their team
-    - Managers see their own data + their assigned employees' data only
+    - Managers see their own data + data of everyone reporting to them
     - Employees see ONLY data assigned to them (not data they created)
     
     Args:
@@ -91,31 +94,22 @@ def filter_by_user_access(queryset, user, assigned_to_field='assigned_to', creat
             company_filter = Q(company=user.company)
         return queryset.filter(company_filter)
     
-    # Get accessible user IDs for team_lead/manager/employee roles
-    accessible_user_ids = get_accessible_user_ids(user)
-    
-    # Build Q objects for filtering
-    filters = Q()
+    # Compiled scope for team_lead/manager/employee roles (a subquery or a
+    # short id set, never the full user list)
+    scope = access_scope(user)
     
     # For employees: ONLY filter by assigned_to (not created_by)
     # For team leads and managers: filter by both assigned_to and created_by
-    if user.role == 'employee':
-        # Employees can ONLY see records assigned to them
-        if assigned_to_field and hasattr(queryset.model, assigned_to_field):
-            filters |= Q(**{f'{assigned_to_field}__id__in': accessible_user_ids})
-    else:
-        # Team leads and managers can see records assigned to them OR created by them/their team
-        # Filter by assigned_to if field exists
-        if assigned_to_field and hasattr(queryset.model, assigned_to_field):
-            filters |= Q(**{f'{assigned_to_field}__id__in': accessible_user_ids})
-        
-        # Filter by created_by if field exists
-        if created_by_field and hasattr(queryset.model, created_by_field):
-            filters |= Q(**{f'{created_by_field}__id__in': accessible_user_ids})
+    user_fields = [assigned_to_field]
+    if user.role != 'employee':
+        user_fields.append(created_by_field)
+    filters = scope.q(*[
+        field for field in user_fields if field and hasattr(queryset.model, field)
+    ])
     
     # Also filter by company to ensure data isolation
     if hasattr(queryset.model, 'company'):
-        filters &= Q(company=user.company)
+        filters &= scope.company_q()
     
     return queryset.filter(filters).distinct()
 
@@ -192,7 +186,7 @@ def should_hide_contact_details(requesting_user, data_owner_user):
     
     Args:
         requesting_user: User making the request
-        data_owner_user: User who owns/created the data
+        data_owner_user: User (or accounts.directory entry) who owns/created the data
         
     Returns:
         bool: True if contact details should be hidden, False otherwise
@@ -207,9 +201,8 @@ def should_hide_contact_details(requesting_user, data_owner_user):
     
     # Team leads can see their team members' data
     if requesting_user.role == 'team_lead':
-        if (requesting_user.team and 
-            data_owner_user.team and 
-            requesting_user.team.id == data_owner_user.team.id):
+        if (requesting_user.team_id and
+            requesting_user.team_id == data_owner_user.team_id):
             return False
     
     # Managers can see their employees' data
@@ -232,16 +225,13 @@ def mask_contact_details(data, requesting_user, owner_user_id=None, owner_user=N
         data: Dictionary containing the data
         requesting_user: User making the request
         owner_user_id: ID of the user who owns the data (optional)
-        owner_user: User object who owns the data (optional)
+        owner_user: User object (or directory entry) who owns the data (optional)
         
     Returns:
         dict: Data with masked contact details if necessary
     """
     if not owner_user and owner_user_id:
-        try:
-            owner_user = User.objects.get(id=owner_user_id)
-        except User.DoesNotExist:
-            return data
+        owner_user = user_directory.get(owner_user_id)
     
     if not owner_user:
         return data
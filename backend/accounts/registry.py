@@ -0,0 +1,136 @@
+"""
+Process-wide company registry.
+
+Companies change a few times a year but are looked up on almost every ASE and
+Capital request. The registry loads the whole table once per process and
+resolves by id or code from memory:
+
+    from accounts.registry import company_registry
+
+    company_registry.by_code('ESWARI_CAP')
+    company_registry.first_by_codes(ASE_COMPANY_CODES)
+    company_registry.by_id(request.query_params.get('company'))
+
+It is invalidated by the Company post_save/post_delete signals
+(accounts.signals). Signals only reach the process that made the change, so
+each process also reloads its index after COMPANY_REGISTRY_MAX_AGE seconds;
+with COMPANY_REGISTRY_SHARED_VERSION enabled, invalidation also bumps a
+version stamp in the shared cache, so every worker process reloads on its
+next lookup. The index is dropped when the signal fires and again after
+commit, so a lookup made while the transaction was open does not keep the
+uncommitted state; a change that is rolled back is only forgotten on the next
+reload.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+# Codes the ASE Technologies company has used; the first existing one wins
+ASE_COMPANY_CODES = ('ASE', 'ASE_TECH')
+
+VERSION_CACHE_KEY = 'accounts:company_registry:version'
+
+
+class CompanyRegistry:
+    """In-memory id/code index over accounts.Company."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = None
+        self._by_code = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    # ── Lookups ───────────────────────────────────────────────────────────
+
+    def by_id(self, company_id):
+        """Company with this id (int or numeric string), or None."""
+        try:
+            company_id = int(company_id)
+        except (TypeError, ValueError):
+            return None
+        return self._index()[0].get(company_id)
+
+    def by_code(self, code):
+        """Company with this code, or None."""
+        return self._index()[1].get(code)
+
+    def first_by_codes(self, codes):
+        """First company found among ``codes``, in the given order."""
+        by_code = self._index()[1]
+        for code in codes:
+            if code in by_code:
+                return by_code[code]
+        return None
+
+    def all(self):
+        """All companies, ordered like Company.objects.all()."""
+        return list(self._index()[0].values())
+
+    # ── Loading / invalidation ────────────────────────────────────────────
+
+    def _shared_version(self):
+        if not getattr(settings, 'COMPANY_REGISTRY_SHARED_VERSION', False):
+            return None
+        return cache.get(VERSION_CACHE_KEY, 0)
+
+    def _load(self):
+        from accounts.models import Company
+
+        by_id, by_code = {}, {}
+        for company in Company.objects.all():
+            by_id[company.id] = company
+            by_code[company.code] = company
+        return by_id, by_code
+
+    def _is_current(self, version):
+        max_age = getattr(settings, 'COMPANY_REGISTRY_MAX_AGE', 300)
+        return (
+            self._by_id is not None
+            and version == self._version
+            and time.monotonic() - self._loaded_at < max_age
+        )
+
+    def _index(self):
+        version = self._shared_version()
+        by_id, by_code = self._by_id, self._by_code
+        if self._is_current(version):
+            return by_id, by_code
+        with self._lock:
+            if not self._is_current(version):
+                self._by_id, self._by_code = self._load()
+                self._version = version
+                self._loaded_at = time.monotonic()
+            return self._by_id, self._by_code
+
+    def invalidate(self, shared=True):
+        """Drop the in-process index (and bump the shared version stamp)."""
+        with self._lock:
+            self._by_id = None
+            self._by_code = None
+        if shared and getattr(settings, 'COMPANY_REGISTRY_SHARED_VERSION', False):
+            try:
+                cache.incr(VERSION_CACHE_KEY)
+            except ValueError:
+                cache.set(VERSION_CACHE_KEY, 1, None)
+
+    def company_changed(self, using=DEFAULT_DB_ALIAS):
+        """
+        Signal hook: a company row was saved or deleted. Drops the index now
+        (for this transaction) and again after commit, when the other workers
+        are told to reload too.
+        """
+        self.invalidate(shared=False)
+        transaction.on_commit(self.invalidate, using=using)
+
+
+company_registry = CompanyRegistry()
+
+
+def get_ase_company():
+    """The ASE Technologies company, or None."""
+    return company_registry.first_by_codes(ASE_COMPANY_CODES)
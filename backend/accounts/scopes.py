@@ -0,0 +1,162 @@
+"""
+Compiled, cached access scopes.
+
+``access_scope(user)`` describes which users' records ``user`` may see and
+compiles that into a queryset filter instead of materializing every
+accessible user id:
+
+    scope = access_scope(request.user)
+    qs = qs.filter(scope.q('assigned_to', 'created_by'))
+
+- admin: no user filter (``is_global``)
+- hr: no user filter within their company (``company_wide``)
+- team_lead: members of their team, as a subquery
+- manager: themselves and everyone reporting to them, directly or through
+  other managers
+- employee (and team leads without a team): only themselves
+- any other role: nobody
+
+Scopes are cached per user under a version stamp that is bumped whenever a
+user is created or deleted or their role, company, team, manager or active
+flag changes (accounts.signals). The bump only reaches other worker
+processes through a shared cache; with the per-process LocMemCache scopes
+live no longer than an authenticated user (AUTH_USER_CACHE_TTL), which
+bounds how long a manager keeps the reporting tree of before a move.
+"""
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from utils.cache_versions import VERSIONED_CACHE_TTL, cache_is_shared
+
+
+VERSION_CACHE_KEY = 'accounts:access_scope:version'
+
+SCOPE_CACHE_TTL = VERSIONED_CACHE_TTL if cache_is_shared() else getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+# User fields a scope is compiled from
+SCOPE_FIELDS = ('role', 'company_id', 'team_id', 'manager_id', 'is_active')
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """Which users' records a user may access."""
+    user_id: int
+    role: str
+    company_id: int | None
+    team_id: int | None = None
+    # manager: the manager and their whole reporting tree
+    user_ids: frozenset = frozenset()
+
+    @property
+    def is_global(self):
+        return self.role == 'admin'
+
+    @property
+    def company_wide(self):
+        return self.role == 'hr'
+
+    def users(self):
+        """The users in scope, usable as the right-hand side of ``__in``."""
+        from accounts.models import User
+
+        if self.role == 'team_lead' and self.team_id:
+            return User.objects.filter(team_id=self.team_id, company_id=self.company_id).values('id')
+        if self.role == 'manager':
+            return self.user_ids
+        if self.role in ('employee', 'team_lead'):
+            return [self.user_id]
+        return []
+
+    def q(self, *user_fields):
+        """
+        ``Q`` matching rows where any of ``user_fields`` (FK names) points at
+        a user in scope. Empty (no filter) for admin and HR scopes.
+        """
+        if self.is_global or self.company_wide:
+            return Q()
+        users = self.users()
+        condition = Q()
+        for field in user_fields:
+            condition |= Q(**{f'{field}_id__in': users})
+        return condition
+
+    def company_q(self, field='company'):
+        """``Q`` limiting rows to the user's company (empty for admins)."""
+        if self.is_global:
+            return Q()
+        return Q(**{f'{field}_id': self.company_id})
+
+
+def _reporting_tree(user):
+    """``user`` and everyone in the same company who reports to them."""
+    from accounts.models import User
+
+    ids = {user.id}
+    frontier = [user.id]
+    while frontier:
+        frontier = [
+            report_id for report_id in User.objects.filter(
+                manager_id__in=frontier, company_id=user.company_id
+            ).values_list('id', flat=True)
+            if report_id not in ids
+        ]
+        ids.update(frontier)
+    return frozenset(ids)
+
+
+def compile_scope(user):
+    """Build the AccessScope of ``user`` from the database."""
+    return AccessScope(
+        user_id=user.id,
+        role=user.role,
+        company_id=user.company_id,
+        team_id=user.team_id,
+        user_ids=_reporting_tree(user) if user.role == 'manager' else frozenset(),
+    )
+
+
+def _version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # Not 1: restarting an evicted counter low could revive old scopes
+        cache.add(VERSION_CACHE_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def access_scope(user):
+    """The (cached) AccessScope of ``user``; memoized on the user object for the request."""
+    version = _version()
+    memo = getattr(user, '_access_scope', None)
+    if memo is not None and memo[0] == version:
+        return memo[1]
+
+    key = f'access_scope:{user.id}:v{version}'
+    scope = cache.get(key)
+    if scope is None or (scope.role, scope.company_id, scope.team_id) != (user.role, user.company_id, user.team_id):
+        scope = compile_scope(user)
+        cache.set(key, scope, SCOPE_CACHE_TTL)
+    user._access_scope = (version, scope)
+    return scope
+
+
+def _bump():
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, int(time.time() * 1000), None)
+
+
+def invalidate_scopes():
+    """
+    Make every cached scope stale. Bumps now (for this transaction) and
+    again after commit, so a scope compiled by another request before the
+    commit is not reused.
+    """
+    _bump()
+    transaction.on_commit(_bump)
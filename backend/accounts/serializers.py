@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from .directory import user_directory
 from .models import Company
 from teams.models import Team
 from utils.validators import CompanyValidationMixin, ManagerValidationMixin
@@ -25,9 +26,7 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_manager_name(self, obj):
         """Get the manager's full name"""
-        if obj.manager:
-            return f"{obj.manager.first_name} {obj.manager.last_name}".strip() or obj.manager.username
-        return None
+        return user_directory.name(obj.manager_id)
     
     def get_employees_count(self, obj):
         """Get count of employees under this manager"""
@@ -44,9 +43,7 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_approved_by_name(self, obj):
         """Get the approver's full name"""
-        if obj.approved_by:
-            return f"{obj.approved_by.first_name} {obj.approved_by.last_name}".strip() or obj.approved_by.username
-        return None
+        return user_directory.name(obj.approved_by_id)
     
     def get_team_info(self, obj):
         """Get team information"""
@@ -1,11 +1,17 @@
 """
 Signal handlers for accounts app.
 """
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 import logging
 
+from .authentication import invalidate_auth_user
+from .directory import user_directory
+from .models import Company
+from .registry import company_registry
+from .scopes import SCOPE_FIELDS, invalidate_scopes
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,11 @@ def clear_manager_on_company_change(sender, instance, **kwargs):
             # Get the old instance from database
             old_instance = User.objects.get(pk=instance.pk)
             
+            # Remember whether the access scopes need recompiling (post_save)
+            instance._access_scope_changed = any(
+                getattr(old_instance, field) != getattr(instance, field) for field in SCOPE_FIELDS
+            )
+            
             # Check if company has changed
             if old_instance.company_id != instance.company_id:
                 # If user has a manager, check if manager is from the new company
@@ -38,3 +49,55 @@ def clear_manager_on_company_change(sender, instance, **kwargs):
         except User.DoesNotExist:
             # This shouldn't happen, but handle gracefully
             pass
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_registry(sender, instance, using, **kwargs):
+    """Reload the process-wide company registry after any company change."""
+    company_registry.company_changed(using=using)
+    # Cached request users carry their company (and its is_active flag)
+    invalidate_auth_user()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_directory(sender, instance, using, update_fields=None, **kwargs):
+    """Forget the directory entry of a saved user (logins only touch last_login)."""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    user_directory.user_changed(instance.pk, using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_auth_user(sender, instance, update_fields=None, **kwargs):
+    """Resolve the user from the database again on its next authenticated request."""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_auth_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_directory_on_delete(sender, instance, using, **kwargs):
+    user_directory.user_changed(instance.pk, deleted=True, using=using)
+
+
+@receiver(post_save, sender=User)
+def invalidate_access_scopes(sender, instance, created, update_fields=None, **kwargs):
+    """Recompile access scopes when a user joins or changes role, company, team or manager."""
+    if update_fields and not set(update_fields) & {'role', 'company', 'team', 'manager', 'is_active'}:
+        return
+    if created or getattr(instance, '_access_scope_changed', True):
+        invalidate_scopes()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_access_scopes_on_delete(sender, instance, **kwargs):
+    invalidate_scopes()
+
+
+@receiver(post_save, sender='teams.Team')
+@receiver(post_delete, sender='teams.Team')
+def invalidate_user_directory_teams(sender, instance, using, **kwargs):
+    """Team names are part of the directory entries; teams rarely change."""
+    user_directory.invalidate()
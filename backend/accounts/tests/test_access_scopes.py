@@ -0,0 +1,123 @@
+"""
+Tests for compiled, cached access scopes.
+
+Tests cover:
+- Admins and HR compile to no user filter
+- A manager's scope covers their whole reporting tree
+- Team lead scopes compile to a subquery instead of an id list
+- Scopes are cached and recompiled when a user's manager or team changes
+- Without a shared cache, scopes expire as soon as cached auth users do
+- filter_by_user_access and get_capital_queryset apply the scope
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.conf import settings
+from django.test import TestCase
+
+from accounts.models import Company
+from accounts.permissions import filter_by_user_access
+from accounts.scopes import SCOPE_CACHE_TTL, access_scope
+from capital.models import CapitalCustomer
+from capital.views import get_capital_queryset
+from customers.models import Customer
+from teams.models import Team
+
+User = get_user_model()
+
+
+class AccessScopeTest(TestCase):
+    """Tests for accounts.scopes.access_scope"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.team = Team.objects.create(name='Frontend', team_type='technical', company=self.company)
+        self.admin = self._user('admin', 'admin')
+        self.head = self._user('head', 'manager')
+        self.manager = self._user('manager', 'manager', manager=self.head)
+        self.employee = self._user('employee', 'employee', manager=self.manager, team=self.team)
+        self.outsider = self._user('outsider', 'employee')
+
+    def _user(self, username, role, **kwargs):
+        return User.objects.create_user(
+            username=username, password='testpass123', role=role, company=self.company, **kwargs
+        )
+
+    def _fresh(self, user):
+        # A new object, like request.user on the next request
+        return User.objects.get(pk=user.pk)
+
+    def _customer(self, phone, assigned_to):
+        return Customer.objects.create(
+            name=phone, phone=phone, company=self.company, assigned_to=assigned_to, created_by=self.admin,
+        )
+
+    def test_admin_and_hr_have_no_user_filter(self):
+        hr = self._user('hr', 'hr')
+
+        self.assertEqual(access_scope(self.admin).q('assigned_to', 'created_by'), Q())
+        self.assertEqual(access_scope(hr).q('assigned_to'), Q())
+        self.assertEqual(access_scope(self.admin).company_q(), Q())
+        self.assertEqual(access_scope(hr).company_q(), Q(company_id=self.company.id))
+
+    def test_manager_scope_covers_reporting_tree(self):
+        scope = access_scope(self.head)
+
+        self.assertEqual(scope.users(), {self.head.id, self.manager.id, self.employee.id})
+        self.assertEqual(access_scope(self.employee).users(), [self.employee.id])
+
+    def test_team_lead_scope_is_a_subquery(self):
+        lead = self._user('lead', 'team_lead', team=self.team)
+
+        users = access_scope(lead).users()
+
+        self.assertNotIsInstance(users, (list, set, frozenset))
+        self.assertEqual(set(users.values_list('id', flat=True)), {lead.id, self.employee.id})
+
+    def test_scope_is_cached_until_reporting_lines_change(self):
+        access_scope(self.head)
+        head = self._fresh(self.head)
+        with self.assertNumQueries(0):
+            access_scope(head)
+
+        self.outsider.manager = self.manager
+        self.outsider.save()
+        self.assertIn(self.outsider.id, access_scope(self._fresh(self.head)).users())
+
+        self.outsider.manager = None
+        self.outsider.save()
+        self.assertNotIn(self.outsider.id, access_scope(self._fresh(self.head)).users())
+
+    def test_scope_ttl_is_short_without_shared_cache(self):
+        # Other workers never see this process's version bumps
+        self.assertLessEqual(SCOPE_CACHE_TTL, settings.AUTH_USER_CACHE_TTL)
+
+    def test_login_does_not_invalidate(self):
+        access_scope(self.head)
+        self.employee.save(update_fields=['last_login'])
+        head = self._fresh(self.head)
+        with self.assertNumQueries(0):
+            access_scope(head)
+
+    def test_filter_by_user_access_applies_scope(self):
+        indirect = self._customer('9000000001', self.employee)
+        self._customer('9000000002', self.outsider)
+
+        visible = filter_by_user_access(Customer.objects.all(), self._fresh(self.head))
+        self.assertEqual(list(visible), [indirect])
+        self.assertEqual(
+            filter_by_user_access(Customer.objects.all(), self._fresh(self.admin)).count(), 2
+        )
+
+    def test_capital_queryset_applies_scope(self):
+        capital, _ = Company.objects.get_or_create(code='ESWARI_CAP', defaults={'name': 'Eswari Capital'})
+        head = User.objects.create_user(username='cap_head', role='manager', company=capital)
+        manager = User.objects.create_user(username='cap_manager', role='manager', company=capital, manager=head)
+        employee = User.objects.create_user(username='cap_employee', role='employee', company=capital, manager=manager)
+        owned = CapitalCustomer.objects.create(
+            name='Owned', phone='9000000003', company=capital,
+            assigned_to=employee, created_by=head,
+        )
+        CapitalCustomer.objects.create(name='Other', phone='9000000004', company=capital, created_by=self.admin)
+
+        self.assertEqual(list(get_capital_queryset(CapitalCustomer.objects.all(), self._fresh(head))), [owned])
+        self.assertEqual(list(get_capital_queryset(CapitalCustomer.objects.all(), self._fresh(employee))), [owned])
@@ -0,0 +1,73 @@
+"""
+Tests for cached JWT user resolution.
+
+Tests cover:
+- A repeated token is resolved without querying the user or company
+- Deactivating a user, changing their role or deleting them applies to the next request
+- Deactivating the user's company is seen by the next request
+- WebSocket authentication resolves users through the same cache
+"""
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import CachedJWTAuthentication, get_auth_user
+from accounts.models import Company
+from eswari_crm.consumers import NotificationConsumer
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """Tests for accounts.authentication"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.user = User.objects.create_user(
+            username='employee', password='testpass123', role='employee', company=self.company,
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def test_repeated_token_is_served_from_cache(self):
+        self.authentication.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+            self.assertEqual(user, self.user)
+            self.assertEqual(user.company.code, 'ESWARI')
+
+    def test_user_changes_apply_to_next_request(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(client.get('/api/auth/profile/').status_code, status.HTTP_200_OK)
+
+        self.user.role = 'manager'
+        self.user.save()
+        self.assertEqual(self.authentication.get_user(self.token).role, 'manager')
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(client.get('/api/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.delete()
+        self.assertIsNone(get_auth_user(self.token['user_id']))
+
+    def test_company_deactivation_applies_to_next_request(self):
+        self.assertTrue(self.authentication.get_user(self.token).company.is_active)
+
+        self.company.is_active = False
+        self.company.save()
+
+        self.assertFalse(self.authentication.get_user(self.token).company.is_active)
+
+    def test_websocket_uses_the_cache(self):
+        consumer = NotificationConsumer()
+        self.assertEqual(async_to_sync(consumer._get_user)(self.user.id), self.user)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(async_to_sync(consumer._get_user)(self.user.id))
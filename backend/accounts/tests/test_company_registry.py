@@ -0,0 +1,89 @@
+"""
+Tests for the process-wide company registry.
+
+Tests cover:
+- Lookups by id/code are served from memory once loaded
+- Saving or deleting a company invalidates the registry
+- The index is dropped again when the transaction commits
+- The shared-cache version stamp forces a reload
+- The index is reloaded after COMPANY_REGISTRY_MAX_AGE even without a signal
+- notify_ase_data_changed targets the ASE company's group
+"""
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models import Company
+from accounts.registry import VERSION_CACHE_KEY, company_registry, get_ase_company
+from eswari_crm.ws_utils import notify_ase_data_changed
+
+
+class CompanyRegistryTest(TestCase):
+    """Tests for accounts.registry.company_registry"""
+
+    def setUp(self):
+        company_registry.invalidate()
+
+    def test_lookups_hit_memory_after_first_load(self):
+        seeded = Company.objects.get(code='ESWARI')
+        with self.assertNumQueries(1):
+            self.assertEqual(company_registry.by_code('ESWARI'), seeded)
+        with self.assertNumQueries(0):
+            self.assertEqual(company_registry.by_id(seeded.id), seeded)
+            self.assertEqual(company_registry.by_id(str(seeded.id)), seeded)
+            self.assertEqual(company_registry.first_by_codes(['MISSING', 'ESWARI']), seeded)
+            self.assertIsNone(company_registry.by_code('MISSING'))
+            self.assertIsNone(company_registry.by_id('not-a-number'))
+
+    def test_save_and_delete_invalidate(self):
+        self.assertIsNone(company_registry.by_code('REG_TEST'))
+
+        company = Company.objects.create(name='Registry Test', code='REG_TEST')
+        self.assertEqual(company_registry.by_code('REG_TEST'), company)
+
+        company.code = 'REG_RENAMED'
+        company.save()
+        self.assertIsNone(company_registry.by_code('REG_TEST'))
+        self.assertEqual(company_registry.by_code('REG_RENAMED').id, company.id)
+
+        company.delete()
+        self.assertIsNone(company_registry.by_code('REG_RENAMED'))
+
+    def test_commit_invalidates_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(name='Committed', code='COMMITTED')
+            # Loaded while the transaction is still open
+            self.assertEqual(company_registry.by_code('COMMITTED'), company)
+            Company.objects.filter(id=company.id).update(name='Renamed')
+        self.assertEqual(company_registry.by_code('COMMITTED').name, 'Renamed')
+
+    @override_settings(COMPANY_REGISTRY_SHARED_VERSION=True)
+    def test_shared_version_bump_forces_reload(self):
+        company_registry.by_code('ESWARI')
+        with self.assertNumQueries(0):
+            company_registry.by_code('ESWARI')
+
+        # Another worker changed a company and bumped the stamp
+        cache.set(VERSION_CACHE_KEY, cache.get(VERSION_CACHE_KEY, 0) + 1, None)
+        with self.assertNumQueries(1):
+            company_registry.by_code('ESWARI')
+
+    def test_index_expires_after_max_age(self):
+        company = Company.objects.get(code='ESWARI')
+        company_registry.by_code('ESWARI')
+
+        # Another worker deactivated the company; no signal reaches this one
+        Company.objects.filter(id=company.id).update(is_active=False)
+        self.assertTrue(company_registry.by_code('ESWARI').is_active)
+
+        with override_settings(COMPANY_REGISTRY_MAX_AGE=0), self.assertNumQueries(1):
+            self.assertFalse(company_registry.by_code('ESWARI').is_active)
+
+    @override_settings(WS_COALESCE_WINDOW=0)
+    def test_ase_notifications_use_the_ase_company_group(self):
+        ase, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.assertEqual(get_ase_company(), ase)
+        with patch('eswari_crm.ws_utils._send_to_group', return_value=True) as send:
+            notify_ase_data_changed('leads', 'created', record_id=1)
+        self.assertEqual(send.call_args[0][0], f'company_{ase.id}')
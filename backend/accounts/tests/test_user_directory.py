@@ -0,0 +1,125 @@
+"""
+Tests for the process-wide user directory.
+
+Tests cover:
+- get_many resolves any number of users with at most one query, then from memory
+- Saving a user (or renaming their team) refreshes their entry
+- Entries are dropped again when the transaction commits
+- The shared-cache version stamp forces a reload
+- Contact masking and conversion-by-user analytics read owners from the directory
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.directory import VERSION_CACHE_KEY, user_directory
+from accounts.models import Company
+from accounts.permissions import mask_contact_details
+from customers.models import Customer
+from customers.services import AnalyticsService
+from teams.models import Team
+
+User = get_user_model()
+
+
+class UserDirectoryTest(TestCase):
+    """Tests for accounts.directory.user_directory"""
+
+    def setUp(self):
+        user_directory.invalidate()
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.team = Team.objects.create(name='Frontend', team_type='technical', company=self.company)
+        self.manager = User.objects.create_user(
+            username='manager', email='manager@test.com', password='testpass123',
+            first_name='Meena', last_name='Rao', role='manager', company=self.company,
+        )
+        self.employee = User.objects.create_user(
+            username='employee', email='employee@test.com', password='testpass123',
+            role='employee', company=self.company, team=self.team, manager=self.manager,
+        )
+
+    def _bulk_users(self, count):
+        # bulk_create skips the signals, like users created by another process
+        return User.objects.bulk_create([
+            User(username=f'bulk_{i}', first_name=f'Bulk{i}', role='employee', company=self.company)
+            for i in range(count)
+        ])
+
+    def test_get_many_is_one_query_then_memory(self):
+        ids = [user.id for user in self._bulk_users(20)]
+
+        with self.assertNumQueries(1):
+            entries = user_directory.get_many(ids + [None, 'x'])
+        self.assertEqual(len(entries), 20)
+        with self.assertNumQueries(0):
+            self.assertEqual(user_directory.name(ids[3]), 'Bulk3')
+            self.assertEqual(user_directory.get(str(ids[0])).role, 'employee')
+            self.assertIsNone(user_directory.get(None))
+
+    def test_entry_fields(self):
+        entry = user_directory.get(self.employee.id)
+
+        self.assertEqual(entry.name, 'employee')
+        self.assertEqual((entry.team_id, entry.team_name), (self.team.id, 'Frontend'))
+        self.assertEqual(entry.manager_id, self.manager.id)
+        self.assertEqual(user_directory.name(self.manager.id), 'Meena Rao')
+
+    def test_saves_refresh_entries(self):
+        self.assertEqual(user_directory.name(self.employee.id), 'employee')
+
+        self.employee.first_name = 'Ravi'
+        self.employee.save()
+        self.assertEqual(user_directory.name(self.employee.id), 'Ravi')
+
+        self.team.name = 'Web Platform'
+        self.team.save()
+        self.assertEqual(user_directory.get(self.employee.id).team_name, 'Web Platform')
+
+        user_id = self.employee.id
+        self.employee.delete()
+        self.assertIsNone(user_directory.get(user_id))
+
+    def test_commit_invalidates_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.first_name = 'Ravi'
+            self.employee.save()
+            # Loaded while the transaction is still open
+            self.assertEqual(user_directory.name(self.employee.id), 'Ravi')
+            User.objects.filter(id=self.employee.id).update(first_name='Kiran')
+        self.assertEqual(user_directory.name(self.employee.id), 'Kiran')
+
+    @override_settings(USER_DIRECTORY_SHARED_VERSION=True)
+    def test_shared_version_bump_forces_reload(self):
+        user_id = self._bulk_users(1)[0].id
+        user_directory.get(user_id)
+        with self.assertNumQueries(0):
+            user_directory.get(user_id)
+
+        # Another worker changed a user and bumped the stamp
+        cache.set(VERSION_CACHE_KEY, cache.get(VERSION_CACHE_KEY, 0) + 1, None)
+        with self.assertNumQueries(1):
+            user_directory.get(user_id)
+
+    def test_contact_masking_uses_directory(self):
+        data = {'phone': '9876543210'}
+        colleague = User.objects.create_user(
+            username='colleague', role='employee', company=self.company, team=self.team,
+        )
+        team_lead = User.objects.create_user(
+            username='lead', role='team_lead', company=self.company, team=self.team,
+        )
+
+        self.assertEqual(mask_contact_details(dict(data), colleague, owner_user_id=self.employee.id)['phone'], '***HIDDEN***')
+        self.assertEqual(mask_contact_details(dict(data), team_lead, owner_user_id=self.employee.id), data)
+        self.assertEqual(mask_contact_details(dict(data), self.manager, owner_user_id=self.employee.id), data)
+
+    def test_conversion_by_user_resolves_names_in_one_query(self):
+        for i, creator in enumerate([self.manager, self.employee] * 3):
+            Customer.objects.create(
+                name=f'Customer {i}', phone=f'98765000{i:02d}', company=self.company, created_by=creator,
+            )
+
+        with self.assertNumQueries(2):
+            results = AnalyticsService.get_conversion_by_user(self.company.id)
+
+        self.assertEqual({row['user_name'] for row in results}, {'Meena Rao', 'employee'})
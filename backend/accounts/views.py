@@ -227,15 +227,13 @@ class RegisterView(generics.CreateAPIView):
                 
                 # Create notifications for all admins
                 try:
-                    from notifications.models import Notification
-                    from notifications.utils import send_push_notification
+                    from notifications.utils import send_bulk_push_notification
                     from django.contrib.auth import get_user_model
                     User = get_user_model()
                     
                     # Get all admin users
                     admin_users = User.objects.filter(role='admin', is_active=True)
                     
-                    # Create notification for each admin
                     user_name = f"{user.first_name} {user.last_name}".strip() or user.username
                     hr_name = f"{request.user.first_name} {request.user.last_name}".strip() or request.user.username
                     
@@ -249,33 +247,17 @@ class RegisterView(generics.CreateAPIView):
                         'action_url': '/admin/pending-users'
                     }
                     
-                    for admin in admin_users:
-                        # Create in-app notification
-                        Notification.objects.create(
-                            user=admin,
-                            notification_type='system_alert',
-                            title=notification_title,
-                            message=notification_message,
-                            data=notification_data,
-                            company=user.company
-                        )
-                        
-                        # Send browser push notification
-                        try:
-                            send_push_notification(
-                                user=admin,
-                                title=notification_title,
-                                message=notification_message,
-                                notification_type='system_alert',
-                                data=notification_data,
-                                company=user.company
-                            )
-                            print(f"Sent push notification to admin: {admin.username}")
-                        except Exception as push_error:
-                            print(f"Failed to send push notification to {admin.username}: {str(push_error)}")
-                            # Continue even if push notification fails
+                    # One in-app notification + browser/mobile push per admin, written in bulk
+                    notified = send_bulk_push_notification(
+                        users=admin_users,
+                        title=notification_title,
+                        message=notification_message,
+                        notification_type='system_alert',
+                        data=notification_data,
+                        company=user.company
+                    )
                     
-                    print(f"Created approval notifications for {admin_users.count()} admin(s)")
+                    print(f"Created approval notifications for {notified} admin(s)")
                     
                 except Exception as e:
                     print(f"Failed to create approval notifications: {str(e)}")
@@ -1552,17 +1534,16 @@ def invite_register_view(request):
 
         # Notify all admins via web push
         try:
-            from notifications.utils import send_push_notification
+            from notifications.utils import send_bulk_push_notification
             admins = User.objects.filter(role='admin', is_active=True)
             full_name = f"{user.first_name} {user.last_name}".strip() or user.username
-            for admin in admins:
-                send_push_notification(
-                    user=admin,
-                    title='New User Pending Approval',
-                    message=f'{full_name} has registered and is awaiting your approval.',
-                    notification_type='system_alert',
-                    data={'url': '/admin/pending-users', 'user_id': str(user.id)},
-                )
+            send_bulk_push_notification(
+                users=admins,
+                title='New User Pending Approval',
+                message=f'{full_name} has registered and is awaiting your approval.',
+                notification_type='system_alert',
+                data={'url': '/admin/pending-users', 'user_id': str(user.id)},
+            )
         except Exception as e:
             pass  # Don't fail registration if notification fails
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ReportSchedule
+from .models import OverviewSnapshot, ReportSchedule
 
 
 @admin.register(ReportSchedule)
@@ -7,3 +7,10 @@ class ReportScheduleAdmin(admin.ModelAdmin):
     list_display = ['name', 'frequency', 'report_type', 'is_active', 'last_sent_at', 'next_send_at']
     list_filter = ['frequency', 'report_type', 'is_active']
     search_fields = ['name']
+
+
+@admin.register(OverviewSnapshot)
+class OverviewSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['period', 'period_start', 'computed_at']
+    readonly_fields = ['period', 'period_start', 'data', 'section_timings_ms', 'sources_as_of',
+                       'sources_changed_at', 'computed_at', 'refresh_started_at']
@@ -5,3 +5,7 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analytics'
     verbose_name = 'Unified Analytics'
+
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import analytics.signals  # noqa
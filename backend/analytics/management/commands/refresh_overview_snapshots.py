@@ -0,0 +1,47 @@
+"""
+Management command to recompute the cross-company overview snapshots.
+
+Usage:
+  python manage.py refresh_overview_snapshots              # all periods
+  python manage.py refresh_overview_snapshots --period month
+  python manage.py refresh_overview_snapshots --stale-only
+
+Run this via cron job so requests always find a warm snapshot:
+  */5 * * * * cd /path/to/backend && python manage.py refresh_overview_snapshots --stale-only
+"""
+
+from django.core.management.base import BaseCommand
+
+from analytics.models import OverviewSnapshot
+from analytics.overview import OVERVIEW_PERIODS, is_stale, refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cross-company analytics overview snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            choices=OVERVIEW_PERIODS,
+            action='append',
+            help='Period to refresh (repeatable; defaults to all periods)',
+        )
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            help='Skip snapshots that are still fresh',
+        )
+
+    def handle(self, *args, **options):
+        periods = options['period'] or OVERVIEW_PERIODS
+        existing = {s.period: s for s in OverviewSnapshot.objects.filter(period__in=periods)}
+
+        for period in periods:
+            current = existing.get(period)
+            if options['stale_only'] and current is not None and not is_stale(current):
+                self.stdout.write(f'Fresh: {period}')
+                continue
+
+            snapshot = refresh_snapshot(period)
+            total_ms = sum(snapshot.section_timings_ms.values())
+            self.stdout.write(self.style.SUCCESS(f'Refreshed: {period} ({total_ms:.0f} ms)'))
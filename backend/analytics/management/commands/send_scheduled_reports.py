@@ -16,16 +16,17 @@ from django.template.loader import render_to_string
 from django.conf import settings
 
 from analytics.models import ReportSchedule
+from analytics.scorecards import build_scorecards, sort_scorecards
 from analytics.views import (
     _get_period_range,
 )
-from accounts.models import User, Company
+from accounts.models import Company
 from leads.models import Lead
 from ase_leads.models import ASELead
 from capital.models import CapitalLoan, CapitalService, CapitalCustomer
 from customers.models import Customer
 from tasks.models import Task
-from django.db.models import Count, Sum, Q
+from django.db.models import Sum
 
 import logging
 
@@ -103,15 +104,17 @@ class Command(BaseCommand):
             ).count()
 
         elif report_type == 'scorecards':
-            top_performers = User.objects.filter(
-                is_active=True, role__in=['manager', 'employee']
-            ).annotate(
-                leads_count=Count('created_leads', filter=Q(created_leads__created_at__date__gte=start_date))
-            ).order_by('-leads_count')[:5]
+            top_performers = sort_scorecards(build_scorecards(start_date))[:5]
 
             data['top_performers'] = [
-                {'name': f"{u.first_name} {u.last_name}".strip() or u.username, 'leads': u.leads_count}
-                for u in top_performers
+                {
+                    'name': sc['name'],
+                    'score': sc['total_score'],
+                    'leads': sc['eswari_leads_created'] + sc['ase_leads_created'],
+                    'deals': sc['ase_deals_won'],
+                    'tasks': sc['tasks_completed'],
+                }
+                for sc in top_performers
             ]
 
         return data
@@ -147,7 +150,10 @@ class Command(BaseCommand):
         elif schedule.report_type == 'scorecards':
             lines.extend(["", "🏆 TOP PERFORMERS"])
             for i, p in enumerate(data.get('top_performers', []), 1):
-                lines.append(f"  {i}. {p['name']} - {p['leads']} leads")
+                lines.append(
+                    f"  {i}. {p['name']} - {p['score']} pts "
+                    f"({p['leads']} leads, {p['deals']} deals, {p['tasks']} tasks)"
+                )
 
         lines.extend([
             "",
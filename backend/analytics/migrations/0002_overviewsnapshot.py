@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverviewSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=10, unique=True)),
+                ('period_start', models.DateField()),
+                ('data', models.JSONField(default=dict, help_text='The overview payload as served')),
+                ('section_timings_ms', models.JSONField(default=dict, help_text='Compute time per section in milliseconds')),
+                ('source_version', models.CharField(blank=True, help_text='Cache generation the snapshot was computed at', max_length=200)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['period'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_overviewsnapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='overviewsnapshot',
+            name='source_version',
+        ),
+        migrations.AddField(
+            model_name='overviewsnapshot',
+            name='sources_as_of',
+            field=models.DateTimeField(blank=True, help_text='Rows updated after this time are not in the snapshot', null=True),
+        ),
+        migrations.AddField(
+            model_name='overviewsnapshot',
+            name='refresh_started_at',
+            field=models.DateTimeField(blank=True, help_text='Set while a worker recomputes the snapshot', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_overviewsnapshot_sources_as_of'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='overviewsnapshot',
+            name='sources_changed_at',
+            field=models.DateTimeField(blank=True, help_text='Last committed write to a source model', null=True),
+        ),
+    ]
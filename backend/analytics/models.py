@@ -62,3 +62,39 @@ class ReportSchedule(models.Model):
                 else:
                     self.next_send_at = now.replace(month=now.month + 1, day=1)
         super().save(*args, **kwargs)
+
+
+class OverviewSnapshot(models.Model):
+    """
+    Precomputed cross-company overview for one period
+    (see analytics.overview for how it is refreshed and served).
+    """
+    period = models.CharField(max_length=10, unique=True)
+    period_start = models.DateField()
+    data = models.JSONField(default=dict, help_text="The overview payload as served")
+    section_timings_ms = models.JSONField(
+        default=dict,
+        help_text="Compute time per section in milliseconds"
+    )
+    sources_as_of = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Rows updated after this time are not in the snapshot"
+    )
+    sources_changed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last committed write to a source model"
+    )
+    computed_at = models.DateTimeField()
+    refresh_started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Set while a worker recomputes the snapshot"
+    )
+
+    class Meta:
+        ordering = ['period']
+
+    def __str__(self):
+        return f"Overview {self.period} @ {self.computed_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,230 @@
+"""
+Cross-company overview snapshots.
+
+The overview counts rows across every business unit. Instead of computing
+it inside the request, results are stored per period in OverviewSnapshot
+and served with stale-while-revalidate semantics:
+
+  - a fresh snapshot is returned as is;
+  - a stale one (older than OVERVIEW_SNAPSHOT_MAX_AGE, from an earlier
+    period window, or older than the last write to a source model) is still
+    returned immediately, and one background thread recomputes it;
+  - only the very first request for a period computes inline.
+
+Staleness and the refresh claim both live on the snapshot rows, so every
+worker process (and the cron command) agrees on them and a read costs no
+queries beyond the snapshot itself. Saves and deletes of SOURCE_MODELS stamp
+``sources_changed_at`` on the snapshots after commit (analytics.signals);
+``.update()`` and ``bulk_create`` skip signals and are only picked up once
+the snapshot reaches OVERVIEW_SNAPSHOT_MAX_AGE.
+
+``manage.py refresh_overview_snapshots`` (cron) keeps every period warm so
+requests rarely see a stale snapshot at all.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from accounts.models import User
+from ase_leads.aggregation import aggregate_metrics
+from ase_leads.models import ASELead
+from capital.models import CapitalCustomer, CapitalLoan, CapitalService
+from customers.models import Customer
+from leads.models import Lead
+from leaves.models import Leave
+from tasks.models import Task
+
+from .models import OverviewSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+OVERVIEW_PERIODS = ('today', 'week', 'month', 'quarter', 'year')
+
+SNAPSHOT_MAX_AGE = getattr(settings, 'OVERVIEW_SNAPSHOT_MAX_AGE', 15 * 60)
+
+# A refresh claim older than this is assumed dead and can be taken over
+REFRESH_LOCK_TIMEOUT = 120
+
+
+def _eswari_group(start_date):
+    leads = aggregate_metrics(Lead.objects.all(), {
+        'leads_total': Count('pk'),
+        'leads_period': Q(created_at__date__gte=start_date),
+        'leads_hot': Q(status='hot'),
+    })
+    customers = aggregate_metrics(Customer.objects.all(), {
+        'customers_total': Count('pk'),
+        'customers_period': Q(created_at__date__gte=start_date),
+    })
+    return {**leads, **customers}
+
+
+def _ase_technologies(start_date):
+    won = Q(status='won', deal_closed_at__date__gte=start_date)
+    m = aggregate_metrics(ASELead.objects.all(), {
+        'leads_total': Count('pk'),
+        'leads_period': Q(created_at__date__gte=start_date),
+        'deals_won': won,
+        'revenue': Sum('estimated_project_value', filter=won),
+        'pipeline_value': Sum(
+            'estimated_project_value', filter=Q(status__in=['proposal_sent', 'negotiating'])
+        ),
+    })
+    m['revenue'] = float(m['revenue'] or 0)
+    m['pipeline_value'] = float(m['pipeline_value'] or 0)
+    return m
+
+
+def _eswari_capital(start_date):
+    in_period = Q(created_at__date__gte=start_date)
+    disbursed = in_period & Q(status='disbursed')
+    customers = aggregate_metrics(CapitalCustomer.objects.all(), {
+        'customers_total': Count('pk'),
+        'customers_period': in_period,
+    })
+    loans = aggregate_metrics(CapitalLoan.objects.all(), {
+        'loans_total': Count('pk'),
+        'loans_period': in_period,
+        'loans_disbursed': disbursed,
+        'loan_value_disbursed': Sum('loan_amount', filter=disbursed),
+    })
+    loans['loan_value_disbursed'] = float(loans['loan_value_disbursed'] or 0)
+    services = aggregate_metrics(CapitalService.objects.all(), {
+        'services_total': Count('pk'),
+        'services_period': in_period,
+        'services_completed': in_period & Q(status='completed'),
+    })
+    return {**customers, **loans, **services}
+
+
+def _team(start_date):
+    tasks = aggregate_metrics(Task.objects.all(), {
+        'total_tasks': Count('pk'),
+        'tasks_completed_period': Q(status='completed', updated_at__date__gte=start_date),
+    })
+    return {
+        'total_employees': User.objects.filter(is_active=True).count(),
+        'pending_leaves': Leave.objects.filter(status='pending').count(),
+        **tasks,
+    }
+
+
+OVERVIEW_SECTIONS = {
+    'eswari_group': _eswari_group,
+    'ase_technologies': _ase_technologies,
+    'eswari_capital': _eswari_capital,
+    'team': _team,
+}
+
+
+# Models the sections read
+SOURCE_MODELS = (
+    Lead, Customer, ASELead, CapitalCustomer, CapitalLoan, CapitalService, Task, Leave, User,
+)
+
+
+def mark_sources_changed():
+    """
+    Record a committed write to a source model. Only snapshots not already
+    marked since they were computed are written, so a burst of writes
+    costs one row update per snapshot.
+    """
+    OverviewSnapshot.objects.filter(
+        Q(sources_changed_at__isnull=True) | Q(sources_changed_at__lt=F('sources_as_of'))
+    ).update(sources_changed_at=timezone.now())
+
+
+def compute_overview(period):
+    """Compute the overview for ``period``; returns (data, timings in ms)."""
+    from analytics.views import _get_period_range
+
+    start_date, end_date = _get_period_range(period)
+    data = {
+        'period': period,
+        'period_start': str(start_date),
+        'period_end': str(end_date),
+    }
+    timings = {}
+    for name, compute in OVERVIEW_SECTIONS.items():
+        started = time.monotonic()
+        data[name] = compute(start_date)
+        timings[name] = round((time.monotonic() - started) * 1000, 1)
+    return data, timings
+
+
+def refresh_snapshot(period):
+    """Recompute and store the snapshot for ``period``."""
+    sources_as_of = timezone.now()
+    data, timings = compute_overview(period)
+    snapshot, _ = OverviewSnapshot.objects.update_or_create(
+        period=period,
+        defaults={
+            'period_start': data['period_start'],
+            'data': data,
+            'section_timings_ms': timings,
+            'sources_as_of': sources_as_of,
+            'computed_at': timezone.now(),
+            'refresh_started_at': None,
+        },
+    )
+    return snapshot
+
+
+def is_stale(snapshot):
+    from analytics.views import _get_period_range
+
+    if (timezone.now() - snapshot.computed_at).total_seconds() > SNAPSHOT_MAX_AGE:
+        return True
+    if str(snapshot.period_start) != str(_get_period_range(snapshot.period)[0]):
+        return True
+    if snapshot.sources_as_of is None:
+        return True
+    return snapshot.sources_changed_at is not None and snapshot.sources_changed_at >= snapshot.sources_as_of
+
+
+def _claim_refresh(snapshot):
+    """Mark ``snapshot`` as being refreshed; False if another worker already is."""
+    now = timezone.now()
+    unclaimed = Q(refresh_started_at__isnull=True) | Q(
+        refresh_started_at__lt=now - timedelta(seconds=REFRESH_LOCK_TIMEOUT)
+    )
+    return OverviewSnapshot.objects.filter(unclaimed, pk=snapshot.pk).update(refresh_started_at=now) == 1
+
+
+def _refresh_in_background(snapshot):
+    if not _claim_refresh(snapshot):
+        return  # Already being refreshed
+    period = snapshot.period
+
+    def run():
+        try:
+            refresh_snapshot(period)
+        except Exception:
+            logger.exception('Overview snapshot refresh failed for %s', period)
+            OverviewSnapshot.objects.filter(period=period).update(refresh_started_at=None)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, name=f'overview-refresh-{period}', daemon=True).start()
+
+
+def get_overview_snapshot(period):
+    """
+    The snapshot to serve for ``period`` and whether it is stale. Stale
+    snapshots trigger a background refresh (OVERVIEW_SNAPSHOT_BACKGROUND_REFRESH).
+    """
+    snapshot = OverviewSnapshot.objects.filter(period=period).first()
+    if snapshot is None:
+        return refresh_snapshot(period), False
+
+    stale = is_stale(snapshot)
+    if stale and getattr(settings, 'OVERVIEW_SNAPSHOT_BACKGROUND_REFRESH', True):
+        _refresh_in_background(snapshot)
+    return snapshot, stale
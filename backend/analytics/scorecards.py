@@ -0,0 +1,166 @@
+"""
+Employee scorecard engine.
+
+Every metric is computed for the whole workforce at once: each source table
+gets one grouped ``values(<user fields>).annotate(...)`` query, and the rows
+are merged in memory keyed by user id. The query count is therefore fixed
+(one per source plus one for the users) no matter how many employees there
+are, so nobody has to be cut off.
+
+A metric can credit several user columns of the same row, e.g. an ASE deal
+counts for both its manager and its assignee (once if they are the same
+person).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db.models import Count, Q, QuerySet, Sum
+
+from accounts.models import User
+from ase_leads.aggregation import metric_expressions
+from ase_leads.models import ASELead, ASELeadActivity
+from capital.models import CapitalCustomer, CapitalLoan, CapitalService
+from leads.models import Lead
+from leaves.models import Leave
+from tasks.models import Task
+
+
+SCORECARD_ROLES = ('manager', 'employee')
+
+# Weight of each metric in total_score
+SCORE_WEIGHTS = {
+    'eswari_leads_created': 1,
+    'ase_leads_created': 1,
+    'ase_deals_won': 5,
+    'capital_customers_created': 1,
+    'capital_loans_processed': 1,
+    'tasks_completed': 1,
+}
+
+# Metrics reported as float rather than int
+AMOUNT_METRICS = {'ase_revenue'}
+
+
+@dataclass(frozen=True)
+class ScorecardSource:
+    """
+    One grouped query. ``metrics`` maps a metric name to ``(metric, credited
+    user fields)``, where metric is a ``Q`` (rows counted) or an aggregate.
+    ``company`` is the ?company filter value the source belongs to (None:
+    always included).
+    """
+    company: str | None
+    queryset: QuerySet
+    metrics: dict
+
+    @property
+    def group_by(self):
+        fields = []
+        for _, credited in self.metrics.values():
+            fields.extend(f for f in credited if f not in fields)
+        return fields
+
+
+def scorecard_sources(start_date):
+    created = Q(created_at__date__gte=start_date)
+    hot = Q(status='hot', updated_at__date__gte=start_date)
+    won = Q(status='won', deal_closed_at__date__gte=start_date)
+    return [
+        ScorecardSource('eswari', Lead.objects.filter(created | hot), {
+            'eswari_leads_created': (created, ('created_by',)),
+            'eswari_leads_converted': (hot, ('assigned_to',)),
+        }),
+        ScorecardSource('ase', ASELead.objects.filter(created | won), {
+            'ase_leads_created': (created, ('created_by',)),
+            'ase_deals_won': (won, ('managed_by', 'assigned_to')),
+            'ase_revenue': (Sum('estimated_project_value', filter=won), ('managed_by', 'assigned_to')),
+        }),
+        ScorecardSource('ase', ASELeadActivity.objects.filter(created, activity_type='call'), {
+            'ase_calls_made': (Count('pk'), ('user',)),
+        }),
+        ScorecardSource('capital', CapitalCustomer.objects.filter(created), {
+            'capital_customers_created': (Count('pk'), ('created_by',)),
+        }),
+        ScorecardSource('capital', CapitalLoan.objects.filter(updated_at__date__gte=start_date), {
+            'capital_loans_processed': (Count('pk'), ('assigned_to',)),
+        }),
+        ScorecardSource('capital', CapitalService.objects.filter(
+            status='completed', updated_at__date__gte=start_date
+        ), {
+            'capital_services_completed': (Count('pk'), ('assigned_to',)),
+        }),
+        ScorecardSource(None, Task.objects.filter(status='completed', updated_at__date__gte=start_date), {
+            'tasks_completed': (Count('pk'), ('assigned_to',)),
+        }),
+        ScorecardSource(None, Leave.objects.filter(status='approved', start_date__gte=start_date), {
+            'leaves_taken': (Count('pk'), ('user',)),
+        }),
+    ]
+
+
+def _metric_totals(sources):
+    """``{user_id: {metric: value}}`` with one query per source."""
+    totals = defaultdict(lambda: defaultdict(int))
+    for source in sources:
+        expressions = metric_expressions({name: m for name, (m, _) in source.metrics.items()})
+        rows = source.queryset.order_by().values(*source.group_by).annotate(**expressions)
+        for row in rows:
+            for name, (_, credited) in source.metrics.items():
+                value = row[name]
+                if not value:
+                    continue
+                for user_id in {row[field] for field in credited} - {None}:
+                    totals[user_id][name] += value
+    return totals
+
+
+def build_scorecards(start_date, company_filter='all', role_filter='all'):
+    """
+    Scorecards for every active manager/employee (``role_filter`` narrows
+    to one role), with the metrics of ``company_filter`` ('all' for every
+    business unit) counted from ``start_date``. Unsorted.
+    """
+    sources = [
+        s for s in scorecard_sources(start_date)
+        if company_filter == 'all' or s.company in (None, company_filter)
+    ]
+    metric_names = [name for source in sources for name in source.metrics]
+    totals = _metric_totals(sources)
+
+    users = User.objects.filter(is_active=True, role__in=SCORECARD_ROLES)
+    if role_filter != 'all':
+        users = users.filter(role=role_filter)
+
+    scorecards = []
+    for user in users.select_related('company', 'team'):
+        values = totals.get(user.id, {})
+        scorecard = {
+            'id': user.id,
+            'name': f"{user.first_name} {user.last_name}".strip() or user.username,
+            'role': user.role,
+            'company': user.company.name if user.company else 'N/A',
+            'company_code': user.company.code if user.company else None,
+            'team': user.team.name if user.team else None,
+            'designation': user.designation or '',
+        }
+        for name in metric_names:
+            value = values.get(name, 0)
+            scorecard[name] = float(value) if name in AMOUNT_METRICS else value
+        scorecard['total_score'] = sum(
+            scorecard.get(name, 0) * weight for name, weight in SCORE_WEIGHTS.items()
+        )
+        scorecards.append(scorecard)
+    return scorecards
+
+
+def sort_scorecards(scorecards, sort='total_score', descending=True):
+    """
+    Sort by ``sort`` (any scorecard metric, 'total_score' or 'name'), ties
+    broken by name and id so pages are stable.
+    """
+    def key(scorecard):
+        value = scorecard.get(sort, 0)
+        return value.lower() if isinstance(value, str) else value
+
+    ordered = sorted(scorecards, key=lambda sc: (sc['name'].lower(), sc['id']))
+    return sorted(ordered, key=key, reverse=descending)
@@ -0,0 +1,54 @@
+"""
+Signal hooks for analytics app.
+
+Register every model the dashboards and analytics read, so that a write
+invalidates the owning company's cached results (utils.cache_versions), and
+mark the overview snapshots stale when a model they read changes.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ase_leads.models import ASELead
+from ase_leads.models.activity import ASELeadActivity
+from capital.models import CapitalCustomer, CapitalLead, CapitalLoan, CapitalService, CapitalTask
+from customers.models import Customer
+from leads.models import Lead
+from leaves.models import Leave
+from tasks.models import Task
+from utils.cache_versions import bump_company, bump_user, track_model
+
+from .overview import SOURCE_MODELS, mark_sources_changed
+
+User = get_user_model()
+
+
+for model in (
+    ASELead, Lead, Customer, Task, Leave,
+    CapitalCustomer, CapitalLead, CapitalLoan, CapitalService, CapitalTask,
+):
+    track_model(model)
+
+track_model(ASELeadActivity, company_of=lambda activity: activity.lead.company_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_caches(sender, instance, update_fields=None, **kwargs):
+    """Role/team changes alter which dashboard a user sees; counts change too."""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_user(instance.pk)
+    bump_company(instance.company_id)
+
+
+def overview_sources_changed(sender, instance, update_fields=None, **kwargs):
+    if sender is User and update_fields and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(mark_sources_changed)
+
+
+for model in SOURCE_MODELS:
+    uid = f'overview_sources:{model._meta.label}'
+    post_save.connect(overview_sources_changed, sender=model, dispatch_uid=uid)
+    post_delete.connect(overview_sources_changed, sender=model, dispatch_uid=uid)
@@ -0,0 +1,127 @@
+"""
+Unit tests for the cross-company overview snapshot.
+
+Tests cover:
+- The first request computes and stores a snapshot
+- Later requests are served from the snapshot without recomputing
+- A committed write marks the snapshot stale but it is still served
+- refresh_overview_snapshots recomputes snapshots and records section timings
+- Freshness and the refresh claim come from the database, not the local cache
+- Checking freshness reads no source tables; deletes mark snapshots stale too
+"""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from analytics.models import OverviewSnapshot
+from analytics.overview import OVERVIEW_SECTIONS, _claim_refresh, is_stale, refresh_snapshot
+from leads.models import Lead
+
+User = get_user_model()
+
+
+@override_settings(OVERVIEW_SNAPSHOT_BACKGROUND_REFRESH=False)
+class OverviewSnapshotTest(TestCase):
+    """Tests for the snapshot-backed analytics overview"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('analytics-overview')
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123',
+            role='admin', company=self.company,
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def _create_lead(self, phone):
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(
+                name='Snapshot Lead', phone=phone, company=self.company, created_by=self.admin,
+            )
+
+    def test_first_request_stores_snapshot(self):
+        response = self.client.get(self.url, {'period': 'week'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['period'], 'week')
+        self.assertFalse(response.data['snapshot']['stale'])
+        snapshot = OverviewSnapshot.objects.get(period='week')
+        self.assertEqual(set(snapshot.section_timings_ms), set(OVERVIEW_SECTIONS))
+
+    def test_repeat_request_served_from_snapshot(self):
+        self.client.get(self.url)
+        computed_at = OverviewSnapshot.objects.get(period='month').computed_at
+
+        response = self.client.get(self.url)
+
+        self.assertFalse(response.data['snapshot']['stale'])
+        self.assertEqual(OverviewSnapshot.objects.get(period='month').computed_at, computed_at)
+
+    def test_write_marks_snapshot_stale(self):
+        self.assertEqual(self.client.get(self.url).data['eswari_group']['leads_total'], 0)
+
+        self._create_lead('9000000101')
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.data['snapshot']['stale'])
+        self.assertEqual(response.data['eswari_group']['leads_total'], 0)
+
+    def test_command_refreshes_snapshots(self):
+        self.client.get(self.url)
+        self._create_lead('9000000102')
+
+        out = StringIO()
+        call_command('refresh_overview_snapshots', '--stale-only', stdout=out)
+
+        self.assertIn('Refreshed: month', out.getvalue())
+        self.assertEqual(OverviewSnapshot.objects.count(), 5)
+        response = self.client.get(self.url)
+        self.assertFalse(response.data['snapshot']['stale'])
+        self.assertEqual(response.data['eswari_group']['leads_total'], 1)
+
+    def test_snapshot_from_another_process_is_fresh(self):
+        refresh_snapshot('month')
+        # Another worker's cache knows nothing about this process
+        cache.clear()
+
+        response = self.client.get(self.url)
+        self.assertFalse(response.data['snapshot']['stale'])
+
+    def test_freshness_check_reads_no_source_tables(self):
+        snapshot = refresh_snapshot('month')
+        with self.assertNumQueries(0):
+            self.assertFalse(is_stale(snapshot))
+
+    def test_delete_marks_snapshot_stale(self):
+        self._create_lead('9000000103')
+        refresh_snapshot('month')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.all().delete()
+
+        self.assertTrue(is_stale(OverviewSnapshot.objects.get(period='month')))
+
+    def test_one_refresh_claim_at_a_time(self):
+        snapshot = refresh_snapshot('month')
+        self.assertTrue(_claim_refresh(snapshot))
+        self.assertFalse(_claim_refresh(snapshot))
+
+        self.assertIsNone(refresh_snapshot('month').refresh_started_at)
+        self.assertTrue(_claim_refresh(snapshot))
+
+    def test_non_admin_forbidden(self):
+        employee = User.objects.create_user(
+            username='employee_user', email='emp@test.com', password='testpass123',
+            role='employee', company=self.company,
+        )
+        self.client.force_authenticate(user=employee)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
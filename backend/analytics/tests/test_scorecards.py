@@ -0,0 +1,130 @@
+"""
+Unit tests for the employee scorecard engine.
+
+Tests cover:
+- Metrics are merged per user across source tables
+- A deal counts for its manager and assignee, once when they are the same user
+- The query count does not grow with the number of employees
+- Every employee is included (no 50-user cap), with server-side sort and pages
+- The scheduled scorecards report uses the same engine
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from analytics.management.commands.send_scheduled_reports import Command as SendReportsCommand
+from analytics.scorecards import build_scorecards
+from ase_leads.models import ASELead
+from leads.models import Lead
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class ScorecardEngineTest(TestCase):
+    """Tests for analytics.scorecards and the scorecards endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('analytics-scorecards')
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.ase, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123',
+            role='admin', company=self.company,
+        )
+        self.manager = User.objects.create_user(
+            username='manager', email='manager@test.com', password='testpass123',
+            first_name='Meena', role='manager', company=self.ase,
+        )
+        self.employee = User.objects.create_user(
+            username='employee', email='employee@test.com', password='testpass123',
+            first_name='Ravi', role='employee', company=self.company,
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.today = timezone.now().date()
+
+    def _won_deal(self, phone, managed_by, assigned_to, value):
+        ASELead.objects.create(
+            company_name='Won Co', contact_person='Anil', phone=phone, industry='technology',
+            status='won', deal_closed_at=timezone.now(), estimated_project_value=value,
+            company=self.ase, created_by=self.manager, managed_by=managed_by, assigned_to=assigned_to,
+        )
+
+    def _add_employees(self, count):
+        User.objects.bulk_create([
+            User(username=f'bulk_{i}', email=f'bulk_{i}@test.com', role='employee', company=self.company)
+            for i in range(count)
+        ])
+
+    def test_metrics_merged_per_user(self):
+        self._won_deal('9000000201', self.manager, self.employee, 1000)
+        self._won_deal('9000000202', self.manager, self.manager, 500)
+        Lead.objects.create(name='Lead', phone='9000000203', company=self.company, created_by=self.employee)
+        Task.objects.create(title='Call back', status='completed', company=self.company, assigned_to=self.employee)
+
+        cards = {sc['id']: sc for sc in build_scorecards(self.today.replace(day=1))}
+
+        manager, employee = cards[self.manager.id], cards[self.employee.id]
+        self.assertEqual(manager['ase_leads_created'], 2)
+        self.assertEqual(manager['ase_deals_won'], 2)
+        self.assertEqual(manager['ase_revenue'], 1500.0)
+        self.assertEqual(employee['ase_deals_won'], 1)
+        self.assertEqual(employee['ase_revenue'], 1000.0)
+        self.assertEqual(employee['eswari_leads_created'], 1)
+        self.assertEqual(employee['tasks_completed'], 1)
+        self.assertEqual(employee['total_score'], 1 + 5 + 1)
+        self.assertNotIn(self.admin.id, cards)
+
+    def test_company_filter_limits_metrics(self):
+        card = build_scorecards(self.today, company_filter='ase')[0]
+
+        self.assertIn('ase_deals_won', card)
+        self.assertIn('tasks_completed', card)
+        self.assertNotIn('eswari_leads_created', card)
+        self.assertNotIn('capital_loans_processed', card)
+
+    def test_query_count_independent_of_workforce(self):
+        with CaptureQueriesContext(connection) as small:
+            build_scorecards(self.today)
+        self._add_employees(60)
+        with CaptureQueriesContext(connection) as large:
+            cards = build_scorecards(self.today)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(len(cards), 62)
+
+    def test_endpoint_sorts_and_paginates_full_workforce(self):
+        self._add_employees(60)
+        self._won_deal('9000000204', self.manager, None, 2000)
+
+        response = self.client.get(self.url, {'page_size': 25})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_employees'], 62)
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertEqual(response.data['scorecards'][0]['id'], self.manager.id)
+
+        last = self.client.get(self.url, {'page_size': 25, 'page': 3})
+        self.assertEqual(len(last.data['scorecards']), 12)
+
+        by_name = self.client.get(self.url, {'sort': 'name', 'order': 'asc', 'page_size': 100})
+        names = [sc['name'].lower() for sc in by_name.data['scorecards']]
+        self.assertEqual(names, sorted(names))
+
+    def test_scheduled_report_uses_engine(self):
+        self._won_deal('9000000205', self.manager, self.employee, 1000)
+
+        data = SendReportsCommand()._generate_report_data('scorecards')
+
+        top = data['top_performers'][0]
+        self.assertEqual(top['name'], 'Meena')
+        self.assertEqual(top['deals'], 1)
+        self.assertEqual(top['score'], 6)
@@ -12,7 +12,7 @@ All endpoints require admin role.
 """
 
 from django.core.cache import cache
-from django.db.models import Count, Sum, Avg, F, Q, ExpressionWrapper, DurationField
+from django.db.models import Count, Sum
 from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
 from django.utils import timezone
 from datetime import timedelta
@@ -22,19 +22,26 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from accounts.models import User, Company
+from accounts.models import Company
 from leads.models import Lead
 from ase_leads.models import ASELead
-from capital.models import CapitalLead, CapitalLoan, CapitalService, CapitalCustomer, CapitalTask
+from ase_leads.transitions import ledger_funnel
+from capital.models import CapitalLead, CapitalLoan, CapitalService, CapitalTask
 from customers.models import Customer
-from tasks.models import Task
-from leaves.models import Leave
+from utils.cache_versions import VERSIONED_CACHE_TTL, versioned_key
+from .overview import OVERVIEW_PERIODS, get_overview_snapshot
+from .scorecards import build_scorecards, sort_scorecards
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-CACHE_TTL = 300  # 5 minutes
+# Keys are generation-versioned (utils.cache_versions): any tracked write
+# invalidates them; the TTL bounds staleness in other worker processes.
+CACHE_TTL = VERSIONED_CACHE_TTL
+
+SCORECARD_PAGE_SIZE = 50
+SCORECARD_MAX_PAGE_SIZE = 500
 
 
 def _require_admin(user):
@@ -42,6 +49,14 @@ def _require_admin(user):
     return user.role == 'admin'
 
 
+def _int_param(request, name, default):
+    """Integer query param, ``default`` when missing or malformed."""
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 def _get_period_range(period):
     """Return (start_date, end_date) for the given period string."""
     today = timezone.now().date()
@@ -78,99 +93,26 @@ def cross_company_overview(request):
     
     Query params:
       ?period=month (today, week, month, quarter, year)
+
+    Served from a precomputed snapshot (analytics.overview); a stale one is
+    returned immediately while it is recomputed in the background. The
+    ``snapshot`` key reports when it was computed and per-section timings.
     """
     if not _require_admin(request.user):
         return Response({'detail': 'Admin access required.'}, status=status.HTTP_403_FORBIDDEN)
 
     period = request.query_params.get('period', 'month')
-    start_date, end_date = _get_period_range(period)
+    if period not in OVERVIEW_PERIODS:
+        period = 'month'
 
-    cache_key = f'analytics_overview_{period}'
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached)
-
-    # --- Eswari Group (Real Estate) ---
-    eswari_leads_total = Lead.objects.count()
-    eswari_leads_period = Lead.objects.filter(created_at__date__gte=start_date).count()
-    eswari_leads_hot = Lead.objects.filter(status='hot').count()
-    eswari_customers_total = Customer.objects.count()
-    eswari_customers_period = Customer.objects.filter(created_at__date__gte=start_date).count()
-
-    # --- ASE Technologies (Digital Marketing) ---
-    ase_leads_total = ASELead.objects.count()
-    ase_leads_period = ASELead.objects.filter(created_at__date__gte=start_date).count()
-    ase_deals_won = ASELead.objects.filter(status='won', deal_closed_at__date__gte=start_date).count()
-    ase_revenue = ASELead.objects.filter(
-        status='won', deal_closed_at__date__gte=start_date
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
-    ase_pipeline_value = ASELead.objects.filter(
-        status__in=['proposal_sent', 'negotiating']
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
-
-    # --- Eswari Capital (Financial Services) ---
-    capital_customers_total = CapitalCustomer.objects.count()
-    capital_customers_period = CapitalCustomer.objects.filter(created_at__date__gte=start_date).count()
-    capital_loans_total = CapitalLoan.objects.count()
-    capital_loans_period = CapitalLoan.objects.filter(created_at__date__gte=start_date).count()
-    capital_loans_disbursed = CapitalLoan.objects.filter(
-        status='disbursed', created_at__date__gte=start_date
-    ).count()
-    capital_loan_value = CapitalLoan.objects.filter(
-        status='disbursed', created_at__date__gte=start_date
-    ).aggregate(total=Sum('loan_amount'))['total'] or 0
-    capital_services_total = CapitalService.objects.count()
-    capital_services_period = CapitalService.objects.filter(created_at__date__gte=start_date).count()
-    capital_services_completed = CapitalService.objects.filter(
-        status='completed', created_at__date__gte=start_date
-    ).count()
-
-    # --- Team Overview ---
-    total_employees = User.objects.filter(is_active=True).count()
-    pending_leaves = Leave.objects.filter(status='pending').count()
-    total_tasks = Task.objects.count()
-    tasks_completed_period = Task.objects.filter(
-        status='completed', updated_at__date__gte=start_date
-    ).count()
+    snapshot, stale = get_overview_snapshot(period)
 
-    result = {
-        'period': period,
-        'period_start': str(start_date),
-        'period_end': str(end_date),
-        'eswari_group': {
-            'leads_total': eswari_leads_total,
-            'leads_period': eswari_leads_period,
-            'leads_hot': eswari_leads_hot,
-            'customers_total': eswari_customers_total,
-            'customers_period': eswari_customers_period,
-        },
-        'ase_technologies': {
-            'leads_total': ase_leads_total,
-            'leads_period': ase_leads_period,
-            'deals_won': ase_deals_won,
-            'revenue': float(ase_revenue),
-            'pipeline_value': float(ase_pipeline_value),
-        },
-        'eswari_capital': {
-            'customers_total': capital_customers_total,
-            'customers_period': capital_customers_period,
-            'loans_total': capital_loans_total,
-            'loans_period': capital_loans_period,
-            'loans_disbursed': capital_loans_disbursed,
-            'loan_value_disbursed': float(capital_loan_value),
-            'services_total': capital_services_total,
-            'services_period': capital_services_period,
-            'services_completed': capital_services_completed,
-        },
-        'team': {
-            'total_employees': total_employees,
-            'pending_leaves': pending_leaves,
-            'total_tasks': total_tasks,
-            'tasks_completed_period': tasks_completed_period,
-        },
+    result = dict(snapshot.data)
+    result['snapshot'] = {
+        'computed_at': snapshot.computed_at,
+        'stale': stale,
+        'section_timings_ms': snapshot.section_timings_ms,
     }
-
-    cache.set(cache_key, result, CACHE_TTL)
     return Response(result)
 
 
@@ -200,7 +142,7 @@ def conversion_funnel(request):
     company_filter = request.query_params.get('company', 'all')
     start_date, end_date = _get_period_range(period)
 
-    cache_key = f'analytics_funnel_{period}_{company_filter}'
+    cache_key = versioned_key(f'analytics_funnel_{period}_{start_date}_{company_filter}', all_companies=True)
     cached = cache.get(cache_key)
     if cached:
         return Response(cached)
@@ -231,116 +173,31 @@ def conversion_funnel(request):
         }
 
     # --- ASE Technologies Funnel (with time-in-stage) ---
+    # Current stage counts, plus conversion and time-in-stage from the
+    # status transition ledger (ase_leads.transitions)
     if company_filter in ('all', 'ase'):
         ase_statuses = ['new', 'qualified', 'contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won', 'lost']
-        ase_funnel = {}
-        for s in ase_statuses:
-            qs = ASELead.objects.filter(status=s)
-            count = qs.count()
-            total_value = qs.aggregate(total=Sum('estimated_project_value'))['total'] or 0
-            ase_funnel[s] = {
-                'count': count,
-                'total_value': float(total_value),
-            }
-
-        # Time-in-stage calculations (average days between stage transitions)
-        time_in_stage = {}
-
-        # New → Qualified (research_completed_at - created_at)
-        new_to_qualified = ASELead.objects.filter(
-            research_completed_at__isnull=False,
-            created_at__date__gte=start_date
-        ).annotate(
-            duration=ExpressionWrapper(
-                F('research_completed_at') - F('created_at'),
-                output_field=DurationField()
-            )
-        ).aggregate(avg_duration=Avg('duration'))['avg_duration']
-        time_in_stage['new_to_qualified_days'] = round(new_to_qualified.total_seconds() / 86400, 1) if new_to_qualified else None
-
-        # Qualified → Contacted (first_contact_at - research_completed_at)
-        qualified_to_contacted = ASELead.objects.filter(
-            first_contact_at__isnull=False,
-            research_completed_at__isnull=False,
-            first_contact_at__date__gte=start_date
-        ).annotate(
-            duration=ExpressionWrapper(
-                F('first_contact_at') - F('research_completed_at'),
-                output_field=DurationField()
-            )
-        ).aggregate(avg_duration=Avg('duration'))['avg_duration']
-        time_in_stage['qualified_to_contacted_days'] = round(qualified_to_contacted.total_seconds() / 86400, 1) if qualified_to_contacted else None
-
-        # Contacted → Proposal (proposal_sent_at - first_contact_at)
-        contacted_to_proposal = ASELead.objects.filter(
-            proposal_sent_at__isnull=False,
-            first_contact_at__isnull=False,
-            proposal_sent_at__date__gte=start_date
-        ).annotate(
-            duration=ExpressionWrapper(
-                F('proposal_sent_at') - F('first_contact_at'),
-                output_field=DurationField()
-            )
-        ).aggregate(avg_duration=Avg('duration'))['avg_duration']
-        time_in_stage['contacted_to_proposal_days'] = round(contacted_to_proposal.total_seconds() / 86400, 1) if contacted_to_proposal else None
-
-        # Proposal → Won (deal_closed_at - proposal_sent_at)
-        proposal_to_won = ASELead.objects.filter(
-            deal_closed_at__isnull=False,
-            proposal_sent_at__isnull=False,
-            status='won',
-            deal_closed_at__date__gte=start_date
-        ).annotate(
-            duration=ExpressionWrapper(
-                F('deal_closed_at') - F('proposal_sent_at'),
-                output_field=DurationField()
+        by_status = {
+            row['status']: row
+            for row in ASELead.objects.filter(status__in=ase_statuses).order_by().values('status').annotate(
+                count=Count('pk'), total_value=Sum('estimated_project_value'),
             )
-        ).aggregate(avg_duration=Avg('duration'))['avg_duration']
-        time_in_stage['proposal_to_won_days'] = round(proposal_to_won.total_seconds() / 86400, 1) if proposal_to_won else None
-
-        # Total sales cycle (deal_closed_at - created_at for won deals)
-        total_cycle = ASELead.objects.filter(
-            deal_closed_at__isnull=False,
-            status='won',
-            deal_closed_at__date__gte=start_date
-        ).annotate(
-            duration=ExpressionWrapper(
-                F('deal_closed_at') - F('created_at'),
-                output_field=DurationField()
-            )
-        ).aggregate(avg_duration=Avg('duration'))['avg_duration']
-        time_in_stage['total_sales_cycle_days'] = round(total_cycle.total_seconds() / 86400, 1) if total_cycle else None
-
-        # Stage-to-stage conversion rates
-        total_new = ASELead.objects.filter(created_at__date__gte=start_date).count()
-        total_qualified = ASELead.objects.filter(
-            research_completed_at__date__gte=start_date,
-            status__in=['qualified', 'contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won']
-        ).count()
-        total_contacted = ASELead.objects.filter(
-            first_contact_at__date__gte=start_date,
-            status__in=['contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won']
-        ).count()
-        total_proposal = ASELead.objects.filter(
-            proposal_sent_at__date__gte=start_date,
-            status__in=['proposal_sent', 'negotiating', 'won']
-        ).count()
-        total_won = ASELead.objects.filter(
-            deal_closed_at__date__gte=start_date, status='won'
-        ).count()
-
-        conversion_rates = {
-            'new_to_qualified': round((total_qualified / total_new) * 100, 1) if total_new > 0 else 0,
-            'qualified_to_contacted': round((total_contacted / total_qualified) * 100, 1) if total_qualified > 0 else 0,
-            'contacted_to_proposal': round((total_proposal / total_contacted) * 100, 1) if total_contacted > 0 else 0,
-            'proposal_to_won': round((total_won / total_proposal) * 100, 1) if total_proposal > 0 else 0,
-            'overall': round((total_won / total_new) * 100, 1) if total_new > 0 else 0,
+        }
+        ase_funnel = {
+            s: {
+                'count': by_status.get(s, {}).get('count', 0),
+                'total_value': float(by_status.get(s, {}).get('total_value') or 0),
+            }
+            for s in ase_statuses
         }
 
+        ledger = ledger_funnel(start_date)
         result['ase_technologies'] = {
             'funnel': ase_funnel,
-            'time_in_stage': time_in_stage,
-            'conversion_rates': conversion_rates,
+            'stage_entries': ledger['stage_entries'],
+            'time_in_stage': ledger['time_in_stage'],
+            'conversion_rates': ledger['conversion_rates'],
+            'backward_moves': ledger['backward_moves'],
         }
 
     # --- Eswari Capital Funnel ---
@@ -397,6 +254,11 @@ def employee_scorecards(request):
       ?period=month (today, week, month, quarter, year)
       ?company=all|eswari|ase|capital
       ?role=all|manager|employee
+      ?sort=total_score (any metric or name)  ?order=desc|asc
+      ?page=1  ?page_size=50 (max 500)
+
+    Covers the whole workforce with a fixed number of grouped queries
+    (analytics.scorecards); sorting and pagination happen server-side.
     """
     if not _require_admin(request.user):
         return Response({'detail': 'Admin access required.'}, status=status.HTTP_403_FORBIDDEN)
@@ -406,106 +268,36 @@ def employee_scorecards(request):
     role_filter = request.query_params.get('role', 'all')
     start_date, end_date = _get_period_range(period)
 
-    cache_key = f'analytics_scorecards_{period}_{company_filter}_{role_filter}'
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached)
-
-    # Get active employees
-    users_qs = User.objects.filter(is_active=True, role__in=['manager', 'employee'])
-    if role_filter != 'all':
-        users_qs = users_qs.filter(role=role_filter)
-
-    scorecards = []
-
-    for user in users_qs.select_related('company', 'team')[:50]:  # Limit to 50 for performance
-        scorecard = {
-            'id': user.id,
-            'name': f"{user.first_name} {user.last_name}".strip() or user.username,
-            'role': user.role,
-            'company': user.company.name if user.company else 'N/A',
-            'company_code': user.company.code if user.company else None,
-            'team': user.team.name if user.team else None,
-            'designation': user.designation or '',
-        }
-
-        # Eswari Group metrics
-        if company_filter in ('all', 'eswari'):
-            scorecard['eswari_leads_created'] = Lead.objects.filter(
-                created_by=user, created_at__date__gte=start_date
-            ).count()
-            scorecard['eswari_leads_converted'] = Lead.objects.filter(
-                assigned_to=user, status='hot', updated_at__date__gte=start_date
-            ).count()
-
-        # ASE Technologies metrics
-        if company_filter in ('all', 'ase'):
-            scorecard['ase_leads_created'] = ASELead.objects.filter(
-                created_by=user, created_at__date__gte=start_date
-            ).count()
-            scorecard['ase_deals_won'] = ASELead.objects.filter(
-                Q(managed_by=user) | Q(assigned_to=user),
-                status='won',
-                deal_closed_at__date__gte=start_date
-            ).count()
-            scorecard['ase_revenue'] = float(ASELead.objects.filter(
-                Q(managed_by=user) | Q(assigned_to=user),
-                status='won',
-                deal_closed_at__date__gte=start_date
-            ).aggregate(total=Sum('estimated_project_value'))['total'] or 0)
-            scorecard['ase_calls_made'] = 0
-            try:
-                from ase_leads.models.activity import ASELeadActivity
-                scorecard['ase_calls_made'] = ASELeadActivity.objects.filter(
-                    user=user, activity_type='call', created_at__date__gte=start_date
-                ).count()
-            except ImportError:
-                pass
-
-        # Capital metrics
-        if company_filter in ('all', 'capital'):
-            scorecard['capital_customers_created'] = CapitalCustomer.objects.filter(
-                created_by=user, created_at__date__gte=start_date
-            ).count()
-            scorecard['capital_loans_processed'] = CapitalLoan.objects.filter(
-                assigned_to=user, updated_at__date__gte=start_date
-            ).count()
-            scorecard['capital_services_completed'] = CapitalService.objects.filter(
-                assigned_to=user, status='completed', updated_at__date__gte=start_date
-            ).count()
-
-        # General metrics
-        scorecard['tasks_completed'] = Task.objects.filter(
-            assigned_to=user, status='completed', updated_at__date__gte=start_date
-        ).count()
-        scorecard['leaves_taken'] = Leave.objects.filter(
-            user=user, status='approved', start_date__gte=start_date
-        ).count()
-
-        scorecards.append(scorecard)
-
-    # Sort by total activity (sum of key metrics)
-    for sc in scorecards:
-        sc['total_score'] = (
-            sc.get('eswari_leads_created', 0) +
-            sc.get('ase_leads_created', 0) +
-            sc.get('ase_deals_won', 0) * 5 +
-            sc.get('capital_customers_created', 0) +
-            sc.get('capital_loans_processed', 0) +
-            sc.get('tasks_completed', 0)
-        )
-
-    scorecards.sort(key=lambda x: x['total_score'], reverse=True)
-
-    result = {
+    cache_key = versioned_key(
+        f'analytics_scorecards_{period}_{start_date}_{company_filter}_{role_filter}', all_companies=True,
+    )
+    scorecards = cache.get(cache_key)
+    if scorecards is None:
+        scorecards = build_scorecards(start_date, company_filter, role_filter)
+        cache.set(cache_key, scorecards, CACHE_TTL)
+
+    sort = request.query_params.get('sort', 'total_score')
+    if sort != 'name' and not (scorecards and isinstance(scorecards[0].get(sort), (int, float))):
+        sort = 'total_score'
+    descending = request.query_params.get('order', 'desc') != 'asc'
+    page_size = min(max(_int_param(request, 'page_size', SCORECARD_PAGE_SIZE), 1), SCORECARD_MAX_PAGE_SIZE)
+    total_pages = max((len(scorecards) + page_size - 1) // page_size, 1)
+    page = min(max(_int_param(request, 'page', 1), 1), total_pages)
+
+    ordered = sort_scorecards(scorecards, sort, descending)
+    offset = (page - 1) * page_size
+
+    return Response({
         'period': period,
         'period_start': str(start_date),
         'total_employees': len(scorecards),
-        'scorecards': scorecards,
-    }
-
-    cache.set(cache_key, result, CACHE_TTL)
-    return Response(result)
+        'sort': sort,
+        'order': 'desc' if descending else 'asc',
+        'page': page,
+        'page_size': page_size,
+        'total_pages': total_pages,
+        'scorecards': ordered[offset:offset + page_size],
+    })
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -529,7 +321,7 @@ def revenue_trend(request):
     granularity = request.query_params.get('granularity', 'daily')
     start_date, end_date = _get_period_range(period)
 
-    cache_key = f'analytics_revenue_trend_{period}_{granularity}'
+    cache_key = versioned_key(f'analytics_revenue_trend_{period}_{start_date}_{granularity}', all_companies=True)
     cached = cache.get(cache_key)
     if cached:
         return Response(cached)
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class AnnouncementsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'announcements'
\ No newline at end of file
+    name = 'announcements'
+
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import announcements.signals  # noqa
@@ -0,0 +1,158 @@
+"""
+Announcement audiences.
+
+Who an announcement is addressed to depends on its target roles, its
+companies and its assigned employees, and on each user's role, company and
+manager. Instead of re-evaluating those rules per announcement on every
+page load, they are resolved once into AnnouncementAudience rows
+(announcement, user), so listing and unread are a single join:
+
+    Announcement.objects.filter(audience__user=user)
+
+Rows are kept in sync by signals (announcements.signals): when an
+announcement or its companies/assigned employees change, and when a user
+is created or changes role, company or manager. Syncing drops the cached
+unread counters of the users involved (announcements.read_state).
+``backfill_audiences`` seeds rows for announcements created before the
+table existed.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from .models import Announcement, AnnouncementAudience
+from .read_state import forget_unread_counts
+
+User = get_user_model()
+
+Assignment = Announcement.assigned_employees.through
+CompanyLink = Announcement.companies.through
+
+
+def is_addressed_to(user, announcement, company_ids, assigned_ids):
+    """
+    Whether ``announcement`` is addressed to ``user``.
+
+    ``user`` needs id/role/company_id/manager_id; ``company_ids`` are the
+    announcement's companies (new and legacy field) and ``assigned_ids``
+    its assigned employees.
+
+    - Company: admins (and HR without a company) see every company; everyone
+      else only their own company and announcements without companies
+    - Managers: announcements they created, are assigned to, that have no
+      target roles or target managers
+    - Employees: announcements they are assigned to, from their manager, or
+      (when nobody is assigned) with no target roles or targeting employees
+    - Other roles: assigned to them, no target roles, or (when nobody is
+      assigned) targeting their role
+    """
+    company_wide = user.role == 'admin' or (user.role == 'hr' and not user.company_id)
+    if company_ids and not company_wide and user.company_id not in company_ids:
+        return False
+
+    target_roles = announcement.target_roles or []
+    if user.id in assigned_ids:
+        return True
+    if user.role == 'manager':
+        return (
+            announcement.created_by_id == user.id
+            or not target_roles
+            or 'manager' in target_roles
+        )
+    if user.role == 'employee':
+        if user.manager_id and announcement.created_by_id == user.manager_id:
+            return True
+        return not assigned_ids and (not target_roles or 'employee' in target_roles)
+    return not target_roles or (user.role in target_roles and not assigned_ids)
+
+
+def _replace_rows(existing, wanted, make_row, delete_rows):
+    stale = existing - wanted
+    if stale:
+        delete_rows(stale)
+    AnnouncementAudience.objects.bulk_create(
+        [make_row(key) for key in wanted - existing], ignore_conflicts=True
+    )
+    return len(wanted - existing), len(stale)
+
+
+def sync_announcement_audience(announcement):
+    """Recompute the audience of one announcement. Returns (added, removed)."""
+    company_ids = set(
+        CompanyLink.objects.filter(announcement_id=announcement.pk).values_list('company_id', flat=True)
+    )
+    if announcement.company_id:
+        company_ids.add(announcement.company_id)
+    assigned_ids = set(
+        Assignment.objects.filter(announcement_id=announcement.pk).values_list('user_id', flat=True)
+    )
+
+    users = User.objects.only('id', 'role', 'company_id', 'manager_id')
+    if company_ids:
+        users = users.filter(
+            Q(company_id__in=company_ids) | Q(role='admin') | Q(role='hr', company__isnull=True)
+        )
+    wanted = {
+        user.id for user in users
+        if is_addressed_to(user, announcement, company_ids, assigned_ids)
+    }
+
+    rows = AnnouncementAudience.objects.filter(announcement_id=announcement.pk)
+    existing = set(rows.values_list('user_id', flat=True))
+    # Activity or expiry may have changed too, so every counter involved goes
+    forget_unread_counts(existing | wanted)
+    return _replace_rows(
+        existing, wanted,
+        lambda user_id: AnnouncementAudience(announcement_id=announcement.pk, user_id=user_id),
+        lambda stale: rows.filter(user_id__in=stale).delete(),
+    )
+
+
+def sync_user_audience(user):
+    """Recompute which announcements are addressed to one user. Returns (added, removed)."""
+    announcements = Announcement.objects.only('id', 'target_roles', 'created_by_id', 'company_id')
+    if not (user.role == 'admin' or (user.role == 'hr' and not user.company_id)):
+        announcements = announcements.filter(
+            Q(company_id=user.company_id)
+            | Q(companies__id=user.company_id)
+            | Q(company__isnull=True, companies__isnull=True)
+        ).distinct()
+    announcements = list(announcements)
+    ids = [announcement.id for announcement in announcements]
+
+    company_ids, assigned_ids = {}, {}
+    for announcement_id, company_id in CompanyLink.objects.filter(
+        announcement_id__in=ids
+    ).values_list('announcement_id', 'company_id'):
+        company_ids.setdefault(announcement_id, set()).add(company_id)
+    for announcement_id, user_id in Assignment.objects.filter(
+        announcement_id__in=ids
+    ).values_list('announcement_id', 'user_id'):
+        assigned_ids.setdefault(announcement_id, set()).add(user_id)
+
+    wanted = set()
+    for announcement in announcements:
+        companies = company_ids.get(announcement.id, set())
+        if announcement.company_id:
+            companies = companies | {announcement.company_id}
+        if is_addressed_to(user, announcement, companies, assigned_ids.get(announcement.id, set())):
+            wanted.add(announcement.id)
+
+    rows = AnnouncementAudience.objects.filter(user_id=user.pk)
+    existing = set(rows.values_list('announcement_id', flat=True))
+    forget_unread_counts([user.pk])
+    return _replace_rows(
+        existing, wanted,
+        lambda announcement_id: AnnouncementAudience(announcement_id=announcement_id, user_id=user.pk),
+        lambda stale: rows.filter(announcement_id__in=stale).delete(),
+    )
+
+
+def backfill_audiences(announcements=None):
+    """Resolve the audience of every (or the given) announcement. Returns rows written."""
+    if announcements is None:
+        announcements = Announcement.objects.all()
+    written = 0
+    for announcement in announcements.only('id', 'target_roles', 'created_by_id', 'company_id').iterator():
+        added, _ = sync_announcement_audience(announcement)
+        written += added
+    return written
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from announcements.audience import backfill_audiences
+
+
+class Command(BaseCommand):
+    help = 'Resolve the audience table for announcements created before it existed'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Backfilling announcement audiences...')
+
+        written = backfill_audiences()
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {written} audience row(s).'))
@@ -134,4 +134,22 @@ class AnnouncementRead(models.Model):
         ordering = ['-read_at']
     
     def __str__(self):
-        return f"{self.user.username} read {self.announcement.title}"
\ No newline at end of file
+        return f"{self.user.username} read {self.announcement.title}"
+
+class AnnouncementAudience(models.Model):
+    """
+    Precomputed (announcement, user) pairs: who each announcement is
+    addressed to. Maintained by announcements.audience; lets visibility and
+    unread queries join instead of evaluating the targeting rules per row.
+    """
+    announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name='audience')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='announcement_audience')
+    
+    class Meta:
+        unique_together = ['announcement', 'user']
+        indexes = [
+            models.Index(fields=['user', 'announcement'], name='announcement_audience_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.announcement_id} -> {self.user_id}"
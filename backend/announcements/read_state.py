@@ -0,0 +1,90 @@
+"""
+Announcement read state and cached unread counters.
+
+Unread announcements are the ones addressed to a user (the audience table,
+see announcements.audience) without an AnnouncementRead row. Marking reads
+is one ``bulk_create`` however many announcements are marked, and each
+user's unread count is cached so the unread badge poll is a cache hit:
+
+    unread_count(user)                  # cached; one query on a miss
+    mark_read(user, announcement_ids)   # returns how many were new
+
+Counters are dropped (and recomputed on the next poll) when the user reads
+something and when the audience, activity or expiry of an announcement
+addressed to them changes. A counter also expires when the next counted
+announcement does. Dropping a counter only reaches other worker processes
+through a shared cache; with the per-process LocMemCache counters live for
+a minute, so the badge may trail a new announcement by that much. The
+banner polls the count and fetches the unread list only when it changes.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from utils.cache_versions import cache_is_shared
+
+from .models import Announcement, AnnouncementRead
+
+UNREAD_COUNT_TTL = 6 * 60 * 60 if cache_is_shared() else 60
+
+
+def _count_key(user_id):
+    return f'announcements:unread_count:{user_id}'
+
+
+def unread_announcements(user):
+    """Announcements addressed to ``user`` that they have not read and that have not expired."""
+    queryset = Announcement.objects.filter(audience__user=user).exclude(reads__user=user).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+    )
+    if user.role not in ['admin', 'hr']:
+        queryset = queryset.filter(is_active=True)
+    return queryset
+
+
+def unread_count(user):
+    """Number of unread announcements of ``user``, served from the cache when possible."""
+    key = _count_key(user.id)
+    count = cache.get(key)
+    if count is None:
+        totals = unread_announcements(user).aggregate(count=Count('id'), next_expiry=Min('expires_at'))
+        count = totals['count']
+        timeout = UNREAD_COUNT_TTL
+        if totals['next_expiry']:
+            seconds = (totals['next_expiry'] - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(seconds) + 1))
+        cache.set(key, count, timeout)
+    return count
+
+
+def forget_unread_counts(user_ids):
+    """
+    Drop the cached counters of ``user_ids``. Drops them now (for this
+    transaction) and again after commit, so a count computed by another
+    request before the commit is not kept.
+    """
+    keys = [_count_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def mark_read(user, announcement_ids):
+    """Record ``user`` as having read ``announcement_ids``. Returns how many were unread."""
+    announcement_ids = set(announcement_ids)
+    if not announcement_ids:
+        return 0
+    already_read = set(
+        AnnouncementRead.objects.filter(user=user, announcement_id__in=announcement_ids)
+        .values_list('announcement_id', flat=True)
+    )
+    new_ids = announcement_ids - already_read
+    if new_ids:
+        AnnouncementRead.objects.bulk_create(
+            [AnnouncementRead(announcement_id=announcement_id, user=user) for announcement_id in new_ids],
+            ignore_conflicts=True,
+        )
+        forget_unread_counts([user.id])
+    return len(new_ids)
@@ -0,0 +1,58 @@
+"""
+Signal handlers for announcements app.
+
+Keep the precomputed announcement audiences (announcements.audience) in
+step with announcement targeting and with the user facts it depends on,
+and drop the unread counters (announcements.read_state) they affect.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .audience import sync_announcement_audience, sync_user_audience
+from .models import Announcement
+from .read_state import forget_unread_counts
+
+User = get_user_model()
+
+AUDIENCE_FIELDS = {'target_roles', 'company', 'company_id', 'created_by', 'created_by_id'}
+USER_AUDIENCE_FIELDS = {'role', 'company', 'company_id', 'manager', 'manager_id'}
+
+
+@receiver(post_save, sender=Announcement)
+def update_announcement_audience(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & AUDIENCE_FIELDS:
+        return
+    sync_announcement_audience(instance)
+
+
+@receiver(pre_delete, sender=Announcement)
+def forget_counts_of_deleted_announcement(sender, instance, **kwargs):
+    # The audience rows are deleted with the announcement
+    forget_unread_counts(instance.audience.values_list('user_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Announcement.companies.through)
+@receiver(m2m_changed, sender=Announcement.assigned_employees.through)
+def update_audience_on_targets_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Companies or assigned employees changed, from either side of the relation."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_announcement_audience(instance)
+    elif isinstance(instance, User):
+        sync_user_audience(instance)
+    else:
+        # company.announcements.add(...); a clear does not say which ones
+        announcements = Announcement.objects.all() if pk_set is None else Announcement.objects.filter(pk__in=pk_set)
+        for announcement in announcements:
+            sync_announcement_audience(announcement)
+
+
+@receiver(post_save, sender=User)
+def update_user_audience(sender, instance, created, update_fields=None, **kwargs):
+    """New users, and users whose role, company or manager changed (see accounts.signals)."""
+    if update_fields and not set(update_fields) & USER_AUDIENCE_FIELDS:
+        return
+    if created or getattr(instance, '_access_scope_changed', True):
+        sync_user_audience(instance)
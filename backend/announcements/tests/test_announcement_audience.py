@@ -0,0 +1,153 @@
+"""
+Tests for the precomputed announcement audience.
+
+Tests cover:
+- Managers and employees list announcements through the audience table,
+  with a query count that does not grow with the number of announcements
+- Assigned employees, target roles and companies resolve into audience rows
+- New users and manager changes update their audience
+- Unread excludes read announcements and those of other companies
+- backfill_announcement_audience seeds rows for older announcements
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from announcements.models import Announcement, AnnouncementAudience, AnnouncementRead
+from announcements.signals import update_announcement_audience
+
+User = get_user_model()
+
+
+class AnnouncementAudienceTestCase(TestCase):
+    """Tests for announcements.audience and the endpoints reading it"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.other_company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.admin = self._user('admin', 'admin')
+        self.manager = self._user('manager', 'manager')
+        self.other_manager = self._user('other_manager', 'manager')
+        self.employee = self._user('employee', 'employee', manager=self.manager)
+        self.outsider = self._user('outsider', 'employee', company=self.other_company)
+
+    def _user(self, username, role, company=None, **kwargs):
+        return User.objects.create_user(
+            username=username, password='testpass123', role=role,
+            company=company or self.company, **kwargs
+        )
+
+    def _announce(self, title, created_by=None, company=None, **kwargs):
+        announcement = Announcement.objects.create(
+            title=title, message=title, created_by=created_by or self.admin, **kwargs
+        )
+        announcement.companies.set([company or self.company])
+        return announcement
+
+    def _audience(self, announcement):
+        return set(announcement.audience.values_list('user__username', flat=True))
+
+    def _titles(self, response):
+        data = response.data['results'] if isinstance(response.data, dict) else response.data
+        return {item['title'] for item in data}
+
+    def test_targeting_resolves_into_rows(self):
+        general = self._announce('General')
+        for_managers = self._announce('Managers', target_roles=['manager'])
+        from_manager = self._announce('Team update', created_by=self.manager, target_roles=['manager'])
+        assigned = self._announce('Assigned', target_roles=['employee'])
+        assigned.assigned_employees.set([self.employee])
+
+        self.assertEqual(self._audience(general), {'admin', 'manager', 'other_manager', 'employee'})
+        self.assertEqual(self._audience(for_managers), {'manager', 'other_manager'})
+        self.assertEqual(self._audience(from_manager), {'manager', 'other_manager', 'employee'})
+        self.assertEqual(self._audience(assigned), {'employee'})
+
+        assigned.assigned_employees.clear()
+        self.assertEqual(self._audience(assigned), {'employee'})
+        assigned.target_roles = ['manager']
+        assigned.save()
+        self.assertEqual(self._audience(assigned), {'manager', 'other_manager'})
+
+    def test_user_changes_update_audience(self):
+        general = self._announce('General')
+        from_manager = self._announce('Team update', created_by=self.other_manager, target_roles=['manager'])
+
+        newcomer = self._user('newcomer', 'employee')
+        self.assertIn('newcomer', self._audience(general))
+
+        newcomer.manager = self.other_manager
+        newcomer.save()
+        self.assertIn('newcomer', self._audience(from_manager))
+
+        newcomer.company = self.other_company
+        newcomer.manager = None
+        newcomer.save()
+        self.assertNotIn('newcomer', self._audience(general))
+
+    def test_list_query_count_does_not_grow(self):
+        self._announce('First')
+        self.client.force_authenticate(user=self.employee)
+        self.client.get('/api/announcements/')
+
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/announcements/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        baseline = list_queries()
+        for i in range(5):
+            self._announce(f'More {i}')
+        self.assertEqual(list_queries(), baseline)
+
+    def test_manager_and_employee_listing(self):
+        self._announce('General')
+        self._announce('Managers', target_roles=['manager'])
+        self._announce('Other company', company=self.other_company)
+        self._announce('Inactive', is_active=False)
+
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self._titles(self.client.get('/api/announcements/')), {'General', 'Managers'})
+
+        self.client.force_authenticate(user=self.employee)
+        self.assertEqual(self._titles(self.client.get('/api/announcements/')), {'General'})
+        response = self.client.get('/api/announcements/', {'company': self.other_company.id})
+        self.assertEqual(self._titles(response), set())
+
+    def test_unread_excludes_read_and_other_companies(self):
+        general = self._announce('General')
+        self._announce('Employees', target_roles=['employee'])
+        self._announce('Other company', company=self.other_company)
+        AnnouncementRead.objects.create(announcement=general, user=self.employee)
+        self.client.force_authenticate(user=self.employee)
+
+        response = self.client.get('/api/announcements/unread/')
+
+        self.assertEqual(self._titles(response), {'Employees'})
+
+    def test_backfill_command(self):
+        post_save.disconnect(update_announcement_audience, sender=Announcement)
+        try:
+            announcement = Announcement.objects.create(title='Old', message='Old', created_by=self.admin)
+        finally:
+            post_save.connect(update_announcement_audience, sender=Announcement)
+        self.assertFalse(AnnouncementAudience.objects.filter(announcement=announcement).exists())
+
+        out = StringIO()
+        call_command('backfill_announcement_audience', stdout=out)
+
+        self.assertIn('Wrote 5 audience row(s)', out.getvalue())
+        self.assertEqual(
+            self._audience(announcement),
+            {'admin', 'manager', 'other_manager', 'employee', 'outsider'},
+        )
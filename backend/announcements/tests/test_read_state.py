@@ -0,0 +1,111 @@
+"""
+Tests for announcement read state and cached unread counters.
+
+Tests cover:
+- mark_all_read inserts every read row at once, with a fixed query count
+- mark_read reports announcements that were already read
+- unread_count is served from the cache until something changes
+- Reading, publishing, deactivating and deleting drop the counters involved
+- Without a shared cache, counters only live for a minute
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from announcements.models import Announcement, AnnouncementRead
+from announcements.read_state import UNREAD_COUNT_TTL, unread_count
+
+User = get_user_model()
+
+
+class AnnouncementReadStateTestCase(TestCase):
+    """Tests for announcements.read_state and the endpoints using it"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.admin = User.objects.create_user(
+            username='admin', password='testpass123', role='admin', company=self.company,
+        )
+        self.employee = User.objects.create_user(
+            username='employee', password='testpass123', role='employee', company=self.company,
+        )
+        self.client.force_authenticate(user=self.employee)
+
+    def _announce(self, title, **kwargs):
+        announcement = Announcement.objects.create(title=title, message=title, created_by=self.admin, **kwargs)
+        announcement.companies.set([self.company])
+        return announcement
+
+    def _mark_all_read_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/announcements/mark_all_read/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response.data['message']
+
+    def test_mark_all_read_is_one_insert(self):
+        self._announce('First')
+        few_queries, message = self._mark_all_read_queries()
+        self.assertEqual(message, 'Marked 1 announcements as read')
+
+        for i in range(5):
+            self._announce(f'More {i}')
+        many_queries, message = self._mark_all_read_queries()
+
+        self.assertEqual(message, 'Marked 5 announcements as read')
+        self.assertEqual(many_queries, few_queries)
+        self.assertEqual(AnnouncementRead.objects.filter(user=self.employee).count(), 6)
+        self.assertEqual(self._mark_all_read_queries()[1], 'Marked 0 announcements as read')
+
+    def test_mark_read_reports_already_read(self):
+        announcement = self._announce('General')
+        url = f'/api/announcements/{announcement.id}/mark_read/'
+
+        self.assertFalse(self.client.post(url).data['already_read'])
+        self.assertTrue(self.client.post(url).data['already_read'])
+
+    def test_unread_count_is_cached(self):
+        self._announce('General')
+        self.assertEqual(self.client.get('/api/announcements/unread_count/').data, {'count': 1})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.employee), 1)
+
+    def test_counter_ttl_is_short_without_shared_cache(self):
+        # Other workers never see this process drop a counter
+        self.assertLessEqual(UNREAD_COUNT_TTL, 60)
+
+    def test_changes_drop_the_counter(self):
+        first = self._announce('First')
+        self.assertEqual(unread_count(self.employee), 1)
+
+        second = self._announce('Second')
+        self.assertEqual(unread_count(self.employee), 2)
+
+        self.client.post(f'/api/announcements/{first.id}/mark_read/')
+        self.assertEqual(unread_count(self.employee), 1)
+
+        second.is_active = False
+        second.save()
+        self.assertEqual(unread_count(self.employee), 0)
+
+        second.is_active = True
+        second.save()
+        self.assertEqual(unread_count(self.employee), 1)
+        second.delete()
+        self.assertEqual(unread_count(self.employee), 0)
+
+    def test_expired_announcements_are_not_counted(self):
+        self._announce('Expired', expires_at=timezone.now() - timedelta(hours=1))
+        self._announce('Current', expires_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(unread_count(self.employee), 1)
@@ -3,11 +3,11 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import viewsets
-from django.utils import timezone
 from django.db import models
 from django.db.models import Q
 from django.contrib.auth import get_user_model
-from .models import Announcement, AnnouncementRead
+from .models import Announcement
+from . import read_state
 from .serializers import AnnouncementSerializer
 from accounts.permissions import CompanyAccessPermission
 from utils.mixins import CompanyFilterMixin
@@ -27,59 +27,38 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         
         try:
             logger.info(f"📢 Starting notification send for announcement: {announcement.title}")
-            recipients = []
             
             # Determine recipients based on target roles and companies
             target_roles = announcement.target_roles or []
             assigned_employees = announcement.assigned_employees.all()
             
-            logger.info(f"   Target roles: {target_roles}")
-            logger.info(f"   Assigned employees: {assigned_employees.count()}")
-            
             # Get companies this announcement is for
             announcement_companies = list(announcement.companies.all())
             if announcement.company:
                 announcement_companies.append(announcement.company)
             
+            logger.info(f"   Target roles: {target_roles}")
             logger.info(f"   Companies: {[c.name for c in announcement_companies]}")
             
-            # If specific employees are assigned, notify only them
+            # Recipients stay a queryset so the fan-out streams them in batches
             if assigned_employees.exists():
-                recipients = list(assigned_employees)
-                logger.info(f"   Using assigned employees: {len(recipients)} users")
+                # If specific employees are assigned, notify only them
+                recipients = assigned_employees
             else:
                 # Notify based on roles and companies
-                if not target_roles:
-                    # No specific roles = notify everyone in the companies
-                    if announcement_companies:
-                        for company in announcement_companies:
-                            recipients.extend(list(company.users.all()))
-                        logger.info(f"   Notifying all users in companies: {len(recipients)} users")
-                    else:
-                        # No companies specified = notify all users
-                        recipients = list(User.objects.filter(is_active=True))
-                        logger.info(f"   Notifying ALL active users: {len(recipients)} users")
+                if announcement_companies:
+                    # Specific companies: every user in them (any active state)
+                    recipients = User.objects.filter(company__in=announcement_companies)
                 else:
-                    # Notify specific roles in the companies
-                    if announcement_companies:
-                        for company in announcement_companies:
-                            recipients.extend(list(company.users.filter(role__in=target_roles)))
-                        logger.info(f"   Notifying roles {target_roles} in companies: {len(recipients)} users")
-                    else:
-                        # No companies specified = notify all users with these roles
-                        recipients = list(User.objects.filter(role__in=target_roles, is_active=True))
-                        logger.info(f"   Notifying roles {target_roles} globally: {len(recipients)} users")
-            
-            # Remove duplicates
-            recipients = list(set(recipients))
-            logger.info(f"   After deduplication: {len(recipients)} users")
+                    # No companies specified = all active users
+                    recipients = User.objects.filter(is_active=True)
+                if target_roles:
+                    recipients = recipients.filter(role__in=target_roles)
             
             # Don't notify the creator
-            recipients = [u for u in recipients if u.id != announcement.created_by.id]
-            logger.info(f"   After removing creator: {len(recipients)} users")
-            logger.info(f"   Recipients: {[u.username for u in recipients]}")
+            recipients = recipients.exclude(id=announcement.created_by_id).distinct()
             
-            if recipients:
+            if recipients.exists():
                 title = f"New Announcement: {announcement.title}"
                 message = announcement.message[:100] + ('...' if len(announcement.message) > 100 else '')
                 
@@ -114,7 +93,9 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             company_id = self.request.GET.get('company')
         
         # Optimize queries with select_related and prefetch_related for companies
-        base_queryset = Announcement.objects.select_related('company', 'created_by').prefetch_related('companies')
+        base_queryset = Announcement.objects.select_related('company', 'created_by').prefetch_related(
+            'companies', 'assigned_employees'
+        )
         
         if user.role == 'admin':
             # Admin can see ALL announcements across all companies
@@ -169,134 +150,28 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
                 is_active=True
             ).distinct()
         
-        elif user.role == 'manager':
+        elif user.role in ['manager', 'employee']:
             # Manager can see:
             # 1. Announcements they created
             # 2. Announcements targeted to managers
             # 3. Announcements specifically assigned to them
-            
-            # Base filter for manager's company
-            manager_company = user.company
-            
-            # If company filter is specified and it matches their company, use it
-            if company_id:
-                try:
-                    if int(company_id) == user.company.id:
-                        manager_company = user.company
-                    else:
-                        # Manager can't see announcements from other companies
-                        return Announcement.objects.none()
-                except (ValueError, TypeError):
-                    pass
-            
-            # SQLite-compatible approach: filter in Python for JSON field queries
-            # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-            all_announcements = base_queryset.filter(
-                models.Q(company=manager_company) | 
-                models.Q(companies=manager_company) | 
-                models.Q(company__isnull=True, companies__isnull=True),
-                is_active=True
-            ).distinct()
-            valid_ids = []
-            
-            for announcement in all_announcements:
-                # Check if user should see this announcement
-                if (announcement.created_by == user or  # Created by user
-                    announcement.assigned_employees.filter(id=user.id).exists() or  # Assigned to user
-                    not announcement.target_roles or  # No role restrictions
-                    'manager' in (announcement.target_roles or [])):  # Manager role included
-                    valid_ids.append(announcement.id)
-            
-            return base_queryset.filter(id__in=valid_ids)
-        
-        elif user.role == 'employee':
             # Employee can see:
             # 1. Announcements targeted to employees in their company
             # 2. Announcements specifically assigned to them
-            # 3. Only if they are assigned to a manager (manager-employee relationship)
-            
-            # Base filter for employee's company
-            employee_company = user.company
+            # 3. Announcements from their manager
+            # Both only within their company (or without company); the rules
+            # are resolved into the audience table (announcements.audience)
             
-            # If company filter is specified and it matches their company, use it
+            # If company filter is specified, it must match their company
             if company_id:
                 try:
-                    if int(company_id) == user.company.id:
-                        employee_company = user.company
-                    else:
-                        # Employee can't see announcements from other companies
+                    if int(company_id) != user.company.id:
+                        # Managers and employees can't see announcements from other companies
                         return Announcement.objects.none()
-                except (ValueError, TypeError):
+                except (ValueError, TypeError, AttributeError):
                     pass
             
-            # SQLite-compatible approach: filter in Python for JSON field queries
-            # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-            all_announcements = base_queryset.filter(
-                models.Q(company=employee_company) | 
-                models.Q(companies=employee_company) | 
-                models.Q(company__isnull=True, companies__isnull=True),
-                is_active=True
-            ).distinct()
-            valid_ids = []
-            
-            for announcement in all_announcements:
-                # Check if user should see this announcement
-                should_include = False
-                
-                # Always include if specifically assigned to user
-                if announcement.assigned_employees.filter(id=user.id).exists():
-                    should_include = True
-                # Include if from their manager (if they have one)
-                elif user.manager and announcement.created_by == user.manager:
-                    should_include = True
-                # Include if no specific assignment and role matches
-                elif (not announcement.assigned_employees.exists() and 
-                      (not announcement.target_roles or 'employee' in (announcement.target_roles or []))):
-                    should_include = True
-                
-                if should_include:
-                    valid_ids.append(announcement.id)
-            
-            return base_queryset.filter(id__in=valid_ids)
-            
-            # If company filter is specified and it matches their company, use it
-            if company_id:
-                try:
-                    if int(company_id) == user.company.id:
-                        employee_company = user.company
-                    else:
-                        # Employee can't see announcements from other companies
-                        return Announcement.objects.none()
-                except (ValueError, TypeError):
-                    pass
-            
-            # SQLite-compatible approach: filter in Python for JSON field queries
-            # Include announcements for their company AND announcements without company (for backward compatibility)
-            all_announcements = base_queryset.filter(
-                models.Q(company=employee_company) | models.Q(company__isnull=True),
-                is_active=True
-            )
-            valid_ids = []
-            
-            for announcement in all_announcements:
-                # Check if user should see this announcement
-                should_include = False
-                
-                # Always include if specifically assigned to user
-                if announcement.assigned_employees.filter(id=user.id).exists():
-                    should_include = True
-                # Include if from their manager (if they have one)
-                elif user.manager and announcement.created_by == user.manager:
-                    should_include = True
-                # Include if no specific assignment and role matches
-                elif (not announcement.assigned_employees.exists() and 
-                      (not announcement.target_roles or 'employee' in (announcement.target_roles or []))):
-                    should_include = True
-                
-                if should_include:
-                    valid_ids.append(announcement.id)
-            
-            return base_queryset.filter(id__in=valid_ids)
+            return base_queryset.filter(audience__user=user, is_active=True)
         
         # Default: no access
         return Announcement.objects.none()
@@ -414,12 +289,6 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         """Get only unread announcements for the current user"""
         user = request.user
         
-        # Get announcements that the user hasn't read yet
-        read_announcement_ids = AnnouncementRead.objects.filter(
-            user=user
-        ).values_list('announcement_id', flat=True)
-        
-        # Apply the same company filtering logic as get_queryset
         # Get company filter from query parameters (handle both DRF and Django requests)
         company_id = None
         if hasattr(request, 'query_params'):
@@ -429,119 +298,32 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             # Regular Django request
             company_id = request.GET.get('company')
         
-        # Get all active announcements not yet read with optimized queries
-        base_queryset = Announcement.objects.select_related('company', 'created_by').prefetch_related('companies')
+        # Announcements addressed to the user (one join on the audience
+        # table) they haven't read yet, see announcements.read_state
+        queryset = read_state.unread_announcements(user).select_related('company', 'created_by').prefetch_related(
+            'companies', 'assigned_employees'
+        )
         
-        # Apply company filtering based on user role
-        if user.role == 'admin':
-            # Admin can see ALL announcements across all companies
-            queryset = base_queryset.exclude(id__in=read_announcement_ids)
-            
-            # If company filter is specified, filter by that company (both legacy and new)
-            if company_id:
-                try:
-                    company_id = int(company_id)
+        # Admins (and HR users for their own company, or without a company)
+        # can narrow the list down to one company
+        if company_id and user.role in ['admin', 'hr']:
+            try:
+                company_id = int(company_id)
+                if user.role == 'admin' or not user.company or company_id == user.company.id:
                     queryset = queryset.filter(
                         models.Q(company_id=company_id) | models.Q(companies__id=company_id)
                     ).distinct()
-                except (ValueError, TypeError):
-                    pass  # Ignore invalid company_id
-        
-        elif user.role == 'hr':
-            # HR can see all announcements within their company
-            # If HR user doesn't have a company, show all announcements (like admin)
-            if not user.company:
-                queryset = base_queryset.exclude(id__in=read_announcement_ids)
-                
-                # If company filter is specified, filter by that company
-                if company_id:
-                    try:
-                        company_id = int(company_id)
-                        queryset = queryset.filter(
-                            models.Q(company_id=company_id) | models.Q(companies__id=company_id)
-                        ).distinct()
-                    except (ValueError, TypeError):
-                        pass
-            # If company filter is specified and it matches their company, use it
-            elif company_id:
-                try:
-                    if int(company_id) == user.company.id:
-                        queryset = base_queryset.filter(
-                            models.Q(company_id=int(company_id)) | models.Q(companies__id=int(company_id))
-                        ).exclude(id__in=read_announcement_ids).distinct()
-                    else:
-                        # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-                        queryset = base_queryset.filter(
-                            models.Q(company=user.company) | 
-                            models.Q(companies=user.company) | 
-                            models.Q(company__isnull=True, companies__isnull=True)
-                        ).exclude(id__in=read_announcement_ids).distinct()
-                except (ValueError, TypeError):
-                    # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-                    queryset = base_queryset.filter(
-                        models.Q(company=user.company) | 
-                        models.Q(companies=user.company) | 
-                        models.Q(company__isnull=True, companies__isnull=True)
-                    ).exclude(id__in=read_announcement_ids).distinct()
-            else:
-                # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-                queryset = base_queryset.filter(
-                    models.Q(company=user.company) | 
-                    models.Q(companies=user.company) | 
-                    models.Q(company__isnull=True, companies__isnull=True)
-                ).exclude(id__in=read_announcement_ids).distinct()
+            except (ValueError, TypeError):
+                pass  # Ignore invalid company_id
         
-        else:  # manager or employee
-            # Filter by user's company only
-            # Include announcements for their company (both legacy and new) AND announcements without company (for backward compatibility)
-            queryset = base_queryset.filter(
-                models.Q(company=user.company) | 
-                models.Q(companies=user.company) | 
-                models.Q(company__isnull=True, companies__isnull=True),
-                is_active=True
-            ).exclude(id__in=read_announcement_ids).distinct()
-        
-        # Filter based on role and assigned employees (same logic as get_queryset)
-        filtered_announcements = []
-        for announcement in queryset:
-            should_include = False
-            
-            # Check if user created it (for managers)
-            if user.role == 'manager' and announcement.created_by == user:
-                should_include = True
-            
-            # Check target roles
-            elif not announcement.target_roles or len(announcement.target_roles) == 0:
-                # Empty target_roles means for everyone
-                should_include = True
-            elif user.role in announcement.target_roles:
-                # User's role is in target roles
-                # Check if there are assigned employees
-                assigned_count = announcement.assigned_employees.count()
-                if assigned_count == 0:
-                    # No specific employees assigned, show to all in role
-                    should_include = True
-                elif announcement.assigned_employees.filter(id=user.id).exists():
-                    # User is specifically assigned
-                    should_include = True
-            
-            # Check if user is specifically assigned (even if role doesn't match)
-            elif announcement.assigned_employees.filter(id=user.id).exists():
-                should_include = True
-            
-            if should_include:
-                filtered_announcements.append(announcement.id)
-        
-        # Filter by announcement IDs and expiry date
-        final_queryset = Announcement.objects.filter(
-            id__in=filtered_announcements
-        ).filter(
-            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=timezone.now())
-        )
-        
-        serializer = self.get_serializer(final_queryset, many=True)
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """Number of unread announcements for the current user (cached, for badge polling)"""
+        return Response({'count': read_state.unread_count(request.user)})
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark an announcement as read by the current user"""
@@ -552,13 +334,8 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             from rest_framework.exceptions import NotFound
             raise NotFound('Announcement not found or you do not have permission to access it.')
         
-        user = request.user
-        
-        # Create or get the read record
-        read_record, created = AnnouncementRead.objects.get_or_create(
-            announcement=announcement,
-            user=user
-        )
+        # Create the read record (and drop the cached unread count)
+        created = read_state.mark_read(request.user, [announcement.id])
         
         return Response({
             'message': 'Announcement marked as read',
@@ -568,21 +345,11 @@ class AnnouncementViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all visible announcements as read for the current user"""
-        user = request.user
-        announcements = self.get_queryset()
-        
-        # Create read records for all announcements the user can see
-        read_records = []
-        for announcement in announcements:
-            read_record, created = AnnouncementRead.objects.get_or_create(
-                announcement=announcement,
-                user=user
-            )
-            if created:
-                read_records.append(read_record)
+        # Create read records for all announcements the user can see, in one insert
+        marked = read_state.mark_read(request.user, self.get_queryset().values_list('id', flat=True))
         
         return Response({
-            'message': f'Marked {len(read_records)} announcements as read'
+            'message': f'Marked {marked} announcements as read'
         })
 
     @action(detail=True, methods=['patch'])
@@ -0,0 +1,118 @@
+"""
+ASE customer file importer used by ASECustomerViewSet.import_customers.
+
+Rows are streamed from the sheet and bulk inserted per batch through
+import_jobs instead of one ``objects.create`` per pandas row.
+"""
+from django.db import transaction
+
+from eswari_crm.ws_utils import notify_ase_data_changed
+from import_jobs.base import BaseImporter, ImportFailed
+from search.services import index_created
+from utils.phones import normalize_phone, set_normalized_phones
+from utils.spreadsheets import is_blank_row
+from .models import ASECustomer
+
+
+class ASECustomerFileImporter(BaseImporter):
+    """
+    Import the phone/name/company_name call template.
+
+    Every row becomes a pending call assigned to the importing user; they
+    can reassign later if needed.
+    """
+
+    # Only the first created calls are echoed back for the import summary
+    max_created_preview = 100
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.columns = {}
+        self.created_customers = []
+        self.seen_phones = set()
+
+    def map_columns(self, header_row):
+        self.columns = {
+            str(header).strip(): idx
+            for idx, header in enumerate(header_row or [])
+            if header is not None
+        }
+        # Validate required columns - only phone is required
+        if 'phone' not in self.columns:
+            raise ImportFailed('Missing required columns: phone')
+
+    def _cell(self, row, column):
+        idx = self.columns.get(column)
+        if idx is None or idx >= len(row) or row[idx] is None or str(row[idx]).strip() == '':
+            return None
+        value = row[idx]
+        # Excel stores numbers as floats, e.g. 9876543210.0
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value).strip()
+
+    def process_batch(self, batch, first_row_num):
+        parsed = []
+        for offset, row in enumerate(batch):
+            if is_blank_row(row):
+                continue
+            phone = self._cell(row, 'phone')
+            if not phone:
+                self.add_error({'row': first_row_num + offset - 1, 'error': 'Phone is required'})
+                continue
+            parsed.append((first_row_num + offset - 1, row, phone))
+
+        existing = set(ASECustomer.objects.filter(
+            company=self.company,
+            normalized_phone__in={normalize_phone(phone) for _, _, phone in parsed},
+        ).values_list('normalized_phone', flat=True))
+
+        to_create = []
+        for row_num, row, phone in parsed:
+            normalized = normalize_phone(phone)
+            if normalized in existing or normalized in self.seen_phones:
+                self.duplicates += 1
+                self.add_error({'row': row_num, 'phone': phone, 'error': 'Phone number already exists'})
+                continue
+            self.seen_phones.add(normalized)
+            to_create.append(ASECustomer(
+                phone=phone,
+                name=self._cell(row, 'name'),
+                company_name=self._cell(row, 'company_name'),
+                call_status='pending',  # Default status
+                company=self.company,
+                created_by=self.user,
+                assigned_to=self.user,
+            ))
+
+        if not to_create:
+            return
+        with transaction.atomic():
+            created = ASECustomer.objects.bulk_create(set_normalized_phones(to_create))
+            index_created(created)
+        self.created += len(created)
+
+        room = self.max_created_preview - len(self.created_customers)
+        for customer in created[:max(room, 0)]:
+            self.created_customers.append({
+                'id': customer.id,
+                'name': customer.name,
+                'phone': customer.phone,
+                'assigned_to': self.user.username,
+            })
+
+    def finish(self):
+        if self.created:
+            notify_ase_data_changed('calls', 'bulk_imported', extra={'count': self.created})
+
+    def result(self):
+        return {
+            'success': True,
+            'message': f'Successfully imported {self.created} customers',
+            'created_customers': self.created_customers,
+            'errors': self.errors,
+            'total_processed': self.total_rows,
+            'total_created': self.created,
+            'total_errors': self.error_count,
+            'total_duplicates': self.duplicates,
+        }
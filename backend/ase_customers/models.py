@@ -3,8 +3,11 @@ from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
 
-class ASECustomer(models.Model):
+
+class ASECustomer(NormalizedPhoneModel):
     """
     ASE Technologies Simple Customer Model
     Similar to Eswari Group customers with basic fields
@@ -107,6 +110,8 @@ class ASECustomer(models.Model):
             models.Index(fields=['company', 'call_status']),
             models.Index(fields=['company', 'created_at']),
             models.Index(fields=['is_converted']),
+            models.Index(fields=['company', 'normalized_phone'], name='asecust_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='asecust_company_rev_phone_idx'),
         ]
     
     def __str__(self):
@@ -136,13 +141,11 @@ class ASECustomer(models.Model):
     
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
     
     @property
     def created_by_name(self):
-        return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
+        return user_directory.name(self.created_by_id)
 
 
 class CallLog(models.Model):
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from accounts.directory import user_directory
+from utils.phones import normalize_phone
 from .models import ASECustomer, CallLog, CustomerNote
 
 
@@ -53,7 +55,7 @@ class ASECustomerSerializer(serializers.ModelSerializer):
         if request and hasattr(request.user, 'company'):
             company = request.user.company
         if company and value:
-            qs = ASECustomer.objects.filter(phone=value, company=company)
+            qs = ASECustomer.objects.filter(normalized_phone=normalize_phone(value), company=company)
             if self.instance:
                 qs = qs.exclude(pk=self.instance.pk)
             if qs.exists():
@@ -147,9 +149,7 @@ class CallLogSerializer(serializers.ModelSerializer):
         read_only_fields = ['called_by', 'called_at']
 
     def get_called_by_name(self, obj):
-        if obj.called_by:
-            return f"{obj.called_by.first_name} {obj.called_by.last_name}".strip() or obj.called_by.username
-        return 'Unknown'
+        return user_directory.name(obj.called_by_id, 'Unknown')
 
     def get_call_status_display(self, obj):
         if obj.call_status == 'custom' and obj.custom_status:
@@ -172,9 +172,7 @@ class CustomerNoteSerializer(serializers.ModelSerializer):
         read_only_fields = ['author', 'created_at']
 
     def get_author_name(self, obj):
-        if obj.author:
-            return f"{obj.author.first_name} {obj.author.last_name}".strip() or obj.author.username
-        return 'Unknown'
+        return user_directory.name(obj.author_id, 'Unknown')
     
     def validate_content(self, value):
         """Validate note content length (max 500 characters)"""
@@ -9,19 +9,44 @@ from django.db.models import Q
 from django.utils import timezone
 
 from accounts.permissions import CompanyAccessPermission
+from accounts.registry import company_registry
+from accounts.scopes import access_scope
 from .models import ASECustomer
 from .serializers import ASECustomerSerializer, ASECustomerListSerializer, CallLogSerializer, CustomerNoteSerializer
 from eswari_crm.ws_utils import notify_ase_data_changed
+from import_jobs.services import submit_import, wants_background
+from import_jobs.views import import_response
+from search.services import index_created, reindex
+from utils.exports import ExportColumn, export_response
+from utils.pagination import KeysetPaginationMixin
+from utils.phones import PhoneSearchFilter, normalize_phone, set_normalized_phones
 
 logger = logging.getLogger(__name__)
 
 
-class ASECustomerPagination(PageNumberPagination):
+class ASECustomerPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 2000  # Increased to support larger datasets
 
 
+ASE_CUSTOMER_EXPORT_COLUMNS = [
+    ExportColumn('id', 'ID', width=10),
+    ExportColumn('name', 'Name'),
+    ExportColumn('phone', 'Phone', text=True),
+    ExportColumn('email', 'Email'),
+    ExportColumn('call_status', 'Call Status', lambda c: c.get_call_status_display()),
+    ExportColumn('custom_call_status', 'Custom Call Status'),
+    ExportColumn('company', 'Company', lambda c: c.company.name),
+    ExportColumn('assigned_to', 'Assigned To', lambda c: c.assigned_to_name),
+    ExportColumn('notes', 'Notes', width=40),
+    ExportColumn('is_converted', 'Is Converted', lambda c: 'Yes' if c.is_converted else 'No'),
+    ExportColumn('converted_lead_id', 'Converted Lead ID'),
+    ExportColumn('created_at', 'Created At', lambda c: c.created_at.strftime('%Y-%m-%d %H:%M:%S')),
+    ExportColumn('created_by', 'Created By', lambda c: c.created_by_name),
+]
+
+
 class ASECustomerViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing ASE Customers (simple version)
@@ -30,7 +55,7 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
     serializer_class = ASECustomerSerializer
     permission_classes = [IsAuthenticated, CompanyAccessPermission]
     pagination_class = ASECustomerPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PhoneSearchFilter, filters.OrderingFilter]
     
     # Search fields
     search_fields = [
@@ -58,7 +83,7 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        qs = ASECustomer.objects.select_related('company', 'assigned_to', 'created_by').all()
+        qs = ASECustomer.objects.select_related('company').all()
 
         if user.is_superuser:
             # Superuser can see all — optionally scoped by ?company=
@@ -81,17 +106,14 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         elif user.role == 'employee':
             if not user.company:
                 return qs.none()
-            qs = qs.filter(company=user.company).filter(Q(assigned_to=user) | Q(created_by=user)).distinct()
+            qs = qs.filter(company=user.company).filter(
+                access_scope(user).q('assigned_to', 'created_by')
+            ).distinct()
         elif user.role == 'manager':
             if not user.company:
                 return qs.none()
-            employee_ids = list(
-                user.__class__.objects.filter(manager=user, company=user.company).values_list('id', flat=True)
-            )
-            employee_ids.append(user.id)
             qs = qs.filter(company=user.company).filter(
-                Q(assigned_to__id__in=employee_ids) |
-                Q(created_by__id__in=employee_ids) |
+                access_scope(user).q('assigned_to', 'created_by') |
                 Q(assigned_to__isnull=True)
             ).distinct()
         else:
@@ -244,7 +266,7 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
                 custom_status=updated.custom_call_status if new_status == 'custom' else None,
                 notes=None,
             )
-        notify_ase_data_changed('calls', 'updated', record_id=updated.id)
+        notify_ase_data_changed('calls', 'updated', record_id=updated.id, fields=serializer.validated_data)
     
     def perform_destroy(self, instance):
         """
@@ -295,14 +317,12 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         if user.role == 'admin':
             company_id = request.query_params.get('company')
             if company_id:
-                from accounts.models import Company
-                try:
-                    company = Company.objects.get(id=company_id)
-                except Company.DoesNotExist:
-                    pass
+                company = company_registry.by_id(company_id) or company
         if not company:
             return Response({'exists': False})
-        qs = ASECustomer.objects.filter(phone=phone, company=company).select_related('assigned_to')
+        qs = ASECustomer.objects.filter(
+            normalized_phone=normalize_phone(phone), company=company,
+        ).select_related('assigned_to')
         if exclude_id:
             qs = qs.exclude(pk=exclude_id)
         
@@ -357,7 +377,7 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         customer = self.get_object()
 
         if request.method == 'GET':
-            logs = CallLog.objects.filter(customer=customer).select_related('called_by')
+            logs = CallLog.objects.filter(customer=customer)
             serializer = CallLogSerializer(logs, many=True)
             return Response(serializer.data)
 
@@ -580,10 +600,15 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            record_ids = list(qs.values_list('id', flat=True))
             updated = qs.update(assigned_to=assignee)
+            reindex(ASECustomer, record_ids)
 
             if updated > 0:
-                notify_ase_data_changed('calls', 'bulk_updated', extra={'count': updated, 'field': 'assigned_to'})
+                notify_ase_data_changed(
+                    'calls', 'bulk_updated', extra={'field': 'assigned_to'}, record_ids=record_ids,
+                    fields=['assigned_to'],
+                )
 
             return Response({
                 'success': True,
@@ -612,10 +637,14 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
             return Response({'error': f'Invalid status. Choose from: {", ".join(valid_statuses)}'}, status=status.HTTP_400_BAD_REQUEST)
 
         qs = self.get_queryset().filter(id__in=customer_ids)
+        record_ids = list(qs.values_list('id', flat=True))
         updated = qs.update(call_status=new_status)
 
         if updated > 0:
-            notify_ase_data_changed('calls', 'bulk_updated', extra={'count': updated, 'field': 'call_status', 'new_status': new_status})
+            notify_ase_data_changed(
+                'calls', 'bulk_updated', extra={'field': 'call_status', 'new_status': new_status},
+                record_ids=record_ids, fields=['call_status'],
+            )
 
         return Response({'success': True, 'updated': updated})
 
@@ -661,13 +690,14 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
                         }, status=status.HTTP_403_FORBIDDEN)
             
             # Delete each customer individually (avoids .distinct() issue)
-            deleted_count = 0
+            deleted_ids = []
             for customer in customers_to_delete:
+                deleted_ids.append(customer.id)
                 customer.delete()
-                deleted_count += 1
+            deleted_count = len(deleted_ids)
 
             if deleted_count > 0:
-                notify_ase_data_changed('calls', 'bulk_deleted', extra={'count': deleted_count})
+                notify_ase_data_changed('calls', 'bulk_deleted', record_ids=deleted_ids)
 
             return Response({'success': True, 'deleted': deleted_count})
         except Exception as e:
@@ -694,9 +724,8 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         user = request.user
         company = getattr(user, 'company', None)
         if not company:
-            # Admin without company — use ASE (company_id=2) by default
-            from accounts.models import Company
-            company = Company.objects.filter(code='ASE').first()
+            # Admin without company — use ASE by default
+            company = company_registry.by_code('ASE')
             if not company:
                 return Response({'error': 'ASE company not found'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -709,8 +738,11 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         duplicates = 0
         skipped = 0
 
-        # Pre-fetch existing phones with their creator info
-        existing_records = ASECustomer.objects.filter(company=company).select_related('created_by').values_list('phone', 'created_by__first_name', 'created_by__last_name', 'created_by__username')
+        # Look up only the numbers in this file, by normalized phone
+        candidates = {normalize_phone(row.get('phone')) for row in rows} - {''}
+        existing_records = ASECustomer.objects.filter(
+            company=company, normalized_phone__in=candidates,
+        ).values_list('normalized_phone', 'created_by__first_name', 'created_by__last_name', 'created_by__username')
         existing_phone_map = {}
         for phone, fn, ln, uname in existing_records:
             name = f"{fn or ''} {ln or ''}".strip() or uname or 'Unknown'
@@ -720,9 +752,7 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
 
         for i, row in enumerate(rows):
             phone = str(row.get('phone', '')).strip()
-            
-            # Clean phone: remove spaces, dashes, plus signs for comparison
-            phone_clean = phone.replace(' ', '').replace('-', '').replace('+', '')
+            phone_clean = normalize_phone(row.get('phone'))
             
             # Skip completely empty rows (no phone at all)
             if not phone_clean:
@@ -754,19 +784,6 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
                 duplicates += 1
                 continue
             
-            # Also check with original phone format
-            if phone in existing_phone_map:
-                employee_name = existing_phone_map[phone]
-                errors.append({
-                    'row': i + 1,
-                    'phone': phone,
-                    'error': f"This number is already added by {employee_name}",
-                    'type': 'duplicate',
-                    'added_by': employee_name,
-                })
-                duplicates += 1
-                continue
-            
             # Check duplicate within batch
             if phone_clean in seen_phones:
                 errors.append({
@@ -827,7 +844,8 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
         imported = 0
         if to_create:
             with db_transaction.atomic():
-                created = ASECustomer.objects.bulk_create(to_create, batch_size=500)
+                created = ASECustomer.objects.bulk_create(set_normalized_phones(to_create), batch_size=500)
+                index_created(created)
                 imported = len(created)
 
         if imported > 0:
@@ -843,6 +861,11 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def import_customers(self, request):
+        """
+        Import calls from an Excel/CSV file (phone required; name, company_name
+        optional). Rows are bulk inserted in batches by ASECustomerFileImporter;
+        with ``async=true`` the file is queued and a job id returned (202).
+        """
         if 'file' not in request.FILES:
             return Response(
                 {'error': 'No file provided'},
@@ -858,135 +881,25 @@ class ASECustomerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            import pandas as pd
-            
-            # Read file based on type
-            if file.name.endswith('.csv'):
-                df = pd.read_csv(file)
-            else:
-                df = pd.read_excel(file)
-            
-            # Validate required columns - only phone is required
-            required_columns = ['phone']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                return Response(
-                    {'error': f'Missing required columns: {", ".join(missing_columns)}'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Auto-assignment logic: ALL imports assigned to the importing user first
-            # They can manually reassign later if needed
-            # This applies to all roles: admin, manager, employee
-            assigned_user = request.user
-            
-            created_customers = []
-            errors = []
-            
-            for index, row in df.iterrows():
-                try:
-                    # Prepare customer data - only use the 3 template fields
-                    customer_data = {
-                        'phone': str(row['phone']).strip(),
-                        'name': str(row.get('name', '')).strip() if pd.notna(row.get('name')) else None,
-                        'company_name': str(row.get('company_name', '')).strip() if pd.notna(row.get('company_name')) else None,
-                        'call_status': 'pending',  # Default status
-                        'company': request.user.company,
-                        'created_by': request.user,
-                    }
-                    
-                    # Auto-assign ALL imported calls to the importing user
-                    customer_data['assigned_to'] = assigned_user
-                    
-                    # Create customer
-                    customer = ASECustomer.objects.create(**customer_data)
-                    created_customers.append({
-                        'id': customer.id,
-                        'name': customer.name,
-                        'phone': customer.phone,
-                        'assigned_to': customer.assigned_to.username if customer.assigned_to else None
-                    })
-                    
-                except Exception as e:
-                    errors.append({
-                        'row': index + 1,
-                        'error': str(e),
-                        'data': dict(row)
-                    })
-            
-            return Response({
-                'success': True,
-                'message': f'Successfully imported {len(created_customers)} customers',
-                'created_customers': created_customers,
-                'errors': errors,
-                'total_processed': len(df),
-                'total_created': len(created_customers),
-                'total_errors': len(errors)
-            })
-            
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to process file: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        job = submit_import(
+            'ase_customers', request.user, request.user.company,
+            file=file, background=wants_background(request),
+        )
+        return import_response(job, success_status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'])
     def export_customers(self, request):
         """
-        Export ASE customers to Excel file
+        Export ASE customers to Excel (default) or CSV, streamed row by row.
+        Honours the list filters/search; ?file_format=csv and ?columns=<keys>.
         """
-        try:
-            import pandas as pd
-            from django.http import HttpResponse
-            import io
-            
-            # Get customers
-            customers = self.get_queryset()
-            
-            # Prepare data for export
-            data = []
-            for customer in customers:
-                data.append({
-                    'ID': customer.id,
-                    'Name': customer.name,
-                    'Phone': customer.phone,
-                    'Email': customer.email or '',
-                    'Call Status': customer.get_call_status_display(),
-                    'Custom Call Status': customer.custom_call_status or '',
-                    'Company': customer.company.name,
-                    'Assigned To': customer.assigned_to_name or '',
-                    'Notes': customer.notes or '',
-                    'Is Converted': 'Yes' if customer.is_converted else 'No',
-                    'Converted Lead ID': customer.converted_lead_id or '',
-                    'Created At': customer.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'Created By': customer.created_by_name,
-                })
-            
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
-            # Create Excel file in memory
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='ASE Customers', index=False)
-            
-            output.seek(0)
-            
-            # Create response
-            response = HttpResponse(
-                output.getvalue(),
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            response['Content-Disposition'] = 'attachment; filename="ase_customers_export.xlsx"'
-            
-            return response
-            
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to export customers: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return export_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            ASE_CUSTOMER_EXPORT_COLUMNS,
+            'ase_customers_export',
+            'ASE Customers',
+        )
     
     @action(detail=False, methods=['get'])
     def teammates(self, request):
@@ -0,0 +1,79 @@
+"""
+Conditional aggregation helpers for ASE dashboards.
+
+Instead of one ``.count()`` per metric and time window, every counter over
+the same base queryset is computed in a single ``aggregate()`` with
+``Count(filter=Q(...))`` / ``Sum(filter=...)``:
+
+    windows = period_windows()
+    stats = aggregate_metrics(ASELead.objects.filter(company=company), {
+        'queue': Q(status='new'),                                   # Count
+        'today_won': Q(status='won', deal_closed_at__date=windows.today),
+        'revenue': Sum('estimated_project_value', filter=Q(status='won')),
+    })
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+@dataclass(frozen=True)
+class PeriodWindows:
+    today: date
+    week_start: date
+    month_start: date
+
+
+def period_windows(today=None):
+    """Today, Monday of this week and the 1st of this month."""
+    today = today or timezone.now().date()
+    return PeriodWindows(
+        today=today,
+        week_start=today - timedelta(days=today.weekday()),
+        month_start=today.replace(day=1),
+    )
+
+
+def window_filters(field, windows, **extra):
+    """
+    ``{'today': Q, 'week': Q, 'month': Q}`` on the date part of ``field``,
+    each combined with the ``extra`` lookups.
+    """
+    return {
+        'today': Q(**{f'{field}__date': windows.today}, **extra),
+        'week': Q(**{f'{field}__date__gte': windows.week_start}, **extra),
+        'month': Q(**{f'{field}__date__gte': windows.month_start}, **extra),
+    }
+
+
+def metric_expressions(metrics):
+    """
+    Aggregate expressions for ``metrics``: each value is either a ``Q``
+    (counted rows matching it) or an aggregate expression such as
+    ``Sum(..., filter=Q(...))``, passed through as is.
+    """
+    return {
+        name: Count('pk', filter=metric) if isinstance(metric, Q) else metric
+        for name, metric in metrics.items()
+    }
+
+
+def aggregate_metrics(queryset, metrics):
+    """
+    Evaluate all ``metrics`` (see metric_expressions) over ``queryset`` in
+    one query. Returns a dict with the same keys; aggregates over no rows
+    come back as None.
+    """
+    if not metrics:
+        return {}
+    return queryset.order_by().aggregate(**metric_expressions(metrics))
+
+
+def windowed_metrics(prefix, field, windows, **extra):
+    """``{prefix_today: Q, prefix_week: Q, prefix_month: Q}`` for aggregate_metrics."""
+    return {
+        f'{prefix}_{period}': q
+        for period, q in window_filters(field, windows, **extra).items()
+    }
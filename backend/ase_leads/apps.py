@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class AseLeadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ase_leads'
-    verbose_name = 'ASE Leads'
\ No newline at end of file
+    verbose_name = 'ASE Leads'
+
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import ase_leads.signals  # noqa
@@ -0,0 +1,133 @@
+"""
+Load-aware distribution of unassigned BRE research data to BOE employees.
+
+    plan = plan_bre_distribution(company, boe_users, limit=None)
+    apply_bre_distribution(plan)
+
+Planning costs two queries: the grouped open-record count per BOE user and
+the ids of the unassigned records. New records go to the least-loaded users
+first so everyone ends up as close to the same open count as possible
+("water filling"). Applying the plan is one range UPDATE per user, all in a
+single transaction.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ase_leads.models.bre_data import BREResearchData
+from search.services import reindex
+
+
+# Assigned records still waiting on a BOE call outcome
+OPEN_CALL_STATUSES = ('', 'pending', 'no_answer', 'callback')
+
+
+@dataclass
+class Allocation:
+    user: object
+    current_open: int
+    count: int = 0
+    id_range: tuple = None  # (first_id, last_id) of the records to assign
+
+    @property
+    def name(self):
+        return f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username
+
+
+@dataclass
+class DistributionPlan:
+    company: object
+    allocations: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return sum(a.count for a in self.allocations)
+
+
+def open_counts(company, user_ids):
+    """Open (assigned, not yet resolved) BRE records per user, in one grouped query."""
+    rows = BREResearchData.objects.filter(
+        company=company,
+        assigned_to_id__in=user_ids,
+        status='assigned',
+        call_status__in=OPEN_CALL_STATUSES,
+    ).values('assigned_to_id').annotate(n=Count('id'))
+    return {row['assigned_to_id']: row['n'] for row in rows}
+
+
+def balanced_targets(loads, total):
+    """
+    Split ``total`` new records over users with the given current ``loads``
+    (list of ints) so the resulting maximum load is as small as possible.
+
+    Returns a list of counts in the same order as ``loads``. Ties go to the
+    earlier user.
+    """
+    if not loads or total <= 0:
+        return [0] * len(loads)
+
+    order = sorted(range(len(loads)), key=lambda i: (loads[i], i))
+    # Find how many of the least-loaded users get records and the level they reach
+    filled, level_sum = 0, 0
+    for k, i in enumerate(order, start=1):
+        level_sum += loads[i]
+        filled = k
+        level = (total + level_sum) // k
+        if k == len(order) or level <= loads[order[k]]:
+            break
+
+    counts = [0] * len(loads)
+    for i in order[:filled]:
+        counts[i] = level - loads[i]
+    # Hand out what floor division left over, least-loaded first
+    for i in order[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def plan_bre_distribution(company, boe_users, limit=None):
+    """Plan how the company's unassigned ('new') records are spread over ``boe_users``."""
+    loads = open_counts(company, [u.id for u in boe_users])
+    allocations = [Allocation(user=u, current_open=loads.get(u.id, 0)) for u in boe_users]
+
+    unassigned = BREResearchData.objects.filter(company=company, status='new').order_by('id')
+    if limit:
+        unassigned = unassigned[:limit]
+    record_ids = list(unassigned.values_list('id', flat=True))
+
+    counts = balanced_targets([a.current_open for a in allocations], len(record_ids))
+    start = 0
+    for allocation, count in zip(allocations, counts):
+        allocation.count = count
+        if count:
+            allocation.id_range = (record_ids[start], record_ids[start + count - 1])
+            start += count
+    return DistributionPlan(company=company, allocations=allocations)
+
+
+def apply_bre_distribution(plan):
+    """
+    Assign each user's id range in one UPDATE. Only records that are still
+    'new' are touched, so records assigned concurrently are skipped; the
+    per-user counts are updated to what was actually written.
+    """
+    with transaction.atomic():
+        for allocation in plan.allocations:
+            if not allocation.id_range:
+                continue
+            first_id, last_id = allocation.id_range
+            allocation.count = BREResearchData.objects.filter(
+                company=plan.company,
+                status='new',
+                id__gte=first_id,
+                id__lte=last_id,
+            ).update(assigned_to=allocation.user, status='assigned', updated_at=timezone.now())
+            reindex(BREResearchData, BREResearchData.objects.filter(
+                company=plan.company,
+                assigned_to=allocation.user,
+                id__gte=first_id,
+                id__lte=last_id,
+            ).values_list('id', flat=True))
+    return plan
@@ -0,0 +1,215 @@
+"""
+Streaming import engines for BRE research data and BOE lead uploads.
+
+Rows are read from the uploaded sheet in fixed-size chunks. Each chunk costs
+one duplicate lookup (``normalized_phone__in``) and one ``bulk_create``, so a
+50k-row upload is ~100 queries instead of 100k+, and memory stays flat
+regardless of file size.
+
+Both importers run through import_jobs (inline or in the background worker).
+"""
+from django.db import IntegrityError, transaction
+
+from ase_leads.models.bre_data import BREResearchData
+from ase_leads.models.boe_lead import BOELead
+from import_jobs.base import BaseImporter, ImportFailed
+from search.services import index_created
+from utils.phones import normalize_phone, set_normalized_phones
+from utils.spreadsheets import is_blank_row
+
+
+NAME_HEADERS = ('name', 'contact_person', 'company_name', 'contact name')
+PHONE_HEADERS = ('phone', 'phone_number', 'phone number', 'mobile', 'contact number')
+LOCATION_HEADERS = ('location', 'city', 'address', 'area')
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+class BREResearchImporter(BaseImporter):
+    """
+    Import BRE research rows for one user/company.
+
+    Usage:
+        importer = BREResearchImporter(user=request.user, company=company)
+        importer.map_columns(header_row)
+        result = importer.run(data_rows)
+
+    ``run`` returns the same report the upload endpoint has always returned:
+    created / duplicates / errors (first ``max_errors`` messages) / total_rows.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_name = _full_name(self.user.first_name, self.user.last_name)
+        self.name_col = None
+        self.phone_col = None
+        self.location_col = None
+
+    # ── Header mapping ────────────────────────────────────────────────────
+
+    def map_columns(self, header_row):
+        """Locate name/phone/location columns in the header row."""
+        headers = [str(h).lower().strip() if h else '' for h in (header_row or [])]
+        for i, h in enumerate(headers):
+            if h in NAME_HEADERS:
+                self.name_col = i
+            elif h in PHONE_HEADERS:
+                self.phone_col = i
+            elif h in LOCATION_HEADERS:
+                self.location_col = i
+
+        if self.name_col is None:
+            raise ImportFailed('Could not find "name" column. Expected columns: name, phone, location')
+        if self.phone_col is None:
+            raise ImportFailed('Could not find "phone" column. Expected columns: name, phone, location')
+
+    # ── Processing ────────────────────────────────────────────────────────
+
+    def result(self):
+        return {
+            'message': f'Upload complete. {self.created} leads created.',
+            'created': self.created,
+            'duplicates': self.duplicates,
+            'errors': self.errors,
+            'error_count': self.error_count,
+            'total_rows': self.total_rows,
+        }
+
+    def _parse_row(self, row_num, row):
+        """Return (name, phone, location) or an error message string, or None to skip."""
+        if is_blank_row(row):
+            return None
+        try:
+            name = str(row[self.name_col]).strip() if row[self.name_col] else ''
+            phone = normalize_phone(row[self.phone_col])
+            location = ''
+            if self.location_col is not None and len(row) > self.location_col and row[self.location_col]:
+                location = str(row[self.location_col]).strip()
+        except Exception as e:
+            return f'Row {row_num}: {str(e)}'
+
+        if not name and not phone:
+            return None
+        if not name or not phone:
+            return f'Row {row_num}: Missing name or phone'
+        if len(phone) < 10:
+            return f'Row {row_num}: Invalid phone number "{phone}"'
+        return name, phone, location
+
+    def process_batch(self, batch, first_row_num):
+        parsed = []
+        for offset, row in enumerate(batch):
+            row_num = first_row_num + offset
+            outcome = self._parse_row(row_num, row)
+            if outcome is not None:
+                parsed.append((row_num, outcome))
+
+        phones = {outcome[1] for _, outcome in parsed if isinstance(outcome, tuple)}
+        existing = {}
+        if phones:
+            for phone, first_name, last_name in BREResearchData.objects.filter(
+                company=self.company, normalized_phone__in=phones,
+            ).values_list('normalized_phone', 'created_by__first_name', 'created_by__last_name'):
+                existing[phone] = _full_name(first_name, last_name) or 'Unknown'
+
+        pending = []
+        for row_num, outcome in parsed:
+            if isinstance(outcome, str):
+                self.add_error(outcome)
+                continue
+            name, phone, location = outcome
+            if phone in existing:
+                self.duplicates += 1
+                self.add_error(f'Row {row_num}: Phone {phone} already created by "{existing[phone]}"')
+                continue
+            # Later rows with the same number count as duplicates of this one
+            existing[phone] = self.user_name
+            pending.append((row_num, BREResearchData(
+                name=name,
+                phone_number=phone,
+                location=location,
+                notes='',
+                company=self.company,
+                created_by=self.user,
+                assigned_to=self.user,  # Auto-assign to creator
+            )))
+
+        if pending:
+            self._insert(pending)
+
+    def _insert(self, pending):
+        try:
+            with transaction.atomic():
+                index_created(BREResearchData.objects.bulk_create(set_normalized_phones([obj for _, obj in pending])))
+            self.created += len(pending)
+        except IntegrityError:
+            # A concurrent upload claimed one of the numbers between the
+            # duplicate lookup and the insert; fall back to per-row saves so
+            # only the conflicting rows are reported.
+            for row_num, obj in pending:
+                try:
+                    with transaction.atomic():
+                        obj.pk = None
+                        obj.save()
+                    self.created += 1
+                except Exception as e:
+                    self.add_error(f'Row {row_num}: {str(e)}')
+
+
+class BOELeadImporter(BaseImporter):
+    """
+    Import BOE leads from the BOE leads template.
+
+    Columns are positional: Name, Phone Number, Location, Notes, Call Notes.
+    Rows without a name are ignored; rows missing a phone are reported.
+    """
+
+    max_errors = 10
+
+    def process_batch(self, batch, first_row_num):
+        to_create = []
+        for offset, row in enumerate(batch):
+            row_num = first_row_num + offset
+            if not row or not row[0]:
+                continue
+
+            name, phone, location, notes, call_notes = (self._cell(row, i) for i in range(5))
+            if not name or not phone:
+                self.add_error(f'Row {row_num}: Name and phone are required')
+                self.skipped += 1
+                continue
+
+            # Excel stores numbers as floats, e.g. 9876543210.0
+            if phone.endswith('.0'):
+                phone = phone[:-2]
+
+            to_create.append(BOELead(
+                name=name,
+                phone_number=phone,
+                location=location,
+                notes=notes,
+                call_notes=call_notes,
+                created_by=self.user,
+                company=self.company,
+            ))
+
+        if to_create:
+            with transaction.atomic():
+                index_created(BOELead.objects.bulk_create(set_normalized_phones(to_create)))
+            self.created += len(to_create)
+
+    @staticmethod
+    def _cell(row, index):
+        if len(row) <= index or not row[index]:
+            return ''
+        return str(row[index]).strip()
+
+    def result(self):
+        return {
+            'message': f'{self.created} leads imported successfully.',
+            'created': self.created,
+            'skipped': self.skipped,
+            'errors': self.errors,
+        }
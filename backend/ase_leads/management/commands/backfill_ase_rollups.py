@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Company
+from ase_leads.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ASE daily metric rollups from leads and activities'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company',
+            type=str,
+            default=None,
+            help='Company code to rebuild (defaults to all companies)',
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            default=None,
+            help='Only rebuild days on or after this date (YYYY-MM-DD)',
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(code=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Company '{options['company']}' not found")
+
+        since = None
+        if options['since']:
+            from datetime import date
+            since = date.fromisoformat(options['since'])
+
+        scope = company.code if company else 'all companies'
+        self.stdout.write(f'Rebuilding ASE rollups for {scope}' + (f' since {since}' if since else '') + '...')
+
+        written = rebuild_rollups(company=company, since=since)
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {written} rollup row(s).'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Company
+from ase_leads.transitions import backfill_transitions
+
+
+class Command(BaseCommand):
+    help = 'Seed the ASE lead status ledger for leads created before it existed (or without a creation entry)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company',
+            type=str,
+            default=None,
+            help='Company code to backfill (defaults to all companies)',
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(code=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Company '{options['company']}' not found")
+
+        scope = company.code if company else 'all companies'
+        self.stdout.write(f'Backfilling ASE status transitions for {scope}...')
+
+        written = backfill_transitions(company=company)
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {written} transition row(s).'))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ase_leads', '0023_update_lead_status_choices'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='breresearchdata',
+            index=models.Index(fields=['company', 'status', 'id'], name='bre_company_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breresearchdata',
+            index=models.Index(fields=['company', 'assigned_to', 'status'], name='bre_company_assignee_st_idx'),
+        ),
+    ]
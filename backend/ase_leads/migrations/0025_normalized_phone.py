@@ -0,0 +1,51 @@
+"""
+Adds normalized_phone (digits-only phone used for duplicate detection) with a
+(company, normalized_phone) index, and fills it in for existing rows.
+"""
+from django.db import migrations, models
+
+from utils.phones import backfill_normalized_phones
+
+
+def populate_normalized_phone(apps, schema_editor):
+    backfill_normalized_phones(apps.get_model('ase_leads', 'ASELead'), 'phone')
+    backfill_normalized_phones(apps.get_model('ase_leads', 'BOELead'), 'phone_number')
+    backfill_normalized_phones(apps.get_model('ase_leads', 'BREResearchData'), 'phone_number')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ase_leads', '0024_bre_distribution_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aselead',
+            name='normalized_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Digits-only phone used for duplicate detection', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='boelead',
+            name='normalized_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Digits-only phone used for duplicate detection', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='breresearchdata',
+            name='normalized_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Digits-only phone used for duplicate detection', max_length=20),
+        ),
+        migrations.RunPython(populate_normalized_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='aselead',
+            index=models.Index(fields=['company', 'normalized_phone'], name='aselead_company_norm_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boelead',
+            index=models.Index(fields=['company', 'normalized_phone'], name='boe_company_norm_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breresearchdata',
+            index=models.Index(fields=['company', 'normalized_phone'], name='bre_company_norm_phone_idx'),
+        ),
+    ]
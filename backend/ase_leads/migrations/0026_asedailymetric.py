@@ -0,0 +1,36 @@
+"""
+Adds ASEDailyMetric, the per-user daily rollup of ASE pipeline metrics.
+Existing data is rolled up with ``manage.py backfill_ase_rollups``.
+"""
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_revert_marketing_roles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ase_leads', '0025_normalized_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ASEDailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('metric', models.CharField(choices=[('calls', 'Calls'), ('emails', 'Emails'), ('meetings', 'Meetings'), ('researched', 'Researched'), ('qualified', 'Qualified'), ('disqualified', 'Disqualified'), ('scored', 'Scored Leads'), ('lead_score_total', 'Lead Score Total'), ('contacted', 'Contacted'), ('responded', 'Responded'), ('response_hours_total', 'Response Hours Total'), ('proposals', 'Proposals'), ('won', 'Won'), ('valued_won', 'Won With Value'), ('lost', 'Lost'), ('revenue', 'Revenue')], max_length=30)),
+                ('value', models.DecimalField(decimal_places=2, default=0, help_text='Count, or a sum for revenue / *_total metrics', max_digits=16)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ase_daily_metrics', to='accounts.company')),
+                ('user', models.ForeignKey(help_text='User the metric is credited to', on_delete=django.db.models.deletion.CASCADE, related_name='ase_daily_metrics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'ASE Daily Metric',
+                'verbose_name_plural': 'ASE Daily Metrics',
+                'indexes': [models.Index(fields=['company', 'metric', 'day'], name='ase_daily_metric_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'user', 'day', 'metric'), name='ase_daily_metric_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+"""
+Adds ASELeadStatusTransition, the append-only ledger of lead status changes.
+Existing leads are seeded with ``manage.py backfill_ase_transitions``.
+"""
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_revert_marketing_roles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ase_leads', '0026_asedailymetric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ASELeadStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, help_text='Empty for the creation entry', max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ase_status_transitions', to='accounts.company')),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='ase_leads.aselead')),
+                ('user', models.ForeignKey(blank=True, help_text='User who made the change, when known', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ase_status_transitions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'ASE Lead Status Transition',
+                'verbose_name_plural': 'ASE Lead Status Transitions',
+                'ordering': ['at', 'id'],
+                'indexes': [models.Index(fields=['company', 'at'], name='ase_transition_period_idx'), models.Index(fields=['company', 'to_status', 'at'], name='ase_transition_stage_idx'), models.Index(fields=['lead', 'at'], name='ase_transition_lead_idx')],
+            },
+        ),
+    ]
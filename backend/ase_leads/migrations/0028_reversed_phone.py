@@ -0,0 +1,52 @@
+"""
+Adds reversed_phone (normalized_phone reversed, for indexed last-digits
+search) with a (company, reversed_phone) index, and fills it in for existing
+rows.
+"""
+from django.db import migrations, models
+
+from utils.phones import backfill_reversed_phones
+
+
+def populate_reversed_phone(apps, schema_editor):
+    backfill_reversed_phones(apps.get_model('ase_leads', 'ASELead'))
+    backfill_reversed_phones(apps.get_model('ase_leads', 'BOELead'))
+    backfill_reversed_phones(apps.get_model('ase_leads', 'BREResearchData'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ase_leads', '0027_aseleadstatustransition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aselead',
+            name='reversed_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='normalized_phone reversed, for indexed last-digits search', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='boelead',
+            name='reversed_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='normalized_phone reversed, for indexed last-digits search', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='breresearchdata',
+            name='reversed_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='normalized_phone reversed, for indexed last-digits search', max_length=20),
+        ),
+        migrations.RunPython(populate_reversed_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='aselead',
+            index=models.Index(fields=['company', 'reversed_phone'], name='aselead_company_rev_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boelead',
+            index=models.Index(fields=['company', 'reversed_phone'], name='boe_company_rev_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breresearchdata',
+            index=models.Index(fields=['company', 'reversed_phone'], name='bre_company_rev_phone_idx'),
+        ),
+    ]
@@ -6,5 +6,8 @@ from .activity import ASELeadActivity
 from .task import ASELeadTask
 from .bre_data import BREResearchData
 from .boe_lead import BOELead
+from .rollup import ASEDailyMetric
+from .transition import ASELeadStatusTransition
 
-__all__ = ['ASELead', 'ASELeadActivity', 'ASELeadTask', 'BREResearchData', 'BOELead']
+__all__ = ['ASELead', 'ASELeadActivity', 'ASELeadTask', 'BREResearchData', 'BOELead', 'ASEDailyMetric',
+           'ASELeadStatusTransition']
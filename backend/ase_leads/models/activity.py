@@ -5,6 +5,8 @@ Tracks all activities and interactions with ASE leads
 from django.db import models
 from django.conf import settings
 
+from accounts.directory import user_directory
+
 
 class ASELeadActivity(models.Model):
     """
@@ -147,9 +149,7 @@ class ASELeadActivity(models.Model):
     @property
     def user_name(self):
         """Return the full name of the user who performed this activity"""
-        if self.user:
-            return f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username
-        return None
+        return user_directory.name(self.user_id)
     
     @property
     def is_overdue_followup(self):
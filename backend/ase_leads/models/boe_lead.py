@@ -7,13 +7,18 @@ When BOE marks data as "Interested", it gets copied here as a lead.
 from django.db import models
 from django.conf import settings
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
 
-class BOELead(models.Model):
+
+class BOELead(NormalizedPhoneModel):
     """
     Leads created by BOE employees from research data.
     Separate table from BREResearchData for better performance.
     """
 
+    phone_field = 'phone_number'
+
     name = models.CharField(max_length=255)
     phone_number = models.CharField(max_length=20)
     location = models.CharField(max_length=255, blank=True, default='')
@@ -76,18 +81,18 @@ class BOELead(models.Model):
         ordering = ['-created_at']
         verbose_name = 'BOE Lead'
         verbose_name_plural = 'BOE Leads'
+        indexes = [
+            models.Index(fields=['company', 'normalized_phone'], name='boe_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='boe_company_rev_phone_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.phone_number}"
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
     @property
     def assigned_to_cre_name(self):
-        if self.assigned_to_cre:
-            return f"{self.assigned_to_cre.first_name} {self.assigned_to_cre.last_name}".strip() or self.assigned_to_cre.username
-        return None
+        return user_directory.name(self.assigned_to_cre_id)
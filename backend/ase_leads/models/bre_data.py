@@ -7,13 +7,18 @@ Fields: name, phone_number, location, notes, created_by, assigned_to
 from django.db import models
 from django.conf import settings
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
 
-class BREResearchData(models.Model):
+
+class BREResearchData(NormalizedPhoneModel):
     """
     Research data uploaded by BRE employees.
     Separate from the main ASELead table.
     """
 
+    phone_field = 'phone_number'
+
     name = models.CharField(
         max_length=255,
         help_text="Contact person name"
@@ -118,6 +123,11 @@ class BREResearchData(models.Model):
             models.Index(fields=['company', 'created_by']),
             models.Index(fields=['company', 'assigned_to']),
             models.Index(fields=['phone_number']),
+            models.Index(fields=['company', 'normalized_phone'], name='bre_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='bre_company_rev_phone_idx'),
+            # Auto-assign: unassigned records in id order, open counts per BOE user
+            models.Index(fields=['company', 'status', 'id'], name='bre_company_status_id_idx'),
+            models.Index(fields=['company', 'assigned_to', 'status'], name='bre_company_assignee_st_idx'),
         ]
 
     def __str__(self):
@@ -125,12 +135,8 @@ class BREResearchData(models.Model):
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
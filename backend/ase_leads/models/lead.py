@@ -2,8 +2,11 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
 
-class ASELead(models.Model):
+
+class ASELead(NormalizedPhoneModel):
     """
     ASE Technologies Digital Marketing Lead Model
     Contains all the digital marketing specific fields that were previously in ASECustomer
@@ -244,6 +247,8 @@ class ASELead(models.Model):
             models.Index(fields=['priority']),
             models.Index(fields=['company', 'status']),
             models.Index(fields=['company', 'created_at']),
+            models.Index(fields=['company', 'normalized_phone'], name='aselead_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='aselead_company_rev_phone_idx'),
         ]
     
     def __str__(self):
@@ -251,13 +256,11 @@ class ASELead(models.Model):
     
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
     
     @property
     def created_by_name(self):
-        return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
+        return user_directory.name(self.created_by_id)
     
     @property
     def service_interests_display(self):
@@ -0,0 +1,78 @@
+"""
+ASE Daily Metric Model
+Per-user daily rollups of pipeline metrics for analytics
+"""
+from django.db import models
+from django.conf import settings
+
+
+class ASEDailyMetric(models.Model):
+    """
+    One counter per (company, user, day, metric)
+
+    Maintained incrementally by ase_leads.rollups (lead/activity signals)
+    and rebuildable with ``manage.py backfill_ase_rollups``. Analytics sum
+    these rows instead of scanning ASELead / ASELeadActivity.
+
+    The day is the local (TIME_ZONE) date of the event, matching the
+    ``__date`` lookups used elsewhere.
+    """
+
+    METRIC_CHOICES = [
+        # Activities (ASELeadActivity.user, created_at)
+        ('calls', 'Calls'),
+        ('emails', 'Emails'),
+        ('meetings', 'Meetings'),
+        # BRE research (researched_by, research_completed_at)
+        ('researched', 'Researched'),
+        ('qualified', 'Qualified'),
+        ('disqualified', 'Disqualified'),
+        ('scored', 'Scored Leads'),
+        ('lead_score_total', 'Lead Score Total'),
+        # BOE outreach (contacted_by, first_contact_at)
+        ('contacted', 'Contacted'),
+        ('responded', 'Responded'),
+        ('response_hours_total', 'Response Hours Total'),
+        # CRE (managed_by, proposal_sent_at / deal_closed_at)
+        ('proposals', 'Proposals'),
+        ('won', 'Won'),
+        ('valued_won', 'Won With Value'),
+        ('lost', 'Lost'),
+        ('revenue', 'Revenue'),
+    ]
+
+    company = models.ForeignKey(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        related_name='ase_daily_metrics',
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ase_daily_metrics',
+        help_text="User the metric is credited to"
+    )
+    day = models.DateField()
+    metric = models.CharField(max_length=30, choices=METRIC_CHOICES)
+    value = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=0,
+        help_text="Count, or a sum for revenue / *_total metrics"
+    )
+
+    class Meta:
+        verbose_name = 'ASE Daily Metric'
+        verbose_name_plural = 'ASE Daily Metrics'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'user', 'day', 'metric'],
+                name='ase_daily_metric_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'metric', 'day'], name='ase_daily_metric_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.metric} user={self.user_id}: {self.value}"
@@ -5,6 +5,8 @@ Manages tasks and follow-ups for ASE leads
 from django.db import models
 from django.conf import settings
 
+from accounts.directory import user_directory
+
 
 class ASELeadTask(models.Model):
     """
@@ -160,30 +162,22 @@ class ASELeadTask(models.Model):
     @property
     def assigned_to_name(self):
         """Return the full name of the user assigned to this task"""
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
     
     @property
     def created_by_name(self):
         """Return the full name of the user who created this task"""
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
     @property
     def assigned_by_name(self):
         """Return the full name of the user who assigned this lead (BOE)"""
-        if self.assigned_by:
-            return f"{self.assigned_by.first_name} {self.assigned_by.last_name}".strip() or self.assigned_by.username
-        return None
+        return user_directory.name(self.assigned_by_id)
 
     @property
     def closed_by_name(self):
         """Return the full name of the user who closed this task (CRE)"""
-        if self.closed_by:
-            return f"{self.closed_by.first_name} {self.closed_by.last_name}".strip() or self.closed_by.username
-        return None
+        return user_directory.name(self.closed_by_id)
     
     @property
     def is_overdue(self):
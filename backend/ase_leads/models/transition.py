@@ -0,0 +1,54 @@
+"""
+ASE Lead Status Transition Model
+Append-only ledger of lead status changes for funnel analytics
+"""
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class ASELeadStatusTransition(models.Model):
+    """
+    One row per status change of an ASELead, never updated or deleted
+    (except with the lead itself).
+
+    Written by the lead signals for every save that changes the status
+    (BRE/BOE/CRE actions, the lead API) and by bulk ``.update()`` callers
+    through ase_leads.transitions. The creation entry has an empty
+    from_status.
+    """
+
+    lead = models.ForeignKey(
+        'ase_leads.ASELead',
+        on_delete=models.CASCADE,
+        related_name='status_transitions',
+    )
+    company = models.ForeignKey(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        related_name='ase_status_transitions',
+    )
+    from_status = models.CharField(max_length=20, blank=True, help_text="Empty for the creation entry")
+    to_status = models.CharField(max_length=20)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ase_status_transitions',
+        help_text="User who made the change, when known"
+    )
+    at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'ASE Lead Status Transition'
+        verbose_name_plural = 'ASE Lead Status Transitions'
+        ordering = ['at', 'id']
+        indexes = [
+            models.Index(fields=['company', 'at'], name='ase_transition_period_idx'),
+            models.Index(fields=['company', 'to_status', 'at'], name='ase_transition_stage_idx'),
+            models.Index(fields=['lead', 'at'], name='ase_transition_lead_idx'),
+        ]
+
+    def __str__(self):
+        return f"Lead {self.lead_id}: {self.from_status or '-'} → {self.to_status} @ {self.at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,309 @@
+"""
+Daily rollups of ASE pipeline metrics (ASEDailyMetric).
+
+Every lead-based metric belongs to a *family* that credits one user on one
+day, e.g. the research family credits ``researched_by`` on the local date of
+``research_completed_at``. When a lead changes, only the (company, user, day)
+cells of the families it touches are recomputed, with one grouped query per
+family. Activity metrics (calls, emails, meetings) are plain counters,
+incremented / decremented as activities are created or deleted.
+
+Writes are hooked up in ase_leads.signals; bulk ``.update()`` paths call
+refresh_lead_rollups() themselves. ``manage.py backfill_ase_rollups``
+rebuilds everything from source rows.
+
+Reading:
+
+    totals = metric_totals(company, period_start, ['calls', 'contacted'], user=user)
+    best = top_user(company, period_start, 'won')
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ase_leads.aggregation import aggregate_metrics, metric_expressions
+from ase_leads.models import ASELead, ASEDailyMetric
+from ase_leads.models.activity import ASELeadActivity
+
+
+@dataclass(frozen=True)
+class LeadFamily:
+    """Metrics credited to ``user_field`` on the date of ``date_field``."""
+    user_field: str
+    date_field: str
+    metrics: dict
+    # Other lead fields the metric values depend on
+    depends_on: tuple = field(default=())
+
+    @property
+    def fields(self):
+        return ('company_id', f'{self.user_field}_id', self.date_field) + self.depends_on
+
+    def key(self, values):
+        """(company_id, user_id, day) for a lead's field values, or None."""
+        user_id = values.get(f'{self.user_field}_id')
+        moment = values.get(self.date_field)
+        if not user_id or not moment:
+            return None
+        return (values['company_id'], user_id, timezone.localdate(moment))
+
+
+LEAD_FAMILIES = [
+    LeadFamily(
+        user_field='researched_by',
+        date_field='research_completed_at',
+        depends_on=('status', 'disqualification_reason', 'lead_score'),
+        metrics={
+            'researched': Count('pk'),
+            'qualified': Q(status='qualified'),
+            'disqualified': Q(disqualification_reason__isnull=False),
+            'scored': Q(lead_score__gt=0),
+            'lead_score_total': Sum('lead_score', filter=Q(lead_score__gt=0)),
+        },
+    ),
+    LeadFamily(
+        user_field='contacted_by',
+        date_field='first_contact_at',
+        depends_on=('response_time_hours',),
+        metrics={
+            'contacted': Count('pk'),
+            'responded': Q(response_time_hours__isnull=False),
+            'response_hours_total': Sum('response_time_hours'),
+        },
+    ),
+    LeadFamily(
+        user_field='managed_by',
+        date_field='proposal_sent_at',
+        metrics={
+            'proposals': Count('pk'),
+        },
+    ),
+    LeadFamily(
+        user_field='managed_by',
+        date_field='deal_closed_at',
+        depends_on=('status', 'estimated_project_value'),
+        metrics={
+            'won': Q(status='won'),
+            'valued_won': Q(status='won', estimated_project_value__isnull=False),
+            'lost': Q(status='lost'),
+            'revenue': Sum('estimated_project_value', filter=Q(status='won')),
+        },
+    ),
+]
+
+# Every lead field any family reads
+LEAD_FIELDS = tuple(dict.fromkeys(f for family in LEAD_FAMILIES for f in family.fields))
+
+ACTIVITY_METRICS = {
+    'call': 'calls',
+    'email': 'emails',
+    'meeting': 'meetings',
+}
+
+# Metrics stored as sums rather than counts
+SUM_METRICS = {'lead_score_total', 'response_hours_total', 'revenue'}
+
+
+def _metric_rows(family, queryset):
+    """Grouped (company_id, user_id, day) -> {metric: value} over ``queryset``."""
+    user_attr = f'{family.user_field}_id'
+    rows = (
+        queryset
+        .filter(**{f'{family.user_field}__isnull': False, f'{family.date_field}__isnull': False})
+        .annotate(rollup_day=TruncDate(family.date_field))
+        .order_by()
+        .values('company_id', user_attr, 'rollup_day')
+        .annotate(**metric_expressions(family.metrics))
+    )
+    return {
+        (row['company_id'], row[user_attr], row['rollup_day']): {name: row[name] for name in family.metrics}
+        for row in rows
+    }
+
+
+def _metric_objs(cells):
+    return [
+        ASEDailyMetric(company_id=company_id, user_id=user_id, day=day, metric=metric, value=value or 0)
+        for (company_id, user_id, day), values in cells.items()
+        for metric, value in values.items()
+    ]
+
+
+def _write(cells):
+    """Upsert ``{(company_id, user_id, day): {metric: value}}``."""
+    objs = _metric_objs(cells)
+    if connection.features.supports_update_conflicts_with_target:
+        ASEDailyMetric.objects.bulk_create(
+            objs,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['company', 'user', 'day', 'metric'],
+            update_fields=['value'],
+        )
+        return
+    # MySQL cannot name the conflict target: update each cell, create the missing ones
+    for obj in objs:
+        lookup = {'company_id': obj.company_id, 'user_id': obj.user_id, 'day': obj.day, 'metric': obj.metric}
+        cells = ASEDailyMetric.objects.filter(**lookup)
+        if cells.update(value=obj.value):
+            continue
+        try:
+            with transaction.atomic():
+                obj.save(force_insert=True)
+        except IntegrityError:
+            # Created concurrently
+            cells.update(value=obj.value)
+
+
+def _refresh_family(family, keys):
+    """Recompute the given (company_id, user_id, day) cells of one family."""
+    by_company = defaultdict(list)
+    for key in keys:
+        by_company[key[0]].append(key)
+
+    cells = {}
+    for company_id, company_keys in by_company.items():
+        days = [day for _, _, day in company_keys]
+        queryset = ASELead.objects.filter(
+            company_id=company_id,
+            **{
+                f'{family.user_field}_id__in': {user_id for _, user_id, _ in company_keys},
+                f'{family.date_field}__date__gte': min(days),
+                f'{family.date_field}__date__lte': max(days),
+            }
+        )
+        rows = _metric_rows(family, queryset)
+        zeros = dict.fromkeys(family.metrics, 0)
+        for key in company_keys:
+            cells[key] = rows.get(key, zeros)
+    _write(cells)
+
+
+def refresh_lead_rollups(leads, previous=None):
+    """
+    Recompute the rollup cells touched by ``leads`` (instances or a queryset).
+
+    ``previous`` maps lead id -> its LEAD_FIELDS values before the change, so
+    cells the lead moved out of are corrected too. Families whose inputs did
+    not change are skipped.
+    """
+    if hasattr(leads, 'values'):
+        current = list(leads.values('pk', *LEAD_FIELDS))
+    else:
+        current = [
+            {'pk': lead.pk, **{name: getattr(lead, name) for name in LEAD_FIELDS}}
+            for lead in leads
+        ]
+    previous = previous or {}
+
+    for family in LEAD_FAMILIES:
+        keys = set()
+        for values in current:
+            before = previous.get(values['pk'])
+            if before is not None and all(before[f] == values[f] for f in family.fields):
+                continue
+            keys.update(k for k in (family.key(values), before and family.key(before)) if k)
+        if keys:
+            _refresh_family(family, keys)
+
+
+def record_activity(activity, delta=1):
+    """Add ``delta`` to the activity's calls/emails/meetings counter."""
+    metric = ACTIVITY_METRICS.get(activity.activity_type)
+    if metric is None or not activity.created_at:
+        return
+    lookup = {
+        'company_id': activity.lead.company_id,
+        'user_id': activity.user_id,
+        'day': timezone.localdate(activity.created_at),
+        'metric': metric,
+    }
+    cells = ASEDailyMetric.objects.filter(**lookup)
+    if cells.update(value=F('value') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ASEDailyMetric.objects.create(value=max(delta, 0), **lookup)
+    except IntegrityError:
+        # Created concurrently
+        cells.update(value=F('value') + delta)
+
+
+def rebuild_rollups(company=None, since=None):
+    """
+    Recompute all rollup rows (optionally for one company / from ``since``).
+    Returns the number of rows written.
+    """
+    leads = ASELead.objects.all()
+    activities = ASELeadActivity.objects.filter(activity_type__in=ACTIVITY_METRICS)
+    existing = ASEDailyMetric.objects.all()
+    if company is not None:
+        leads = leads.filter(company=company)
+        activities = activities.filter(lead__company=company)
+        existing = existing.filter(company=company)
+    if since is not None:
+        activities = activities.filter(created_at__date__gte=since)
+        existing = existing.filter(day__gte=since)
+
+    cells = defaultdict(dict)
+    for family in LEAD_FAMILIES:
+        family_leads = leads
+        if since is not None:
+            family_leads = leads.filter(**{f'{family.date_field}__date__gte': since})
+        for key, values in _metric_rows(family, family_leads).items():
+            cells[key].update(values)
+
+    activity_rows = (
+        activities
+        .annotate(rollup_day=TruncDate('created_at'))
+        .order_by()
+        .values('lead__company_id', 'user_id', 'rollup_day', 'activity_type')
+        .annotate(n=Count('pk'))
+    )
+    for row in activity_rows:
+        key = (row['lead__company_id'], row['user_id'], row['rollup_day'])
+        cells[key][ACTIVITY_METRICS[row['activity_type']]] = row['n']
+
+    with transaction.atomic():
+        existing.delete()
+        ASEDailyMetric.objects.bulk_create(_metric_objs(cells), batch_size=1000)
+    return sum(len(values) for values in cells.values())
+
+
+# ── Reading ─────────────────────────────────────────────────────────────────
+
+def _value(metric, total):
+    if metric in SUM_METRICS:
+        return total or Decimal('0')
+    return int(total or 0)
+
+
+def metric_totals(company, since, metrics, user=None):
+    """``{metric: total}`` from ``since`` (inclusive) to today, in one query."""
+    rows = ASEDailyMetric.objects.filter(company=company, day__gte=since)
+    if user is not None:
+        rows = rows.filter(user=user)
+    totals = aggregate_metrics(rows, {
+        metric: Sum('value', filter=Q(metric=metric)) for metric in metrics
+    })
+    return {metric: _value(metric, totals[metric]) for metric in metrics}
+
+
+def top_user(company, since, metric):
+    """
+    The user with the highest ``metric`` total since ``since``, as a dict of
+    user__username / user__first_name / user__last_name, or None.
+    """
+    return (
+        ASEDailyMetric.objects
+        .filter(company=company, day__gte=since, metric=metric, value__gt=0)
+        .values('user__username', 'user__first_name', 'user__last_name')
+        .annotate(total=Sum('value'))
+        .order_by('-total')
+        .first()
+    )
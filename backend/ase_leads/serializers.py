@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.utils import timezone
+from accounts.directory import user_directory
+from utils.phones import normalize_phone
 from .models import ASELead
 from .models.activity import ASELeadActivity
 from .models.task import ASELeadTask
@@ -152,7 +154,8 @@ class ASELeadSerializer(serializers.ModelSerializer):
         """
         Return the number of days the lead has been in its current status.
 
-        Uses the most relevant workflow timestamp for the current status:
+        Uses the time the lead entered its status per the transition ledger
+        when available, otherwise the most relevant workflow timestamp:
           - new          → created_at
           - qualified    → research_completed_at  (falls back to created_at)
           - contacted    → first_contact_at        (falls back to updated_at)
@@ -163,24 +166,27 @@ class ASELeadSerializer(serializers.ModelSerializer):
           - on_hold      → updated_at
         """
         status = obj.status
-        reference_dt = None
-
-        if status == 'new':
-            reference_dt = obj.created_at
-        elif status == 'qualified':
-            reference_dt = obj.research_completed_at or obj.created_at
-        elif status == 'contacted':
-            reference_dt = obj.first_contact_at or obj.updated_at
-        elif status == 'nurturing':
-            reference_dt = obj.last_engagement_date or obj.updated_at
-        elif status == 'proposal_sent':
-            reference_dt = obj.proposal_sent_at or obj.updated_at
-        elif status == 'negotiating':
-            reference_dt = obj.proposal_sent_at or obj.updated_at
-        elif status in ('won', 'lost'):
-            reference_dt = obj.deal_closed_at or obj.updated_at
-        else:
-            reference_dt = obj.updated_at
+        # When the list was annotated from the status ledger
+        # (ase_leads.transitions.with_status_changed_at)
+        reference_dt = getattr(obj, 'status_changed_at', None)
+
+        if reference_dt is None:
+            if status == 'new':
+                reference_dt = obj.created_at
+            elif status == 'qualified':
+                reference_dt = obj.research_completed_at or obj.created_at
+            elif status == 'contacted':
+                reference_dt = obj.first_contact_at or obj.updated_at
+            elif status == 'nurturing':
+                reference_dt = obj.last_engagement_date or obj.updated_at
+            elif status == 'proposal_sent':
+                reference_dt = obj.proposal_sent_at or obj.updated_at
+            elif status == 'negotiating':
+                reference_dt = obj.proposal_sent_at or obj.updated_at
+            elif status in ('won', 'lost'):
+                reference_dt = obj.deal_closed_at or obj.updated_at
+            else:
+                reference_dt = obj.updated_at
 
         if reference_dt is None:
             return None
@@ -279,21 +285,15 @@ class ASELeadSerializer(serializers.ModelSerializer):
 
     def get_researched_by_name(self, obj):
         """Get the BRE's full name"""
-        if obj.researched_by:
-            return f"{obj.researched_by.first_name} {obj.researched_by.last_name}".strip() or obj.researched_by.username
-        return None
+        return user_directory.name(obj.researched_by_id)
     
     def get_contacted_by_name(self, obj):
         """Get the BOE's full name"""
-        if obj.contacted_by:
-            return f"{obj.contacted_by.first_name} {obj.contacted_by.last_name}".strip() or obj.contacted_by.username
-        return None
+        return user_directory.name(obj.contacted_by_id)
     
     def get_managed_by_name(self, obj):
         """Get the CRE's full name"""
-        if obj.managed_by:
-            return f"{obj.managed_by.first_name} {obj.managed_by.last_name}".strip() or obj.managed_by.username
-        return None
+        return user_directory.name(obj.managed_by_id)
 
     def get_recent_activities(self, obj):
         """
@@ -464,7 +464,7 @@ class ASELeadSerializer(serializers.ModelSerializer):
         if request and hasattr(request.user, 'company'):
             company = request.user.company
         if company and value:
-            qs = ASELead.objects.filter(phone=value, company=company).select_related('assigned_to')
+            qs = ASELead.objects.filter(normalized_phone=normalize_phone(value), company=company).select_related('assigned_to')
             if self.instance:
                 qs = qs.exclude(pk=self.instance.pk)
             if qs.exists():
@@ -611,24 +611,27 @@ class ASELeadListSerializer(serializers.ModelSerializer):
     def get_days_in_current_status(self, obj):
         """Return the number of days the lead has been in its current status."""
         status = obj.status
-        reference_dt = None
-
-        if status == 'new':
-            reference_dt = obj.created_at
-        elif status == 'qualified':
-            reference_dt = obj.research_completed_at or obj.created_at
-        elif status == 'contacted':
-            reference_dt = obj.first_contact_at or obj.updated_at
-        elif status == 'nurturing':
-            reference_dt = obj.last_engagement_date or obj.updated_at
-        elif status == 'proposal_sent':
-            reference_dt = obj.proposal_sent_at or obj.updated_at
-        elif status == 'negotiating':
-            reference_dt = obj.proposal_sent_at or obj.updated_at
-        elif status in ('won', 'lost'):
-            reference_dt = obj.deal_closed_at or obj.updated_at
-        else:
-            reference_dt = obj.updated_at
+        # When the list was annotated from the status ledger
+        # (ase_leads.transitions.with_status_changed_at)
+        reference_dt = getattr(obj, 'status_changed_at', None)
+
+        if reference_dt is None:
+            if status == 'new':
+                reference_dt = obj.created_at
+            elif status == 'qualified':
+                reference_dt = obj.research_completed_at or obj.created_at
+            elif status == 'contacted':
+                reference_dt = obj.first_contact_at or obj.updated_at
+            elif status == 'nurturing':
+                reference_dt = obj.last_engagement_date or obj.updated_at
+            elif status == 'proposal_sent':
+                reference_dt = obj.proposal_sent_at or obj.updated_at
+            elif status == 'negotiating':
+                reference_dt = obj.proposal_sent_at or obj.updated_at
+            elif status in ('won', 'lost'):
+                reference_dt = obj.deal_closed_at or obj.updated_at
+            else:
+                reference_dt = obj.updated_at
 
         if reference_dt is None:
             return None
@@ -693,21 +696,15 @@ class ASELeadListSerializer(serializers.ModelSerializer):
     
     def get_researched_by_name(self, obj):
         """Get the BRE's full name"""
-        if obj.researched_by:
-            return f"{obj.researched_by.first_name} {obj.researched_by.last_name}".strip() or obj.researched_by.username
-        return None
+        return user_directory.name(obj.researched_by_id)
     
     def get_contacted_by_name(self, obj):
         """Get the BOE's full name"""
-        if obj.contacted_by:
-            return f"{obj.contacted_by.first_name} {obj.contacted_by.last_name}".strip() or obj.contacted_by.username
-        return None
+        return user_directory.name(obj.contacted_by_id)
     
     def get_managed_by_name(self, obj):
         """Get the CRE's full name"""
-        if obj.managed_by:
-            return f"{obj.managed_by.first_name} {obj.managed_by.last_name}".strip() or obj.managed_by.username
-        return None
+        return user_directory.name(obj.managed_by_id)
     
     class Meta:
         model = ASELead
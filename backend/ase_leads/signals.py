@@ -0,0 +1,72 @@
+"""
+Signal handlers for ase_leads app.
+
+Keep the ASEDailyMetric rollups (ase_leads.rollups) in step with lead and
+activity writes, and append status changes to the transition ledger
+(ase_leads.transitions).
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ASELead
+from .models.activity import ASELeadActivity
+from .rollups import LEAD_FIELDS, record_activity, refresh_lead_rollups
+from .transitions import record_transition
+
+
+def _touches_rollups(update_fields):
+    if update_fields is None:
+        return True
+    return any(name in LEAD_FIELDS or f'{name}_id' in LEAD_FIELDS for name in update_fields)
+
+
+@receiver(pre_save, sender=ASELead)
+def remember_lead_rollup_fields(sender, instance, update_fields=None, **kwargs):
+    """
+    Capture the rollup inputs as stored, before this save changes them
+    (``status`` is among them, for the ledger too).
+    """
+    instance._rollup_previous = None
+    if instance.pk and _touches_rollups(update_fields):
+        instance._rollup_previous = (
+            ASELead.objects.filter(pk=instance.pk).values('pk', *LEAD_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=ASELead)
+def update_lead_rollups(sender, instance, created, update_fields=None, **kwargs):
+    """Recompute the rollup cells this lead entered or left."""
+    if not created and not _touches_rollups(update_fields):
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    refresh_lead_rollups([instance], previous={instance.pk: previous} if previous else None)
+
+
+@receiver(post_save, sender=ASELead)
+def record_status_transition(sender, instance, created, **kwargs):
+    """Append creation and status changes to the ledger."""
+    user = getattr(instance, '_status_changed_by', None)
+    user_id = user.pk if user else None
+    instance._status_changed_by = None
+    if created:
+        record_transition(instance, '', user_id or instance.created_by_id)
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous and previous['status'] != instance.status:
+        record_transition(instance, previous['status'], user_id)
+
+
+@receiver(post_delete, sender=ASELead)
+def remove_lead_from_rollups(sender, instance, **kwargs):
+    refresh_lead_rollups([instance])
+
+
+@receiver(post_save, sender=ASELeadActivity)
+def count_activity(sender, instance, created, **kwargs):
+    if created:
+        record_activity(instance)
+
+
+@receiver(post_delete, sender=ASELeadActivity)
+def uncount_activity(sender, instance, **kwargs):
+    record_activity(instance, delta=-1)
@@ -0,0 +1,142 @@
+"""
+Unit tests for BRE research auto-assignment.
+
+Tests cover:
+- balanced_targets water-filling over current loads
+- Auto-assign favours BOE users with fewer open records
+- dry_run returns the plan without assigning anything
+- limit handling and the empty-queue error
+- Query count does not grow with the number of records
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.distribution import balanced_targets
+from ase_leads.models.bre_data import BREResearchData
+
+User = get_user_model()
+
+
+class BalancedTargetsTest(TestCase):
+    """Tests for the pure allocation function"""
+
+    def test_equal_loads_split_evenly(self):
+        self.assertEqual(balanced_targets([0, 0, 0], 7), [3, 2, 2])
+
+    def test_least_loaded_users_are_filled_first(self):
+        self.assertEqual(balanced_targets([0, 5, 10], 7), [6, 1, 0])
+
+    def test_total_is_always_preserved(self):
+        for loads, total in [([3, 1, 4, 1, 5], 9), ([10, 0], 3), ([2, 2], 0)]:
+            self.assertEqual(sum(balanced_targets(loads, total)), total)
+
+
+class AutoAssignViewTest(TestCase):
+    """Tests for the bre_research_auto_assign view"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ase-leads-bre-research-auto-assign')
+
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.bre_team = Team.objects.create(
+            name="BRE Team", team_type="marketing", marketing_category="bre", company=self.company,
+        )
+        self.boe_team = Team.objects.create(
+            name="BOE Team", team_type="marketing", marketing_category="boe", company=self.company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user", email="bre@test.com", password="testpass123",
+            role="employee", company=self.company, team=self.bre_team,
+        )
+        self.boe_busy = User.objects.create_user(
+            username="boe_busy", email="busy@test.com", password="testpass123",
+            role="employee", company=self.company, team=self.boe_team,
+        )
+        self.boe_free = User.objects.create_user(
+            username="boe_free", email="free@test.com", password="testpass123",
+            role="employee", company=self.company, team=self.boe_team,
+        )
+        self.client.force_authenticate(user=self.bre_user)
+
+    def _records(self, count, start=0, **kwargs):
+        BREResearchData.objects.bulk_create([
+            BREResearchData(
+                name=f'Lead {i}', phone_number=str(9000000000 + i),
+                company=self.company, created_by=self.bre_user, **kwargs,
+            )
+            for i in range(start, start + count)
+        ])
+
+    def _assigned_to(self, user):
+        return BREResearchData.objects.filter(assigned_to=user, status='assigned').count()
+
+    def test_assignment_balances_open_loads(self):
+        self._records(4, start=100, assigned_to=self.boe_busy, status='assigned')
+        self._records(6)
+
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_assigned'], 6)
+        self.assertEqual(self._assigned_to(self.boe_busy), 5)
+        self.assertEqual(self._assigned_to(self.boe_free), 5)
+        self.assertFalse(BREResearchData.objects.filter(status='new').exists())
+
+    def test_resolved_records_do_not_count_as_load(self):
+        self._records(4, start=100, assigned_to=self.boe_busy, status='assigned', call_status='not_interested')
+        self._records(4)
+
+        self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(BREResearchData.objects.filter(assigned_to=self.boe_busy, call_status='pending').count(), 2)
+        self.assertEqual(self._assigned_to(self.boe_free), 2)
+
+    def test_dry_run_does_not_assign(self):
+        self._records(3)
+
+        response = self.client.post(self.url, {'dry_run': True}, format='json')
+
+        self.assertTrue(response.data['dry_run'])
+        self.assertEqual(response.data['total_assigned'], 3)
+        self.assertEqual(sum(p['assigned'] for p in response.data['planned']), 3)
+        self.assertEqual(BREResearchData.objects.filter(status='new').count(), 3)
+
+    def test_limit_and_selected_users(self):
+        self._records(10)
+
+        response = self.client.post(self.url, {'limit': 4, 'boe_user_ids': [self.boe_free.id]}, format='json')
+
+        self.assertEqual(response.data['total_assigned'], 4)
+        self.assertEqual(self._assigned_to(self.boe_free), 4)
+        self.assertEqual(self._assigned_to(self.boe_busy), 0)
+        # Oldest records are assigned first
+        self.assertEqual(
+            set(BREResearchData.objects.filter(assigned_to=self.boe_free).values_list('name', flat=True)),
+            {'Lead 0', 'Lead 1', 'Lead 2', 'Lead 3'},
+        )
+
+    def test_nothing_to_assign(self):
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_is_independent_of_record_count(self):
+        self._records(5)
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, {}, format='json')
+
+        self._records(200, start=1000)
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(BREResearchData.objects.filter(status='new').count(), 0)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
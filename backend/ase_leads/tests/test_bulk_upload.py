@@ -0,0 +1,222 @@
+"""
+Unit tests for the BRE bulk_upload view and BREResearchImporter engine.
+
+Tests cover:
+- CSV and Excel uploads create BREResearchData rows for the uploader
+- Duplicate report for numbers already in the company and repeated in the file
+- Validation errors (missing name/phone, short phone numbers)
+- Missing header columns and unsupported formats
+- Query count stays bounded per chunk instead of per row
+- Row ceiling handling
+"""
+
+import io
+
+import openpyxl
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.importers import BREResearchImporter
+from ase_leads.models.bre_data import BREResearchData
+
+User = get_user_model()
+
+
+def make_csv(rows):
+    content = '\n'.join(','.join(str(c) for c in row) for row in rows)
+    return SimpleUploadedFile('leads.csv', content.encode('utf-8'), content_type='text/csv')
+
+
+def make_xlsx(rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    output = io.BytesIO()
+    wb.save(output)
+    return SimpleUploadedFile(
+        'leads.xlsx', output.getvalue(),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+class BulkUploadViewTest(TestCase):
+    """Tests for the bulk_upload view function"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.url = reverse('ase-leads-bulk-upload')
+
+        self.ase_company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.bre_team = Team.objects.create(
+            name="BRE Team",
+            team_type="marketing",
+            marketing_category="bre",
+            company=self.ase_company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user",
+            email="bre@test.com",
+            password="testpass123",
+            first_name="Bre",
+            last_name="User",
+            role="employee",
+            company=self.ase_company,
+            team=self.bre_team,
+        )
+        self.other_bre = User.objects.create_user(
+            username="other_bre",
+            email="other@test.com",
+            password="testpass123",
+            first_name="Other",
+            last_name="Researcher",
+            role="employee",
+            company=self.ase_company,
+            team=self.bre_team,
+        )
+        self.client.force_authenticate(user=self.bre_user)
+
+    def test_csv_upload_creates_records(self):
+        upload = make_csv([
+            ['name', 'phone', 'location'],
+            ['John Doe', '9876543210', 'Mumbai'],
+            ['Jane Smith', '+91 87654 32109', 'Delhi'],
+        ])
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['total_rows'], 2)
+        record = BREResearchData.objects.get(phone_number='8765432109')
+        self.assertEqual(record.created_by, self.bre_user)
+        self.assertEqual(record.assigned_to, self.bre_user)
+        self.assertEqual(record.company, self.ase_company)
+
+    def test_xlsx_upload_strips_float_suffix(self):
+        upload = make_xlsx([
+            ['Name', 'Phone Number', 'City'],
+            ['John Doe', 9876543210.0, 'Mumbai'],
+        ])
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(BREResearchData.objects.filter(phone_number='9876543210', location='Mumbai').exists())
+
+    def test_duplicates_are_reported_with_creator(self):
+        BREResearchData.objects.create(
+            name='Existing', phone_number='9876543210', company=self.ase_company,
+            created_by=self.other_bre, assigned_to=self.other_bre,
+        )
+        upload = make_csv([
+            ['name', 'phone'],
+            ['John Doe', '9876543210'],
+            ['Jane Smith', '8765432109'],
+            ['Jane Again', '8765432109'],
+        ])
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['duplicates'], 2)
+        self.assertEqual(response.data['errors'], [
+            'Row 2: Phone 9876543210 already created by "Other Researcher"',
+            'Row 4: Phone 8765432109 already created by "Bre User"',
+        ])
+
+    def test_invalid_rows_are_reported(self):
+        upload = make_csv([
+            ['name', 'phone'],
+            ['', '9876543210'],
+            ['Short', '12345'],
+            ['', ''],
+            ['Valid', '9876543210'],
+        ])
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [
+            'Row 2: Missing name or phone',
+            'Row 3: Invalid phone number "12345"',
+        ])
+
+    def test_missing_phone_column(self):
+        upload = make_csv([['name', 'location'], ['John', 'Mumbai']])
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('phone', response.data['error'])
+
+    def test_unsupported_format(self):
+        upload = SimpleUploadedFile('leads.txt', b'name,phone\n', content_type='text/plain')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Unsupported file format', response.data['error'])
+
+
+class BREResearchImporterTest(TestCase):
+    """Tests for the chunked import engine itself"""
+
+    def setUp(self):
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.user = User.objects.create_user(
+            username="bre_user",
+            email="bre@test.com",
+            password="testpass123",
+            role="employee",
+            company=self.company,
+        )
+
+    def _rows(self, count, start=9000000000):
+        return [[f'Lead {i}', str(start + i), 'Hyderabad'] for i in range(count)]
+
+    def test_queries_scale_with_chunks_not_rows(self):
+        importer = BREResearchImporter(user=self.user, company=self.company, batch_size=100)
+        importer.map_columns(['name', 'phone', 'location'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = importer.run(self._rows(500))
+
+        self.assertEqual(result['created'], 500)
+        self.assertEqual(BREResearchData.objects.filter(company=self.company).count(), 500)
+        # A duplicate lookup, a savepoint and the insert batch(es) per chunk --
+        # independent of how many rows each chunk holds.
+        self.assertLessEqual(len(ctx.captured_queries), 5 * 6)
+
+    def test_duplicates_across_chunks(self):
+        importer = BREResearchImporter(user=self.user, company=self.company, batch_size=2)
+        importer.map_columns(['name', 'phone'])
+        rows = [['A', '9000000001'], ['B', '9000000002'], ['C', '9000000001']]
+
+        result = importer.run(rows)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['duplicates'], 1)
+
+    def test_row_ceiling(self):
+        importer = BREResearchImporter(user=self.user, company=self.company, batch_size=2, max_rows=3)
+        importer.map_columns(['name', 'phone'])
+
+        result = importer.run(self._rows(6))
+
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(result['total_rows'], 3)
+        self.assertIn('Row limit of 3 reached', result['errors'][-1])
+
+    def test_error_messages_are_capped(self):
+        importer = BREResearchImporter(user=self.user, company=self.company)
+        importer.map_columns(['name', 'phone'])
+
+        result = importer.run([['Bad', '1'] for _ in range(50)])
+
+        self.assertEqual(len(result['errors']), BREResearchImporter.max_errors)
+        self.assertEqual(result['error_count'], 50)
@@ -0,0 +1,130 @@
+"""
+Unit tests for generation-versioned dashboard/analytics caching.
+
+Tests cover:
+- Bumping a company's generation changes its keys (and cross-company keys)
+- Bumps only take effect once the transaction commits
+- A committed lead write invalidates the cached dashboard immediately
+- Writes in another company leave the cached dashboard alone
+- The bulk_create import and .update() assignment paths bump the company
+- Only caches shared between processes count as shared
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.models import ASELead
+from customers.models import Customer
+from utils.cache_versions import bump_company, bump_user, cache_is_shared, versioned_key
+
+User = get_user_model()
+
+
+class VersionedKeyTest(TestCase):
+    """Tests for utils.cache_versions"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_company_and_cross_company_keys(self):
+        company_key = versioned_key('stats', company=1)
+        global_key = versioned_key('overview', all_companies=True)
+        other_key = versioned_key('stats', company=2)
+        self.assertEqual(versioned_key('stats', company=1), company_key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_company(1)
+
+        self.assertNotEqual(versioned_key('stats', company=1), company_key)
+        self.assertNotEqual(versioned_key('overview', all_companies=True), global_key)
+        self.assertEqual(versioned_key('stats', company=2), other_key)
+
+    def test_bump_waits_for_commit(self):
+        user_key = versioned_key('mine', user=7)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            bump_user(7)
+            self.assertEqual(versioned_key('mine', user=7), user_key)
+        callbacks[0]()
+        self.assertNotEqual(versioned_key('mine', user=7), user_key)
+
+    def test_only_cross_process_backends_are_shared(self):
+        self.assertFalse(cache_is_shared())
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with override_settings(CACHES=redis):
+            self.assertTrue(cache_is_shared())
+
+
+class DashboardCacheInvalidationTest(TestCase):
+    """Dashboard stats stay cached until a relevant write commits"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('ase-leads-dashboard-stats')
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.other_company = Company.objects.create(name="Other Corp", code="OTHER_CV")
+        team = Team.objects.create(
+            name="BRE Team", team_type="marketing", marketing_category="bre", company=self.company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user", email="bre@test.com", password="testpass123",
+            role="employee", company=self.company, team=team,
+        )
+        self.other_user = User.objects.create_user(
+            username="other_user", email="other@test.com", password="testpass123",
+            role="employee", company=self.other_company,
+        )
+        self.client.force_authenticate(user=self.bre_user)
+
+    def _create_lead(self, company, phone):
+        with self.captureOnCommitCallbacks(execute=True):
+            ASELead.objects.create(
+                company_name="Queued Co", contact_person="Ravi", phone=phone,
+                industry="technology", status="new", company=company,
+                created_by=self.bre_user if company == self.company else self.other_user,
+            )
+
+    def test_committed_write_invalidates_dashboard(self):
+        self.assertEqual(self.client.get(self.url).data['research_queue']['total'], 0)
+
+        self._create_lead(self.company, '9000000001')
+
+        self.assertEqual(self.client.get(self.url).data['research_queue']['total'], 1)
+
+    def test_other_company_write_keeps_cache(self):
+        self.client.get(self.url)
+        self._create_lead(self.other_company, '9000000002')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['research_queue']['total'], 0)
+
+    def test_bulk_import_invalidates_dashboard(self):
+        self.assertEqual(self.client.get(self.url).data['research_queue']['total'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/ase-leads/bulk_import/', {'leads': [
+                {'company_name': 'Bulk Co', 'phone': '9000000003', 'industry': 'technology'},
+            ]}, format='json')
+        self.assertEqual(response.data['imported'], 1)
+
+        self.assertEqual(self.client.get(self.url).data['research_queue']['total'], 1)
+
+    def test_customer_bulk_assign_bumps_company(self):
+        customer = Customer.objects.create(phone='9000000004', company=self.company, created_by=self.bre_user)
+        key = versioned_key('stats', company=self.company.id)
+        admin = User.objects.create_user(username="cv_admin", password="testpass123", role="admin")
+        self.client.force_authenticate(user=admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/customers/bulk_assign/', {
+                'customer_ids': [customer.id], 'employee_id': self.bre_user.id,
+            }, format='json')
+        self.assertEqual(response.data['updated'], 1)
+
+        self.assertNotEqual(versioned_key('stats', company=self.company.id), key)
@@ -0,0 +1,101 @@
+"""
+Unit tests for coalesced WebSocket change events.
+
+Tests cover:
+- Changes buffered within the window go out as one event per group and entity
+- A lone per-record change keeps its original payload
+- Bulk endpoints send one summary event listing the affected ids
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from ase_leads.models import ASELead
+from eswari_crm.ws_utils import ChangeCoalescer, MAX_RECORD_IDS
+
+User = get_user_model()
+
+
+@patch('eswari_crm.ws_utils._send_to_group', return_value=True)
+class ChangeCoalescerTest(TestCase):
+    """Tests for eswari_crm.ws_utils.ChangeCoalescer"""
+
+    def setUp(self):
+        self.coalescer = ChangeCoalescer(window=60)
+
+    def test_buffered_changes_are_merged(self, send):
+        for record_id in (1, 2, 3):
+            self.coalescer.add('company_1', 'ase_data_changed', {'entity': 'leads', 'action': 'deleted', 'record_id': record_id})
+        self.coalescer.add('company_1', 'ase_data_changed', {'entity': 'leads', 'action': 'created', 'record_id': 4})
+        self.coalescer.add('company_1', 'ase_data_changed', {'entity': 'calls', 'action': 'updated', 'record_id': 9})
+        send.assert_not_called()
+
+        self.coalescer.flush()
+
+        self.assertEqual(send.call_count, 2)
+        events = {call.args[2]['entity']: call.args[2] for call in send.call_args_list}
+        self.assertEqual(events['leads'], {
+            'entity': 'leads',
+            'action': 'batch',
+            'batched': True,
+            'count': 4,
+            'actions': {'deleted': 3, 'created': 1},
+            'record_ids': [1, 2, 3, 4],
+            'truncated': False,
+        })
+        self.assertEqual(events['calls'], {'entity': 'calls', 'action': 'updated', 'record_id': 9})
+
+        self.coalescer.flush()
+        self.assertEqual(send.call_count, 2)
+
+    def test_record_ids_are_capped(self, send):
+        record_ids = list(range(MAX_RECORD_IDS + 10))
+        self.coalescer.add('company_1', 'task_updated', {
+            'entity': 'tasks', 'action': 'bulk_updated', 'record_ids': record_ids, 'count': len(record_ids),
+        })
+        self.coalescer.flush()
+
+        event = send.call_args.args[2]
+        self.assertEqual(event['count'], MAX_RECORD_IDS + 10)
+        self.assertEqual(len(event['record_ids']), MAX_RECORD_IDS)
+        self.assertTrue(event['truncated'])
+
+
+@override_settings(WS_COALESCE_WINDOW=0)
+class BulkChangeEventTest(TestCase):
+    """Bulk endpoints send one summary change event"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.admin = User.objects.create_user(
+            username='ase_admin', password='testpass123', role='admin', company=self.company,
+        )
+        self.leads = [
+            ASELead.objects.create(
+                company_name=f'Co {i}', contact_person='Ravi', phone=f'900000000{i}',
+                industry='technology', status='new', company=self.company, created_by=self.admin,
+            )
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.admin)
+
+    def test_bulk_status_update_sends_one_event(self):
+        lead_ids = [lead.id for lead in self.leads]
+
+        with patch('eswari_crm.ws_utils._send_to_group', return_value=True) as send:
+            response = self.client.post(
+                reverse('bulk-update-ase-lead-status'), {'lead_ids': lead_ids, 'status': 'demo_done'}, format='json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        send.assert_called_once()
+        group, event_type, data = send.call_args.args
+        self.assertEqual((group, event_type), (f'company_{self.company.id}', 'ase_data_changed'))
+        self.assertEqual(sorted(data['record_ids']), sorted(lead_ids))
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['action'], 'bulk_updated')
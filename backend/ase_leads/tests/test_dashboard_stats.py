@@ -8,6 +8,7 @@ Tests cover:
 - Performance metrics
 - Caching functionality
 - Company scoping
+- Constant query count per role
 """
 
 from django.test import TestCase
@@ -25,6 +26,12 @@ from teams.models import Team
 from ase_leads.models import ASELead
 from ase_leads.models.activity import ASELeadActivity
 from ase_leads.models.task import ASELeadTask
+from ase_leads.views.dashboard import (
+    _calculate_boe_stats,
+    _calculate_bre_stats,
+    _calculate_cre_stats,
+    _calculate_marketing_lead_stats,
+)
 
 User = get_user_model()
 
@@ -695,3 +702,21 @@ class DashboardStatsViewTest(TestCase):
         
         # Should have zero win rate (not error)
         self.assertEqual(data['performance']['proposal_win_rate'], 0)
+
+    # ── Query budget ──────────────────────────────────────────────────────────
+
+    def _assert_query_budget(self, calculate, user, budget):
+        with self.assertNumQueries(budget):
+            calculate(user)
+
+    def test_bre_stats_single_query(self):
+        self._assert_query_budget(_calculate_bre_stats, self.bre_user, 1)
+
+    def test_boe_stats_two_queries(self):
+        self._assert_query_budget(_calculate_boe_stats, self.boe_user, 2)
+
+    def test_cre_stats_three_queries(self):
+        self._assert_query_budget(_calculate_cre_stats, self.cre_user, 3)
+
+    def test_marketing_lead_stats_two_queries(self):
+        self._assert_query_budget(_calculate_marketing_lead_stats, self.marketing_lead_user, 2)
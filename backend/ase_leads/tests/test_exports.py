@@ -0,0 +1,110 @@
+"""
+Unit tests for the streaming BOE leads export.
+
+Tests cover:
+- Excel export is streamed and keeps phone numbers as text
+- CSV export and column selection
+- Unknown columns / formats are rejected
+- Query count does not grow with the number of rows
+"""
+
+import csv
+import io
+
+import openpyxl
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.models.boe_lead import BOELead
+
+User = get_user_model()
+
+
+class BOELeadsExportTest(TestCase):
+    """Tests for the boe_leads_export view"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ase-leads-boe-leads-export')
+
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.boe_team = Team.objects.create(
+            name="BOE Team", team_type="marketing", marketing_category="boe", company=self.company,
+        )
+        self.boe_user = User.objects.create_user(
+            username="boe_user", email="boe@test.com", password="testpass123",
+            first_name="Boe", last_name="User",
+            role="employee", company=self.company, team=self.boe_team,
+        )
+        self.client.force_authenticate(user=self.boe_user)
+
+    def _leads(self, count, start=0):
+        BOELead.objects.bulk_create([
+            BOELead(
+                name=f'Lead {i}', phone_number=str(9000000000 + i), location='Hyderabad',
+                created_by=self.boe_user, company=self.company,
+            )
+            for i in range(start, start + count)
+        ])
+
+    def _download(self, **params):
+        response = self.client.get(self.url, params)
+        return response, b''.join(response.streaming_content)
+
+    def test_xlsx_export(self):
+        self._leads(3)
+
+        response, content = self._download()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('boe_leads.xlsx', response['Content-Disposition'])
+        sheet = openpyxl.load_workbook(io.BytesIO(content)).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows[0][:3], ('Name', 'Phone Number', 'Location'))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sheet['B2'].number_format, '@')
+        self.assertIsInstance(rows[1][1], str)
+        self.assertEqual(rows[1][6], 'Boe User')
+
+    def test_csv_export_with_selected_columns(self):
+        self._leads(2)
+
+        response, content = self._download(file_format='csv', columns='phone_number,name')
+
+        self.assertIn('boe_leads.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows[0], ['Phone Number', 'Name'])
+        self.assertEqual(sorted(rows[1:]), [['9000000000', 'Lead 0'], ['9000000001', 'Lead 1']])
+
+    def test_unknown_column_is_rejected(self):
+        response = self.client.get(self.url, {'columns': 'name,salary'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salary', response.data['error'])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(self.url, {'file_format': 'pdf'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_is_independent_of_row_count(self):
+        self._leads(5)
+        # The first export loads the process-wide user directory once
+        self._download(file_format='csv')
+        with CaptureQueriesContext(connection) as small:
+            self._download(file_format='csv')
+
+        self._leads(300, start=100)
+        with CaptureQueriesContext(connection) as large:
+            _, content = self._download(file_format='csv')
+
+        self.assertEqual(content.decode('utf-8-sig').count('\n'), 306)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
@@ -0,0 +1,92 @@
+"""
+Unit tests for keyset (cursor) pagination.
+
+Tests cover:
+- Walking every page returns each row once, including rows sharing a created_at
+- Page-number responses are unchanged without a cursor parameter
+- Cursor pages run no COUNT unless a count is asked for; counts are cached
+- Orderings outside the whitelist and tampered cursors are rejected
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from ase_leads.models import ASELead
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(TestCase):
+    """Tests for utils.pagination through the ASE lead list"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.admin = User.objects.create_user(
+            username='ase_admin', password='testpass123', role='admin', company=self.company,
+        )
+        self.leads = [
+            ASELead.objects.create(
+                company_name=f'Co {i}', contact_person='Ravi', phone=f'90000000{i:02d}',
+                industry='technology', status='new', company=self.company, created_by=self.admin,
+            )
+            for i in range(7)
+        ]
+        # Several rows share a timestamp: the id tie-breaker must keep them apart
+        ASELead.objects.filter(id__in=[lead.id for lead in self.leads[2:6]]).update(created_at=timezone.now())
+        self.url = reverse('ase-leads-list')
+        self.client.force_authenticate(user=self.admin)
+
+    def _walk(self, params):
+        ids, url, params = [], self.url, {'cursor': '', 'page_size': 3, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_cursor_walk_returns_every_row_once(self):
+        expected = list(ASELead.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(self._walk({}), expected)
+
+        expected = list(ASELead.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(self._walk({'ordering': 'created_at'}), expected)
+
+    def test_page_numbers_without_cursor(self):
+        response = self.client.get(self.url, {'page': 2, 'page_size': 3})
+
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIn('page=3', response.data['next'])
+
+    def test_count_only_when_asked_and_cached(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'cursor': '', 'page_size': 3})
+        self.assertIsNone(response.data['count'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+        self.assertEqual(self.client.get(self.url, {'cursor': '', 'count': 'true'}).data['count'], 7)
+        ASELead.objects.filter(id=self.leads[0].id).delete()
+        self.assertEqual(self.client.get(self.url, {'cursor': '', 'count': 'true'}).data['count'], 7)
+        self.assertEqual(
+            self.client.get(self.url, {'cursor': '', 'count': 'true', 'status': 'new'}).data['count'], 6,
+        )
+
+    def test_invalid_requests(self):
+        response = self.client.get(self.url, {'cursor': '', 'ordering': 'company_name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, status.HTTP_404_NOT_FOUND)
+
+        next_url = self.client.get(self.url, {'cursor': '', 'page_size': 3}).data['next']
+        response = self.client.get(f'{next_url}&ordering=created_at')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
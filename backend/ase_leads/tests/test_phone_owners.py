@@ -0,0 +1,218 @@
+"""
+Unit tests for phone normalization and the cross-entity owner lookup.
+
+Tests cover:
+- normalize_phone strips formatting, +91 / 0 prefixes and Excel's .0
+- normalized_phone is kept in sync on save() and set before bulk_create
+- BRE add_lead rejects the same number in a different format
+- find_phone_owners finds a number across tables in one query
+- The phone-owners endpoint is scoped to the user's company
+- phone_search_q matches the first or last digits of a number (not the middle)
+  through reversed_phone, and ?search= uses it alone for digit-only terms
+  (no icontains scan); other terms get the usual search
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Company
+from teams.models import Team
+from ase_customers.models import ASECustomer
+from ase_leads.models.bre_data import BREResearchData
+from ase_leads.models.boe_lead import BOELead
+from utils.phones import find_phone_owners, normalize_phone, phone_search_q, set_normalized_phones
+
+User = get_user_model()
+
+
+class NormalizePhoneTest(TestCase):
+    """Tests for the pure normalizer"""
+
+    def test_formats_of_the_same_number_match(self):
+        for raw in ['9876543210', '+91 98765-43210', '919876543210', '09876543210',
+                    '98765 43210', 9876543210.0, '9876543210.0']:
+            self.assertEqual(normalize_phone(raw), '9876543210', raw)
+
+    def test_empty_values(self):
+        self.assertEqual(normalize_phone(None), '')
+        self.assertEqual(normalize_phone('  '), '')
+        self.assertEqual(normalize_phone('n/a'), '')
+
+    def test_other_lengths_keep_their_digits(self):
+        self.assertEqual(normalize_phone('+1 (415) 555-0100'), '14155550100')
+
+
+class PhoneOwnersTest(TestCase):
+    """Tests for normalized_phone persistence and the owner lookup"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.other_company = Company.objects.create(name="Other Co", code="OTHER_PH")
+        self.team = Team.objects.create(
+            name="BRE Team", team_type="marketing", marketing_category="bre", company=self.company,
+        )
+        self.user = User.objects.create_user(
+            username="bre_user", email="bre@test.com", password="testpass123",
+            first_name="Ravi", last_name="Kumar",
+            role="employee", company=self.company, team=self.team,
+        )
+        self.other_user = User.objects.create_user(
+            username="other_user", email="other@test.com", password="testpass123",
+            role="employee", company=self.other_company,
+        )
+
+    def test_save_keeps_normalized_phone_in_sync(self):
+        record = BREResearchData.objects.create(
+            name="Acme", phone_number="+91 98765 43210", company=self.company, created_by=self.user,
+        )
+        self.assertEqual(record.normalized_phone, '9876543210')
+
+        record.phone_number = '0 91234 56789'
+        record.save(update_fields=['phone_number'])
+        record.refresh_from_db()
+        self.assertEqual(record.normalized_phone, '9123456789')
+        self.assertEqual(record.reversed_phone, '9876543219')
+
+    def test_bulk_create_with_set_normalized_phones(self):
+        BOELead.objects.bulk_create(set_normalized_phones([
+            BOELead(name="A", phone_number="98765-43210", company=self.company, created_by=self.user),
+        ]))
+        self.assertTrue(BOELead.objects.filter(normalized_phone='9876543210').exists())
+
+    def test_add_lead_rejects_same_number_in_another_format(self):
+        BREResearchData.objects.create(
+            name="Acme", phone_number="9876543210", company=self.company, created_by=self.user,
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('ase-leads-add-lead'), {
+            'name': 'Acme again', 'phone': '+91 98765-43210',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Ravi Kumar', response.data['error'])
+
+    def test_find_phone_owners_across_tables_in_one_query(self):
+        BREResearchData.objects.create(
+            name="Acme", phone_number="9876543210", company=self.company, created_by=self.user,
+        )
+        ASECustomer.objects.create(
+            name="Acme Customer", phone="+919876543210", company=self.company,
+            created_by=self.user, assigned_to=self.user,
+        )
+        ASECustomer.objects.create(
+            name="Elsewhere", phone="9876543210", company=self.other_company, created_by=self.other_user,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            owners = find_phone_owners('098765 43210', company=self.company)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.assertEqual(
+            sorted((o['entity'], o['name']) for o in owners),
+            [('ase_customer', 'Acme Customer'), ('bre_research', 'Acme')],
+        )
+        self.assertTrue(all(o['created_by_name'] == 'Ravi Kumar' for o in owners))
+        self.assertEqual(len(find_phone_owners('9876543210')), 3)
+
+    def test_phone_owners_endpoint_is_company_scoped(self):
+        ASECustomer.objects.create(
+            name="Elsewhere", phone="9876543210", company=self.other_company, created_by=self.other_user,
+        )
+        self.client.force_authenticate(user=self.user)
+        url = reverse('phone_owners')
+
+        response = self.client.get(url, {'phone': '+91 98765 43210'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['phone'], '9876543210')
+        self.assertFalse(response.data['exists'])
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(url, {'phone': '9876543210'})
+        self.assertTrue(response.data['exists'])
+        self.assertEqual(response.data['owners'][0]['entity'], 'ase_customer')
+
+    def test_phone_owners_requires_phone(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('phone_owners'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_phone_owners_rejects_bad_company(self):
+        admin = User.objects.create_user(username="owners_admin", password="testpass123", role="admin")
+        self.client.force_authenticate(user=admin)
+        url = reverse('phone_owners')
+
+        response = self.client.get(url, {'phone': '9876543210', 'company': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'phone': '9876543210'})
+        self.assertEqual(response.data['error'], 'Company is required for admin users.')
+
+        self.user.company = None
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url, {'phone': '9876543210'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Your account is not assigned to a company.')
+
+
+class PhoneSearchTest(TestCase):
+    """Tests for the indexed partial-number search"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.admin = User.objects.create_user(
+            username="ase_admin", password="testpass123", role="admin", company=self.company,
+        )
+        for name, phone in [("Acme", "+91 98765 43210"), ("Beta", "9123499999"), ("Gamma", "7000098765")]:
+            ASECustomer.objects.create(name=name, phone=phone, company=self.company, created_by=self.admin)
+
+    def _names(self, search):
+        return sorted(ASECustomer.objects.filter(phone_search_q(search)).values_list('name', flat=True))
+
+    def test_prefix_suffix_and_exact(self):
+        self.assertEqual(self._names('43210'), ['Acme'])
+        self.assertEqual(self._names('98765'), ['Acme', 'Gamma'])
+        self.assertEqual(self._names('+91 98765-43210'), ['Acme'])
+        self.assertEqual(self._names('999'), ['Beta'])
+        self.assertEqual(self._names('91234'), ['Beta'])
+        # Digits from the middle of a number are not matched
+        self.assertEqual(self._names('6543'), [])
+
+    def test_text_is_not_a_phone_search(self):
+        self.assertIsNone(phone_search_q('Acme'))
+        self.assertIsNone(phone_search_q('---'))
+        self.assertIsNone(phone_search_q(''))
+
+    def test_search_param_uses_phone_index(self):
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('ase-customers-list')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'search': '98765'})
+        self.assertEqual(sorted(row['name'] for row in response.data['results']), ['Acme', 'Gamma'])
+        self.assertTrue(any('reversed_phone' in query['sql'] for query in ctx.captured_queries))
+
+        response = self.client.get(url, {'search': 'Gam'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Gamma'])
+
+    def test_digit_search_is_not_combined_with_a_scan(self):
+        ASECustomer.objects.create(
+            name="Delta", phone="8000000000", notes="Invoice 6543 pending",
+            company=self.company, created_by=self.admin,
+        )
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('ase-customers-list')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'search': '6543'})
+        self.assertEqual(response.data['results'], [])
+        self.assertFalse(any('LIKE' in query['sql'] for query in ctx.captured_queries))
+
+        # A term that is not a number still searches the other fields
+        response = self.client.get(url, {'search': 'Invoice 6543'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Delta'])
@@ -0,0 +1,154 @@
+"""
+Unit tests for the ASE daily metric rollups.
+
+Tests cover:
+- Qualifying a lead through the BRE action credits the researcher's day
+- Later status changes move the lead out of the qualified count
+- Activity creation/deletion increments/decrements the counters
+- Cells are upserted without a conflict target on backends lacking one (MySQL)
+- backfill_ase_rollups rebuilds the same rows from source data
+- my-performance reads its figures from the rollups
+"""
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.models import ASELead, ASEDailyMetric
+from ase_leads.models.activity import ASELeadActivity
+from ase_leads.rollups import metric_totals
+
+User = get_user_model()
+
+
+class DailyRollupTest(TestCase):
+    """Tests for ase_leads.rollups and the signals maintaining them"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.today = timezone.localdate()
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.bre_team = Team.objects.create(
+            name="BRE Team", team_type="marketing", marketing_category="bre", company=self.company,
+        )
+        self.boe_team = Team.objects.create(
+            name="BOE Team", team_type="marketing", marketing_category="boe", company=self.company,
+        )
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@test.com", password="testpass123",
+            role="admin", company=self.company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user", email="bre@test.com", password="testpass123",
+            role="employee", company=self.company, team=self.bre_team,
+        )
+        self.boe_user = User.objects.create_user(
+            username="boe_user", email="boe@test.com", password="testpass123",
+            role="employee", company=self.company, team=self.boe_team,
+        )
+        self.lead = ASELead.objects.create(
+            company_name="Rollup Co", contact_person="Ravi", phone="9000000001",
+            industry="technology", status="new", company=self.company, created_by=self.admin,
+        )
+
+    def _cell(self, user, metric):
+        row = ASEDailyMetric.objects.filter(
+            company=self.company, user=user, day=self.today, metric=metric,
+        ).first()
+        return row.value if row else Decimal('0')
+
+    def test_qualify_action_credits_researcher(self):
+        self.client.force_authenticate(user=self.bre_user)
+        response = self.client.post(
+            reverse('ase-leads-qualify', args=[self.lead.pk]), {'lead_score': 70}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._cell(self.bre_user, 'researched'), 1)
+        self.assertEqual(self._cell(self.bre_user, 'qualified'), 1)
+        self.assertEqual(self._cell(self.bre_user, 'lead_score_total'), 70)
+        # The status_change activity is not a call/email/meeting
+        self.assertFalse(ASEDailyMetric.objects.filter(metric__in=['calls', 'emails', 'meetings']).exists())
+
+    def test_status_change_moves_lead_out_of_qualified(self):
+        self.lead.status = 'qualified'
+        self.lead.researched_by = self.bre_user
+        self.lead.research_completed_at = timezone.now()
+        self.lead.save()
+        self.assertEqual(self._cell(self.bre_user, 'qualified'), 1)
+
+        self.lead.status = 'contacted'
+        self.lead.contacted_by = self.boe_user
+        self.lead.first_contact_at = timezone.now()
+        self.lead.save()
+        self.assertEqual(self._cell(self.bre_user, 'qualified'), 0)
+        self.assertEqual(self._cell(self.bre_user, 'researched'), 1)
+        self.assertEqual(self._cell(self.boe_user, 'contacted'), 1)
+
+        self.lead.delete()
+        self.assertEqual(self._cell(self.bre_user, 'researched'), 0)
+
+    def test_activities_increment_and_decrement(self):
+        call = ASELeadActivity.objects.create(
+            lead=self.lead, user=self.boe_user, activity_type='call', title='Call',
+        )
+        ASELeadActivity.objects.create(
+            lead=self.lead, user=self.boe_user, activity_type='call', title='Call again',
+        )
+        self.assertEqual(self._cell(self.boe_user, 'calls'), 2)
+
+        call.delete()
+        self.assertEqual(self._cell(self.boe_user, 'calls'), 1)
+
+    def test_upsert_without_conflict_target(self):
+        features = type(connection.features)
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(features, 'supports_update_conflicts', False):
+            self.test_status_change_moves_lead_out_of_qualified()
+
+    def test_backfill_rebuilds_same_rows(self):
+        self.lead.status = 'won'
+        self.lead.managed_by = self.bre_user
+        self.lead.deal_closed_at = timezone.now()
+        self.lead.estimated_project_value = Decimal('25000.00')
+        self.lead.save()
+        ASELeadActivity.objects.create(
+            lead=self.lead, user=self.boe_user, activity_type='email', title='Email',
+        )
+
+        def snapshot():
+            return set(ASEDailyMetric.objects.filter(value__gt=0).values_list('user_id', 'day', 'metric', 'value'))
+
+        maintained = snapshot()
+        ASEDailyMetric.objects.all().delete()
+        call_command('backfill_ase_rollups', '--company', 'ASE', stdout=StringIO())
+
+        self.assertEqual(snapshot(), maintained)
+        totals = metric_totals(self.company, self.today, ['won', 'revenue', 'emails'])
+        self.assertEqual(totals, {'won': 1, 'revenue': Decimal('25000.00'), 'emails': 1})
+
+    def test_my_performance_reads_rollups(self):
+        ASELeadActivity.objects.create(
+            lead=self.lead, user=self.boe_user, activity_type='call', title='Call',
+        )
+        self.client.force_authenticate(user=self.boe_user)
+        url = reverse('ase-leads-my-performance')
+
+        self.assertEqual(self.client.get(url).data['calls_made'], 1)
+
+        cache.clear()
+        ASEDailyMetric.objects.all().delete()
+        self.assertEqual(self.client.get(url).data['calls_made'], 0)
@@ -0,0 +1,180 @@
+"""
+Unit tests for the ASE lead status transition ledger.
+
+Tests cover:
+- Creating a lead records the creation entry
+- BRE qualify records new → qualified credited to the acting user
+- Saves that leave the status alone record nothing
+- Bulk status updates record one transition per changed lead
+- Funnel figures count leads that later moved backwards
+- The lead list reports days in status from the ledger
+- backfill_ase_transitions reconstructs a ledger for older leads
+- bulk_import records creation entries; the backfill adds missing ones
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.models import ASELead, ASELeadStatusTransition
+from ase_leads.transitions import attribute_status_change, ledger_funnel
+
+User = get_user_model()
+
+
+class StatusTransitionLedgerTest(TestCase):
+    """Tests for ase_leads.transitions and the signals writing the ledger"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.today = timezone.localdate()
+        self.company = Company.objects.create(name="ASE Technologies", code="ASE")
+        bre_team = Team.objects.create(
+            name="BRE Team", team_type="marketing", marketing_category="bre", company=self.company,
+        )
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@test.com", password="testpass123",
+            role="admin", company=self.company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user", email="bre@test.com", password="testpass123",
+            role="employee", company=self.company, team=bre_team,
+        )
+        self.lead = self._create_lead('9000000301')
+
+    def _create_lead(self, phone):
+        return ASELead.objects.create(
+            company_name="Ledger Co", contact_person="Ravi", phone=phone,
+            industry="technology", status="new", company=self.company, created_by=self.admin,
+        )
+
+    def _move(self, lead, to_status):
+        lead.status = to_status
+        attribute_status_change(lead, self.admin)
+        lead.save()
+
+    def _ledger(self, lead):
+        return list(lead.status_transitions.values_list('from_status', 'to_status'))
+
+    def test_creation_entry(self):
+        entry = self.lead.status_transitions.get()
+        self.assertEqual((entry.from_status, entry.to_status), ('', 'new'))
+        self.assertEqual(entry.user, self.admin)
+        self.assertEqual(entry.company, self.company)
+
+    def test_qualify_action_records_transition(self):
+        self.client.force_authenticate(user=self.bre_user)
+        response = self.client.post(
+            reverse('ase-leads-qualify', args=[self.lead.pk]), {'lead_score': 70}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entry = self.lead.status_transitions.last()
+        self.assertEqual((entry.from_status, entry.to_status), ('new', 'qualified'))
+        self.assertEqual(entry.user, self.bre_user)
+
+    def test_unchanged_status_records_nothing(self):
+        self.lead.notes = 'Called back'
+        self.lead.save()
+        self.lead.save(update_fields=['notes'])
+
+        self.assertEqual(self._ledger(self.lead), [('', 'new')])
+
+    def test_bulk_update_records_transitions(self):
+        other = self._create_lead('9000000302')
+        other.status = 'quotation'
+        other.save()
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('bulk-update-ase-lead-status'),
+            {'lead_ids': [self.lead.pk, other.pk], 'status': 'quotation'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._ledger(self.lead), [('', 'new'), ('new', 'quotation')])
+        self.assertEqual(self.lead.status_transitions.last().user, self.admin)
+        self.assertEqual(self._ledger(other), [('', 'new'), ('new', 'quotation')])
+
+    def test_funnel_counts_leads_that_moved_back(self):
+        for to_status in ('qualified', 'contacted', 'proposal_sent', 'contacted'):
+            self._move(self.lead, to_status)
+        self._create_lead('9000000303')
+
+        funnel = ledger_funnel(self.today)
+
+        self.assertEqual(funnel['stage_entries']['new'], 2)
+        self.assertEqual(funnel['stage_entries']['proposal_sent'], 1)
+        self.assertEqual(funnel['conversion_rates']['new_to_qualified'], 50.0)
+        self.assertEqual(funnel['conversion_rates']['contacted_to_proposal'], 100.0)
+        self.assertEqual(funnel['backward_moves'], 1)
+        self.assertEqual(funnel['time_in_stage']['new_to_qualified_days'], 0.0)
+        self.assertIsNone(funnel['time_in_stage']['proposal_to_won_days'])
+
+    def test_funnel_query_count(self):
+        self._move(self.lead, 'qualified')
+        with self.assertNumQueries(2):
+            ledger_funnel(self.today)
+
+    def test_lead_list_days_in_status_from_ledger(self):
+        self._move(self.lead, 'qualified')
+        transitions = ASELeadStatusTransition.objects.filter(lead=self.lead)
+        transitions.filter(to_status='new').update(at=timezone.now() - timedelta(days=10))
+        transitions.filter(to_status='qualified').update(at=timezone.now() - timedelta(days=4))
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(reverse('ase-leads-list'))
+
+        self.assertEqual(response.data['results'][0]['days_in_current_status'], 4)
+
+    def test_backfill_reconstructs_older_leads(self):
+        now = timezone.now()
+        ASELeadStatusTransition.objects.all().delete()
+        ASELead.objects.filter(pk=self.lead.pk).update(
+            status='won', research_completed_at=now, first_contact_at=now,
+            proposal_sent_at=now, deal_closed_at=now,
+        )
+
+        out = StringIO()
+        call_command('backfill_ase_transitions', stdout=out)
+
+        self.assertIn('Wrote 5 transition row(s)', out.getvalue())
+        self.assertEqual(
+            [to for _, to in self._ledger(self.lead)],
+            ['new', 'qualified', 'contacted', 'proposal_sent', 'won'],
+        )
+        call_command('backfill_ase_transitions', stdout=StringIO())
+        self.assertEqual(self.lead.status_transitions.count(), 5)
+
+    def test_bulk_import_records_creation_entries(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/ase-leads/bulk_import/', {'leads': [
+            {'company_name': 'Bulk Co', 'phone': '9000000304', 'industry': 'technology'},
+        ]}, format='json')
+        self.assertEqual(response.data['imported'], 1)
+
+        lead = ASELead.objects.get(normalized_phone='9000000304')
+        self.assertEqual(self._ledger(lead), [('', 'new')])
+        self.assertEqual(ledger_funnel(self.today)['stage_entries']['new'], 2)
+
+    def test_backfill_adds_missing_creation_entry(self):
+        self._move(self.lead, 'qualified')
+        self.lead.status_transitions.filter(from_status='').delete()
+
+        call_command('backfill_ase_transitions', stdout=StringIO())
+
+        self.assertEqual(sorted(self._ledger(self.lead)), [('', 'new'), ('new', 'qualified')])
+        creation = self.lead.status_transitions.get(from_status='')
+        self.assertEqual(creation.at, self.lead.created_at)
+        call_command('backfill_ase_transitions', stdout=StringIO())
+        self.assertEqual(self.lead.status_transitions.count(), 2)
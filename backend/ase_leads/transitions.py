@@ -0,0 +1,242 @@
+"""
+ASE lead status ledger (ASELeadStatusTransition) and the funnel analytics
+computed from it.
+
+Rows are appended by the lead signals (ase_leads.signals) on every save
+that creates a lead or changes its ``status``; call
+``attribute_status_change(lead, user)`` before saving to record who made
+the change. Queryset ``.update()`` calls bypass the signals and record
+their changes with ``record_bulk_transitions``:
+
+    previous = statuses_before_update(leads)
+    leads.update(status='won')
+    record_bulk_transitions(previous, 'won', user=request.user)
+
+and ``bulk_create`` paths record the creations with
+``record_created_transitions(created, user=request.user)``.
+
+Because every move is kept, leads that went backwards (e.g. proposal_sent
+back to contacted) still count as having reached the later stage.
+"""
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import ASELead, ASELeadStatusTransition
+
+
+# Milestones of the ASE funnel, in order
+FUNNEL_STAGES = ['new', 'qualified', 'contacted', 'proposal_sent', 'won']
+
+# Position of each status in the pipeline; a transition to a lower rank
+# (other than to 'lost') is a backward move
+STAGE_RANK = {
+    'new': 0,
+    'qualified': 1,
+    'contacted': 2,
+    'nurturing': 2,
+    'proposal_sent': 3,
+    'negotiating': 4,
+    'won': 5,
+}
+
+
+def attribute_status_change(lead, user):
+    """Credit the status change saved next on ``lead`` to ``user``."""
+    lead._status_changed_by = user
+
+
+def record_transition(lead, from_status, user_id=None):
+    return ASELeadStatusTransition.objects.create(
+        lead=lead,
+        company_id=lead.company_id,
+        from_status=from_status or '',
+        to_status=lead.status,
+        user_id=user_id,
+    )
+
+
+def statuses_before_update(queryset):
+    """``[(lead_id, company_id, status)]`` to pass to record_bulk_transitions."""
+    return list(queryset.values_list('pk', 'company_id', 'status'))
+
+
+def record_bulk_transitions(previous, to_status, user=None):
+    """Append one transition per lead in ``previous`` whose status changed."""
+    now = timezone.now()
+    return ASELeadStatusTransition.objects.bulk_create([
+        ASELeadStatusTransition(
+            lead_id=lead_id, company_id=company_id, from_status=from_status,
+            to_status=to_status, user=user, at=now,
+        )
+        for lead_id, company_id, from_status in previous
+        if from_status != to_status
+    ])
+
+
+def record_created_transitions(leads, user=None):
+    """Append the creation transition of each lead saved with ``bulk_create``."""
+    return ASELeadStatusTransition.objects.bulk_create([
+        ASELeadStatusTransition(
+            lead_id=lead.pk, company_id=lead.company_id, from_status='',
+            to_status=lead.status, user=user, at=lead.created_at,
+        )
+        for lead in leads
+    ])
+
+
+def with_status_changed_at(queryset):
+    """Annotate ``status_changed_at``: when each lead entered its current status."""
+    latest = ASELeadStatusTransition.objects.filter(lead=OuterRef('pk')).order_by('-at', '-id')
+    return queryset.annotate(status_changed_at=Subquery(latest.values('at')[:1]))
+
+
+def _days(seconds_list):
+    if not seconds_list:
+        return None
+    return round(sum(seconds_list) / len(seconds_list) / 86400, 1)
+
+
+def _rate(part, whole):
+    return round((part / whole) * 100, 1) if whole > 0 else 0
+
+
+def ledger_funnel(start_date, company=None):
+    """
+    Funnel figures for transitions on or after ``start_date``, in two
+    grouped queries:
+
+      - stage_entries: leads that first reached each FUNNEL_STAGES milestone
+        in the period
+      - conversion_rates: stage-to-stage ratios of those entries
+      - time_in_stage: average days between consecutive milestones (and
+        new → won), for leads that reached the later one in the period
+      - backward_moves: transitions in the period to an earlier stage
+    """
+    ledger = ASELeadStatusTransition.objects.all()
+    if company is not None:
+        ledger = ledger.filter(company=company)
+    in_period = ledger.filter(at__date__gte=start_date)
+
+    # First time each lead active in the period reached each milestone
+    milestones = {}
+    rows = (
+        ledger.filter(lead_id__in=in_period.values('lead_id'), to_status__in=FUNNEL_STAGES)
+        .order_by()
+        .values('lead_id', 'to_status')
+        .annotate(first_at=Min('at'))
+    )
+    for row in rows:
+        milestones.setdefault(row['lead_id'], {})[row['to_status']] = row['first_at']
+
+    entries = dict.fromkeys(FUNNEL_STAGES, 0)
+    pairs = list(zip(FUNNEL_STAGES, FUNNEL_STAGES[1:])) + [('new', 'won')]
+    durations = {pair: [] for pair in pairs}
+    for reached in milestones.values():
+        for stage, at in reached.items():
+            if timezone.localdate(at) >= start_date:
+                entries[stage] += 1
+        for earlier, later in pairs:
+            if earlier in reached and later in reached and timezone.localdate(reached[later]) >= start_date:
+                durations[(earlier, later)].append((reached[later] - reached[earlier]).total_seconds())
+
+    moves = in_period.order_by().values('from_status', 'to_status').annotate(n=Count('pk'))
+    backward = sum(
+        row['n'] for row in moves
+        if row['from_status'] in STAGE_RANK and row['to_status'] in STAGE_RANK
+        and STAGE_RANK[row['to_status']] < STAGE_RANK[row['from_status']]
+    )
+
+    return {
+        'stage_entries': entries,
+        'conversion_rates': {
+            'new_to_qualified': _rate(entries['qualified'], entries['new']),
+            'qualified_to_contacted': _rate(entries['contacted'], entries['qualified']),
+            'contacted_to_proposal': _rate(entries['proposal_sent'], entries['contacted']),
+            'proposal_to_won': _rate(entries['won'], entries['proposal_sent']),
+            'overall': _rate(entries['won'], entries['new']),
+        },
+        'time_in_stage': {
+            'new_to_qualified_days': _days(durations[('new', 'qualified')]),
+            'qualified_to_contacted_days': _days(durations[('qualified', 'contacted')]),
+            'contacted_to_proposal_days': _days(durations[('contacted', 'proposal_sent')]),
+            'proposal_to_won_days': _days(durations[('proposal_sent', 'won')]),
+            'total_sales_cycle_days': _days(durations[('new', 'won')]),
+        },
+        'backward_moves': backward,
+    }
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _reconstructed(lead):
+    """Best-effort transitions for a lead from its workflow timestamps."""
+    steps = [('new', lead['created_at'], lead['created_by_id'])]
+    if lead['research_completed_at'] and not (lead['status'] == 'lost' and lead['disqualification_reason']):
+        steps.append(('qualified', lead['research_completed_at'], lead['researched_by_id']))
+    if lead['first_contact_at']:
+        steps.append(('contacted', lead['first_contact_at'], lead['contacted_by_id']))
+    if lead['proposal_sent_at']:
+        steps.append(('proposal_sent', lead['proposal_sent_at'], lead['managed_by_id']))
+    steps.sort(key=lambda step: step[1])
+    if steps[-1][0] != lead['status']:
+        closed_at = lead['deal_closed_at'] if lead['status'] in ('won', 'lost') else None
+        steps.append((lead['status'], max(closed_at or lead['updated_at'], steps[-1][1]), None))
+
+    from_status = ''
+    for to_status, at, user_id in steps:
+        yield ASELeadStatusTransition(
+            lead_id=lead['pk'], company_id=lead['company_id'], from_status=from_status,
+            to_status=to_status, user_id=user_id, at=at,
+        )
+        from_status = to_status
+
+
+def _creation_rows(leads):
+    """
+    Creation transitions for leads whose later moves are in the ledger but
+    whose creation is not (bulk-created before creations were recorded).
+    The lead was created in the status its first recorded move left.
+    """
+    first_move = ASELeadStatusTransition.objects.filter(lead=OuterRef('pk')).order_by('at', 'id')
+    rows = (
+        leads.exclude(status_transitions__from_status='')
+        .filter(status_transitions__isnull=False)
+        .distinct()
+        .annotate(first_from=Subquery(first_move.values('from_status')[:1]))
+        .values('pk', 'company_id', 'created_at', 'created_by_id', 'first_from')
+    )
+    for lead in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        yield ASELeadStatusTransition(
+            lead_id=lead['pk'], company_id=lead['company_id'], from_status='',
+            to_status=lead['first_from'] or 'new', user_id=lead['created_by_id'], at=lead['created_at'],
+        )
+
+
+def backfill_transitions(company=None):
+    """
+    Seed the ledger for leads that have no transitions yet (created before
+    it existed), and add the missing creation row of leads that only have
+    later moves. Returns the number of rows written.
+    """
+    leads = ASELead.objects.all()
+    if company is not None:
+        leads = leads.filter(company=company)
+    created = list(_creation_rows(leads))
+    written = len(ASELeadStatusTransition.objects.bulk_create(created, batch_size=BACKFILL_BATCH_SIZE))
+
+    leads = leads.filter(status_transitions__isnull=True)
+    rows = leads.values(
+        'pk', 'company_id', 'status', 'created_at', 'updated_at', 'created_by_id',
+        'research_completed_at', 'researched_by_id', 'disqualification_reason',
+        'first_contact_at', 'contacted_by_id', 'proposal_sent_at', 'managed_by_id', 'deal_closed_at',
+    )
+    batch = []
+    for lead in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        batch.extend(_reconstructed(lead))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            written += len(ASELeadStatusTransition.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        written += len(ASELeadStatusTransition.objects.bulk_create(batch))
+    return written
@@ -11,10 +11,15 @@ from django.db import transaction
 from accounts.permissions import CompanyAccessPermission
 from .models import ASELead
 from .serializers import ASELeadSerializer, ASELeadListSerializer
+from .transitions import attribute_status_change, record_created_transitions, with_status_changed_at
 from eswari_crm.ws_utils import notify_ase_data_changed
+from search.services import index_created
+from utils.cache_versions import bump_company
+from utils.phones import PhoneSearchFilter, normalize_phone, phone_or_text_q, set_normalized_phones
+from utils.pagination import KeysetPaginationMixin
 
 
-class ASELeadPagination(PageNumberPagination):
+class ASELeadPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 2000  # Increased to support larger datasets
@@ -28,7 +33,7 @@ class ASELeadViewSet(viewsets.ModelViewSet):
     serializer_class = ASELeadSerializer
     permission_classes = [IsAuthenticated, CompanyAccessPermission]
     pagination_class = ASELeadPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PhoneSearchFilter, filters.OrderingFilter]
     
     # Search fields
     search_fields = [
@@ -120,6 +125,8 @@ class ASELeadViewSet(viewsets.ModelViewSet):
                 qs = qs.filter(created_at__date__lte=datetime.strptime(date_to, '%Y-%m-%d').date())
             except ValueError:
                 pass
+        if self.action in ('list', 'retrieve'):
+            qs = with_status_changed_at(qs)
         return qs
     def get_serializer_class(self):
         if self.action == 'list':
@@ -154,11 +161,12 @@ class ASELeadViewSet(viewsets.ModelViewSet):
             serializer.save(created_by=user, company=user.company)
         
         # Notify all ASE clients of new lead
-        notify_ase_data_changed('leads', 'created')
+        notify_ase_data_changed('leads', 'created', record_id=serializer.instance.id)
     
     def perform_update(self, serializer):
+        attribute_status_change(serializer.instance, self.request.user)
         instance = serializer.save()
-        notify_ase_data_changed('leads', 'updated', record_id=instance.id)
+        notify_ase_data_changed('leads', 'updated', record_id=instance.id, fields=serializer.validated_data)
 
     def perform_destroy(self, instance):
         record_id = instance.id
@@ -217,12 +225,12 @@ class ASELeadViewSet(viewsets.ModelViewSet):
         user = request.user
         # Use explicit company param if provided (admin switching companies), else user's company
         if company_id:
-            qs = ASELead.objects.filter(phone=phone, company_id=company_id).select_related('assigned_to')
+            qs = ASELead.objects.filter(normalized_phone=normalize_phone(phone), company_id=company_id).select_related('assigned_to')
         else:
             company = getattr(user, 'company', None)
             if not company:
                 return Response({'exists': False})
-            qs = ASELead.objects.filter(phone=phone, company=company).select_related('assigned_to')
+            qs = ASELead.objects.filter(normalized_phone=normalize_phone(phone), company=company).select_related('assigned_to')
         if exclude_id:
             qs = qs.exclude(pk=exclude_id)
         
@@ -345,13 +353,15 @@ class ASELeadViewSet(viewsets.ModelViewSet):
         # No round-robin, no team pools - just assign to self first
         # User can manually reassign later if needed
 
-        # Pre-fetch existing phones with their assigned employee info
-        existing_records = ASELead.objects.filter(company=company).select_related('assigned_to').values_list('phone', 'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username')
+        # Look up only the numbers in this file, by normalized phone
+        candidates = {normalize_phone(row.get('phone')) for row in rows} - {''}
+        existing_records = ASELead.objects.filter(
+            company=company, normalized_phone__in=candidates,
+        ).values_list('normalized_phone', 'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username')
         existing_phone_map = {}
         for phone, fn, ln, uname in existing_records:
-            if phone:  # skip None/empty phones
-                name = f"{fn or ''} {ln or ''}".strip() or uname or 'Unknown'
-                existing_phone_map[phone] = name
+            name = f"{fn or ''} {ln or ''}".strip() or uname or 'Unknown'
+            existing_phone_map[phone] = name
 
         to_create = []
         errors = []
@@ -361,9 +371,7 @@ class ASELeadViewSet(viewsets.ModelViewSet):
 
         for i, row in enumerate(rows):
             phone = str(row.get('phone', '')).strip()
-            
-            # Clean phone for comparison
-            phone_clean = phone.replace(' ', '').replace('-', '').replace('+', '')
+            phone_clean = normalize_phone(row.get('phone'))
             
             # Skip completely empty rows (no phone)
             if not phone_clean:
@@ -383,19 +391,6 @@ class ASELeadViewSet(viewsets.ModelViewSet):
                 duplicates += 1
                 continue
             
-            # Also check with original phone format
-            if phone in existing_phone_map:
-                employee_name = existing_phone_map[phone]
-                errors.append({
-                    'row': i + 1,
-                    'phone': phone,
-                    'error': f"This number is already added by {employee_name}",
-                    'type': 'duplicate',
-                    'assigned_to': employee_name,
-                })
-                duplicates += 1
-                continue
-            
             # Check duplicate within batch
             if phone_clean in seen_phones:
                 errors.append({
@@ -445,9 +440,18 @@ class ASELeadViewSet(viewsets.ModelViewSet):
         if to_create:
             with transaction.atomic():
                 created = ASELead.objects.bulk_create(
-                    to_create,
+                    set_normalized_phones(to_create),
                     batch_size=500,
                 )
+                if created and created[0].pk is None:
+                    # MySQL does not return the new ids; phones are unique in this import
+                    created = list(ASELead.objects.filter(
+                        company=company, normalized_phone__in=[lead.normalized_phone for lead in created],
+                    ))
+                record_created_transitions(created, user=user)
+                index_created(created)
+                # bulk_create skips model signals
+                bump_company(company.id)
                 imported = len(created)
 
         if imported > 0:
@@ -576,12 +580,13 @@ class ASELeadViewSet(viewsets.ModelViewSet):
                 return Response({'deleted_count': 0})
             qs = qs.filter(company=user.company)
 
-        count = qs.count()
+        deleted_ids = list(qs.values_list('id', flat=True))
+        count = len(deleted_ids)
         with transaction.atomic():
             qs.delete()
 
         if count > 0:
-            notify_ase_data_changed('leads', 'bulk_deleted', extra={'count': count})
+            notify_ase_data_changed('leads', 'bulk_deleted', record_ids=deleted_ids)
 
         return Response({'deleted_count': count}, status=status.HTTP_200_OK)
 
@@ -601,13 +606,7 @@ class ASELeadViewSet(viewsets.ModelViewSet):
 
         search = request.data.get('search', '').strip()
         if search:
-            queryset = queryset.filter(
-                Q(company_name__icontains=search) |
-                Q(contact_person__icontains=search) |
-                Q(email__icontains=search) |
-                Q(phone__icontains=search) |
-                Q(notes__icontains=search)
-            )
+            queryset = queryset.filter(phone_or_text_q(search, 'phone', 'company_name', 'contact_person', 'email', 'notes'))
 
         status_filter = request.data.get('status', '').strip()
         if status_filter:
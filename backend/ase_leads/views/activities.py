@@ -26,6 +26,7 @@ from ase_leads.models import ASELead
 from ase_leads.models.activity import ASELeadActivity
 from ase_leads.permissions import ASEMarketingPermission
 from ase_leads.serializers import ASELeadActivitySerializer
+from utils.pagination import keyset_page
 
 
 PAGE_SIZE = 20
@@ -36,8 +37,18 @@ def _paginate_queryset(queryset, request):
     Helper to paginate a queryset and return a standardised response dict.
 
     Returns:
-        dict with keys: results, count, page, total_pages
+        dict with keys: results, count, page, total_pages; with a ``cursor``
+        parameter (keyset mode, see utils.pagination): results, count, next_cursor
     """
+    if 'cursor' in request.query_params:
+        page = keyset_page(queryset, request, PAGE_SIZE)
+        serializer = ASELeadActivitySerializer(page.objects, many=True, context={'request': request})
+        return {
+            'results': serializer.data,
+            'count': page.count,
+            'next_cursor': page.next_cursor,
+        }
+
     page_number = request.query_params.get('page', 1)
     try:
         page_number = int(page_number)
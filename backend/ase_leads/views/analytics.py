@@ -11,14 +11,25 @@ Endpoints
   GET /api/ase-leads/analytics/pipeline/           (admin/marketing_lead only)
   GET /api/ase-leads/analytics/conversion-rates/   (admin/marketing_lead only)
 
+Data
+────
+Team and individual performance sum the per-user daily rollups
+(ASEDailyMetric, see ase_leads.rollups) instead of scanning leads and
+activities. Pipeline and conversion figures depend on each lead's current
+status, so they are computed from ASELead, one grouped query each.
+
 Caching
 ───────
-Results are cached for 5 minutes.
-Cache key format: ase_analytics_{endpoint}_{user_id} or ase_analytics_{endpoint}_global
+Results are cached per company (and per user for my-performance) under
+generation-versioned keys (utils.cache_versions), so a write to the
+company's leads or activities invalidates them; otherwise they live for
+VERSIONED_CACHE_TTL. Period keys use the period's start date, so they roll
+over with the calendar.
+Cache key format: ase_analytics_{endpoint}_{company_id|user_id}_{period}_{period_start}:g{generations}
 """
 
 from django.core.cache import cache
-from django.db.models import Count, Sum, Avg, Q
+from django.db.models import Count, Sum, Q
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.decorators import api_view, permission_classes
@@ -26,14 +37,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from ase_leads.aggregation import aggregate_metrics
 from ase_leads.models import ASELead
-from ase_leads.models.activity import ASELeadActivity
 from ase_leads.permissions import ASEMarketingPermission
+from ase_leads.rollups import metric_totals, top_user
 from teams.models import Team
+from utils.cache_versions import VERSIONED_CACHE_TTL, versioned_key
 
 
-# Cache TTL: 5 minutes (300 seconds)
-CACHE_TTL = 300
+# Cache TTL: entries are also invalidated by writes (see utils.cache_versions)
+CACHE_TTL = VERSIONED_CACHE_TTL
 
 
 def _get_period_start(period):
@@ -90,7 +103,9 @@ def team_performance(request):
     period_start = _get_period_start(period)
 
     # Check cache
-    cache_key = f'ase_analytics_team_performance_global_{period}'
+    cache_key = versioned_key(
+        f'ase_analytics_team_performance_{user.company_id}_{period}_{period_start}', company=user.company_id,
+    )
     cached = cache.get(cache_key)
     if cached is not None:
         return Response(cached)
@@ -139,177 +154,83 @@ def team_performance(request):
     return Response(result)
 
 
-def _calculate_bre_team_metrics(company, period_start):
-    """Calculate BRE team metrics for the given period."""
-    leads_researched = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        research_completed_at__date__gte=period_start
-    ).count()
+def _display_name(row):
+    """Full name (or username) from a rollups.top_user() row."""
+    if not row:
+        return None
+    first = row['user__first_name'] or ''
+    last = row['user__last_name'] or ''
+    return f"{first} {last}".strip() or row['user__username']
 
-    leads_qualified = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        status='qualified',
-        research_completed_at__date__gte=period_start
-    ).count()
 
-    leads_disqualified = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        disqualification_reason__isnull=False,
-        research_completed_at__date__gte=period_start
-    ).count()
+def _average(total, count, places=1):
+    return round(float(total) / count, places) if count else 0
 
-    qualification_rate = round((leads_qualified / leads_researched) * 100, 1) if leads_researched > 0 else 0
 
-    avg_lead_score = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        research_completed_at__date__gte=period_start,
-        lead_score__gt=0
-    ).aggregate(avg=Avg('lead_score'))['avg']
-    avg_lead_score = round(avg_lead_score, 1) if avg_lead_score else 0
-
-    # Top performer (most leads researched)
-    top_performer = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        research_completed_at__date__gte=period_start
-    ).values('researched_by__username', 'researched_by__first_name', 'researched_by__last_name').annotate(
-        count=Count('id')
-    ).order_by('-count').first()
-
-    top_performer_name = None
-    if top_performer:
-        first = top_performer['researched_by__first_name'] or ''
-        last = top_performer['researched_by__last_name'] or ''
-        top_performer_name = f"{first} {last}".strip() or top_performer['researched_by__username']
+def _calculate_bre_team_metrics(company, period_start):
+    """Calculate BRE team metrics for the given period."""
+    m = metric_totals(company, period_start, [
+        'researched', 'qualified', 'disqualified', 'scored', 'lead_score_total',
+    ])
+    leads_researched = m['researched']
+    leads_qualified = m['qualified']
+
+    qualification_rate = round((leads_qualified / leads_researched) * 100, 1) if leads_researched > 0 else 0
 
     return {
         'metrics': {
             'leads_researched': leads_researched,
             'leads_qualified': leads_qualified,
-            'leads_disqualified': leads_disqualified,
+            'leads_disqualified': m['disqualified'],
             'qualification_rate': qualification_rate,
-            'avg_lead_score': avg_lead_score,
+            'avg_lead_score': _average(m['lead_score_total'], m['scored']),
         },
-        'top_performer': top_performer_name,
+        # Top performer (most leads researched)
+        'top_performer': _display_name(top_user(company, period_start, 'researched')),
     }
 
 
 def _calculate_boe_team_metrics(company, period_start):
     """Calculate BOE team metrics for the given period."""
-    calls_made = ASELeadActivity.objects.filter(
-        lead__company=company,
-        activity_type='call',
-        created_at__date__gte=period_start
-    ).count()
-
-    emails_sent = ASELeadActivity.objects.filter(
-        lead__company=company,
-        activity_type='email',
-        created_at__date__gte=period_start
-    ).count()
-
-    leads_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by__isnull=False,
-        first_contact_at__date__gte=period_start
-    ).count()
+    m = metric_totals(company, period_start, [
+        'calls', 'emails', 'contacted', 'responded', 'response_hours_total',
+    ])
+    calls_made = m['calls']
+    leads_contacted = m['contacted']
 
     contact_rate = round((leads_contacted / calls_made) * 100, 1) if calls_made > 0 else 0
 
-    avg_response_time = ASELead.objects.filter(
-        company=company,
-        contacted_by__isnull=False,
-        first_contact_at__date__gte=period_start,
-        response_time_hours__isnull=False
-    ).aggregate(avg=Avg('response_time_hours'))['avg']
-    avg_response_time = round(float(avg_response_time), 1) if avg_response_time else 0
-
-    # Top performer (most calls made)
-    top_performer = ASELeadActivity.objects.filter(
-        lead__company=company,
-        activity_type='call',
-        created_at__date__gte=period_start
-    ).values('user__username', 'user__first_name', 'user__last_name').annotate(
-        count=Count('id')
-    ).order_by('-count').first()
-
-    top_performer_name = None
-    if top_performer:
-        first = top_performer['user__first_name'] or ''
-        last = top_performer['user__last_name'] or ''
-        top_performer_name = f"{first} {last}".strip() or top_performer['user__username']
-
     return {
         'metrics': {
             'calls_made': calls_made,
-            'emails_sent': emails_sent,
+            'emails_sent': m['emails'],
             'leads_contacted': leads_contacted,
             'contact_rate': contact_rate,
-            'avg_response_time': avg_response_time,
+            'avg_response_time': _average(m['response_hours_total'], m['responded']),
         },
-        'top_performer': top_performer_name,
+        # Top performer (most calls made)
+        'top_performer': _display_name(top_user(company, period_start, 'calls')),
     }
 
 
 def _calculate_cre_team_metrics(company, period_start):
     """Calculate CRE team metrics for the given period."""
-    proposals_sent = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        proposal_sent_at__date__gte=period_start
-    ).count()
-
-    meetings_held = ASELeadActivity.objects.filter(
-        lead__company=company,
-        activity_type='meeting',
-        created_at__date__gte=period_start
-    ).count()
-
-    deals_won = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).count()
+    m = metric_totals(company, period_start, ['proposals', 'meetings', 'won', 'revenue'])
+    proposals_sent = m['proposals']
+    deals_won = m['won']
 
     win_rate = round((deals_won / proposals_sent) * 100, 1) if proposals_sent > 0 else 0
 
-    revenue = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
-
-    # Top performer (most deals won)
-    top_performer = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).values('managed_by__username', 'managed_by__first_name', 'managed_by__last_name').annotate(
-        count=Count('id')
-    ).order_by('-count').first()
-
-    top_performer_name = None
-    if top_performer:
-        first = top_performer['managed_by__first_name'] or ''
-        last = top_performer['managed_by__last_name'] or ''
-        top_performer_name = f"{first} {last}".strip() or top_performer['managed_by__username']
-
     return {
         'metrics': {
             'proposals_sent': proposals_sent,
-            'meetings_held': meetings_held,
+            'meetings_held': m['meetings'],
             'deals_won': deals_won,
             'win_rate': win_rate,
-            'revenue': float(revenue),
+            'revenue': float(m['revenue']),
         },
-        'top_performer': top_performer_name,
+        # Top performer (most deals won)
+        'top_performer': _display_name(top_user(company, period_start, 'won')),
     }
 
 
@@ -331,7 +252,9 @@ def my_performance(request):
     period_start = _get_period_start(period)
 
     # Check cache
-    cache_key = f'ase_analytics_my_performance_{user.id}_{period}'
+    cache_key = versioned_key(
+        f'ase_analytics_my_performance_{user.id}_{period}_{period_start}', company=user.company_id, user=user.id,
+    )
     cached = cache.get(cache_key)
     if cached is not None:
         return Response(cached)
@@ -360,141 +283,68 @@ def my_performance(request):
 
 def _my_bre_performance(user, company, period_start, period):
     """Calculate individual BRE performance metrics."""
-    leads_researched = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=period_start
-    ).count()
-
-    qualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        status='qualified',
-        research_completed_at__date__gte=period_start
-    ).count()
-
-    disqualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        disqualification_reason__isnull=False,
-        research_completed_at__date__gte=period_start
-    ).count()
+    m = metric_totals(company, period_start, [
+        'researched', 'qualified', 'disqualified', 'scored', 'lead_score_total',
+    ], user=user)
+    leads_researched = m['researched']
+    qualified = m['qualified']
 
     qualification_rate = round((qualified / leads_researched) * 100, 1) if leads_researched > 0 else 0
 
-    avg_lead_score = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=period_start,
-        lead_score__gt=0
-    ).aggregate(avg=Avg('lead_score'))['avg']
-    avg_lead_score = round(avg_lead_score, 1) if avg_lead_score else 0
-
     return {
         'role': 'bre',
         'period': period,
         'period_start': str(period_start),
         'leads_researched': leads_researched,
         'qualified': qualified,
-        'disqualified': disqualified,
+        'disqualified': m['disqualified'],
         'qualification_rate': qualification_rate,
-        'avg_lead_score': avg_lead_score,
+        'avg_lead_score': _average(m['lead_score_total'], m['scored']),
     }
 
 
 def _my_boe_performance(user, company, period_start, period):
     """Calculate individual BOE performance metrics."""
-    calls_made = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='call',
-        created_at__date__gte=period_start
-    ).count()
-
-    emails_sent = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='email',
-        created_at__date__gte=period_start
-    ).count()
-
-    leads_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        first_contact_at__date__gte=period_start
-    ).count()
+    m = metric_totals(company, period_start, [
+        'calls', 'emails', 'contacted', 'responded', 'response_hours_total',
+    ], user=user)
+    calls_made = m['calls']
+    leads_contacted = m['contacted']
 
     contact_rate = round((leads_contacted / calls_made) * 100, 1) if calls_made > 0 else 0
 
-    avg_response_time = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        first_contact_at__date__gte=period_start,
-        response_time_hours__isnull=False
-    ).aggregate(avg=Avg('response_time_hours'))['avg']
-    avg_response_time = round(float(avg_response_time), 1) if avg_response_time else 0
-
     return {
         'role': 'boe',
         'period': period,
         'period_start': str(period_start),
         'calls_made': calls_made,
-        'emails_sent': emails_sent,
+        'emails_sent': m['emails'],
         'leads_contacted': leads_contacted,
         'contact_rate': contact_rate,
-        'avg_response_time': avg_response_time,
+        'avg_response_time': _average(m['response_hours_total'], m['responded']),
     }
 
 
 def _my_cre_performance(user, company, period_start, period):
     """Calculate individual CRE performance metrics."""
-    proposals_sent = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        proposal_sent_at__date__gte=period_start
-    ).count()
-
-    meetings_held = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='meeting',
-        created_at__date__gte=period_start
-    ).count()
-
-    deals_won = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).count()
+    m = metric_totals(company, period_start, [
+        'proposals', 'meetings', 'won', 'valued_won', 'revenue',
+    ], user=user)
+    proposals_sent = m['proposals']
+    deals_won = m['won']
 
     win_rate = round((deals_won / proposals_sent) * 100, 1) if proposals_sent > 0 else 0
 
-    avg_deal_size = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).aggregate(avg=Avg('estimated_project_value'))['avg']
-    avg_deal_size = round(float(avg_deal_size), 2) if avg_deal_size else 0
-
-    revenue = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
-
     return {
         'role': 'cre',
         'period': period,
         'period_start': str(period_start),
         'proposals_sent': proposals_sent,
-        'meetings_held': meetings_held,
+        'meetings_held': m['meetings'],
         'deals_won': deals_won,
         'win_rate': win_rate,
-        'avg_deal_size': avg_deal_size,
-        'revenue': float(revenue),
+        'avg_deal_size': _average(m['revenue'], m['valued_won'], places=2),
+        'revenue': float(m['revenue']),
     }
 
 
@@ -505,17 +355,8 @@ def _my_lead_performance(user, company, period_start, period):
         created_at__date__gte=period_start
     ).count()
 
-    won = ASELead.objects.filter(
-        company=company,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).count()
-
-    revenue = ASELead.objects.filter(
-        company=company,
-        status='won',
-        deal_closed_at__date__gte=period_start
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
+    m = metric_totals(company, period_start, ['won', 'revenue'])
+    won = m['won']
 
     overall_conversion = round((won / total_leads) * 100, 1) if total_leads > 0 else 0
 
@@ -525,7 +366,7 @@ def _my_lead_performance(user, company, period_start, period):
         'period_start': str(period_start),
         'total_leads': total_leads,
         'deals_won': won,
-        'revenue': float(revenue),
+        'revenue': float(m['revenue']),
         'overall_conversion': overall_conversion,
     }
 
@@ -552,7 +393,7 @@ def pipeline_overview(request):
         )
 
     # Check cache
-    cache_key = 'ase_analytics_pipeline_global'
+    cache_key = versioned_key(f'ase_analytics_pipeline_{user.company_id}', company=user.company_id)
     cached = cache.get(cache_key)
     if cached is not None:
         return Response(cached)
@@ -561,14 +402,20 @@ def pipeline_overview(request):
 
     statuses = ['new', 'qualified', 'contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won', 'lost']
 
+    totals = {
+        row['status']: row
+        for row in ASELead.objects.filter(company=company, status__in=statuses)
+        .order_by()
+        .values('status')
+        .annotate(count=Count('id'), total_value=Sum('estimated_project_value'))
+    }
+
     pipeline = {}
     for s in statuses:
-        qs = ASELead.objects.filter(company=company, status=s)
-        count = qs.count()
-        total_value = qs.aggregate(total=Sum('estimated_project_value'))['total'] or 0
+        row = totals.get(s, {})
         pipeline[s] = {
-            'count': count,
-            'total_value': float(total_value),
+            'count': row.get('count', 0),
+            'total_value': float(row.get('total_value') or 0),
         }
 
     result = {
@@ -605,7 +452,9 @@ def conversion_rates(request):
     period_start = _get_period_start(period)
 
     # Check cache
-    cache_key = f'ase_analytics_conversion_rates_global_{period}'
+    cache_key = versioned_key(
+        f'ase_analytics_conversion_rates_{user.company_id}_{period}_{period_start}', company=user.company_id,
+    )
     cached = cache.get(cache_key)
     if cached is not None:
         return Response(cached)
@@ -613,34 +462,27 @@ def conversion_rates(request):
     company = user.company
 
     # Count leads that entered each stage during the period
-    new_leads = ASELead.objects.filter(
-        company=company,
-        created_at__date__gte=period_start
-    ).count()
-
-    qualified_leads = ASELead.objects.filter(
-        company=company,
-        research_completed_at__date__gte=period_start,
-        status__in=['qualified', 'contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won']
-    ).count()
-
-    contacted_leads = ASELead.objects.filter(
-        company=company,
-        first_contact_at__date__gte=period_start,
-        status__in=['contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won']
-    ).count()
-
-    proposal_leads = ASELead.objects.filter(
-        company=company,
-        proposal_sent_at__date__gte=period_start,
-        status__in=['proposal_sent', 'negotiating', 'won']
-    ).count()
-
-    won_leads = ASELead.objects.filter(
-        company=company,
-        deal_closed_at__date__gte=period_start,
-        status='won'
-    ).count()
+    counts = aggregate_metrics(ASELead.objects.filter(company=company), {
+        'new': Q(created_at__date__gte=period_start),
+        'qualified': Q(
+            research_completed_at__date__gte=period_start,
+            status__in=['qualified', 'contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won'],
+        ),
+        'contacted': Q(
+            first_contact_at__date__gte=period_start,
+            status__in=['contacted', 'nurturing', 'proposal_sent', 'negotiating', 'won'],
+        ),
+        'proposal': Q(
+            proposal_sent_at__date__gte=period_start,
+            status__in=['proposal_sent', 'negotiating', 'won'],
+        ),
+        'won': Q(deal_closed_at__date__gte=period_start, status='won'),
+    })
+    new_leads = counts['new']
+    qualified_leads = counts['qualified']
+    contacted_leads = counts['contacted']
+    proposal_leads = counts['proposal']
+    won_leads = counts['won']
 
     # Calculate conversion rates
     new_to_qualified = round((qualified_leads / new_leads) * 100, 1) if new_leads > 0 else 0
@@ -29,6 +29,7 @@ from ase_leads.models import ASELead
 from ase_leads.models.activity import ASELeadActivity
 from ase_leads.permissions import ASEMarketingPermission
 from ase_leads.serializers import ASELeadSerializer
+from ase_leads.transitions import attribute_status_change
 
 
 def _has_bre_access(user):
@@ -131,6 +132,7 @@ def qualify_lead(request, pk):
     # ── 5. Update the lead ────────────────────────────────────────────────────
     now = timezone.now()
     lead.status = 'qualified'
+    attribute_status_change(lead, user)
     lead.researched_by = user
     lead.research_completed_at = now
     lead.lead_score = lead_score
@@ -219,6 +221,7 @@ def disqualify_lead(request, pk):
     # ── 5. Update the lead ────────────────────────────────────────────────────
     now = timezone.now()
     lead.status = 'lost'
+    attribute_status_change(lead, user)
     lead.researched_by = user
     lead.research_completed_at = now
     lead.disqualification_reason = disqualification_reason
@@ -17,6 +17,14 @@ from rest_framework import status
 from ase_leads.models import ASELead
 from ase_leads.models.bre_data import BREResearchData
 from ase_leads.permissions import ASEMarketingPermission
+from ase_leads.distribution import plan_bre_distribution, apply_bre_distribution
+from accounts.directory import user_directory
+from accounts.registry import company_registry, get_ase_company
+from import_jobs.services import submit_import, wants_background
+from import_jobs.views import import_response
+from search.services import reindex
+from utils.exports import ExportColumn, export_response
+from utils.phones import normalize_phone, phone_or_text_q
 
 
 @api_view(['POST'])
@@ -49,14 +57,14 @@ def add_lead(request):
     if not company:
         company_id = request.query_params.get('company') or request.data.get('company')
         if company_id:
-            from accounts.models import Company
-            try:
-                company = Company.objects.get(id=company_id)
-            except Company.DoesNotExist:
+            company = company_registry.by_id(company_id)
+            if not company:
                 return Response({'error': 'Company not found.'}, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response({'error': 'Company is required for admin users.'}, status=status.HTTP_400_BAD_REQUEST)
-    existing = BREResearchData.objects.filter(phone_number=phone, company=company).select_related('created_by').first()
+    existing = BREResearchData.objects.filter(
+        normalized_phone=normalize_phone(phone), company=company,
+    ).select_related('created_by').first()
     if existing:
         creator_name = f"{existing.created_by.first_name} {existing.created_by.last_name}".strip() if existing.created_by else 'Unknown'
         return Response(
@@ -97,136 +105,23 @@ def bulk_upload(request):
     Bulk upload leads from an Excel (.xlsx) or CSV file.
 
     Expected columns: name, phone, location (or phone_number)
-    
+
+    The file is streamed through BREResearchImporter in fixed-size chunks
+    (one duplicate lookup + one bulk insert per chunk), so memory stays flat
+    for very large sheets. With ``async=true`` the file is queued for the
+    import worker and a job id is returned immediately (202).
+
     Returns count of successfully created leads and any errors.
     """
     file = request.FILES.get('file')
     if not file:
         return Response({'error': 'No file uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    filename = file.name.lower()
-    company = request.user.company
-
-    try:
-        if filename.endswith('.xlsx') or filename.endswith('.xls'):
-            import openpyxl
-            wb = openpyxl.load_workbook(file, read_only=True)
-            ws = wb.active
-            rows = list(ws.iter_rows(values_only=True))
-            if not rows:
-                return Response({'error': 'File is empty.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # First row is header
-            headers = [str(h).lower().strip() if h else '' for h in rows[0]]
-            data_rows = rows[1:]
-
-        elif filename.endswith('.csv'):
-            import csv
-            content = file.read().decode('utf-8')
-            reader = csv.reader(io.StringIO(content))
-            rows = list(reader)
-            if not rows:
-                return Response({'error': 'File is empty.'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            headers = [h.lower().strip() for h in rows[0]]
-            data_rows = rows[1:]
-        else:
-            return Response(
-                {'error': 'Unsupported file format. Please upload .xlsx, .xls, or .csv file.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Map column names
-        name_col = None
-        phone_col = None
-        location_col = None
-
-        for i, h in enumerate(headers):
-            if h in ('name', 'contact_person', 'company_name', 'contact name'):
-                name_col = i
-            elif h in ('phone', 'phone_number', 'phone number', 'mobile', 'contact number'):
-                phone_col = i
-            elif h in ('location', 'city', 'address', 'area'):
-                location_col = i
-
-        if name_col is None:
-            return Response(
-                {'error': 'Could not find "name" column. Expected columns: name, phone, location'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        if phone_col is None:
-            return Response(
-                {'error': 'Could not find "phone" column. Expected columns: name, phone, location'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Process rows
-        created = 0
-        errors = []
-        duplicates = 0
-
-        for row_num, row in enumerate(data_rows, start=2):
-            try:
-                # Skip completely empty rows
-                if not row or all(cell is None or str(cell).strip() == '' for cell in row):
-                    continue
-
-                name = str(row[name_col]).strip() if row[name_col] else ''
-                phone = str(row[phone_col]).strip() if row[phone_col] else ''
-                location = str(row[location_col]).strip() if location_col is not None and len(row) > location_col and row[location_col] else ''
-
-                # Clean phone number (remove .0 from Excel numbers)
-                if phone.endswith('.0'):
-                    phone = phone[:-2]
-                phone = phone.replace(' ', '').replace('-', '').replace('+91', '')
-
-                # Skip rows where both name and phone are empty
-                if not name and not phone:
-                    continue
-
-                if not name or not phone:
-                    errors.append(f'Row {row_num}: Missing name or phone')
-                    continue
-
-                if len(phone) < 10:
-                    errors.append(f'Row {row_num}: Invalid phone number "{phone}"')
-                    continue
-
-                # Check duplicate - show who created it
-                existing = BREResearchData.objects.filter(phone_number=phone, company=company).select_related('created_by').first()
-                if existing:
-                    creator_name = f"{existing.created_by.first_name} {existing.created_by.last_name}".strip() if existing.created_by else 'Unknown'
-                    duplicates += 1
-                    errors.append(f'Row {row_num}: Phone {phone} already created by "{creator_name}"')
-                    continue
-
-                BREResearchData.objects.create(
-                    name=name,
-                    phone_number=phone,
-                    location=location,
-                    notes='',
-                    company=company,
-                    created_by=request.user,
-                    assigned_to=request.user,  # Auto-assign to creator
-                )
-                created += 1
-
-            except Exception as e:
-                errors.append(f'Row {row_num}: {str(e)}')
-
-        return Response({
-            'message': f'Upload complete. {created} leads created.',
-            'created': created,
-            'duplicates': duplicates,
-            'errors': errors[:20],  # Limit error messages
-            'total_rows': len(data_rows),
-        }, status=status.HTTP_201_CREATED)
-
-    except Exception as e:
-        return Response(
-            {'error': f'Failed to process file: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    job = submit_import(
+        'bre_research', request.user, request.user.company,
+        file=file, background=wants_background(request),
+    )
+    return import_response(job)
 
 
 @api_view(['GET'])
@@ -299,7 +194,7 @@ def bre_research_list(request):
       - page: page number (default 1)
       - page_size: items per page (default 50)
     """
-    from django.db.models import Q, Case, When, IntegerField
+    from django.db.models import Case, When, IntegerField
     from django.core.paginator import Paginator
 
     user = request.user
@@ -310,8 +205,7 @@ def bre_research_list(request):
             qs = BREResearchData.objects.filter(company_id=company_id)
         elif user.company:
             # Default to ASE Technologies company for the marketing panel
-            from accounts.models import Company
-            ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+            ase_company = get_ase_company()
             if ase_company:
                 qs = BREResearchData.objects.filter(company=ase_company)
             else:
@@ -338,11 +232,7 @@ def bre_research_list(request):
     # Search
     search = request.query_params.get('search', '').strip()
     if search:
-        qs = qs.filter(
-            Q(name__icontains=search) |
-            Q(phone_number__icontains=search) |
-            Q(location__icontains=search)
-        )
+        qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
 
     # Status filter
     status_filter = request.query_params.get('status', '').strip()
@@ -471,15 +361,13 @@ def bre_research_bulk_delete(request):
     """
     Bulk delete multiple BRE research records.
     """
-    from django.db.models import Q
 
     select_all = request.data.get('select_all', False)
     user = request.user
     
     # Admin operates on ASE records
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             base_qs = BREResearchData.objects.filter(company=ase_company)
         else:
@@ -493,7 +381,7 @@ def bre_research_bulk_delete(request):
         qs = base_qs.all()
         search = request.data.get('search', '').strip()
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(phone_number__icontains=search) | Q(location__icontains=search))
+            qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
         status_filter = request.data.get('status', '').strip()
         if status_filter and status_filter != 'all':
             qs = qs.filter(status=status_filter)
@@ -526,7 +414,6 @@ def bre_research_bulk_assign(request):
     Bulk assign multiple BRE research records to a BOE team member.
     """
     from django.contrib.auth import get_user_model
-    from django.db.models import Q
     User = get_user_model()
 
     assigned_to_id = request.data.get('assigned_to')
@@ -543,8 +430,7 @@ def bre_research_bulk_assign(request):
     user = request.user
     # Admin operates on ASE records
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             base_qs = BREResearchData.objects.filter(company=ase_company)
         else:
@@ -557,7 +443,7 @@ def bre_research_bulk_assign(request):
         qs = base_qs.all()
         search = request.data.get('search', '').strip()
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(phone_number__icontains=search) | Q(location__icontains=search))
+            qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
         status_filter = request.data.get('status', '').strip()
         if status_filter and status_filter != 'all':
             qs = qs.filter(status=status_filter)
@@ -575,14 +461,16 @@ def bre_research_bulk_assign(request):
         if limit:
             limit = int(limit)
             ids_to_update = list(qs.values_list('id', flat=True)[:limit])
-            updated = BREResearchData.objects.filter(id__in=ids_to_update).update(assigned_to=assigned_user, status='assigned')
         else:
-            updated = qs.update(assigned_to=assigned_user, status='assigned')
+            ids_to_update = list(qs.values_list('id', flat=True))
+        updated = BREResearchData.objects.filter(id__in=ids_to_update).update(assigned_to=assigned_user, status='assigned')
+        reindex(BREResearchData, ids_to_update)
     else:
         ids = request.data.get('ids', [])
         if not ids:
             return Response({'error': 'ids is required (list of record IDs).'}, status=status.HTTP_400_BAD_REQUEST)
         updated = base_qs.filter(id__in=ids).update(assigned_to=assigned_user, status='assigned')
+        reindex(BREResearchData, ids)
 
     return Response({
         'message': f'{updated} records assigned to {assigned_user.first_name} {assigned_user.last_name}'.strip(),
@@ -608,7 +496,6 @@ def boe_assigned_list(request):
       - date_from: filter by assignment date
       - date_to: filter by assignment date
     """
-    from django.db.models import Q
     from django.core.paginator import Paginator
     from django.utils import timezone
     from datetime import timedelta
@@ -618,8 +505,7 @@ def boe_assigned_list(request):
     
     # Admin sees all ASE assigned data; BOE sees only their own
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             qs = BREResearchData.objects.filter(
                 company=ase_company,
@@ -658,11 +544,7 @@ def boe_assigned_list(request):
     # Search
     search = request.query_params.get('search', '').strip()
     if search:
-        qs = qs.filter(
-            Q(name__icontains=search) |
-            Q(phone_number__icontains=search) |
-            Q(location__icontains=search)
-        )
+        qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
 
     # Date filter
     date_from = request.query_params.get('date_from', '').strip()
@@ -683,8 +565,7 @@ def boe_assigned_list(request):
     month_start = today.replace(day=1)
 
     if user.role == 'admin':
-        from accounts.models import Company as CompanyModel
-        ase_co = CompanyModel.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_co = get_ase_company()
         if ase_co:
             all_assigned = BREResearchData.objects.filter(company=ase_co, status='assigned')
         else:
@@ -832,29 +713,21 @@ def boe_convert_to_lead(request, pk):
 @permission_classes([IsAuthenticated])
 def cre_users_list(request):
     """List all CRE team members and managers/team_leads/admins for assignment dropdown."""
-    from django.contrib.auth import get_user_model
-    from django.db.models import Q
     from teams.models import Team
-    User = get_user_model()
 
     # Get CRE team
     cre_team = Team.objects.filter(marketing_category='cre', is_active=True).first()
 
     # Get all CRE team members (any role) + managers/team_leads/admins
-    filter_q = Q(role__in=['manager', 'team_lead', 'admin'])
-    if cre_team:
-        filter_q = filter_q | Q(team=cre_team)
-
-    users = User.objects.filter(
-        is_active=True
-    ).filter(filter_q).distinct().values('id', 'first_name', 'last_name', 'username', 'role')
-
     result = []
-    for u in users:
-        name = f"{u['first_name']} {u['last_name']}".strip() or u['username']
-        role_label = u['role'].replace('_', ' ').title() if u['role'] != 'employee' else ''
-        display_name = f"{name} ({role_label})" if role_label else name
-        result.append({'id': u['id'], 'name': display_name})
+    for u in user_directory.all():
+        if not u.is_active:
+            continue
+        if u.role not in ('manager', 'team_lead', 'admin') and not (cre_team and u.team_id == cre_team.id):
+            continue
+        role_label = u.role.replace('_', ' ').title() if u.role != 'employee' else ''
+        display_name = f"{u.name} ({role_label})" if role_label else u.name
+        result.append({'id': u.id, 'name': display_name})
     return Response(result)
 
 
@@ -877,7 +750,7 @@ def boe_add_data(request):
 
     company = user.company
     # Check duplicate
-    existing = BREResearchData.objects.filter(phone_number=phone, company=company).first()
+    existing = BREResearchData.objects.filter(normalized_phone=normalize_phone(phone), company=company).first()
     if existing:
         creator_name = f"{existing.created_by.first_name} {existing.created_by.last_name}".strip() if existing.created_by else 'Unknown'
         return Response({'error': f'Phone number {phone} already exists (created by {creator_name})'}, status=status.HTTP_400_BAD_REQUEST)
@@ -915,8 +788,10 @@ def boe_edit_data(request, pk):
     if 'phone_number' in request.data:
         # Check duplicate
         new_phone = request.data['phone_number'].strip()
-        if new_phone != item.phone_number:
-            existing = BREResearchData.objects.filter(phone_number=new_phone, company=user.company).exclude(pk=pk).first()
+        if normalize_phone(new_phone) != item.normalized_phone:
+            existing = BREResearchData.objects.filter(
+                normalized_phone=normalize_phone(new_phone), company=user.company,
+            ).exclude(pk=pk).first()
             if existing:
                 return Response({'error': f'Phone number {new_phone} already exists.'}, status=status.HTTP_400_BAD_REQUEST)
         item.phone_number = new_phone
@@ -988,8 +863,7 @@ def boe_leads_list(request):
     
     # Admin sees all ASE leads; BOE sees only their own
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             qs = BOELead.objects.filter(company=ase_company).select_related('assigned_to_cre', 'source_research', 'created_by')
         else:
@@ -1002,7 +876,7 @@ def boe_leads_list(request):
     # Search
     search = request.query_params.get('search', '').strip()
     if search:
-        qs = qs.filter(Q(name__icontains=search) | Q(phone_number__icontains=search) | Q(location__icontains=search))
+        qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
 
     # Status filter
     status_filter = request.query_params.get('status', '').strip()
@@ -1020,7 +894,6 @@ def boe_leads_list(request):
     # Created by / assigned to filter (admin/manager)
     created_by_filter = request.query_params.get('created_by', '').strip()
     if created_by_filter and user.role in ('admin', 'manager'):
-        from django.db.models import Q
         qs = qs.filter(Q(created_by_id=created_by_filter) | Q(assigned_to_cre_id=created_by_filter))
 
     # CRE assigned filter
@@ -1093,11 +966,10 @@ def boe_leads_create(request):
         except BREResearchData.DoesNotExist:
             pass
 
-    # For admin without company, use ASE Technologies (ID 2) as default
-    from accounts.models import Company
+    # For admin without company, use ASE Technologies as default
     company = user.company
     if not company:
-        company = Company.objects.filter(code='ASE').first()
+        company = company_registry.by_code('ASE')
 
     lead = BOELead.objects.create(
         name=name,
@@ -1230,58 +1102,37 @@ def boe_leads_mark_task_created(request, pk):
 # BOE Leads Export / Import
 # ══════════════════════════════════════════════════════════════════════════════
 
+BOE_LEAD_EXPORT_COLUMNS = [
+    ExportColumn('name', 'Name'),
+    ExportColumn('phone_number', 'Phone Number', text=True),
+    ExportColumn('location', 'Location'),
+    ExportColumn('notes', 'Notes'),
+    ExportColumn('call_notes', 'Call Notes'),
+    ExportColumn('status', 'Status'),
+    ExportColumn('created_by', 'Created By', lambda lead: lead.created_by_name),
+    ExportColumn('assigned_to_cre', 'Assigned to CRE', lambda lead: lead.assigned_to_cre_name),
+    ExportColumn('created_at', 'Date', lambda lead: lead.created_at.strftime('%Y-%m-%d')),
+]
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def boe_leads_export(request):
-    """Export BOE leads to Excel."""
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from django.http import HttpResponse
+    """
+    Export BOE leads to Excel (default) or CSV, streamed row by row.
 
+    Query params: file_format=xlsx|csv, columns=<comma separated keys from
+    BOE_LEAD_EXPORT_COLUMNS>.
+    """
     user = request.user
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         qs = BOELead.objects.filter(company=ase_company) if ase_company else BOELead.objects.all()
     else:
         qs = BOELead.objects.filter(created_by=user)
 
     qs = qs.select_related('assigned_to_cre', 'created_by').order_by('-created_at')
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'BOE Leads'
-
-    # Header style
-    header_fill = PatternFill(start_color='1E40AF', end_color='1E40AF', fill_type='solid')
-    header_font = Font(color='FFFFFF', bold=True)
-
-    headers = ['Name', 'Phone Number', 'Location', 'Notes', 'Call Notes', 'Status', 'Created By', 'Assigned to CRE', 'Date']
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-        ws.column_dimensions[cell.column_letter].width = 20
-
-    # Phone column as text
-    from openpyxl.styles import numbers
-    for row_idx, lead in enumerate(qs, 2):
-        ws.cell(row=row_idx, column=1, value=lead.name)
-        phone_cell = ws.cell(row=row_idx, column=2, value=str(lead.phone_number))
-        phone_cell.number_format = '@'
-        ws.cell(row=row_idx, column=3, value=lead.location)
-        ws.cell(row=row_idx, column=4, value=lead.notes)
-        ws.cell(row=row_idx, column=5, value=lead.call_notes)
-        ws.cell(row=row_idx, column=6, value=lead.status)
-        ws.cell(row=row_idx, column=7, value=lead.created_by_name or '')
-        ws.cell(row=row_idx, column=8, value=lead.assigned_to_cre_name or '')
-        ws.cell(row=row_idx, column=9, value=lead.created_at.strftime('%Y-%m-%d'))
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="boe_leads.xlsx"'
-    wb.save(response)
-    return response
+    return export_response(request, qs, BOE_LEAD_EXPORT_COLUMNS, 'boe_leads', 'BOE Leads')
 
 
 @api_view(['GET'])
@@ -1324,66 +1175,18 @@ def boe_leads_template(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def boe_leads_import(request):
-    """Bulk import BOE leads from Excel."""
-    import openpyxl
-    from io import BytesIO
-
+    """Bulk import BOE leads from Excel (runs as an import job, see bulk_upload)."""
     user = request.user
     file = request.FILES.get('file')
     if not file:
         return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    from accounts.models import Company
     company = user.company
     if not company:
-        company = Company.objects.filter(code='ASE').first()
-
-    try:
-        wb = openpyxl.load_workbook(BytesIO(file.read()), data_only=True)
-        ws = wb.active
-
-        created = 0
-        skipped = 0
-        errors = []
-
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-            if not row or not row[0]:
-                continue
-
-            name = str(row[0]).strip() if row[0] else ''
-            phone = str(row[1]).strip() if row[1] else ''
-            location = str(row[2]).strip() if row[2] else ''
-            notes = str(row[3]).strip() if row[3] else ''
-            call_notes = str(row[4]).strip() if row[4] else ''
-
-            if not name or not phone:
-                errors.append(f'Row {row_idx}: Name and phone are required')
-                skipped += 1
-                continue
-
-            # Clean phone number
-            phone = phone.replace('.0', '').strip()
-
-            BOELead.objects.create(
-                name=name,
-                phone_number=phone,
-                location=location,
-                notes=notes,
-                call_notes=call_notes,
-                created_by=user,
-                company=company,
-            )
-            created += 1
+        company = company_registry.by_code('ASE')
 
-        return Response({
-            'message': f'{created} leads imported successfully.',
-            'created': created,
-            'skipped': skipped,
-            'errors': errors[:10],
-        })
-
-    except Exception as e:
-        return Response({'error': f'Failed to process file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+    job = submit_import('boe_leads', user, company, file=file, background=wants_background(request))
+    return import_response(job, success_status=status.HTTP_200_OK)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1414,8 +1217,7 @@ def bre_dashboard_stats(request):
 
     # Admin sees all ASE records
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             all_records = BREResearchData.objects.filter(company=ase_company)
         else:
@@ -1485,7 +1287,6 @@ def cre_leads_list(request):
       - date_from / date_to: filter by date
       - page / page_size: pagination
     """
-    from django.db.models import Q
     from django.core.paginator import Paginator
     from django.utils import timezone
     from datetime import timedelta
@@ -1501,8 +1302,7 @@ def cre_leads_list(request):
 
     # Admin sees all ASE CRE-assigned leads; manager/team_lead see their company; employee sees own
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             qs = BOELead.objects.filter(company=ase_company, assigned_to_cre__isnull=False)
         else:
@@ -1520,11 +1320,7 @@ def cre_leads_list(request):
     # Search
     search = request.query_params.get('search', '').strip()
     if search:
-        qs = qs.filter(
-            Q(name__icontains=search) |
-            Q(phone_number__icontains=search) |
-            Q(location__icontains=search)
-        )
+        qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
 
     # Status filter
     status_filter = request.query_params.get('status', '').strip()
@@ -1545,8 +1341,7 @@ def cre_leads_list(request):
     month_start = today.replace(day=1)
 
     if user.role == 'admin':
-        from accounts.models import Company as CompanyMdl
-        ase_co2 = CompanyMdl.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_co2 = get_ase_company()
         all_cre = BOELead.objects.filter(company=ase_co2, assigned_to_cre__isnull=False) if ase_co2 else BOELead.objects.filter(assigned_to_cre__isnull=False)
     elif user.role == 'team_lead':
         all_cre = BOELead.objects.filter(company=company, assigned_to_cre__isnull=False) if company else BOELead.objects.filter(assigned_to_cre__isnull=False)
@@ -1771,16 +1566,14 @@ def boe_leads_bulk_delete(request):
     ids = request.data.get('ids', [])
 
     if select_all:
-        from django.db.models import Q
-        from accounts.models import Company
         if user.role == 'admin':
-            ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+            ase_company = get_ase_company()
             qs = BOELead.objects.filter(company=ase_company) if ase_company else BOELead.objects.all()
         else:
             qs = BOELead.objects.filter(company=user.company) if user.company else BOELead.objects.all()
         search = request.data.get('search', '').strip()
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(phone_number__icontains=search) | Q(location__icontains=search))
+            qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
         status_filter = request.data.get('status', '').strip()
         if status_filter and status_filter != 'all':
             qs = qs.filter(status=status_filter)
@@ -1818,10 +1611,8 @@ def boe_leads_bulk_assign(request):
     ids = request.data.get('ids', [])
 
     if select_all:
-        from django.db.models import Q
         if user.role == 'admin':
-            from accounts.models import Company
-            ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+            ase_company = get_ase_company()
             qs = BOELead.objects.filter(company=ase_company) if ase_company else BOELead.objects.all()
         elif user.role in ('manager', 'team_lead'):
             qs = BOELead.objects.filter(company=user.company) if user.company else BOELead.objects.all()
@@ -1830,11 +1621,12 @@ def boe_leads_bulk_assign(request):
             qs = BOELead.objects.filter(created_by=user)
         search = request.data.get('search', '').strip()
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(phone_number__icontains=search) | Q(location__icontains=search))
+            qs = qs.filter(phone_or_text_q(search, 'phone_number', 'name', 'location'))
         status_filter = request.data.get('status', '').strip()
         if status_filter and status_filter != 'all':
             qs = qs.filter(status=status_filter)
-        updated = qs.update(assigned_to_cre=cre_user, status='assigned_cre')
+        ids = list(qs.values_list('id', flat=True))
+        updated = BOELead.objects.filter(id__in=ids).update(assigned_to_cre=cre_user, status='assigned_cre')
     elif ids:
         if user.role in ('admin', 'manager', 'team_lead'):
             updated = BOELead.objects.filter(id__in=ids).update(assigned_to_cre=cre_user, status='assigned_cre')
@@ -1843,6 +1635,7 @@ def boe_leads_bulk_assign(request):
             updated = BOELead.objects.filter(id__in=ids, created_by=user).update(assigned_to_cre=cre_user, status='assigned_cre')
     else:
         return Response({'error': 'No records selected.'}, status=status.HTTP_400_BAD_REQUEST)
+    reindex(BOELead, ids)
 
     return Response({'message': f'{updated} records assigned.', 'updated': updated})
 
@@ -1852,10 +1645,6 @@ def boe_leads_bulk_assign(request):
 @permission_classes([IsAuthenticated])
 def boe_leads_creators(request):
     """Return distinct users who created or are assigned CRE for BOE leads (for filter dropdown)."""
-    from django.contrib.auth import get_user_model
-    from django.db.models import Q
-    User = get_user_model()
-
     user = request.user
     if user.role in ('admin', 'manager', 'team_lead'):
         # Get both creators and CRE-assigned users
@@ -1866,15 +1655,13 @@ def boe_leads_creators(request):
         creator_ids = set(BOELead.objects.filter(created_by=user).values_list('created_by_id', flat=True).distinct())
         all_ids = creator_ids
 
-    users = User.objects.filter(id__in=all_ids, is_active=True).values(
-        'id', 'first_name', 'last_name', 'username', 'role'
-    )
     result = []
-    for u in users:
-        name = f"{u['first_name']} {u['last_name']}".strip() or u['username']
-        role_label = u['role'].replace('_', ' ').title() if u['role'] not in ('employee',) else ''
-        display_name = f"{name} ({role_label})" if role_label else name
-        result.append({'id': u['id'], 'first_name': u['first_name'], 'last_name': u['last_name'], 'name': display_name})
+    for u in sorted(user_directory.get_many(all_ids).values(), key=lambda entry: entry.id):
+        if not u.is_active:
+            continue
+        role_label = u.role.replace('_', ' ').title() if u.role not in ('employee',) else ''
+        display_name = f"{u.name} ({role_label})" if role_label else u.name
+        result.append({'id': u.id, 'first_name': u.first_name, 'last_name': u.last_name, 'name': display_name})
     return Response(result)
 
 
@@ -1883,12 +1670,14 @@ def boe_leads_creators(request):
 @permission_classes([IsAuthenticated])
 def bre_research_auto_assign(request):
     """
-    Auto-assign unassigned (new) BRE research data equally to BOE employees.
-    Distributes in round-robin fashion.
+    Auto-assign unassigned (new) BRE research data to BOE employees.
+    Records go to the employees with the fewest open records first, so
+    everyone ends up with a balanced workload (see ase_leads.distribution).
     
     Request body:
       - boe_user_ids (optional): List of specific BOE user IDs to assign to. If empty, assigns to all BOE members.
       - limit (optional): Max number of records to assign. If empty, assigns all unassigned.
+      - dry_run (optional): Return the planned distribution without assigning anything.
     """
     from django.contrib.auth import get_user_model
     from teams.models import Team
@@ -1898,17 +1687,14 @@ def bre_research_auto_assign(request):
     company = user.company
     # For admin users, default to ASE company for marketing panel operations
     if user.role == 'admin':
-        from accounts.models import Company
-        ase_company = Company.objects.filter(code__in=['ASE', 'ASE_TECH']).first()
+        ase_company = get_ase_company()
         if ase_company:
             company = ase_company
     if not company:
         company_id = request.data.get('company')
         if company_id:
-            from accounts.models import Company
-            try:
-                company = Company.objects.get(id=company_id)
-            except Company.DoesNotExist:
+            company = company_registry.by_id(company_id)
+            if not company:
                 return Response({'error': 'Company not found.'}, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response({'error': 'Company is required.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1925,42 +1711,36 @@ def bre_research_auto_assign(request):
     if not boe_users:
         return Response({'error': 'No BOE employees found to assign to.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Get unassigned records
-    unassigned = BREResearchData.objects.filter(company=company, status='new').order_by('created_at')
-
-    # Apply limit if provided
     limit = request.data.get('limit')
-    if limit:
-        limit = int(limit)
-        unassigned = unassigned[:limit]
-
-    # Get IDs to assign
-    record_ids = list(unassigned.values_list('id', flat=True))
-    total = len(record_ids)
+    plan = plan_bre_distribution(company, boe_users, limit=int(limit) if limit else None)
+    total = plan.total
 
     if total == 0:
         return Response({'error': 'No unassigned records to distribute.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Round-robin distribution
-    num_users = len(boe_users)
-    assigned_counts = {u.id: 0 for u in boe_users}
-
-    for i, record_id in enumerate(record_ids):
-        target_user = boe_users[i % num_users]
-        BREResearchData.objects.filter(id=record_id).update(
-            assigned_to=target_user,
-            status='assigned'
-        )
-        assigned_counts[target_user.id] += 1
+    dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+    if not dry_run:
+        apply_bre_distribution(plan)
+        total = plan.total
 
-    # Build response with assignment details
-    details = []
-    for u in boe_users:
-        name = f"{u.first_name} {u.last_name}".strip() or u.username
-        details.append(f"{name}: {assigned_counts[u.id]}")
+    num_users = len(boe_users)
+    planned = [{
+        'user_id': a.user.id,
+        'name': a.name,
+        'current_open': a.current_open,
+        'assigned': a.count,
+        'open_after': a.current_open + a.count,
+    } for a in plan.allocations]
+
+    if dry_run:
+        message = f'{total} records would be auto-assigned to {num_users} BOE employees.'
+    else:
+        message = f'{total} records auto-assigned to {num_users} BOE employees.'
 
     return Response({
-        'message': f'{total} records auto-assigned to {num_users} BOE employees.',
+        'message': message,
+        'dry_run': dry_run,
         'total_assigned': total,
-        'distribution': details,
+        'distribution': [f"{a.name}: {a.count}" for a in plan.allocations],
+        'planned': planned,
     })
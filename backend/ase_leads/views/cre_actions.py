@@ -31,6 +31,7 @@ from ase_leads.models import ASELead
 from ase_leads.models.activity import ASELeadActivity
 from ase_leads.permissions import ASEMarketingPermission
 from ase_leads.serializers import ASELeadSerializer, ASELeadActivitySerializer
+from ase_leads.transitions import attribute_status_change
 
 
 # Valid stage transitions for update_deal_stage
@@ -140,6 +141,7 @@ def send_proposal(request, pk):
     now = timezone.now()
 
     lead.status = 'proposal_sent'
+    attribute_status_change(lead, user)
     lead.proposal_sent_at = now
 
     if not lead.managed_by:
@@ -360,6 +362,7 @@ def update_deal_stage(request, pk):
     now = timezone.now()
     old_status = lead.status
     lead.status = stage
+    attribute_status_change(lead, user)
 
     update_fields = ['status']
 
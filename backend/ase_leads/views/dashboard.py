@@ -16,26 +16,34 @@ Role-based metrics
 
 Caching
 ───────
-Results are cached for 5 minutes per user to reduce database load.
-Cache key format: ase_dashboard_stats_{user_id}
+Results are cached per user under a generation-versioned key
+(utils.cache_versions): any write to the user's company's leads or
+activities, or to the user, invalidates it. Otherwise entries live for
+VERSIONED_CACHE_TTL.
+Cache key format: ase_dashboard_stats_{user_id}_{date}:g{company}.{user}
+
+Queries
+───────
+Each role's counters come from conditional aggregates (ase_leads.aggregation),
+so a cold dashboard costs a fixed 1–3 queries regardless of window or status
+count (pinned by the query-budget tests in test_dashboard_stats).
 """
 
 from django.core.cache import cache
-from django.db.models import Count, Q, Avg, Sum
-from django.utils import timezone
-from datetime import timedelta
+from django.db.models import Q, Avg, Sum
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from ase_leads.aggregation import aggregate_metrics, period_windows, windowed_metrics
 from ase_leads.models import ASELead
 from ase_leads.models.activity import ASELeadActivity
-from ase_leads.models.task import ASELeadTask
 from ase_leads.permissions import ASEMarketingPermission
+from utils.cache_versions import VERSIONED_CACHE_TTL, versioned_key
 
 
-# Cache TTL: 5 minutes (300 seconds)
-CACHE_TTL = 300
+# Cache TTL: entries are also invalidated by writes (see utils.cache_versions)
+CACHE_TTL = VERSIONED_CACHE_TTL
 
 
 @api_view(['GET'])
@@ -52,7 +60,12 @@ def dashboard_stats(request):
     user = request.user
 
     # ── 1. Check cache first ─────────────────────────────────────────────────
-    cache_key = f'ase_dashboard_stats_{user.id}'
+    # Today/week/month windows move at midnight, so the date is part of the key
+    cache_key = versioned_key(
+        f'ase_dashboard_stats_{user.id}_{period_windows().today}',
+        company=user.company_id,
+        user=user.id,
+    )
     cached_stats = cache.get(cache_key)
     if cached_stats is not None:
         return Response(cached_stats)
@@ -95,82 +108,34 @@ def _calculate_bre_stats(user):
     - This week's metrics
     - This month's metrics
     - Performance metrics (qualification rate, avg research time, quality score)
-    """
-    company = user.company
-    today = timezone.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
-
-    # ── Research Queue ────────────────────────────────────────────────────────
-    # New leads that need research
-    research_queue_count = ASELead.objects.filter(
-        company=company,
-        status='new'
-    ).count()
-
-    # ── Today's Metrics ───────────────────────────────────────────────────────
-    today_researched = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date=today
-    ).count()
-
-    today_qualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date=today,
-        status='qualified'
-    ).count()
-
-    today_disqualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date=today,
-        status='lost',
-        disqualification_reason__isnull=False
-    ).count()
-
-    # ── This Week's Metrics ───────────────────────────────────────────────────
-    week_researched = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=week_start
-    ).count()
-
-    week_qualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=week_start,
-        status='qualified'
-    ).count()
-
-    # ── This Month's Metrics ──────────────────────────────────────────────────
-    month_researched = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=month_start
-    ).count()
 
-    month_qualified = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        research_completed_at__date__gte=month_start,
-        status='qualified'
-    ).count()
+    One query: every counter is a filtered aggregate over the company's leads.
+    """
+    windows = period_windows()
+    mine = Q(researched_by=user)
+
+    metrics = {
+        # New leads that need research
+        'research_queue': Q(status='new'),
+        'today_disqualified': mine & Q(
+            research_completed_at__date=windows.today,
+            status='lost',
+            disqualification_reason__isnull=False,
+        ),
+        # Average lead score for qualified leads
+        'avg_lead_score': Avg('lead_score', filter=mine & Q(status='qualified')),
+    }
+    metrics.update(windowed_metrics('researched', 'research_completed_at', windows, researched_by=user))
+    metrics.update(windowed_metrics('qualified', 'research_completed_at', windows, researched_by=user, status='qualified'))
+    m = aggregate_metrics(ASELead.objects.filter(company=user.company), metrics)
 
     # ── Performance Metrics ───────────────────────────────────────────────────
     # Qualification rate (qualified / total researched)
     qualification_rate = 0
-    if month_researched > 0:
-        qualification_rate = round((month_qualified / month_researched) * 100, 1)
+    if m['researched_month'] > 0:
+        qualification_rate = round((m['qualified_month'] / m['researched_month']) * 100, 1)
 
-    # Average lead score for qualified leads
-    avg_lead_score = ASELead.objects.filter(
-        company=company,
-        researched_by=user,
-        status='qualified'
-    ).aggregate(avg_score=Avg('lead_score'))['avg_score']
-    avg_lead_score = round(avg_lead_score, 1) if avg_lead_score else 0
+    avg_lead_score = round(m['avg_lead_score'], 1) if m['avg_lead_score'] else 0
 
     # Quality score (based on avg lead score)
     quality_score = round(avg_lead_score / 10, 1) if avg_lead_score else 0
@@ -179,20 +144,20 @@ def _calculate_bre_stats(user):
         'role': 'bre',
         'role_display': 'Business Research Executive',
         'research_queue': {
-            'total': research_queue_count,
+            'total': m['research_queue'],
         },
         'today': {
-            'researched': today_researched,
-            'qualified': today_qualified,
-            'disqualified': today_disqualified,
+            'researched': m['researched_today'],
+            'qualified': m['qualified_today'],
+            'disqualified': m['today_disqualified'],
         },
         'this_week': {
-            'researched': week_researched,
-            'qualified': week_qualified,
+            'researched': m['researched_week'],
+            'qualified': m['qualified_week'],
         },
         'this_month': {
-            'researched': month_researched,
-            'qualified': month_qualified,
+            'researched': m['researched_month'],
+            'qualified': m['qualified_month'],
         },
         'performance': {
             'qualification_rate': qualification_rate,
@@ -206,6 +171,9 @@ def _calculate_bre_stats(user):
 # BOE Dashboard Stats
 # ══════════════════════════════════════════════════════════════════════════════
 
+WARM_ENGAGEMENT_LEVELS = ['warm', 'hot', 'very_hot']
+
+
 def _calculate_boe_stats(user):
     """
     Calculate dashboard statistics for Business Outreach Executive (BOE).
@@ -217,47 +185,40 @@ def _calculate_boe_stats(user):
     - This week's metrics
     - This month's metrics
     - Performance metrics (contact rate, warm conversion, avg response time)
+
+    Two queries: one over the company's leads, one over the user's activities.
     """
     company = user.company
-    today = timezone.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
-
-    # ── Call Queue ────────────────────────────────────────────────────────────
-    # Qualified leads that need contact
-    call_queue_count = ASELead.objects.filter(
-        company=company,
-        status__in=['qualified', 'contacted', 'nurturing']
-    ).count()
-
-    # ── Today's Metrics ───────────────────────────────────────────────────────
-    today_calls = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='call',
-        created_at__date=today
-    ).count()
-
-    today_emails = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='email',
-        created_at__date=today
-    ).count()
-
-    today_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        first_contact_at__date=today
-    ).count()
-
-    # Warm leads created today (leads moved to warm/hot engagement)
-    today_warm_leads = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        engagement_level__in=['warm', 'hot', 'very_hot'],
-        last_engagement_date__date=today
-    ).count()
+    windows = period_windows()
+
+    lead_metrics = {
+        # Qualified leads that need contact
+        'call_queue': Q(status__in=['qualified', 'contacted', 'nurturing']),
+        'avg_response_time': Avg(
+            'response_time_hours',
+            filter=Q(contacted_by=user, response_time_hours__isnull=False),
+        ),
+    }
+    lead_metrics.update(windowed_metrics('contacted', 'first_contact_at', windows, contacted_by=user))
+    # Leads moved to warm/hot engagement
+    lead_metrics.update(windowed_metrics(
+        'warm', 'last_engagement_date', windows,
+        contacted_by=user, engagement_level__in=WARM_ENGAGEMENT_LEVELS,
+    ))
+    leads = aggregate_metrics(ASELead.objects.filter(company=company), lead_metrics)
+
+    activity_metrics = {}
+    activity_metrics.update(windowed_metrics('calls', 'created_at', windows, activity_type='call'))
+    activity_metrics.update(windowed_metrics('emails', 'created_at', windows, activity_type='email'))
+    activities = aggregate_metrics(
+        ASELeadActivity.objects.filter(
+            lead__company=company,
+            user=user,
+            activity_type__in=['call', 'email'],
+            created_at__date__gte=min(windows.week_start, windows.month_start),
+        ),
+        activity_metrics,
+    )
 
     # ── Daily Targets ─────────────────────────────────────────────────────────
     # Standard targets for BOE role
@@ -267,49 +228,10 @@ def _calculate_boe_stats(user):
         'contacts': 20,
     }
 
-    # ── This Week's Metrics ───────────────────────────────────────────────────
-    week_calls = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='call',
-        created_at__date__gte=week_start
-    ).count()
-
-    week_emails = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='email',
-        created_at__date__gte=week_start
-    ).count()
-
-    week_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        first_contact_at__date__gte=week_start
-    ).count()
-
-    # ── This Month's Metrics ──────────────────────────────────────────────────
-    month_calls = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='call',
-        created_at__date__gte=month_start
-    ).count()
-
-    month_emails = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='email',
-        created_at__date__gte=month_start
-    ).count()
-
-    month_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        first_contact_at__date__gte=month_start
-    ).count()
-
     # ── Performance Metrics ───────────────────────────────────────────────────
+    month_calls = activities['calls_month']
+    month_contacted = leads['contacted_month']
+
     # Contact rate (contacted / total calls)
     contact_rate = 0
     if month_calls > 0:
@@ -317,44 +239,34 @@ def _calculate_boe_stats(user):
 
     # Warm conversion rate (warm leads / contacted)
     warm_conversion = 0
-    month_warm_leads = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        engagement_level__in=['warm', 'hot', 'very_hot'],
-        last_engagement_date__date__gte=month_start
-    ).count()
     if month_contacted > 0:
-        warm_conversion = round((month_warm_leads / month_contacted) * 100, 1)
+        warm_conversion = round((leads['warm_month'] / month_contacted) * 100, 1)
 
     # Average response time
-    avg_response_time = ASELead.objects.filter(
-        company=company,
-        contacted_by=user,
-        response_time_hours__isnull=False
-    ).aggregate(avg_time=Avg('response_time_hours'))['avg_time']
+    avg_response_time = leads['avg_response_time']
     avg_response_time = round(avg_response_time, 1) if avg_response_time else 0
 
     return {
         'role': 'boe',
         'role_display': 'Business Outreach Executive',
         'call_queue': {
-            'total': call_queue_count,
+            'total': leads['call_queue'],
         },
         'today': {
-            'calls': today_calls,
-            'emails': today_emails,
-            'contacted': today_contacted,
-            'warm_leads': today_warm_leads,
+            'calls': activities['calls_today'],
+            'emails': activities['emails_today'],
+            'contacted': leads['contacted_today'],
+            'warm_leads': leads['warm_today'],
         },
         'daily_targets': daily_targets,
         'this_week': {
-            'calls': week_calls,
-            'emails': week_emails,
-            'contacted': week_contacted,
+            'calls': activities['calls_week'],
+            'emails': activities['emails_week'],
+            'contacted': leads['contacted_week'],
         },
         'this_month': {
             'calls': month_calls,
-            'emails': month_emails,
+            'emails': activities['emails_month'],
             'contacted': month_contacted,
         },
         'performance': {
@@ -369,6 +281,9 @@ def _calculate_boe_stats(user):
 # CRE Dashboard Stats
 # ══════════════════════════════════════════════════════════════════════════════
 
+CRE_ACTIVE_PIPELINE = ['contacted', 'proposal_sent', 'negotiating']
+
+
 def _calculate_cre_stats(user):
     """
     Calculate dashboard statistics for Client Research Executive (CRE).
@@ -380,145 +295,79 @@ def _calculate_cre_stats(user):
     - This month's metrics
     - Performance metrics (proposal win rate, avg deal size, avg sales cycle)
     - Expected revenue
+
+    Three queries: lead counters, meeting counters and the won-deal dates
+    for the average sales cycle.
     """
     company = user.company
-    today = timezone.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
-
-    # ── Pipeline Overview ─────────────────────────────────────────────────────
-    warm_leads = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='contacted'
-    ).count()
-
-    proposals_sent = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='proposal_sent'
-    ).count()
-
-    negotiating = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='negotiating'
-    ).count()
-
-    # Expected revenue (sum of estimated_project_value for active pipeline)
-    expected_revenue = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status__in=['contacted', 'proposal_sent', 'negotiating']
-    ).aggregate(
-        total=Sum('estimated_project_value')
-    )['total'] or 0
-
-    # ── Today's Metrics ───────────────────────────────────────────────────────
-    today_proposals = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        proposal_sent_at__date=today
-    ).count()
-
-    today_meetings = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='meeting',
-        created_at__date=today
-    ).count()
-
-    # ── This Week's Metrics ───────────────────────────────────────────────────
-    week_proposals = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        proposal_sent_at__date__gte=week_start
-    ).count()
-
-    week_meetings = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='meeting',
-        created_at__date__gte=week_start
-    ).count()
-
-    # ── This Month's Metrics ──────────────────────────────────────────────────
-    month_proposals = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        proposal_sent_at__date__gte=month_start
-    ).count()
-
-    month_meetings = ASELeadActivity.objects.filter(
-        lead__company=company,
-        user=user,
-        activity_type='meeting',
-        created_at__date__gte=month_start
-    ).count()
-
-    month_won = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='won',
-        deal_closed_at__date__gte=month_start
-    ).count()
+    windows = period_windows()
+    managed = ASELead.objects.filter(company=company, managed_by=user)
+    won_this_month = Q(status='won', deal_closed_at__date__gte=windows.month_start)
+
+    lead_metrics = {
+        'warm_leads': Q(status='contacted'),
+        'proposals_sent': Q(status='proposal_sent'),
+        'negotiating': Q(status='negotiating'),
+        # Expected revenue (sum of estimated_project_value for active pipeline)
+        'expected_revenue': Sum('estimated_project_value', filter=Q(status__in=CRE_ACTIVE_PIPELINE)),
+        'month_won': won_this_month,
+        # Average deal size (won deals this month)
+        'avg_deal_size': Avg('estimated_project_value', filter=won_this_month),
+    }
+    lead_metrics.update(windowed_metrics('proposals', 'proposal_sent_at', windows))
+    leads = aggregate_metrics(managed, lead_metrics)
+
+    meetings = aggregate_metrics(
+        ASELeadActivity.objects.filter(
+            lead__company=company,
+            user=user,
+            activity_type='meeting',
+            created_at__date__gte=min(windows.week_start, windows.month_start),
+        ),
+        windowed_metrics('meetings', 'created_at', windows),
+    )
 
     # ── Performance Metrics ───────────────────────────────────────────────────
     # Proposal win rate (won / proposals sent)
     proposal_win_rate = 0
-    if month_proposals > 0:
-        proposal_win_rate = round((month_won / month_proposals) * 100, 1)
+    if leads['proposals_month'] > 0:
+        proposal_win_rate = round((leads['month_won'] / leads['proposals_month']) * 100, 1)
 
-    # Average deal size (won deals this month)
-    avg_deal_size = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
-        status='won',
-        deal_closed_at__date__gte=month_start
-    ).aggregate(avg_value=Avg('estimated_project_value'))['avg_value']
-    avg_deal_size = round(avg_deal_size, 2) if avg_deal_size else 0
+    avg_deal_size = round(leads['avg_deal_size'], 2) if leads['avg_deal_size'] else 0
 
     # Average sales cycle (days from first_contact_at to deal_closed_at for won deals)
-    won_deals = ASELead.objects.filter(
-        company=company,
-        managed_by=user,
+    won_dates = managed.filter(
         status='won',
         first_contact_at__isnull=False,
         deal_closed_at__isnull=False
-    ).only('first_contact_at', 'deal_closed_at')
-    
+    ).values_list('first_contact_at', 'deal_closed_at')
+
     avg_sales_cycle = 0
-    if won_deals.exists():
-        total_days = 0
-        count = 0
-        for lead in won_deals:
-            delta = lead.deal_closed_at - lead.first_contact_at
-            total_days += delta.days
-            count += 1
-        if count > 0:
-            avg_sales_cycle = round(total_days / count, 1)
+    cycle_days = [(closed - contacted).days for contacted, closed in won_dates]
+    if cycle_days:
+        avg_sales_cycle = round(sum(cycle_days) / len(cycle_days), 1)
 
     return {
         'role': 'cre',
         'role_display': 'Client Research Executive',
         'pipeline': {
-            'warm_leads': warm_leads,
-            'proposals_sent': proposals_sent,
-            'negotiating': negotiating,
-            'expected_revenue': float(expected_revenue),
+            'warm_leads': leads['warm_leads'],
+            'proposals_sent': leads['proposals_sent'],
+            'negotiating': leads['negotiating'],
+            'expected_revenue': float(leads['expected_revenue'] or 0),
         },
         'today': {
-            'proposals': today_proposals,
-            'meetings': today_meetings,
+            'proposals': leads['proposals_today'],
+            'meetings': meetings['meetings_today'],
         },
         'this_week': {
-            'proposals': week_proposals,
-            'meetings': week_meetings,
+            'proposals': leads['proposals_week'],
+            'meetings': meetings['meetings_week'],
         },
         'this_month': {
-            'proposals': month_proposals,
-            'meetings': month_meetings,
-            'won': month_won,
+            'proposals': leads['proposals_month'],
+            'meetings': meetings['meetings_month'],
+            'won': leads['month_won'],
         },
         'performance': {
             'proposal_win_rate': proposal_win_rate,
@@ -532,6 +381,18 @@ def _calculate_cre_stats(user):
 # Marketing Lead Dashboard Stats
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Pipeline visualization buckets -> statuses counted in each
+PIPELINE_STAGES = {
+    'new': ['new'],
+    'qualified': ['qualified'],
+    'contacted': ['contacted', 'nurturing'],
+    'proposal_sent': ['proposal_sent'],
+    'negotiating': ['negotiating'],
+    'won': ['won'],
+    'lost': ['lost'],
+}
+
+
 def _calculate_marketing_lead_stats(user):
     """
     Calculate dashboard statistics for Marketing Team Lead.
@@ -541,47 +402,49 @@ def _calculate_marketing_lead_stats(user):
     - Team performance by role (BRE, BOE, CRE)
     - Pipeline visualization data
     - Action items (leads needing assignment, proposals pending, high-value deals)
+
+    Two queries: one over the company's leads, one for the month's calls.
     """
     company = user.company
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
+    month_start = period_windows().month_start
+
+    researched = Q(research_completed_at__date__gte=month_start)
+    contacted_this_month = Q(first_contact_at__date__gte=month_start)
+    proposed = Q(proposal_sent_at__date__gte=month_start)
+    won_this_month = Q(status='won', deal_closed_at__date__gte=month_start)
+
+    metrics = {
+        # ── Team-Wide Metrics (This Month) ────────────────────────────────────
+        'total_leads': Q(created_at__date__gte=month_start),
+        'qualified': researched & Q(status='qualified'),
+        'contacted': contacted_this_month & Q(status__in=['contacted', 'nurturing']),
+        'proposals': proposed & Q(status__in=['proposal_sent', 'negotiating']),
+        'won': won_this_month,
+        # Revenue (sum of estimated_project_value for won deals this month)
+        'revenue': Sum('estimated_project_value', filter=won_this_month),
+        # ── Team Performance by Role ──────────────────────────────────────────
+        'bre_researched': researched & Q(researched_by__isnull=False),
+        'bre_qualified': researched & Q(researched_by__isnull=False, status='qualified'),
+        'boe_contacted': contacted_this_month & Q(contacted_by__isnull=False),
+        'cre_proposals': proposed & Q(managed_by__isnull=False),
+        'cre_won': won_this_month & Q(managed_by__isnull=False),
+        # ── Action Items ──────────────────────────────────────────────────────
+        'leads_needing_assignment': Q(status='new', assigned_to__isnull=True),
+        'high_value_deals': Q(status='negotiating', estimated_project_value__gte=100000),  # High-value threshold
+    }
+    for stage, statuses in PIPELINE_STAGES.items():
+        metrics[f'pipeline_{stage}'] = Q(status__in=statuses)
+    m = aggregate_metrics(ASELead.objects.filter(company=company), metrics)
 
-    # ── Team-Wide Metrics (This Month) ────────────────────────────────────────
-    total_leads = ASELead.objects.filter(
-        company=company,
+    boe_calls = ASELeadActivity.objects.filter(
+        lead__company=company,
+        activity_type='call',
         created_at__date__gte=month_start
     ).count()
 
-    qualified = ASELead.objects.filter(
-        company=company,
-        status='qualified',
-        research_completed_at__date__gte=month_start
-    ).count()
-
-    contacted = ASELead.objects.filter(
-        company=company,
-        status__in=['contacted', 'nurturing'],
-        first_contact_at__date__gte=month_start
-    ).count()
-
-    proposals = ASELead.objects.filter(
-        company=company,
-        status__in=['proposal_sent', 'negotiating'],
-        proposal_sent_at__date__gte=month_start
-    ).count()
-
-    won = ASELead.objects.filter(
-        company=company,
-        status='won',
-        deal_closed_at__date__gte=month_start
-    ).count()
-
-    # Revenue (sum of estimated_project_value for won deals this month)
-    revenue = ASELead.objects.filter(
-        company=company,
-        status='won',
-        deal_closed_at__date__gte=month_start
-    ).aggregate(total=Sum('estimated_project_value'))['total'] or 0
+    total_leads, qualified, contacted, proposals, won = (
+        m['total_leads'], m['qualified'], m['contacted'], m['proposals'], m['won']
+    )
 
     # Conversion rates
     qualification_rate = round((qualified / total_leads) * 100, 1) if total_leads > 0 else 0
@@ -589,83 +452,15 @@ def _calculate_marketing_lead_stats(user):
     proposal_rate = round((proposals / contacted) * 100, 1) if contacted > 0 else 0
     win_rate = round((won / proposals) * 100, 1) if proposals > 0 else 0
 
-    # ── Team Performance by Role ──────────────────────────────────────────────
-    # BRE Team
-    bre_researched = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        research_completed_at__date__gte=month_start
-    ).count()
-
-    bre_qualified = ASELead.objects.filter(
-        company=company,
-        researched_by__isnull=False,
-        status='qualified',
-        research_completed_at__date__gte=month_start
-    ).count()
-
+    bre_researched, bre_qualified = m['bre_researched'], m['bre_qualified']
     bre_qualification_rate = round((bre_qualified / bre_researched) * 100, 1) if bre_researched > 0 else 0
 
-    # BOE Team
-    boe_calls = ASELeadActivity.objects.filter(
-        lead__company=company,
-        activity_type='call',
-        created_at__date__gte=month_start
-    ).count()
-
-    boe_contacted = ASELead.objects.filter(
-        company=company,
-        contacted_by__isnull=False,
-        first_contact_at__date__gte=month_start
-    ).count()
-
+    boe_contacted = m['boe_contacted']
     boe_contact_rate = round((boe_contacted / boe_calls) * 100, 1) if boe_calls > 0 else 0
 
-    # CRE Team
-    cre_proposals = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        proposal_sent_at__date__gte=month_start
-    ).count()
-
-    cre_won = ASELead.objects.filter(
-        company=company,
-        managed_by__isnull=False,
-        status='won',
-        deal_closed_at__date__gte=month_start
-    ).count()
-
+    cre_proposals, cre_won = m['cre_proposals'], m['cre_won']
     cre_win_rate = round((cre_won / cre_proposals) * 100, 1) if cre_proposals > 0 else 0
 
-    # ── Pipeline Visualization ────────────────────────────────────────────────
-    pipeline = {
-        'new': ASELead.objects.filter(company=company, status='new').count(),
-        'qualified': ASELead.objects.filter(company=company, status='qualified').count(),
-        'contacted': ASELead.objects.filter(company=company, status__in=['contacted', 'nurturing']).count(),
-        'proposal_sent': ASELead.objects.filter(company=company, status='proposal_sent').count(),
-        'negotiating': ASELead.objects.filter(company=company, status='negotiating').count(),
-        'won': ASELead.objects.filter(company=company, status='won').count(),
-        'lost': ASELead.objects.filter(company=company, status='lost').count(),
-    }
-
-    # ── Action Items ──────────────────────────────────────────────────────────
-    leads_needing_assignment = ASELead.objects.filter(
-        company=company,
-        status='new',
-        assigned_to__isnull=True
-    ).count()
-
-    proposals_pending_review = ASELead.objects.filter(
-        company=company,
-        status='proposal_sent'
-    ).count()
-
-    high_value_deals = ASELead.objects.filter(
-        company=company,
-        status='negotiating',
-        estimated_project_value__gte=100000  # High-value threshold
-    ).count()
-
     return {
         'role': 'marketing_lead',
         'role_display': 'Marketing Team Lead',
@@ -675,7 +470,7 @@ def _calculate_marketing_lead_stats(user):
             'contacted': contacted,
             'proposals': proposals,
             'won': won,
-            'revenue': float(revenue),
+            'revenue': float(m['revenue'] or 0),
             'qualification_rate': qualification_rate,
             'contact_rate': contact_rate,
             'proposal_rate': proposal_rate,
@@ -698,10 +493,10 @@ def _calculate_marketing_lead_stats(user):
                 'win_rate': cre_win_rate,
             },
         },
-        'pipeline': pipeline,
+        'pipeline': {stage: m[f'pipeline_{stage}'] for stage in PIPELINE_STAGES},
         'action_items': {
-            'leads_needing_assignment': leads_needing_assignment,
-            'proposals_pending_review': proposals_pending_review,
-            'high_value_deals': high_value_deals,
+            'leads_needing_assignment': m['leads_needing_assignment'],
+            'proposals_pending_review': m['pipeline_proposal_sent'],
+            'high_value_deals': m['high_value_deals'],
         },
     }
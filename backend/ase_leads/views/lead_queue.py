@@ -30,7 +30,6 @@ Query parameters
   ?page_size=<n>           Page size (default: 50, max: 2000)
 """
 
-from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -40,9 +39,12 @@ from rest_framework.pagination import PageNumberPagination
 from ase_leads.models import ASELead
 from ase_leads.permissions import ASEMarketingPermission
 from ase_leads.serializers import ASELeadListSerializer
+from ase_leads.transitions import with_status_changed_at
+from utils.pagination import KeysetPaginationMixin
+from utils.phones import phone_or_text_q
 
 
-class ASELeadPagination(PageNumberPagination):
+class ASELeadPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination class for ASE lead list endpoints.
     Mirrors the settings used by ASELeadViewSet in views.py.
@@ -129,12 +131,7 @@ def my_lead_queue(request):
 
     search = request.query_params.get('search', '').strip()
     if search:
-        qs = qs.filter(
-            Q(company_name__icontains=search)
-            | Q(contact_person__icontains=search)
-            | Q(phone__icontains=search)
-            | Q(notes__icontains=search)
-        )
+        qs = qs.filter(phone_or_text_q(search, 'phone', 'company_name', 'contact_person', 'notes'))
 
     # ── 3. Ordering ───────────────────────────────────────────────────────────
     ordering = request.query_params.get('ordering', '-created_at').strip()
@@ -145,6 +142,7 @@ def my_lead_queue(request):
         qs = qs.order_by('-created_at')
 
     # ── 4. Pagination ─────────────────────────────────────────────────────────
+    qs = with_status_changed_at(qs)
     paginator = ASELeadPagination()
     page = paginator.paginate_queryset(qs, request)
     if page is not None:
@@ -28,6 +28,7 @@ from ase_leads.models import ASELead
 from ase_leads.models.task import ASELeadTask
 from ase_leads.serializers import ASELeadTaskSerializer
 from eswari_crm.ws_utils import notify_ase_data_changed
+from utils.pagination import keyset_page
 
 User = get_user_model()
 
@@ -39,8 +40,18 @@ def _paginate_queryset(queryset, request):
     Helper to paginate a queryset and return a standardised response dict.
 
     Returns:
-        dict with keys: results, count, page, total_pages
+        dict with keys: results, count, page, total_pages; with a ``cursor``
+        parameter (keyset mode, see utils.pagination): results, count, next_cursor
     """
+    if 'cursor' in request.query_params:
+        page = keyset_page(queryset, request, PAGE_SIZE)
+        serializer = ASELeadTaskSerializer(page.objects, many=True, context={'request': request})
+        return {
+            'results': serializer.data,
+            'count': page.count,
+            'next_cursor': page.next_cursor,
+        }
+
     page_number = request.query_params.get('page', 1)
     try:
         page_number = int(page_number)
@@ -301,7 +312,10 @@ def update_task(request, pk):
 
     # Return serialized task
     serializer = ASELeadTaskSerializer(task, context={'request': request})
-    notify_ase_data_changed('tasks', 'updated', record_id=task.id)
+    notify_ase_data_changed(
+        'tasks', 'updated', record_id=task.id,
+        fields=[field for field in updatable_fields if field in request.data],
+    )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -343,7 +357,10 @@ def complete_task(request, pk):
 
     # Return serialized task
     serializer = ASELeadTaskSerializer(task, context={'request': request})
-    notify_ase_data_changed('tasks', 'updated', record_id=task.id, extra={'status': 'completed'})
+    notify_ase_data_changed(
+        'tasks', 'updated', record_id=task.id, extra={'status': 'completed'},
+        fields=['status', 'completed_at', 'closed_by'],
+    )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -13,16 +13,39 @@ from django.db import transaction
 from django.utils import timezone
 from leads.models import Lead
 from ase_leads.models import ASELead
+from ase_leads.rollups import refresh_lead_rollups
+from ase_leads.transitions import record_bulk_transitions, statuses_before_update
 from capital.models import CapitalCustomer, CapitalLead, CapitalLoan, CapitalService
+from search.services import reindex
 from tasks.models import Task
 from accounts.models import User
-from eswari_crm.ws_utils import notify_ase_data_changed
+from eswari_crm.ws_utils import notify_ase_data_changed, notify_company_changed
+from utils.cache_versions import bump_company
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _invalidate_caches(queryset):
+    """.update() skips model signals; bump the affected companies' cache generations."""
+    for company_id in queryset.order_by().values_list('company_id', flat=True).distinct():
+        bump_company(company_id)
+
+
+def _notify_changed(queryset, event_type, entity, **extra):
+    """One summary change event per affected company, listing the record ids."""
+    by_company = {}
+    for company_id, record_id in queryset.order_by().values_list('company_id', 'id'):
+        by_company.setdefault(company_id, []).append(record_id)
+    for company_id, record_ids in by_company.items():
+        if company_id:
+            notify_company_changed(
+                company_id, event_type, entity, 'bulk_updated',
+                record_ids=record_ids, extra=extra, fields=[extra['field']],
+            )
+
+
 def _check_permission(user):
     """Only admin and manager can perform bulk operations."""
     if user.role not in ('admin', 'manager'):
@@ -66,6 +89,11 @@ def bulk_assign_leads(request):
             assigned_to=assignee,
             updated_at=timezone.now()
         )
+        _invalidate_caches(Lead.objects.filter(id__in=lead_ids))
+        reindex(Lead, lead_ids)
+
+    if updated > 0:
+        _notify_changed(Lead.objects.filter(id__in=lead_ids), 'lead_updated', 'leads', field='assigned_to')
 
     return Response({
         'updated': updated,
@@ -104,9 +132,15 @@ def bulk_assign_ase_leads(request):
             assigned_to=assignee,
             updated_at=timezone.now()
         )
+        _invalidate_caches(ASELead.objects.filter(id__in=lead_ids))
+        reindex(ASELead, lead_ids)
 
     if updated > 0:
-        notify_ase_data_changed('leads', 'bulk_updated', extra={'count': updated, 'field': 'assigned_to'})
+        notify_ase_data_changed(
+            'leads', 'bulk_updated', extra={'field': 'assigned_to'},
+            record_ids=ASELead.objects.filter(id__in=lead_ids).values_list('id', flat=True),
+            fields=['assigned_to'],
+        )
 
     return Response({
         'updated': updated,
@@ -147,6 +181,12 @@ def bulk_update_lead_status(request):
             status=new_status,
             updated_at=timezone.now()
         )
+        _invalidate_caches(Lead.objects.filter(id__in=lead_ids))
+
+    if updated > 0:
+        _notify_changed(
+            Lead.objects.filter(id__in=lead_ids), 'lead_updated', 'leads', field='status', new_status=new_status,
+        )
 
     return Response({'updated': updated, 'new_status': new_status})
 
@@ -177,13 +217,22 @@ def bulk_update_ase_lead_status(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     with transaction.atomic():
+        previous = statuses_before_update(ASELead.objects.select_for_update().filter(id__in=lead_ids))
         updated = ASELead.objects.filter(id__in=lead_ids).update(
             status=new_status,
             updated_at=timezone.now()
         )
+        _invalidate_caches(ASELead.objects.filter(id__in=lead_ids))
+        # .update() skips the model signals that maintain the daily rollups
+        # and the status ledger
+        refresh_lead_rollups(ASELead.objects.filter(id__in=lead_ids))
+        record_bulk_transitions(previous, new_status, user=request.user)
 
     if updated > 0:
-        notify_ase_data_changed('leads', 'bulk_updated', extra={'count': updated, 'field': 'status', 'new_status': new_status})
+        notify_ase_data_changed(
+            'leads', 'bulk_updated', extra={'field': 'status', 'new_status': new_status},
+            record_ids=[lead_id for lead_id, _, _ in previous], fields=['status'],
+        )
 
     return Response({'updated': updated, 'new_status': new_status})
 
@@ -220,6 +269,12 @@ def bulk_update_task_status(request):
             status=new_status,
             updated_at=timezone.now()
         )
+        _invalidate_caches(Task.objects.filter(id__in=task_ids))
+
+    if updated > 0:
+        _notify_changed(
+            Task.objects.filter(id__in=task_ids), 'task_updated', 'tasks', field='status', new_status=new_status,
+        )
 
     return Response({'updated': updated, 'new_status': new_status})
 
@@ -256,6 +311,7 @@ def bulk_update_capital_loan_status(request):
             status=new_status,
             updated_at=timezone.now()
         )
+        _invalidate_caches(CapitalLoan.objects.filter(id__in=loan_ids))
 
     return Response({'updated': updated, 'new_status': new_status})
  
@@ -297,6 +353,8 @@ def bulk_assign_capital_customers(request):
             assigned_to=assignee,
             updated_at=timezone.now()
         )
+        _invalidate_caches(CapitalCustomer.objects.filter(id__in=customer_ids))
+        reindex(CapitalCustomer, customer_ids)
 
     return Response({
         'updated': updated,
@@ -0,0 +1,149 @@
+"""
+Importers behind the Eswari Capital ``bulk_import`` actions (run through import_jobs).
+"""
+from django.db import transaction
+
+from import_jobs.base import BaseImporter
+from search.services import index_created
+from utils.phones import NormalizedPhoneModel, set_normalized_phones
+from .models import CapitalCustomer, CapitalLead, CapitalTask, CapitalLoan, CapitalService
+
+
+class CapitalRowImporter(BaseImporter):
+    """Build one ``model`` instance per JSON row and bulk insert each batch."""
+
+    model = None
+    batch_size = 200
+    ignore_conflicts = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen_phones = set()
+
+    def build(self, row):
+        raise NotImplementedError
+
+    def process_batch(self, batch, first_row_num):
+        to_create = [self.build(row) for row in batch]
+        if issubclass(self.model, NormalizedPhoneModel):
+            to_create = self.skip_known_phones(set_normalized_phones(to_create))
+        if not self.ignore_conflicts:
+            with transaction.atomic():
+                index_created(self.model.objects.bulk_create(to_create))
+            self.created += len(to_create)
+            return
+        # Models imported with ignore_conflicts are unique per (phone, company)
+        batch_rows = self.model.objects.filter(company=self.company, phone__in=[obj.phone for obj in to_create])
+        with transaction.atomic():
+            before = batch_rows.count()
+            index_created(self.model.objects.bulk_create(to_create, ignore_conflicts=True))
+            # Rows the database ignored are duplicates, not imports
+            inserted = batch_rows.count() - before
+        self.created += inserted
+        self.duplicates += len(to_create) - inserted
+
+    def skip_known_phones(self, objs):
+        """Drop rows whose number the company (or an earlier row) already has."""
+        existing = set(self.model.objects.filter(
+            company=self.company,
+            normalized_phone__in={obj.normalized_phone for obj in objs} - {''},
+        ).values_list('normalized_phone', flat=True))
+        kept = []
+        for obj in objs:
+            phone = obj.normalized_phone
+            if phone and (phone in existing or phone in self.seen_phones):
+                self.duplicates += 1
+                continue
+            self.seen_phones.add(phone)
+            kept.append(obj)
+        return kept
+
+    def result(self):
+        return {'imported': self.created}
+
+
+class CapitalCustomerImporter(CapitalRowImporter):
+    model = CapitalCustomer
+    ignore_conflicts = True
+
+    def build(self, row):
+        return CapitalCustomer(
+            name=row.get('name', ''),
+            phone=row.get('phone', ''),
+            email=row.get('email') or None,
+            company_name=row.get('company_name', ''),
+            call_status=row.get('call_status', 'pending'),
+            notes=row.get('notes', ''),
+            company=self.company,
+            created_by=self.user,
+        )
+
+
+class CapitalLeadImporter(CapitalRowImporter):
+    model = CapitalLead
+    ignore_conflicts = True
+
+    def build(self, row):
+        return CapitalLead(
+            name=row.get('name', ''),
+            phone=row.get('phone', ''),
+            email=row.get('email', ''),
+            address=row.get('address', ''),
+            status=row.get('status', 'new'),
+            source=row.get('source', 'website'),
+            description=row.get('description', ''),
+            company=self.company,
+            created_by=self.user,
+        )
+
+
+class CapitalTaskImporter(CapitalRowImporter):
+    model = CapitalTask
+
+    def build(self, row):
+        return CapitalTask(
+            title=row.get('title', ''),
+            description=row.get('description', ''),
+            status=row.get('status', 'in_progress'),
+            priority=row.get('priority', 'medium'),
+            company=self.company,
+            created_by=self.user,
+        )
+
+
+class CapitalLoanImporter(CapitalRowImporter):
+    model = CapitalLoan
+
+    def build(self, row):
+        return CapitalLoan(
+            applicant_name=row.get('applicant_name', ''),
+            phone=row.get('phone', ''),
+            email=row.get('email') or None,
+            loan_type=row.get('loan_type', 'personal'),
+            loan_amount=row.get('loan_amount') or None,
+            tenure_months=row.get('tenure_months') or None,
+            bank_name=row.get('bank_name', ''),
+            status=row.get('status', 'inquiry'),
+            notes=row.get('notes', ''),
+            company=self.company,
+            created_by=self.user,
+        )
+
+
+class CapitalServiceImporter(CapitalRowImporter):
+    model = CapitalService
+
+    def build(self, row):
+        return CapitalService(
+            client_name=row.get('client_name', ''),
+            phone=row.get('phone', ''),
+            email=row.get('email') or None,
+            pan_number=row.get('pan_number', ''),
+            business_name=row.get('business_name', ''),
+            service_type=row.get('service_type', 'gst_registration'),
+            financial_year=row.get('financial_year', ''),
+            status=row.get('status', 'inquiry'),
+            notes=row.get('notes', ''),
+            company=self.company,
+            created_by=self.user,
+        )
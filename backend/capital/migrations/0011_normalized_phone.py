@@ -0,0 +1,31 @@
+"""
+Adds normalized_phone (digits-only phone used for duplicate detection) with a
+(company, normalized_phone) index, and fills it in for existing rows.
+"""
+from django.db import migrations, models
+
+from utils.phones import backfill_normalized_phones
+
+
+def populate_normalized_phone(apps, schema_editor):
+    backfill_normalized_phones(apps.get_model('capital', 'CapitalCustomer'), 'phone')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('capital', '0010_add_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='capitalcustomer',
+            name='normalized_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Digits-only phone used for duplicate detection', max_length=20),
+        ),
+        migrations.RunPython(populate_normalized_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='capitalcustomer',
+            index=models.Index(fields=['company', 'normalized_phone'], name='capcust_company_norm_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+"""
+Adds reversed_phone (normalized_phone reversed, for indexed last-digits
+search) with a (company, reversed_phone) index, and fills it in for existing
+rows.
+"""
+from django.db import migrations, models
+
+from utils.phones import backfill_reversed_phones
+
+
+def populate_reversed_phone(apps, schema_editor):
+    backfill_reversed_phones(apps.get_model('capital', 'CapitalCustomer'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('capital', '0011_normalized_phone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='capitalcustomer',
+            name='reversed_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='normalized_phone reversed, for indexed last-digits search', max_length=20),
+        ),
+        migrations.RunPython(populate_reversed_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='capitalcustomer',
+            index=models.Index(fields=['company', 'reversed_phone'], name='capcust_company_rev_phone_idx'),
+        ),
+    ]
@@ -2,8 +2,11 @@ from django.db import models
 from django.conf import settings
 from decimal import Decimal
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
 
-class CapitalCustomer(models.Model):
+
+class CapitalCustomer(NormalizedPhoneModel):
     CALL_STATUS_CHOICES = [
         ('pending', 'Pending'), ('answered', 'Answered'), ('not_answered', 'Not Answered'),
         ('busy', 'Busy'), ('not_interested', 'Not Interested'), ('custom', 'Custom'),
@@ -36,19 +39,21 @@ class CapitalCustomer(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = [('phone', 'company')]
-        indexes = [models.Index(fields=['company']), models.Index(fields=['call_status']), models.Index(fields=['assigned_to'])]
+        indexes = [
+            models.Index(fields=['company']), models.Index(fields=['call_status']), models.Index(fields=['assigned_to']),
+            models.Index(fields=['company', 'normalized_phone'], name='capcust_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='capcust_company_rev_phone_idx'),
+        ]
 
     def __str__(self): return f"{self.name or 'Unknown'} - {self.phone}"
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
 
     @property
     def created_by_name(self):
-        return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
+        return user_directory.name(self.created_by_id)
 
 
 class CapitalLead(models.Model):
@@ -79,15 +84,11 @@ class CapitalLead(models.Model):
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
 
 class CapitalTask(models.Model):
@@ -118,15 +119,11 @@ class CapitalTask(models.Model):
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
 
 class CapitalLoan(models.Model):
@@ -173,15 +170,11 @@ class CapitalLoan(models.Model):
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
 
 class CapitalService(models.Model):
@@ -307,15 +300,11 @@ class CapitalService(models.Model):
 
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
 
     @property
     def created_by_name(self):
-        if self.created_by:
-            return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
-        return None
+        return user_directory.name(self.created_by_id)
 
 
 
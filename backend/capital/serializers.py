@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from accounts.directory import user_directory
 from .models import (
     CapitalCustomer, CapitalLead, CapitalTask, CapitalLoan, CapitalService,
     LoanDocument, LoanApprovalStage, BankInterestRate, BankLoanStatus
@@ -146,9 +147,7 @@ class LoanDocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ['verified_by', 'verified_at', 'created_at', 'updated_at']
     
     def get_verified_by_name(self, obj):
-        if obj.verified_by:
-            return f"{obj.verified_by.first_name} {obj.verified_by.last_name}".strip() or obj.verified_by.username
-        return None
+        return user_directory.name(obj.verified_by_id)
 
 
 class LoanApprovalStageSerializer(serializers.ModelSerializer):
@@ -163,14 +162,10 @@ class LoanApprovalStageSerializer(serializers.ModelSerializer):
         read_only_fields = ['completed_by', 'completed_at', 'created_at', 'updated_at']
     
     def get_assigned_to_name(self, obj):
-        if obj.assigned_to:
-            return f"{obj.assigned_to.first_name} {obj.assigned_to.last_name}".strip() or obj.assigned_to.username
-        return None
+        return user_directory.name(obj.assigned_to_id)
     
     def get_completed_by_name(self, obj):
-        if obj.completed_by:
-            return f"{obj.completed_by.first_name} {obj.completed_by.last_name}".strip() or obj.completed_by.username
-        return None
+        return user_directory.name(obj.completed_by_id)
 
 
 class BankInterestRateSerializer(serializers.ModelSerializer):
@@ -192,9 +187,7 @@ class BankLoanStatusSerializer(serializers.ModelSerializer):
         read_only_fields = ['last_updated_by', 'created_at', 'updated_at']
     
     def get_last_updated_by_name(self, obj):
-        if obj.last_updated_by:
-            return f"{obj.last_updated_by.first_name} {obj.last_updated_by.last_name}".strip() or obj.last_updated_by.username
-        return None
+        return user_directory.name(obj.last_updated_by_id)
 
 
 class CapitalLoanDetailSerializer(CapitalLoanSerializer):
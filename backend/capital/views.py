@@ -5,22 +5,75 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
-from django.db import transaction, IntegrityError
+from django.db import IntegrityError
 from django.utils import timezone
 from decimal import Decimal
 
 from .models import CapitalCustomer, CapitalLead, CapitalTask, CapitalLoan, CapitalService
 from .serializers import CapitalCustomerSerializer, CapitalLeadSerializer, CapitalTaskSerializer, CapitalLoanSerializer, CapitalServiceSerializer
 from accounts.permissions import CompanyAccessPermission
+from accounts.registry import company_registry
+from accounts.scopes import access_scope
+from import_jobs.services import submit_import, wants_background
+from import_jobs.views import import_response
+from utils.exports import ExportColumn, export_response
+from utils.pagination import KeysetPaginationMixin
+from utils.phones import PhoneSearchFilter
 
 
 CAPITAL_CODE = 'ESWARI_CAP'
 
+LOAN_EXPORT_COLUMNS = [
+    ExportColumn('applicant_name', 'Applicant Name'),
+    ExportColumn('phone', 'Phone', text=True),
+    ExportColumn('email', 'Email'),
+    ExportColumn('address', 'Address'),
+    ExportColumn('loan_type', 'Loan Type', lambda l: l.get_loan_type_display()),
+    ExportColumn('loan_amount', 'Loan Amount'),
+    ExportColumn('tenure_months', 'Tenure (Months)'),
+    ExportColumn('interest_rate', 'Interest Rate'),
+    ExportColumn('bank_name', 'Bank Name'),
+    ExportColumn('status', 'Status', lambda l: l.get_status_display()),
+    ExportColumn('notes', 'Notes', width=30),
+    ExportColumn('assigned_to', 'Assigned To', lambda l: l.assigned_to_name),
+]
+
+SERVICE_EXPORT_COLUMNS = [
+    ExportColumn('client_name', 'Client Name'),
+    ExportColumn('phone', 'Phone', text=True),
+    ExportColumn('email', 'Email'),
+    ExportColumn('business_name', 'Business Name'),
+    ExportColumn('city_state', 'City/State'),
+    ExportColumn('service_type', 'Service Type', lambda s: s.get_service_type_display()),
+    ExportColumn('status', 'Status', lambda s: s.get_status_display()),
+    ExportColumn('pan_number', 'PAN Number'),
+    ExportColumn('aadhaar_number', 'Aadhaar Number'),
+    ExportColumn('financial_year', 'Financial Year'),
+    ExportColumn('service_fee', 'Service Fee'),
+    ExportColumn('notes', 'Notes', width=30),
+    ExportColumn('assigned_to', 'Assigned To', lambda s: s.assigned_to_name),
+]
+
 
 def get_capital_company(user):
     """Get the Eswari Capital company object."""
-    from accounts.models import Company
-    return Company.objects.filter(code=CAPITAL_CODE).first()
+    return company_registry.by_code(CAPITAL_CODE)
+
+
+def capital_bulk_import(request, key, kind):
+    """
+    Shared body of the ``bulk_import`` actions: ``{key: [rows]}`` is imported
+    by the matching capital.importers class through an ImportJob (queued for
+    the import worker when ``async`` is true).
+    """
+    rows = request.data.get(key, [])
+    if not rows:
+        return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
+    company = get_capital_company(request.user)
+    if not company:
+        return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
+    job = submit_import(kind, request.user, company, rows=rows, background=wants_background(request))
+    return import_response(job)
 
 
 @api_view(['GET'])
@@ -68,8 +121,7 @@ def capital_company_info(request):
 
 def get_capital_queryset(qs, user):
     """Scope queryset to Eswari Capital and apply role-based filtering."""
-    from accounts.models import Company
-    company = Company.objects.filter(code=CAPITAL_CODE).first()
+    company = company_registry.by_code(CAPITAL_CODE)
     if not company:
         return qs.none()
 
@@ -79,24 +131,15 @@ def get_capital_queryset(qs, user):
         return qs
     if user.role in ['hr']:
         return qs
-    if user.role == 'manager':
-        employee_ids = list(
-            user.__class__.objects.filter(manager=user, is_active=True).values_list('id', flat=True)
-        )
-        employee_ids.append(user.id)
-        return qs.filter(
-            Q(assigned_to__id__in=employee_ids) | Q(created_by__id__in=employee_ids)
-        ).distinct()
-    if user.role == 'employee':
-        # Employees see records assigned to them OR created by them
-        return qs.filter(
-            Q(assigned_to=user) | Q(created_by=user)
-        ).distinct()
+    if user.role in ['manager', 'employee']:
+        # Managers see their reporting tree's records; employees see records
+        # assigned to them OR created by them
+        return qs.filter(access_scope(user).q('assigned_to', 'created_by')).distinct()
 
     return qs.none()
 
 
-class StandardPagination(PageNumberPagination):
+class StandardPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = 100  # Default 100 rows per page for fast loading
     page_size_query_param = 'page_size'
     max_page_size = 2000  # Maximum allowed
@@ -106,7 +149,7 @@ class CapitalCustomerViewSet(viewsets.ModelViewSet):
     serializer_class = CapitalCustomerSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PhoneSearchFilter, filters.OrderingFilter]
     filterset_fields = ['call_status', 'assigned_to', 'is_converted']
     search_fields = ['name', 'phone', 'email', 'company_name', 'notes']
     ordering_fields = ['created_at', 'name', 'call_status']
@@ -114,7 +157,7 @@ class CapitalCustomerViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return get_capital_queryset(
-            CapitalCustomer.objects.select_related('assigned_to', 'created_by', 'company'),
+            CapitalCustomer.objects.select_related('company'),
             self.request.user
         )
 
@@ -175,27 +218,7 @@ class CapitalCustomerViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
-        rows = request.data.get('customers', [])
-        if not rows:
-            return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
-        company = get_capital_company(request.user)
-        if not company:
-            return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
-        to_create = []
-        for row in rows:
-            to_create.append(CapitalCustomer(
-                name=row.get('name', ''),
-                phone=row.get('phone', ''),
-                email=row.get('email') or None,
-                company_name=row.get('company_name', ''),
-                call_status=row.get('call_status', 'pending'),
-                notes=row.get('notes', ''),
-                company=company,
-                created_by=request.user,
-            ))
-        with transaction.atomic():
-            created = CapitalCustomer.objects.bulk_create(to_create, batch_size=200, ignore_conflicts=True)
-        return Response({'imported': len(created)}, status=status.HTTP_201_CREATED)
+        return capital_bulk_import(request, 'customers', 'capital_customers')
 
 
 class CapitalLeadViewSet(viewsets.ModelViewSet):
@@ -210,7 +233,7 @@ class CapitalLeadViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return get_capital_queryset(
-            CapitalLead.objects.select_related('assigned_to', 'created_by', 'company'),
+            CapitalLead.objects.select_related('company'),
             self.request.user
         )
 
@@ -237,28 +260,7 @@ class CapitalLeadViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
-        rows = request.data.get('leads', [])
-        if not rows:
-            return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
-        company = get_capital_company(request.user)
-        if not company:
-            return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
-        to_create = []
-        for row in rows:
-            to_create.append(CapitalLead(
-                name=row.get('name', ''),
-                phone=row.get('phone', ''),
-                email=row.get('email', ''),
-                address=row.get('address', ''),
-                status=row.get('status', 'new'),
-                source=row.get('source', 'website'),
-                description=row.get('description', ''),
-                company=company,
-                created_by=request.user,
-            ))
-        with transaction.atomic():
-            created = CapitalLead.objects.bulk_create(to_create, batch_size=200, ignore_conflicts=True)
-        return Response({'imported': len(created)}, status=status.HTTP_201_CREATED)
+        return capital_bulk_import(request, 'leads', 'capital_leads')
 
 
 class CapitalTaskViewSet(viewsets.ModelViewSet):
@@ -273,7 +275,7 @@ class CapitalTaskViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return get_capital_queryset(
-            CapitalTask.objects.select_related('assigned_to', 'created_by', 'company', 'loan', 'service'),
+            CapitalTask.objects.select_related('company', 'loan', 'service'),
             self.request.user
         )
 
@@ -300,25 +302,7 @@ class CapitalTaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
-        rows = request.data.get('tasks', [])
-        if not rows:
-            return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
-        company = get_capital_company(request.user)
-        if not company:
-            return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
-        to_create = []
-        for row in rows:
-            to_create.append(CapitalTask(
-                title=row.get('title', ''),
-                description=row.get('description', ''),
-                status=row.get('status', 'in_progress'),
-                priority=row.get('priority', 'medium'),
-                company=company,
-                created_by=request.user,
-            ))
-        with transaction.atomic():
-            created = CapitalTask.objects.bulk_create(to_create, batch_size=200)
-        return Response({'imported': len(created)}, status=status.HTTP_201_CREATED)
+        return capital_bulk_import(request, 'tasks', 'capital_tasks')
 
 
 class CapitalLoanViewSet(viewsets.ModelViewSet):
@@ -333,12 +317,11 @@ class CapitalLoanViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return get_capital_queryset(
-            CapitalLoan.objects.select_related('assigned_to', 'created_by', 'company').only(
+            CapitalLoan.objects.select_related('company').only(
                 'id', 'applicant_name', 'phone', 'email', 'address', 'loan_type',
                 'loan_amount', 'tenure_months', 'interest_rate', 'bank_name', 'status',
                 'notes', 'created_at', 'updated_at',
-                'assigned_to__id', 'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username',
-                'created_by__id', 'created_by__first_name', 'created_by__last_name', 'created_by__username',
+                'assigned_to_id', 'created_by_id',
                 'company__id'
             ),
             self.request.user
@@ -382,30 +365,18 @@ class CapitalLoanViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
-        rows = request.data.get('loans', [])
-        if not rows:
-            return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
-        company = get_capital_company(request.user)
-        if not company:
-            return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
-        to_create = []
-        for row in rows:
-            to_create.append(CapitalLoan(
-                applicant_name=row.get('applicant_name', ''),
-                phone=row.get('phone', ''),
-                email=row.get('email') or None,
-                loan_type=row.get('loan_type', 'personal'),
-                loan_amount=row.get('loan_amount') or None,
-                tenure_months=row.get('tenure_months') or None,
-                bank_name=row.get('bank_name', ''),
-                status=row.get('status', 'inquiry'),
-                notes=row.get('notes', ''),
-                company=company,
-                created_by=request.user,
-            ))
-        with transaction.atomic():
-            created = CapitalLoan.objects.bulk_create(to_create, batch_size=200)
-        return Response({'imported': len(created)}, status=status.HTTP_201_CREATED)
+        return capital_bulk_import(request, 'loans', 'capital_loans')
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the filtered loan list as xlsx/csv (?file_format=, ?columns=)."""
+        return export_response(
+            request,
+            self.filter_queryset(self.get_queryset()).defer(None),
+            LOAN_EXPORT_COLUMNS,
+            f'capital-loans-{timezone.now().date().isoformat()}',
+            'Loans',
+        )
 
 
 class CapitalServiceViewSet(viewsets.ModelViewSet):
@@ -420,12 +391,11 @@ class CapitalServiceViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return get_capital_queryset(
-            CapitalService.objects.select_related('assigned_to', 'created_by', 'company').only(
+            CapitalService.objects.select_related('company').only(
                 'id', 'client_name', 'phone', 'email', 'business_name', 'service_type',
                 'status', 'financial_year', 'business_type', 'turnover_range', 'income_slab',
                 'pan_number', 'gstin', 'notes', 'created_at', 'updated_at',
-                'assigned_to__id', 'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username',
-                'created_by__id', 'created_by__first_name', 'created_by__last_name', 'created_by__username',
+                'assigned_to_id', 'created_by_id',
                 'company__id'
             ),
             self.request.user
@@ -469,30 +439,18 @@ class CapitalServiceViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
-        rows = request.data.get('services', [])
-        if not rows:
-            return Response({'error': 'No data'}, status=status.HTTP_400_BAD_REQUEST)
-        company = get_capital_company(request.user)
-        if not company:
-            return Response({'error': 'Capital company not found'}, status=status.HTTP_400_BAD_REQUEST)
-        to_create = []
-        for row in rows:
-            to_create.append(CapitalService(
-                client_name=row.get('client_name', ''),
-                phone=row.get('phone', ''),
-                email=row.get('email') or None,
-                pan_number=row.get('pan_number', ''),
-                business_name=row.get('business_name', ''),
-                service_type=row.get('service_type', 'gst_registration'),
-                financial_year=row.get('financial_year', ''),
-                status=row.get('status', 'inquiry'),
-                notes=row.get('notes', ''),
-                company=company,
-                created_by=request.user,
-            ))
-        with transaction.atomic():
-            created = CapitalService.objects.bulk_create(to_create, batch_size=200)
-        return Response({'imported': len(created)}, status=status.HTTP_201_CREATED)
+        return capital_bulk_import(request, 'services', 'capital_services')
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the filtered service list as xlsx/csv (?file_format=, ?columns=)."""
+        return export_response(
+            request,
+            self.filter_queryset(self.get_queryset()).defer(None),
+            SERVICE_EXPORT_COLUMNS,
+            f'capital-services-{timezone.now().date().isoformat()}',
+            'Services',
+        )
 
 
 
@@ -515,7 +473,7 @@ class LoanDocumentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        base_queryset = LoanDocument.objects.select_related('loan', 'verified_by')
+        base_queryset = LoanDocument.objects.select_related('loan')
         return get_capital_queryset(base_queryset, user)
     
     @action(detail=True, methods=['post'])
@@ -550,7 +508,7 @@ class LoanApprovalStageViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        base_queryset = LoanApprovalStage.objects.select_related('loan', 'assigned_to', 'completed_by')
+        base_queryset = LoanApprovalStage.objects.select_related('loan')
         return get_capital_queryset(base_queryset, user)
     
     @action(detail=True, methods=['post'])
@@ -672,7 +630,7 @@ class BankLoanStatusViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        base_queryset = BankLoanStatus.objects.select_related('loan', 'last_updated_by')
+        base_queryset = BankLoanStatus.objects.select_related('loan')
         return get_capital_queryset(base_queryset, user)
     
     def perform_create(self, serializer):
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import ChangeEntry
+
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(admin.ModelAdmin):
+    list_display = ['company', 'version', 'entity', 'record_id', 'action', 'created_at']
+    list_filter = ['company', 'entity', 'action']
+    readonly_fields = ['created_at']
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ChangeFeedConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'change_feed'
+    verbose_name = 'Change Feed'
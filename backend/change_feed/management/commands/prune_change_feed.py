@@ -0,0 +1,22 @@
+"""
+Delete change-feed entries older than the retention period.
+
+Usage:
+  python manage.py prune_change_feed             # CHANGE_FEED_RETENTION_DAYS (default 7)
+  python manage.py prune_change_feed --days 2
+"""
+
+from django.core.management.base import BaseCommand
+
+from change_feed.services import RETENTION_DAYS, prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Delete old change-feed entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RETENTION_DAYS, help='Keep entries this many days')
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change-feed entr(ies)'))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-17 05:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0022_add_team_to_invitetoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeFeedVersion',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='change_feed_version', serialize=False, to='accounts.company')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'change_feed_versions',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField()),
+                ('entity', models.CharField(help_text='leads, tasks, customers, calls, ...', max_length=30)),
+                ('record_id', models.BigIntegerField(blank=True, help_text='Empty when many records changed', null=True)),
+                ('action', models.CharField(help_text='created, updated, deleted, bulk_updated, ...', max_length=30)),
+                ('fields', models.JSONField(blank=True, default=list, help_text='Changed fields, when known')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_entries', to='accounts.company')),
+            ],
+            options={
+                'db_table': 'change_feed_entries',
+                'ordering': ['company', 'version'],
+                'indexes': [models.Index(fields=['created_at'], name='change_entry_created_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='changeentry',
+            constraint=models.UniqueConstraint(fields=('company', 'version'), name='change_entry_company_version_uniq'),
+        ),
+    ]
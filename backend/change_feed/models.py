@@ -0,0 +1,53 @@
+from django.db import models
+
+
+class ChangeFeedVersion(models.Model):
+    """
+    Latest change-feed version of a company. Versions only go up; every
+    recorded change takes the next one (see change_feed.services).
+    """
+    company = models.OneToOneField(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='change_feed_version',
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'change_feed_versions'
+
+    def __str__(self):
+        return f"{self.company_id} @ {self.version}"
+
+
+class ChangeEntry(models.Model):
+    """
+    One change to one record (or, with no record_id, to many records of an
+    entity at once, e.g. a delete-by-filter or an import). Clients replay
+    entries after the last version they saw: GET /api/changes/?since=<version>.
+    """
+    company = models.ForeignKey(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        related_name='change_entries',
+    )
+    version = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=30, help_text="leads, tasks, customers, calls, ...")
+    record_id = models.BigIntegerField(null=True, blank=True, help_text="Empty when many records changed")
+    action = models.CharField(max_length=30, help_text="created, updated, deleted, bulk_updated, ...")
+    fields = models.JSONField(default=list, blank=True, help_text="Changed fields, when known")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'change_feed_entries'
+        ordering = ['company', 'version']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'version'], name='change_entry_company_version_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='change_entry_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id}#{self.version} {self.entity} {self.record_id} {self.action}"
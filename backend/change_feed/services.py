@@ -0,0 +1,87 @@
+"""
+Per-company change feed.
+
+Every change event sent through eswari_crm.ws_utils is also recorded here
+with the next version of the company, so clients can patch their lists
+instead of refetching them:
+
+    version = record_changes(company_id, 'leads', 'updated', [12], fields=['status'])
+    entries, has_more = changes_since(company_id, since=version - 1)
+
+Versions are handed out under the company's ChangeFeedVersion row lock, so
+they commit in order and a client that has seen version N has seen every
+change up to N. Entries older than CHANGE_FEED_RETENTION_DAYS are removed
+by the `prune_change_feed` command; a client further behind than that
+gets ``reset`` and reloads.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ChangeEntry, ChangeFeedVersion
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 7)
+PAGE_SIZE = 500
+
+
+def record_changes(company_id, entity, action, record_ids=None, fields=None):
+    """
+    Append one entry per record id (a single id-less entry when
+    ``record_ids`` is None) and return the company's new version.
+    """
+    record_ids = [None] if record_ids is None else list(record_ids)
+    if not company_id or not record_ids:
+        return None
+    fields = sorted(fields or [])
+
+    with transaction.atomic():
+        ChangeFeedVersion.objects.get_or_create(company_id=company_id)
+        # The row lock taken here is held until commit: concurrent writers
+        # of the same company get consecutive versions, committed in order
+        ChangeFeedVersion.objects.filter(company_id=company_id).update(version=F('version') + len(record_ids))
+        version = ChangeFeedVersion.objects.values_list('version', flat=True).get(company_id=company_id)
+        first = version - len(record_ids) + 1
+        ChangeEntry.objects.bulk_create([
+            ChangeEntry(
+                company_id=company_id, version=first + offset, entity=entity,
+                record_id=record_id, action=action, fields=fields,
+            )
+            for offset, record_id in enumerate(record_ids)
+        ], batch_size=PAGE_SIZE)
+    return version
+
+
+def current_version(company_id):
+    return ChangeFeedVersion.objects.filter(company_id=company_id).values_list('version', flat=True).first() or 0
+
+
+def changes_since(company_id, since, entity=None, limit=PAGE_SIZE):
+    """Entries after version ``since``, oldest first. Returns (entries, has_more)."""
+    entries = ChangeEntry.objects.filter(company_id=company_id, version__gt=since)
+    if entity:
+        entries = entries.filter(entity=entity)
+    entries = list(entries.order_by('version')[:limit + 1])
+    return entries[:limit], len(entries) > limit
+
+
+def is_behind_retention(company_id, since):
+    """Whether entries after ``since`` have already been pruned."""
+    oldest = ChangeEntry.objects.filter(company_id=company_id).order_by('version').values_list(
+        'version', flat=True
+    ).first()
+    if oldest is None:
+        return since < current_version(company_id)
+    return since < oldest - 1
+
+
+def prune_changes(days=RETENTION_DAYS):
+    """Delete entries older than ``days``. Returns how many were deleted."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = ChangeEntry.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
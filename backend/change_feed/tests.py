@@ -0,0 +1,133 @@
+"""
+Tests for the per-company change feed.
+
+Tests cover:
+- Versions increase per company, one per changed record
+- Change events carry the new version
+- GET /api/changes/?since= returns the entries after a version, paged
+- Clients behind the retention period (or ahead of the feed) are told to reset
+- Users cannot read another company's feed; admins can
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from change_feed.models import ChangeEntry
+from change_feed.services import PAGE_SIZE, changes_since, current_version, record_changes
+from eswari_crm.ws_utils import notify_company_changed
+
+User = get_user_model()
+
+
+class ChangeFeedServiceTest(TestCase):
+    """Tests for change_feed.services"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.other_company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+
+    def test_versions_are_per_company_and_per_record(self):
+        self.assertEqual(record_changes(self.company.id, 'leads', 'created', [1]), 1)
+        self.assertEqual(record_changes(self.company.id, 'leads', 'bulk_updated', [2, 3, 4], ['status']), 4)
+        self.assertEqual(record_changes(self.other_company.id, 'tasks', 'deleted', [9]), 1)
+        self.assertEqual(record_changes(self.company.id, 'calls', 'bulk_imported'), 5)
+
+        entries, has_more = changes_since(self.company.id, since=1)
+        self.assertFalse(has_more)
+        self.assertEqual(
+            [(e.version, e.entity, e.record_id, e.action, e.fields) for e in entries],
+            [
+                (2, 'leads', 2, 'bulk_updated', ['status']),
+                (3, 'leads', 3, 'bulk_updated', ['status']),
+                (4, 'leads', 4, 'bulk_updated', ['status']),
+                (5, 'calls', None, 'bulk_imported', []),
+            ],
+        )
+        self.assertEqual(current_version(self.company.id), 5)
+
+    @override_settings(WS_COALESCE_WINDOW=0)
+    def test_events_carry_the_version(self):
+        record_changes(self.company.id, 'leads', 'created', [1])
+
+        with patch('eswari_crm.ws_utils._send_to_group', return_value=True) as send:
+            notify_company_changed(self.company.id, 'task_updated', 'tasks', 'updated', record_id=7, fields={'status': 'done'})
+
+        self.assertEqual(
+            send.call_args.args[2], {'entity': 'tasks', 'action': 'updated', 'record_id': 7, 'version': 2},
+        )
+        self.assertEqual(ChangeEntry.objects.get(version=2).fields, ['status'])
+
+
+class ChangeFeedAPITest(TestCase):
+    """Tests for GET /api/changes/"""
+
+    url = '/api/changes/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.other_company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.employee = User.objects.create_user(
+            username='employee', password='testpass123', role='employee', company=self.company,
+        )
+        self.admin = User.objects.create_user(
+            username='admin', password='testpass123', role='admin', company=self.company,
+        )
+        self.client.force_authenticate(user=self.employee)
+
+    def test_catch_up_since_version(self):
+        record_changes(self.company.id, 'leads', 'created', [1, 2, 3])
+        record_changes(self.company.id, 'tasks', 'updated', [5], ['status'])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['version'], 4)
+        self.assertEqual(response.data['changes'], [])
+
+        response = self.client.get(self.url, {'since': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['reset'])
+        self.assertEqual(
+            [(c['version'], c['entity'], c['record_id'], c['fields']) for c in response.data['changes']],
+            [(3, 'leads', 3, []), (4, 'tasks', 5, ['status'])],
+        )
+
+        response = self.client.get(self.url, {'since': 0, 'entity': 'tasks'})
+        self.assertEqual([c['record_id'] for c in response.data['changes']], [5])
+
+    def test_pages_report_has_more(self):
+        record_changes(self.company.id, 'leads', 'bulk_deleted', range(1, PAGE_SIZE + 3))
+
+        response = self.client.get(self.url, {'since': 1})
+
+        self.assertEqual(len(response.data['changes']), PAGE_SIZE)
+        self.assertTrue(response.data['has_more'])
+        last = response.data['changes'][-1]['version']
+        self.assertFalse(self.client.get(self.url, {'since': last}).data['has_more'])
+
+    def test_reset_when_behind_retention_or_ahead(self):
+        record_changes(self.company.id, 'leads', 'created', [1, 2, 3])
+        ChangeEntry.objects.filter(version__lte=2).update(created_at=timezone.now() - timedelta(days=30))
+        call_command('prune_change_feed', stdout=StringIO())
+
+        self.assertTrue(self.client.get(self.url, {'since': 0}).data['reset'])
+        self.assertFalse(self.client.get(self.url, {'since': 2}).data['reset'])
+        self.assertTrue(self.client.get(self.url, {'since': 10}).data['reset'])
+
+    def test_company_access(self):
+        record_changes(self.other_company.id, 'calls', 'created', [1])
+
+        response = self.client.get(self.url, {'company': self.other_company.id, 'since': 0})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {'company': self.other_company.id, 'since': 0})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['changes']), 1)
@@ -0,0 +1,70 @@
+"""
+Change Feed API
+
+GET /api/changes/?since=<version>   - Changes after a version, oldest first
+
+Optional: ?company=<id> (admin/HR), ?entity=leads. Without ``since`` only
+the current version is returned, which is where a freshly loaded client
+starts. ``reset: true`` means the client is too far behind (or ahead) to
+catch up and should reload its lists.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from accounts.scopes import access_scope
+
+from .services import changes_since, current_version, is_behind_retention
+
+
+def _entry_data(entry):
+    return {
+        'version': entry.version,
+        'entity': entry.entity,
+        'record_id': entry.record_id,
+        'action': entry.action,
+        'fields': entry.fields,
+        'at': entry.created_at,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def change_list(request):
+    """Changes of the user's company after ?since=<version>."""
+    user = request.user
+    scope = access_scope(user)
+    company_id = user.company_id
+    requested = request.query_params.get('company')
+    if requested:
+        try:
+            requested = int(requested)
+        except ValueError:
+            return Response({'error': 'company must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if requested != company_id and not (scope.is_global or scope.company_wide):
+            return Response({'error': 'You do not have access to this company.'}, status=status.HTTP_403_FORBIDDEN)
+        company_id = requested
+    if not company_id:
+        return Response({'error': 'company is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    version = current_version(company_id)
+    data = {'company': company_id, 'version': version, 'changes': [], 'has_more': False, 'reset': False}
+
+    since = request.query_params.get('since')
+    if since in (None, ''):
+        return Response(data)
+    try:
+        since = int(since)
+    except ValueError:
+        return Response({'error': 'since must be an integer version.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if since > version or is_behind_retention(company_id, since):
+        data['reset'] = True
+        return Response(data)
+
+    entries, has_more = changes_since(company_id, since, entity=request.query_params.get('entity'))
+    data['changes'] = [_entry_data(entry) for entry in entries]
+    data['has_more'] = has_more
+    return Response(data)
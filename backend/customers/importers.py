@@ -0,0 +1,74 @@
+"""
+Customer file importer used by CustomerViewSet.import_customers.
+
+Runs through import_jobs: each batch is validated with
+ImportService.validate_import_data (one duplicate lookup for the batch's
+phones) and inserted with ImportService.bulk_create_customers.
+"""
+from import_jobs.base import BaseImporter
+from .services import ImportService
+
+
+class CustomerFileImporter(BaseImporter):
+    """Import the phone/name customer template (CSV or Excel)."""
+
+    # The summary has always listed every error row
+    max_errors = 1000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phone_col = None
+        self.name_col = None
+        self.data_rows = 0
+        self.seen_phones = set()
+
+    def map_columns(self, header_row):
+        """Headers are matched case-insensitively; a missing column reads as empty."""
+        for idx, header in enumerate(header_row or []):
+            header = str(header).lower().strip() if header else ''
+            if header == 'phone':
+                self.phone_col = idx
+            elif header == 'name':
+                self.name_col = idx
+
+    def _cell(self, row, idx):
+        if idx is None or idx >= len(row) or row[idx] is None:
+            return ''
+        return str(row[idx]).strip()
+
+    def process_batch(self, batch, first_row_num):
+        rows = []
+        for row in batch:
+            phone = self._cell(row, self.phone_col)
+            name = self._cell(row, self.name_col)
+            if phone or name:  # Include row if at least one field has data
+                rows.append({'phone': phone, 'name': name})
+        if not rows:
+            return
+
+        valid_rows, error_rows = ImportService.validate_import_data(
+            rows,
+            self.company.id if self.company else None,
+            seen_phones=self.seen_phones,
+            start_row=self.data_rows + 1,
+        )
+        self.data_rows += len(rows)
+        for error in error_rows:
+            self.add_error(error)
+
+        if valid_rows:
+            result = ImportService.bulk_create_customers(valid_rows, self.user, self.company)
+            self.created += result['success_count']
+            self.duplicates += result['duplicates_skipped']
+
+    def result(self):
+        return {
+            'success': True,
+            'summary': {
+                'total_rows': self.data_rows,
+                'success_count': self.created,
+                'duplicate_count': self.duplicates,
+                'error_count': self.error_count,
+                'errors': self.errors,
+            },
+        }
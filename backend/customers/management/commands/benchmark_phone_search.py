@@ -0,0 +1,105 @@
+"""
+Management command that benchmarks partial-phone search on the customers table.
+
+Usage:
+  python manage.py benchmark_phone_search                  # 1M rows, then rolled back
+  python manage.py benchmark_phone_search --rows 200000 --repeat 10
+
+Fills a throwaway company with random customers inside a transaction, times
+``phone__icontains`` against the customer list's own search filter
+(utils.phones.phone_or_text_q, as CustomerViewSet applies it) for
+last-digits, first-digits and full-number searches, prints the query
+plans, and rolls everything back. Run it against a copy of production, not
+production itself.
+"""
+
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from accounts.models import Company
+from customers.models import Customer
+from utils.phones import phone_or_text_q, set_normalized_phones
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark partial-phone search (icontains vs reversed-digits index)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Customers to generate')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per search')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per insert')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Benchmark data rolled back')
+
+    def _run(self, options):
+        rng = random.Random(options['seed'])
+        company = Company.objects.create(name='Phone search benchmark', code='PHONEBENCH')
+        user = User.objects.create_user(username='phone_search_benchmark', role='admin', company=company)
+
+        started = time.perf_counter()
+        phones = self._generate(company, user, rng, options['rows'], options['batch_size'])
+        self.stdout.write(f'Inserted {len(phones):,} customers in {time.perf_counter() - started:.1f}s')
+        self._analyze()
+
+        sample = rng.choice(phones)
+        searches = [('last 4 digits', sample[-4:]), ('first 5 digits', sample[:5]), ('full number', sample)]
+        base = Customer.objects.filter(company=company)
+
+        for label, search in searches:
+            # The list page's shape: first 50 matches, newest first
+            scan = base.filter(phone__icontains=search).order_by('-created_at').values_list('id', flat=True)[:50]
+            indexed = (
+                base.filter(phone_or_text_q(search, 'phone', 'name'))
+                .order_by('-created_at').values_list('id', flat=True)[:50]
+            )
+            scan_ms, scan_rows = self._time(scan, options['repeat'])
+            indexed_ms, indexed_rows = self._time(indexed, options['repeat'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{label} ({search}): icontains {scan_ms:.1f} ms / {scan_rows} rows, '
+                f'indexed {indexed_ms:.1f} ms / {indexed_rows} rows, {scan_ms / max(indexed_ms, 0.001):.0f}x'
+            ))
+            self.stdout.write(f'  plan: {" | ".join(indexed.explain().splitlines())}')
+
+    def _generate(self, company, user, rng, rows, batch_size):
+        phones = set()
+        while len(phones) < rows:
+            phones.add(f'{rng.choice("6789")}{rng.randrange(10 ** 9):09d}')
+        phones = list(phones)
+        for start in range(0, rows, batch_size):
+            Customer.objects.bulk_create(set_normalized_phones([
+                Customer(phone=phone, name=f'Customer {start + offset}', company=company, created_by=user)
+                for offset, phone in enumerate(phones[start:start + batch_size])
+            ]), batch_size=batch_size)
+        return phones
+
+    def _analyze(self):
+        """Refresh planner statistics, as the production tables have them."""
+        table = Customer._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE TABLE {table}' if connection.vendor == 'mysql' else f'ANALYZE {table}')
+
+    def _time(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            matches = list(queryset.all())  # .all(): a fresh query every run
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), len(matches)
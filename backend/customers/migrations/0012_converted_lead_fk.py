@@ -0,0 +1,90 @@
+"""
+Replaces the free-text converted_lead_id with a real foreign key to
+leads.Lead plus a converted_at timestamp, so conversion analytics can join
+and aggregate in SQL.
+
+Existing references are carried over when they point at a lead of the same
+company; converted_at is the creation time of that lead (conversion creates
+it).
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def link_converted_leads(apps, schema_editor):
+    Customer = apps.get_model('customers', 'Customer')
+    Lead = apps.get_model('leads', 'Lead')
+
+    pending = Customer.objects.filter(legacy_converted_lead_id__isnull=False).exclude(legacy_converted_lead_id='')
+    batch = []
+    for customer in pending.only('pk', 'company_id', 'legacy_converted_lead_id').iterator(chunk_size=BATCH_SIZE):
+        try:
+            lead_id = int(customer.legacy_converted_lead_id)
+        except ValueError:
+            continue
+        batch.append((customer, lead_id))
+        if len(batch) >= BATCH_SIZE:
+            _link_batch(Customer, Lead, batch)
+            batch = []
+    if batch:
+        _link_batch(Customer, Lead, batch)
+
+
+def _link_batch(Customer, Lead, batch):
+    leads = {
+        (lead['pk'], lead['company_id']): lead['created_at']
+        for lead in Lead.objects.filter(pk__in=[lead_id for _, lead_id in batch]).values('pk', 'company_id', 'created_at')
+    }
+    linked = []
+    for customer, lead_id in batch:
+        created_at = leads.get((lead_id, customer.company_id))
+        if created_at is not None:
+            customer.converted_lead_id = lead_id
+            customer.converted_at = created_at
+            linked.append(customer)
+    Customer.objects.bulk_update(linked, ['converted_lead', 'converted_at'])
+
+
+def unlink_converted_leads(apps, schema_editor):
+    Customer = apps.get_model('customers', 'Customer')
+    for customer in Customer.objects.filter(converted_lead__isnull=False).only('pk', 'converted_lead_id'):
+        customer.legacy_converted_lead_id = str(customer.converted_lead_id)
+        customer.save(update_fields=['legacy_converted_lead_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0011_normalized_phone'),
+        ('leads', '0017_normalized_phone'),
+    ]
+
+    operations = [
+        # The FK column is also named converted_lead_id, so move the old one aside
+        migrations.RenameField(
+            model_name='customer',
+            old_name='converted_lead_id',
+            new_name='legacy_converted_lead_id',
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='converted_lead',
+            field=models.ForeignKey(blank=True, help_text='Lead this customer was converted into', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='converted_customers', to='leads.lead'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='converted_at',
+            field=models.DateTimeField(blank=True, help_text='When the customer was converted', null=True),
+        ),
+        migrations.RunPython(link_converted_leads, unlink_converted_leads),
+        migrations.RemoveField(
+            model_name='customer',
+            name='legacy_converted_lead_id',
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['company', 'converted_at'], name='customers_c_company_791e01_idx'),
+        ),
+    ]
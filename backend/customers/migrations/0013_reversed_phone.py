@@ -0,0 +1,32 @@
+"""
+Adds reversed_phone (normalized_phone reversed, for indexed last-digits
+search) with a (company, reversed_phone) index, and fills it in for existing
+rows.
+"""
+from django.db import migrations, models
+
+from utils.phones import backfill_reversed_phones
+
+
+def populate_reversed_phone(apps, schema_editor):
+    backfill_reversed_phones(apps.get_model('customers', 'Customer'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0012_converted_lead_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='reversed_phone',
+            field=models.CharField(blank=True, default='', editable=False, help_text='normalized_phone reversed, for indexed last-digits search', max_length=20),
+        ),
+        migrations.RunPython(populate_reversed_phone, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['company', 'reversed_phone'], name='cust_company_rev_phone_idx'),
+        ),
+    ]
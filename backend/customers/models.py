@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 
+from accounts.directory import user_directory
+from utils.phones import NormalizedPhoneModel
+
 
 class ConversionAuditLog(models.Model):
     """
@@ -54,7 +57,7 @@ class ConversionAuditLog(models.Model):
         return f"{self.action} - {self.customer_name} by {self.performed_by}"
 
 
-class Customer(models.Model):
+class Customer(NormalizedPhoneModel):
     CALL_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('answered', 'Answered'),
@@ -80,7 +83,15 @@ class Customer(models.Model):
     call_date = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True, null=True)
     is_converted = models.BooleanField(default=False)
-    converted_lead_id = models.CharField(max_length=50, blank=True, null=True)
+    converted_lead = models.ForeignKey(
+        'leads.Lead',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='converted_customers',
+        help_text="Lead this customer was converted into"
+    )
+    converted_at = models.DateTimeField(null=True, blank=True, help_text="When the customer was converted")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -92,12 +103,15 @@ class Customer(models.Model):
             models.Index(fields=['company', 'created_at']),
             models.Index(fields=['is_converted']),
             models.Index(fields=['company', 'is_converted']),
+            models.Index(fields=['company', 'converted_at']),
             models.Index(fields=['call_status']),
             # Additional indexes for performance
             models.Index(fields=['company', 'call_status']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['created_by']),
             models.Index(fields=['phone']),  # For search queries
+            models.Index(fields=['company', 'normalized_phone'], name='cust_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='cust_company_rev_phone_idx'),
             models.Index(fields=['name']),   # For search queries
         ]
         
@@ -106,13 +120,11 @@ class Customer(models.Model):
     
     @property
     def assigned_to_name(self):
-        if self.assigned_to:
-            return f"{self.assigned_to.first_name} {self.assigned_to.last_name}".strip() or self.assigned_to.username
-        return None
+        return user_directory.name(self.assigned_to_id)
     
     @property
     def created_by_name(self):
-        return f"{self.created_by.first_name} {self.created_by.last_name}".strip() or self.created_by.username
+        return user_directory.name(self.created_by_id)
 
 
 class CallAllocation(models.Model):
@@ -133,4 +145,4 @@ class CallAllocation(models.Model):
     
     @property
     def employee_name(self):
-        return f"{self.employee.first_name} {self.employee.last_name}".strip() or self.employee.username
\ No newline at end of file
+        return user_directory.name(self.employee_id)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Customer, CallAllocation
+from accounts.directory import user_directory
 from accounts.permissions import should_hide_contact_details
 from utils.validators import CompanyValidationMixin
 
@@ -32,6 +33,8 @@ class CustomerSerializer(CompanyValidationMixin, serializers.ModelSerializer):
     assigned_to_name = serializers.ReadOnlyField()
     created_by_name = serializers.ReadOnlyField()
     company_detail = CompanyNestedSerializer(source='company', read_only=True)
+    # Emitted as a string, as when it was a free-text column
+    converted_lead_id = serializers.CharField(read_only=True, allow_null=True)
     converted_lead = serializers.SerializerMethodField()
     
     class Meta:
@@ -40,9 +43,9 @@ class CustomerSerializer(CompanyValidationMixin, serializers.ModelSerializer):
             'id', 'name', 'phone', 'call_status', 'custom_call_status',
             'assigned_to', 'assigned_to_name', 'created_by', 'created_by_name',
             'scheduled_date', 'call_date', 'notes', 'is_converted',
-            'converted_lead_id', 'converted_lead', 'created_at', 'updated_at', 'company', 'company_detail'
+            'converted_lead_id', 'converted_lead', 'converted_at', 'created_at', 'updated_at', 'company', 'company_detail'
         ]
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'assigned_to_name', 'created_by_name']
+        read_only_fields = ['id', 'created_by', 'converted_at', 'created_at', 'updated_at', 'assigned_to_name', 'created_by_name']
     
     def get_converted_lead(self, obj):
         """Include converted lead object if customer is converted"""
@@ -56,14 +59,11 @@ class CustomerSerializer(CompanyValidationMixin, serializers.ModelSerializer):
         if view and view.action != 'retrieve':
             return None
         
-        # If customer is converted and has a lead ID, fetch the lead
+        # If customer is converted and its lead is in the same company, include it
         if obj.is_converted and obj.converted_lead_id:
-            try:
-                from leads.models import Lead
-                lead = Lead.objects.get(id=obj.converted_lead_id, company=obj.company)
+            lead = obj.converted_lead
+            if lead.company_id == obj.company_id:
                 return ConvertedLeadSerializer(lead).data
-            except Lead.DoesNotExist:
-                return None
         return None
     
     def to_representation(self, instance):
@@ -79,7 +79,7 @@ class CustomerSerializer(CompanyValidationMixin, serializers.ModelSerializer):
         
         # Determine the owner of this customer data
         # Priority: assigned_to > created_by
-        owner_user = instance.assigned_to or instance.created_by
+        owner_user = user_directory.get(instance.assigned_to_id or instance.created_by_id)
         
         if owner_user and should_hide_contact_details(requesting_user, owner_user):
             # Mask sensitive contact information
@@ -12,6 +12,8 @@ from django.core.exceptions import ValidationError
 from .models import Customer
 from .sanitization import InputSanitizer
 from leads.models import Lead
+from search.services import index_created
+from utils.phones import normalize_phone, set_normalized_phones
 
 
 class ValidationService:
@@ -71,7 +73,7 @@ class ValidationService:
             - REQ-015: Company-scoped phone uniqueness
         """
         query = Customer.objects.filter(
-            phone=phone,
+            normalized_phone=normalize_phone(phone),
             company_id=company_id
         )
         
@@ -153,7 +155,7 @@ class ValidationService:
         
         # Check if phone already exists as a lead in the same company
         lead_exists = Lead.objects.filter(
-            phone=phone_to_check,
+            normalized_phone=normalize_phone(phone_to_check),
             company_id=customer.company_id
         ).exists()
         
@@ -361,7 +363,9 @@ class ImportService:
     @staticmethod
     def validate_import_data(
         rows: List[Dict],
-        company_id: int
+        company_id: int,
+        seen_phones: Optional[set] = None,
+        start_row: int = 1
     ) -> Tuple[List[Dict], List[Dict]]:
         """
         Validate import data and return (valid_rows, error_rows)
@@ -370,6 +374,9 @@ class ImportService:
         Args:
             rows: List of dictionaries with 'phone' and 'name' keys
             company_id: Company ID for scoping uniqueness checks
+            seen_phones: Phones accepted by earlier batches of the same import
+                (updated in place); pass the same set for every batch
+            start_row: Row number of the first row in ``rows``
             
         Returns:
             Tuple of (valid_rows, error_rows)
@@ -382,19 +389,14 @@ class ImportService:
             - REQ-007: Clear error messages
             - REQ-075: Input sanitization
         """
-        valid_rows = []
         error_rows = []
-        
-        # Get existing phone numbers in this company for duplicate detection
-        existing_phones = set(
-            Customer.objects.filter(company_id=company_id)
-            .values_list('phone', flat=True)
-        )
+        candidates = []
         
         # Track phones in current import to detect duplicates within the file
-        seen_phones = set()
+        if seen_phones is None:
+            seen_phones = set()
         
-        for idx, row in enumerate(rows, start=1):
+        for idx, row in enumerate(rows, start=start_row):
             try:
                 # Sanitize the entire row first
                 sanitized_row = InputSanitizer.sanitize_import_data(row)
@@ -432,8 +434,21 @@ class ImportService:
                 })
                 continue
             
+            candidates.append((idx, phone, name))
+        
+        # Only look up the numbers in this batch, not the whole company
+        existing_phones = set(
+            Customer.objects.filter(
+                company_id=company_id,
+                normalized_phone__in={normalize_phone(phone) for _, phone, _ in candidates}
+            ).values_list('normalized_phone', flat=True)
+        ) if candidates else set()
+        
+        valid_rows = []
+        for idx, phone, name in candidates:
+            normalized = normalize_phone(phone)
             # Check for duplicates in database
-            if phone in existing_phones:
+            if normalized in existing_phones:
                 error_rows.append({
                     'row': idx,
                     'phone': phone,
@@ -443,7 +458,7 @@ class ImportService:
                 continue
             
             # Check for duplicates within import file
-            if phone in seen_phones:
+            if normalized in seen_phones:
                 error_rows.append({
                     'row': idx,
                     'phone': phone,
@@ -453,12 +468,13 @@ class ImportService:
                 continue
             
             # Valid row
-            seen_phones.add(phone)
+            seen_phones.add(normalized)
             valid_rows.append({
                 'phone': phone,
                 'name': name
             })
         
+        error_rows.sort(key=lambda error: error['row'])
         return valid_rows, error_rows
     
     @staticmethod
@@ -505,9 +521,10 @@ class ImportService:
         # Bulk create with transaction
         with transaction.atomic():
             created_customers = Customer.objects.bulk_create(
-                customers_to_create,
+                set_normalized_phones(customers_to_create),
                 ignore_conflicts=True  # Skip duplicate phone+company rows
             )
+            index_created(created_customers)
         
         # Get the created IDs by querying for the phones we just created
         created_ids = list(
@@ -801,11 +818,12 @@ class ConversionService:
             
         Validates:
             - REQ-033: Mark customer as converted (is_converted = true)
-            - REQ-034: Store lead ID in customer record (converted_lead_id)
+            - REQ-034: Store lead reference in customer record (converted_lead)
         """
         customer.is_converted = True
-        customer.converted_lead_id = str(lead.id)
-        customer.save(update_fields=['is_converted', 'converted_lead_id', 'updated_at'])
+        customer.converted_lead = lead
+        customer.converted_at = lead.created_at
+        customer.save(update_fields=['is_converted', 'converted_lead', 'converted_at', 'updated_at'])
     
     @staticmethod
     def log_conversion(
@@ -923,7 +941,7 @@ class AnalyticsService:
     def get_average_time_to_conversion(company_id: int) -> Optional[float]:
         """
         Calculate average time from customer creation to conversion
-        Uses AVG(lead.created_at - customer.created_at) for converted customers
+        Uses AVG(customer.converted_at - customer.created_at) in one query
         
         Args:
             company_id: Company ID for scoping the calculation
@@ -935,43 +953,21 @@ class AnalyticsService:
             - REQ-054: Calculate average time to conversion
         """
         from django.db.models import Avg, F, ExpressionWrapper, fields
-        from django.db.models.functions import Extract
         
-        # Get converted customers with their leads
-        converted_customers = Customer.objects.filter(
+        avg_duration = Customer.objects.filter(
             company_id=company_id,
             is_converted=True,
-            converted_lead_id__isnull=False
-        )
-        
-        # Calculate time differences
-        total_seconds = 0
-        count = 0
-        
-        for customer in converted_customers:
-            try:
-                # Get the corresponding lead
-                lead = Lead.objects.get(
-                    id=customer.converted_lead_id,
-                    company_id=company_id
-                )
-                
-                # Calculate time difference in seconds
-                time_diff = (lead.created_at - customer.created_at).total_seconds()
-                total_seconds += time_diff
-                count += 1
-                
-            except Lead.DoesNotExist:
-                # Skip if lead not found
-                continue
-        
-        # Calculate average in days
-        if count > 0:
-            avg_seconds = total_seconds / count
-            avg_days = avg_seconds / (24 * 60 * 60)  # Convert to days
-            return round(avg_days, 2)
-        
-        return None
+            converted_at__isnull=False
+        ).aggregate(
+            avg_duration=Avg(ExpressionWrapper(
+                F('converted_at') - F('created_at'),
+                output_field=fields.DurationField()
+            ))
+        )['avg_duration']
+        
+        if avg_duration is None:
+            return None
+        return round(avg_duration.total_seconds() / (24 * 60 * 60), 2)
     
     @staticmethod
     def get_conversion_by_user(
@@ -999,10 +995,8 @@ class AnalyticsService:
             - REQ-055: Show conversion by user
             - REQ-060: Show top converters (users)
         """
-        from django.db.models import Count, Q, Case, When, IntegerField
-        from django.contrib.auth import get_user_model
-        
-        User = get_user_model()
+        from django.db.models import Count, Q
+        from accounts.directory import user_directory
         
         # Base query
         query = Customer.objects.filter(company_id=company_id)
@@ -1018,6 +1012,7 @@ class AnalyticsService:
             total_customers=Count('id'),
             converted=Count('id', filter=Q(is_converted=True))
         ).order_by('-converted')
+        users = user_directory.get_many(stat['created_by'] for stat in user_stats)
         
         # Build result list with user details
         results = []
@@ -1033,11 +1028,8 @@ class AnalyticsService:
                 conversion_rate = 0.0
             
             # Get user details
-            try:
-                user = User.objects.get(id=user_id)
-                user_name = user.get_full_name() or user.username
-            except User.DoesNotExist:
-                user_name = 'Unknown User'
+            user = users.get(user_id)
+            user_name = user.name if user else 'Unknown User'
             
             results.append({
                 'user_id': user_id,
@@ -1128,37 +1120,25 @@ class AnalyticsService:
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get conversions grouped by date
-        # We need to join with Lead to get the conversion date (lead.created_at)
-        conversions_by_date = {}
-        
-        # Get all converted customers in the date range
-        converted_customers = Customer.objects.filter(
-            company_id=company_id,
-            is_converted=True,
-            converted_lead_id__isnull=False
-        )
-        
-        for customer in converted_customers:
-            try:
-                # Get the corresponding lead
-                lead = Lead.objects.get(
-                    id=customer.converted_lead_id,
-                    company_id=company_id
-                )
-                
-                # Check if lead was created in our date range
-                if start_date <= lead.created_at <= end_date:
-                    date_key = lead.created_at.date().isoformat()
-                    conversions_by_date[date_key] = conversions_by_date.get(date_key, 0) + 1
-                    
-            except Lead.DoesNotExist:
-                continue
+        # Get conversions grouped by date in one query
+        conversions_by_date = {
+            row['day'].isoformat(): row['conversions']
+            for row in Customer.objects.filter(
+                company_id=company_id,
+                is_converted=True,
+                converted_at__gte=start_date,
+                converted_at__lte=end_date
+            ).annotate(
+                day=TruncDate('converted_at')
+            ).values('day').annotate(
+                conversions=Count('id')
+            ).order_by()
+        }
         
         # Build complete trend with all dates (including zeros)
         trend = []
-        current_date = start_date.date()
-        end_date_only = end_date.date()
+        current_date = timezone.localtime(start_date).date()
+        end_date_only = timezone.localtime(end_date).date()
         
         while current_date <= end_date_only:
             date_key = current_date.isoformat()
@@ -121,8 +121,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 company=self.company,
                 created_by=self.user,
                 assigned_to=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(1000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -186,8 +185,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(2000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -232,8 +230,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=True,
-                converted_lead_id=str(3000 + i)
+                is_converted=True
             )
             customers.append(customer)
         
@@ -371,8 +368,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(4000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -472,8 +468,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 name=f"Recent Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(5000 + i) if is_converted else None
+                is_converted=is_converted
             )
             # Manually set created_at to recent date
             Customer.objects.filter(id=customer.id).update(created_at=recent_date)
@@ -554,8 +549,7 @@ class TestConversionRateCalculationProperties(TestCase):
                 name=f"Our Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(6000 + i) if is_converted else None
+                is_converted=is_converted
             )
             our_customers.append(customer)
         
@@ -570,7 +564,6 @@ class TestConversionRateCalculationProperties(TestCase):
                 company=other_company,
                 created_by=self.user,
                 is_converted=True,  # All converted
-                converted_lead_id=str(7000 + i)
             )
             other_customers.append(customer)
         
@@ -674,8 +667,7 @@ class TestConversionAggregationProperties(TestCase):
                 company=self.company,
                 created_by=self.user1,
                 assigned_to=self.user1,
-                is_converted=is_converted,
-                converted_lead_id=str(8000 + i) if is_converted else None
+                is_converted=is_converted
             )
             user1_customers.append(customer)
         
@@ -691,8 +683,7 @@ class TestConversionAggregationProperties(TestCase):
                 company=self.company,
                 created_by=self.user2,
                 assigned_to=self.user2,
-                is_converted=is_converted,
-                converted_lead_id=str(9000 + i) if is_converted else None
+                is_converted=is_converted
             )
             user2_customers.append(customer)
         
@@ -796,8 +787,7 @@ class TestConversionAggregationProperties(TestCase):
                 name=f"User1 Customer {i}",
                 company=self.company,
                 created_by=self.user1,
-                is_converted=is_converted,
-                converted_lead_id=str(10000 + i) if is_converted else None
+                is_converted=is_converted
             )
             user1_customers.append(customer)
         
@@ -812,8 +802,7 @@ class TestConversionAggregationProperties(TestCase):
                 name=f"User2 Customer {i}",
                 company=self.company,
                 created_by=self.user2,
-                is_converted=is_converted,
-                converted_lead_id=str(11000 + i) if is_converted else None
+                is_converted=is_converted
             )
             user2_customers.append(customer)
         
@@ -882,8 +871,7 @@ class TestConversionAggregationProperties(TestCase):
                 company=self.company,
                 created_by=self.user1,
                 call_status='pending',
-                is_converted=is_converted,
-                converted_lead_id=str(12000 + i) if is_converted else None
+                is_converted=is_converted
             )
             pending_customers.append(customer)
         
@@ -899,8 +887,7 @@ class TestConversionAggregationProperties(TestCase):
                 company=self.company,
                 created_by=self.user1,
                 call_status='answered',
-                is_converted=is_converted,
-                converted_lead_id=str(13000 + i) if is_converted else None
+                is_converted=is_converted
             )
             answered_customers.append(customer)
         
@@ -1021,7 +1008,8 @@ class TestConversionAggregationProperties(TestCase):
                 Lead.objects.filter(id=lead.id).update(created_at=conversion_date)
                 
                 # Update customer with lead reference
-                customer.converted_lead_id = str(lead.id)
+                customer.converted_lead = lead
+                customer.converted_at = conversion_date
                 customer.save()
                 
                 customers.append(customer)
@@ -1144,8 +1132,7 @@ class TestConversionAggregationProperties(TestCase):
                 company=self.company,
                 created_by=created_by,
                 call_status=call_status,
-                is_converted=is_converted,
-                converted_lead_id=str(14000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -1245,8 +1232,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 company=self.company,
                 created_by=self.user,
                 assigned_to=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(20000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
 
@@ -1345,8 +1331,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=True,
-                converted_lead_id=str(21000 + i)
+                is_converted=True
             )
             customers.append(customer)
 
@@ -1431,8 +1416,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(22000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
 
@@ -1517,8 +1501,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Our Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(23000 + i) if is_converted else None
+                is_converted=is_converted
             )
             our_customers.append(customer)
 
@@ -1591,8 +1574,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(24000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
 
@@ -1689,8 +1671,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 company=self.company,
                 created_by=self.user,
                 assigned_to=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(20000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -1789,8 +1770,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=True,
-                converted_lead_id=str(21000 + i)
+                is_converted=True
             )
             customers.append(customer)
         
@@ -1875,8 +1855,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(22000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -1961,8 +1940,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Our Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(23000 + i) if is_converted else None
+                is_converted=is_converted
             )
             our_customers.append(customer)
         
@@ -2035,8 +2013,7 @@ class TestPendingConversionsCountProperties(TestCase):
                 name=f"Customer {i}",
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=str(24000 + i) if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
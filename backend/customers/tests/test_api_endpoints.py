@@ -76,8 +76,7 @@ class TestCustomerListEndpoint(TestCase):
             phone="1234567890",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         Customer.objects.create(
             name="Unconverted Customer",
@@ -101,8 +100,7 @@ class TestCustomerListEndpoint(TestCase):
             phone="1234567890",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         Customer.objects.create(
             name="Unconverted Customer",
@@ -126,8 +124,7 @@ class TestCustomerListEndpoint(TestCase):
             phone="1234567890",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         Customer.objects.create(
             name="Unconverted Customer",
@@ -236,13 +233,21 @@ class TestCustomerListEndpoint(TestCase):
     
     def test_list_includes_conversion_fields(self):
         """Test that customer list includes is_converted and converted_lead_id fields"""
+        lead = Lead.objects.create(
+            name="Test Customer",
+            phone="1234567890",
+            company=self.company,
+            created_by=self.user,
+            source="customer_conversion"
+        )
         Customer.objects.create(
             name="Test Customer",
             phone="1234567890",
             company=self.company,
             created_by=self.user,
             is_converted=True,
-            converted_lead_id="123"
+            converted_lead=lead,
+            converted_at=lead.created_at
         )
         
         response = self.client.get('/api/customers/')
@@ -251,7 +256,8 @@ class TestCustomerListEndpoint(TestCase):
         self.assertIn('is_converted', response.data['results'][0])
         self.assertIn('converted_lead_id', response.data['results'][0])
         self.assertTrue(response.data['results'][0]['is_converted'])
-        self.assertEqual(response.data['results'][0]['converted_lead_id'], '123')
+        self.assertEqual(response.data['results'][0]['converted_lead_id'], str(lead.id))
+        self.assertIsNotNone(response.data['results'][0]['converted_at'])
 
 
 class TestCustomerDetailEndpoint(TestCase):
@@ -334,7 +340,7 @@ class TestCustomerDetailEndpoint(TestCase):
             company=self.company,
             created_by=self.user,
             is_converted=True,
-            converted_lead_id=str(lead.id)
+            converted_lead=lead
         )
         
         response = self.client.get(f'/api/customers/{customer.id}/')
@@ -348,15 +354,23 @@ class TestCustomerDetailEndpoint(TestCase):
         self.assertEqual(response.data['converted_lead']['requirement_type'], 'apartment')
     
     def test_retrieve_converted_customer_lead_not_found(self):
-        """Test retrieving converted customer with invalid lead_id returns None for converted_lead"""
+        """Test retrieving converted customer whose lead was deleted returns None for converted_lead"""
+        lead = Lead.objects.create(
+            name="John Doe",
+            phone="1234567890",
+            company=self.company,
+            created_by=self.user,
+            source="customer_conversion"
+        )
         customer = Customer.objects.create(
             name="John Doe",
             phone="1234567890",
             company=self.company,
             created_by=self.user,
             is_converted=True,
-            converted_lead_id="99999"  # Non-existent lead
+            converted_lead=lead
         )
+        lead.delete()
         
         response = self.client.get(f'/api/customers/{customer.id}/')
         
@@ -443,8 +457,7 @@ class TestConversionFormEndpoint(TestCase):
             phone="1234567890",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         
         response = self.client.get(f'/api/customers/{customer.id}/conversion-form/')
@@ -529,8 +542,7 @@ class TestConvertToLeadEndpoint(TestCase):
             phone="1234567890",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         
         lead_data = {
@@ -656,8 +668,7 @@ class TestBulkConvertEndpoint(TestCase):
             phone="1234567891",
             company=self.company,
             created_by=self.user,
-            is_converted=True,
-            converted_lead_id="123"
+            is_converted=True
         )
         customer3 = Customer.objects.create(
             name="Customer 3",
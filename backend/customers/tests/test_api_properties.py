@@ -47,7 +47,6 @@ def customer_data(draw, company, user):
         'phone': phone,
         'name': name,
         'is_converted': is_converted,
-        'converted_lead_id': f"lead_{phone}" if is_converted else None,
         'company': company,
         'created_by': user,
         'call_status': draw(st.sampled_from(['pending', 'answered', 'not_answered', 'busy', 'invalid']))
@@ -110,8 +109,7 @@ class TestCustomerAPIProperties(TestCase):
                 phone=phone,
                 company=self.company,
                 created_by=self.user,
-                is_converted=True,
-                converted_lead_id=f"lead_{phone}"
+                is_converted=True
             )
             converted_customers.append(customer)
         
@@ -256,8 +254,7 @@ class TestCustomerAPIProperties(TestCase):
                 phone=phone,
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=f"lead_{phone}" if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -354,8 +351,7 @@ class TestCustomerAPIProperties(TestCase):
                 phone=phone,
                 company=self.company,
                 created_by=self.user,
-                is_converted=is_converted,
-                converted_lead_id=f"lead_{phone}" if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -641,8 +637,7 @@ class TestCustomerAPIProperties(TestCase):
                 company=self.company,
                 created_by=self.user,
                 call_status=call_status,
-                is_converted=is_converted,
-                converted_lead_id=f"lead_{phone}" if is_converted else None
+                is_converted=is_converted
             )
             customers.append(customer)
         
@@ -908,8 +903,7 @@ class TestCustomerAPIProperties(TestCase):
             phone=phone,
             company=self.company,
             created_by=self.user,
-            is_converted=is_converted,
-            converted_lead_id=f"lead_{phone}" if is_converted else None
+            is_converted=is_converted
         )
         
         try:
@@ -225,7 +225,7 @@ class TestConversionStateUpdateProperties(TestCase):
         )
         self.assertEqual(
             customer.converted_lead_id,
-            str(lead.id),
+            lead.id,
             f"Customer {customer.id} converted_lead_id should match lead ID {lead.id}"
         )
         
@@ -276,7 +276,7 @@ class TestConversionStateUpdateProperties(TestCase):
         )
         self.assertEqual(
             customer.converted_lead_id,
-            str(lead.id),
+            lead.id,
             f"Customer {customer.id} converted_lead_id should match lead ID"
         )
         
@@ -429,7 +429,7 @@ class TestConversionStateUpdateProperties(TestCase):
         
         # Verify only conversion fields changed
         self.assertTrue(customer.is_converted)
-        self.assertEqual(customer.converted_lead_id, str(lead.id))
+        self.assertEqual(customer.converted_lead_id, lead.id)
         
         # Clean up
         lead.delete()
@@ -501,9 +501,9 @@ class TestConversionStateUpdateProperties(TestCase):
         self.assertTrue(is_converted_1)
         self.assertTrue(is_converted_2)
         self.assertTrue(is_converted_3)
-        self.assertEqual(converted_lead_id_1, str(lead.id))
-        self.assertEqual(converted_lead_id_2, str(lead.id))
-        self.assertEqual(converted_lead_id_3, str(lead.id))
+        self.assertEqual(converted_lead_id_1, lead.id)
+        self.assertEqual(converted_lead_id_2, lead.id)
+        self.assertEqual(converted_lead_id_3, lead.id)
         
         # Clean up
         lead.delete()
@@ -729,7 +729,7 @@ class TestDuplicateConversionPreventionProperties(TestCase):
         )
         self.assertEqual(
             customer.converted_lead_id,
-            str(lead1.id),
+            lead1.id,
             f"Customer should still reference the original lead"
         )
         
@@ -848,7 +848,7 @@ class TestDuplicateConversionPreventionProperties(TestCase):
             # Verify customer state remains unchanged
             customer.refresh_from_db()
             self.assertTrue(customer.is_converted)
-            self.assertEqual(customer.converted_lead_id, str(lead.id))
+            self.assertEqual(customer.converted_lead_id, lead.id)
         
         # Verify only one lead exists
         lead_count = Lead.objects.filter(
@@ -1085,8 +1085,7 @@ class TestConversionTransactionAtomicityProperties(TestCase):
             company=self.company,
             created_by=self.user,
             assigned_to=self.user,
-            is_converted=True,  # Already converted - will fail validation
-            converted_lead_id='999'
+            is_converted=True  # Already converted - will fail validation
         )
         
         # Count leads before conversion attempt
@@ -1242,7 +1241,7 @@ class TestConversionTransactionAtomicityProperties(TestCase):
             # Verify referential integrity
             self.assertEqual(
                 customer.converted_lead_id,
-                str(lead.id),
+                lead.id,
                 f"Customer converted_lead_id should match created lead ID"
             )
             
@@ -1477,8 +1476,7 @@ class TestConversionTransactionAtomicityProperties(TestCase):
             company=self.company,
             created_by=self.user,
             assigned_to=self.user,
-            is_converted=True,  # Already converted
-            converted_lead_id='999'
+            is_converted=True  # Already converted
         )
         
         # Attempt conversion (should fail)
@@ -1495,9 +1493,8 @@ class TestConversionTransactionAtomicityProperties(TestCase):
                 customer.is_converted,
                 f"Check {check_num + 1}: Customer state should be consistent"
             )
-            self.assertEqual(
+            self.assertIsNone(
                 customer.converted_lead_id,
-                '999',
                 f"Check {check_num + 1}: Customer converted_lead_id should be consistent"
             )
             
@@ -2600,7 +2597,7 @@ class TestReferentialIntegrityProperties(TestCase):
             f"Lead {lead_id} should exist after conversion"
         )
         self.assertEqual(
-            str(lead_id),
+            lead_id,
             converted_lead_id,
             f"Customer's converted_lead_id should match lead ID"
         )
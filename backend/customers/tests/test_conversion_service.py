@@ -7,10 +7,12 @@ bulk conversion, data preparation, and audit logging.
 **Validates: Requirements REQ-028 through REQ-041, REQ-071**
 """
 
+from datetime import timedelta
 from decimal import Decimal
 from django.test import TestCase
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from customers.services import ConversionService, ValidationService
+from customers.services import AnalyticsService, ConversionService, ValidationService
 from customers.models import Customer, ConversionAuditLog
 from leads.models import Lead
 from accounts.models import Company
@@ -76,7 +78,8 @@ class TestConversionServiceSingleConversion(TestCase):
         # Verify customer was marked as converted
         self.customer.refresh_from_db()
         self.assertTrue(self.customer.is_converted)
-        self.assertEqual(self.customer.converted_lead_id, str(lead.id))
+        self.assertEqual(self.customer.converted_lead_id, lead.id)
+        self.assertEqual(self.customer.converted_at, lead.created_at)
         
         # Verify audit log was created
         audit_log = ConversionAuditLog.objects.filter(customer_id=self.customer.id).first()
@@ -206,7 +209,6 @@ class TestConversionServiceBulkConversion(TestCase):
         """Should skip already-converted customers"""
         # Convert first customer manually
         self.customers[0].is_converted = True
-        self.customers[0].converted_lead_id = "999"
         self.customers[0].save()
         
         customer_ids = [c.id for c in self.customers]
@@ -303,3 +305,54 @@ class TestConversionServiceDataPreparation(TestCase):
         lead_data = ConversionService.prepare_lead_data(self.customer, additional_data)
         
         self.assertEqual(lead_data['assigned_to'], self.user)
+
+
+class TestConversionAnalytics(TestCase):
+    """
+    Unit tests for conversion analytics computed from converted_at
+
+    **Validates: Requirements REQ-054, REQ-057**
+    """
+
+    def setUp(self):
+        """Set up converted customers"""
+        self.company = Company.objects.create(name="Test Company", code="TEST")
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            role="admin",
+            company=self.company
+        )
+        self.now = timezone.now()
+        for i, days_to_convert in enumerate([2, 4, 6]):
+            customer = Customer.objects.create(
+                name=f"Customer {i}",
+                phone=f"98765432{i:02d}",
+                company=self.company,
+                created_by=self.user
+            )
+            lead = ConversionService.convert_single(customer, {'requirement_type': 'apartment'}, self.user)
+            Customer.objects.filter(id=customer.id).update(
+                created_at=self.now - timedelta(days=days_to_convert + i),
+                converted_at=self.now - timedelta(days=i)
+            )
+            self.assertEqual(customer.converted_lead, lead)
+
+    def test_average_time_to_conversion_single_query(self):
+        """Should average converted_at - created_at in one query"""
+        with self.assertNumQueries(1):
+            avg_days = AnalyticsService.get_average_time_to_conversion(self.company.id)
+
+        self.assertEqual(avg_days, 4.0)
+
+    def test_conversion_trend_single_query(self):
+        """Should count conversions per day in one query"""
+        with self.assertNumQueries(1):
+            trend = AnalyticsService.get_conversion_trend(self.company.id, days=7)
+
+        counts = {point['date']: point['conversions'] for point in trend}
+        for i in range(3):
+            day = timezone.localtime(self.now - timedelta(days=i)).date().isoformat()
+            self.assertEqual(counts[day], 1)
+        self.assertEqual(sum(counts.values()), 3)
@@ -0,0 +1,60 @@
+"""
+Tests for the streaming customer export endpoint
+"""
+import csv
+import io
+
+import openpyxl
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Company
+from customers.models import Customer
+
+User = get_user_model()
+
+
+class TestCustomerExportEndpoint(TestCase):
+    """Test GET /api/customers/export/"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.company = Company.objects.create(name="Test Company", code="TEST")
+        self.other_company = Company.objects.create(name="Other Company", code="OTHER")
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            role="admin",
+            company=self.company
+        )
+        Customer.objects.create(phone='1234567890', name='John Doe', company=self.company, created_by=self.user)
+        Customer.objects.create(phone='9876543210', name='Jane Smith', company=self.company, created_by=self.user,
+                                call_status='answered')
+        Customer.objects.create(phone='5555555555', name='Other', company=self.other_company, created_by=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_export_xlsx(self):
+        """Excel export contains the same customers as the list"""
+        response = self.client.get('/api/customers/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sheet = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], 'Phone Number')
+        listed = self.client.get('/api/customers/', {'page_size': 100}).data['results']
+        self.assertEqual(sorted(row[0] for row in rows[1:]), sorted(c['phone'] for c in listed))
+
+    def test_export_csv_respects_list_filters(self):
+        """CSV export applies the same call_status filter as the list"""
+        response = self.client.get('/api/customers/export/', {
+            'file_format': 'csv',
+            'columns': 'name,call_status',
+            'call_status': 'answered',
+        })
+
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertEqual(list(csv.reader(io.StringIO(content))), [['Name', 'Call Status'], ['Jane Smith', 'answered']])
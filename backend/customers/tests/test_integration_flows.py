@@ -343,7 +343,7 @@ class CustomerToLeadIntegrationTests(TransactionTestCase):
         # Step 4: Verify conversion completed successfully
         customer.refresh_from_db()
         self.assertTrue(customer.is_converted)
-        self.assertEqual(customer.converted_lead_id, str(lead_id))
+        self.assertEqual(customer.converted_lead_id, lead_id)
         
         lead = Lead.objects.get(id=lead_id)
         self.assertEqual(lead.name, 'Manual Customer')
@@ -6,8 +6,8 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.pagination import PageNumberPagination
 from django.contrib.auth import get_user_model
-from django.db.models import Q
 from django.http import HttpResponse
+from django.utils import timezone
 from .models import Customer, CallAllocation
 from .serializers import CustomerSerializer, CallAllocationSerializer
 from .services import ImportService, ValidationService, ConversionService, AnalyticsService
@@ -16,18 +16,40 @@ from leads.models import Lead
 from leads.serializers import LeadSerializer
 from accounts.permissions import filter_by_user_access, can_hr_access_module, CompanyAccessPermission
 from utils.mixins import CompanyFilterMixin
-from eswari_crm.ws_utils import notify_company
+from utils.pagination import KeysetPaginationMixin
+from eswari_crm.ws_utils import notify_company_changed
+from import_jobs.models import ImportJob
+from import_jobs.services import submit_import, wants_background
+from import_jobs.views import import_response
+from search.services import index_created, reindex
+from utils.cache_versions import bump_company
+from utils.exports import ExportColumn, export_response
+from utils.phones import normalize_phone, phone_or_text_q, set_normalized_phones
 
 User = get_user_model()
 
 
-class CustomerPagination(PageNumberPagination):
+class CustomerPagination(KeysetPaginationMixin, PageNumberPagination):
     """Custom pagination for customer list"""
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 100
 
 
+CUSTOMER_EXPORT_COLUMNS = [
+    ExportColumn('phone', 'Phone Number', text=True, width=15),
+    ExportColumn('name', 'Name'),
+    ExportColumn('call_status', 'Call Status', width=15),
+    ExportColumn('custom_call_status', 'Custom Status', width=15),
+    ExportColumn('assigned_to', 'Assigned To', lambda c: c.assigned_to_name, width=15),
+    ExportColumn('scheduled_date', 'Scheduled Date', lambda c: c.scheduled_date and c.scheduled_date.strftime('%Y-%m-%d'), width=12),
+    ExportColumn('notes', 'Notes', width=30),
+    ExportColumn('created_at', 'Created Date', lambda c: c.created_at.strftime('%Y-%m-%d'), width=12),
+    ExportColumn('created_by', 'Created By', lambda c: c.created_by_name, width=15),
+    ExportColumn('is_converted', 'Is Converted', lambda c: 'Yes' if c.is_converted else 'No', width=12),
+]
+
+
 class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated, CompanyAccessPermission]
@@ -45,19 +67,16 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         
         # Base queryset with optimized database queries
         # Use select_related for ForeignKey fields to avoid N+1 queries
+        # (user names and contact masking come from accounts.directory)
         base_queryset = Customer.objects.select_related(
-            'company', 
-            'assigned_to', 
-            'created_by'
+            'company'
         ).only(
             # Only fetch needed fields to reduce data transfer
             'id', 'name', 'phone', 'call_status', 'custom_call_status',
             'assigned_to_id', 'created_by_id', 'scheduled_date', 'call_date',
-            'notes', 'is_converted', 'converted_lead_id', 'created_at',
+            'notes', 'is_converted', 'converted_lead_id', 'converted_at', 'created_at',
             'updated_at', 'company_id',
             # Related fields
-            'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username',
-            'created_by__first_name', 'created_by__last_name', 'created_by__username',
             'company__id', 'company__name', 'company__code'
         )
         
@@ -101,9 +120,8 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             # Sanitize search input
             search = InputSanitizer.sanitize_string(search, max_length=100)
             if search:
-                queryset = queryset.filter(
-                    Q(name__icontains=search) | Q(phone__icontains=search)
-                )
+                # Digits-only searches use the indexed phone prefix/suffix lookup
+                queryset = queryset.filter(phone_or_text_q(search, 'phone', 'name'))
         
         # Filter by assigned_to
         assigned_to = self.request.query_params.get('assigned_to', None)
@@ -184,14 +202,9 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         
         # Send real-time notification
         if instance.company_id:
-            notify_company(
-                company_id=instance.company_id,
-                event_type='customer_updated',
-                data={
-                    'entity': 'customers',
-                    'action': 'updated',
-                    'record_id': instance.id,
-                }
+            notify_company_changed(
+                instance.company_id, 'customer_updated', 'customers', 'updated',
+                record_id=instance.id, fields=serializer.validated_data,
             )
     
     def perform_create(self, serializer):
@@ -210,14 +223,8 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             
             # Send real-time notification
             if instance.company_id:
-                notify_company(
-                    company_id=instance.company_id,
-                    event_type='customer_created',
-                    data={
-                        'entity': 'customers',
-                        'action': 'created',
-                        'record_id': instance.id,
-                    }
+                notify_company_changed(
+                    instance.company_id, 'customer_created', 'customers', 'created', record_id=instance.id,
                 )
         except Exception as e:
             # Handle duplicate phone number error
@@ -237,7 +244,9 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         Request:
             - file: CSV or Excel file
             - import_type: 'csv' or 'excel'
-        
+            - async (optional): 'true' to queue the import; responds 202 with
+              job_id/status_url (GET /api/imports/<id>/ for progress)
+
         Response:
             {
                 "success": true,
@@ -286,64 +295,33 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            # Parse file based on import type
-            if import_type == 'csv':
-                rows = ImportService.parse_csv(file_obj)
-            elif import_type == 'excel':
-                rows = ImportService.parse_excel(file_obj)
-            else:
-                return Response(
-                    {
-                        'success': False,
-                        'error': 'Invalid import type',
-                        'message': 'Import type must be "csv" or "excel"'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Validate import data (includes sanitization)
-            valid_rows, error_rows = ImportService.validate_import_data(
-                rows,
-                request.user.company_id
+        if import_type not in ('csv', 'excel'):
+            return Response(
+                {
+                    'success': False,
+                    'error': 'Invalid import type',
+                    'message': 'Import type must be "csv" or "excel"'
+                },
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            # Bulk create customers
-            if valid_rows:
-                result = ImportService.bulk_create_customers(
-                    valid_rows,
-                    request.user,
-                    request.user.company
-                )
-                success_count = result['success_count']
-                duplicates_skipped = result['duplicates_skipped']
-            else:
-                success_count = 0
-                duplicates_skipped = 0
-            
-            # Build response summary
-            summary = {
-                'total_rows': len(rows),
-                'success_count': success_count,
-                'duplicate_count': duplicates_skipped,
-                'error_count': len(error_rows),
-                'errors': error_rows
-            }
-            
-            return Response({
-                'success': True,
-                'summary': summary
-            })
-            
-        except Exception as e:
+        
+        # Validated and inserted in batches by CustomerFileImporter;
+        # async=true queues the file for the import worker instead
+        job = submit_import(
+            'customers', request.user, request.user.company,
+            file=file_obj, background=wants_background(request),
+        )
+        if job.status == ImportJob.STATUS_FAILED:
             return Response(
                 {
                     'success': False,
                     'error': 'File processing error',
-                    'message': str(e)
+                    'message': job.error_message,
+                    'job_id': job.id
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
+        return import_response(job, success_status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser], url_path='import/preview')
     def import_preview(self, request):
@@ -481,6 +459,25 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         
         return response
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Export customers (with the same filters as the list) to Excel or CSV
+        
+        Endpoint: GET /api/customers/export/?file_format=xlsx|csv&columns=phone,name
+        
+        Response:
+            Streamed file download; rows are read in chunks so memory stays
+            flat for large customer books
+        """
+        return export_response(
+            request,
+            self.get_queryset(),
+            CUSTOMER_EXPORT_COLUMNS,
+            f'calls_{timezone.now().date().isoformat()}',
+            'Customers',
+        )
+    
     @action(detail=False, methods=['post'])
     def bulk_delete(self, request):
         """Bulk delete customers by IDs."""
@@ -509,8 +506,9 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         errors = []
         duplicate_phones = set(
             Customer.objects.filter(
-                phone__in=[str(c.get('phone', '')) for c in customers_data]
-            ).values_list('phone', flat=True)
+                company=request.user.company,
+                normalized_phone__in={normalize_phone(c.get('phone')) for c in customers_data},
+            ).values_list('normalized_phone', flat=True)
         )
 
         for i, customer_data in enumerate(customers_data):
@@ -518,9 +516,12 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             if not phone:
                 errors.append(f"Row {i+1}: Phone number is required")
                 continue
-            if phone in duplicate_phones:
+            normalized = normalize_phone(phone)
+            if normalized in duplicate_phones:
                 errors.append(f"Row {i+1}: Phone {phone} already exists")
                 continue
+            # Later rows with the same number are duplicates of this one
+            duplicate_phones.add(normalized)
             to_create.append(Customer(
                 name=customer_data.get('name'),
                 phone=phone,
@@ -536,7 +537,8 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         created_count = 0
         if to_create:
             with db_transaction.atomic():
-                created = Customer.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+                created = Customer.objects.bulk_create(set_normalized_phones(to_create), batch_size=500, ignore_conflicts=True)
+                index_created(created)
                 created_count = len(created)
 
         return Response({
@@ -778,7 +780,13 @@ class CustomerViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             qs = self.get_queryset().filter(id__in=customer_ids)
         
         # Update customers
+        record_ids = list(qs.values_list('id', flat=True))
+        company_ids = set(qs.order_by().values_list('company_id', flat=True).distinct())
         updated_count = qs.update(assigned_to=employee)
+        reindex(Customer, record_ids)
+        # .update() skips model signals
+        for company_id in company_ids:
+            bump_company(company_id)
         
         return Response({
             'updated': updated_count,
@@ -15,12 +15,12 @@ Usage:
 import logging
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
 
+from accounts.authentication import get_auth_user
+
 logger = logging.getLogger(__name__)
-User = get_user_model()
  
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
     """
@@ -140,6 +140,13 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             'data': event['data'],
         })
     
+    async def lead_updated(self, event):
+        """Leads updated (bulk assign/status) - triggers refetch on clients."""
+        await self.send_json({
+            'type': 'lead_updated',
+            'data': event['data'],
+        })
+    
     async def lead_deleted(self, event):
         """Lead deleted - triggers refetch on clients."""
         await self.send_json({
@@ -182,6 +189,20 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             'data': event['data'],
         })
 
+    async def import_progress(self, event):
+        """Import job progress (queued / batch processed)."""
+        await self.send_json({
+            'type': 'import_progress',
+            'data': event['data'],
+        })
+
+    async def import_finished(self, event):
+        """Import job completed or failed."""
+        await self.send_json({
+            'type': 'import_finished',
+            'data': event['data'],
+        })
+
     # ═══════════════════════════════════════════════════════════════════════
     # Authentication
     # ═══════════════════════════════════════════════════════════════════════
@@ -206,8 +227,6 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
 
     @database_sync_to_async
     def _get_user(self, user_id):
-        """Fetch user from database."""
-        try:
-            return User.objects.select_related('company').get(id=user_id, is_active=True)
-        except User.DoesNotExist:
-            return None
+        """Resolve the user through the authentication cache."""
+        user = get_auth_user(user_id)
+        return user if user is not None and user.is_active else None
@@ -70,6 +70,9 @@ INSTALLED_APPS = [
     "birthdays",      # Birthday calendar system
     "analytics",      # Unified cross-company analytics
     "bulk_operations",  # Bulk assign/update operations
+    "import_jobs",      # Batched spreadsheet/bulk imports
+    "change_feed",      # Versioned per-company change feed
+    "search",           # Cross-entity search index
 ]
 
 MIDDLEWARE = [
@@ -205,6 +208,57 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB
 
+# Import jobs: spreadsheet/bulk imports run inside the request unless the
+# client passes async=true, which queues them for the `run_import_worker`
+# process (the import_worker service in docker-compose.yml). Setting
+# IMPORT_JOBS_ASYNC makes queueing the default, for clients that poll
+# /api/import-jobs/ for the result.
+IMPORT_JOBS_ASYNC = config('IMPORT_JOBS_ASYNC', default=False, cast=bool)
+IMPORT_JOBS_STALE_MINUTES = config('IMPORT_JOBS_STALE_MINUTES', default=30, cast=int)
+
+# Push outbox (notifications.outbox): pushes are queued in the database and
+# sent by the `run_push_worker` process (the push_worker service in
+# docker-compose.yml). PUSH_DELIVERY_INLINE is a fallback for deployments
+# without the worker: each process sends the pushes its requests queued from
+# a pool of PUSH_DELIVERY_INLINE_THREADS background threads.
+PUSH_DELIVERY_INLINE = config('PUSH_DELIVERY_INLINE', default=False, cast=bool)
+PUSH_DELIVERY_INLINE_THREADS = config('PUSH_DELIVERY_INLINE_THREADS', default=4, cast=int)
+PUSH_OUTBOX_MAX_ATTEMPTS = config('PUSH_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+PUSH_OUTBOX_STALE_MINUTES = config('PUSH_OUTBOX_STALE_MINUTES', default=10, cast=int)
+
+# Company registry (accounts.registry): also keep a version stamp in the shared
+# cache so every worker reloads after a company change. Only useful with a
+# cache backend shared between processes (Redis/Memcached). Without it each
+# process reloads the registry after COMPANY_REGISTRY_MAX_AGE seconds.
+COMPANY_REGISTRY_SHARED_VERSION = config('COMPANY_REGISTRY_SHARED_VERSION', default=False, cast=bool)
+COMPANY_REGISTRY_MAX_AGE = config('COMPANY_REGISTRY_MAX_AGE', default=300, cast=int)
+
+# User directory (accounts.directory): same, for the in-process id → name/role/
+# team index used by serializers and analytics. Without a shared version each
+# process reloads it after USER_DIRECTORY_MAX_AGE seconds.
+USER_DIRECTORY_SHARED_VERSION = config('USER_DIRECTORY_SHARED_VERSION', default=False, cast=bool)
+USER_DIRECTORY_MAX_AGE = config('USER_DIRECTORY_MAX_AGE', default=300, cast=int)
+
+# Authenticated users (with their company) are cached this many seconds by
+# accounts.authentication; user and company writes invalidate them.
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
+
+# Dashboard/analytics results cached under generation-versioned keys
+# (utils.cache_versions) are invalidated by writes. Invalidation only reaches
+# other workers through a shared cache, so 0 (the default) means 6 hours with
+# Redis/Memcached and 5 minutes with the per-process LocMemCache.
+VERSIONED_CACHE_TTL = config('VERSIONED_CACHE_TTL', default=0, cast=int)
+
+# Totals of cursor-paginated lists (utils.pagination, ?count=true) are cached
+# per filter signature this many seconds; they may lag recent writes.
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=60, cast=int)
+
+# Cross-company overview snapshots (analytics.overview): age after which a
+# snapshot is recomputed, and whether a stale read starts that recompute in
+# a background thread (otherwise only refresh_overview_snapshots does).
+OVERVIEW_SNAPSHOT_MAX_AGE = config('OVERVIEW_SNAPSHOT_MAX_AGE', default=15 * 60, cast=int)
+OVERVIEW_SNAPSHOT_BACKGROUND_REFRESH = config('OVERVIEW_SNAPSHOT_BACKGROUND_REFRESH', default=True, cast=bool)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -213,7 +267,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -269,6 +323,12 @@ CHANNEL_LAYERS = {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
     }
 }
+# Record change events (eswari_crm.ws_utils) arriving within this many seconds
+# are merged into one event per group and entity; 0 sends each one immediately
+WS_COALESCE_WINDOW = config('WS_COALESCE_WINDOW', default=0.5, cast=float)
+# Change feed (change_feed.services): entries are kept this long for clients
+# catching up with GET /api/changes/?since=<version>
+CHANGE_FEED_RETENTION_DAYS = config('CHANGE_FEED_RETENTION_DAYS', default=7, cast=int)
 # For production with Redis, uncomment below:
 # CHANNEL_LAYERS = {
 #     "default": {
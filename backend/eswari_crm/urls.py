@@ -43,6 +43,7 @@ def serve_media_with_cors(request, path):
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("api/health/", views.health_check, name="health_check"),
+    path("api/phone-owners/", views.phone_owners, name="phone_owners"),
     path("api/auth/", include("accounts.urls")),
     path("api/", include("leads.urls")),
     path("api/", include("projects.urls")),
@@ -66,12 +67,16 @@ urlpatterns = [
     path("api/", include("birthdays.urls")),  # Birthday calendar URLs
     path("api/insights/", include("analytics.urls")),  # Unified analytics (renamed from 'analytics' to avoid ad-blocker filters)
     path("api/bulk/", include("bulk_operations.urls")),  # Bulk operations
+    path("api/imports/", include("import_jobs.urls")),  # Import job progress
+    path("api/changes/", include("change_feed.urls")),  # Versioned change feed
+    path("api/search/", include("search.urls")),  # Cross-entity search
 
     # ═══════════════════════════════════════════════════════════════════════
     # API v1 — Versioned endpoints (mirrors /api/ for mobile app stability)
     # The mobile app should migrate to /api/v1/ for future-proof compatibility
     # ═══════════════════════════════════════════════════════════════════════
     path("api/v1/health/", views.health_check, name="v1_health_check"),
+    path("api/v1/phone-owners/", views.phone_owners, name="v1_phone_owners"),
     path("api/v1/auth/", include("accounts.urls")),
     path("api/v1/", include("leads.urls")),
     path("api/v1/", include("projects.urls")),
@@ -95,6 +100,9 @@ urlpatterns = [
     path("api/v1/", include("birthdays.urls")),
     path("api/v1/insights/", include("analytics.urls")),
     path("api/v1/bulk/", include("bulk_operations.urls")),
+    path("api/v1/imports/", include("import_jobs.urls")),
+    path("api/v1/changes/", include("change_feed.urls")),
+    path("api/v1/search/", include("search.urls")),
 
     # ═══════════════════════════════════════════════════════════════════════
     # API Documentation (Swagger / OpenAPI)
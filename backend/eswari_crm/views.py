@@ -1,5 +1,11 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from utils.phones import find_phone_owners, normalize_phone
 
 @csrf_exempt
 def health_check(request):
@@ -12,4 +18,36 @@ def health_check(request):
             'projects': '/api/projects/',
             'tasks': '/api/tasks/',
         }
-    })
\ No newline at end of file
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def phone_owners(request):
+    """
+    Who already has this number, across customers, leads and research data.
+    Query params: ?phone=<number>&company=<id> (company is admin only)
+    Returns: {"phone": normalized, "exists": bool, "owners": [...]}
+    """
+    phone = request.query_params.get('phone', '').strip()
+    if not phone:
+        return Response({'error': 'phone is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    company_id = request.user.company_id
+    if request.user.role == 'admin':
+        requested = request.query_params.get('company')
+        if requested:
+            try:
+                company_id = int(requested)
+            except ValueError:
+                return Response({'error': 'company must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+    if not company_id:
+        if request.user.role == 'admin':
+            return Response({'error': 'Company is required for admin users.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'error': 'Your account is not assigned to a company.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    owners = find_phone_owners(phone, company=company_id)
+    return Response({
+        'phone': normalize_phone(phone),
+        'exists': bool(owners),
+        'owners': owners,
+    })
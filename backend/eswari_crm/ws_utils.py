@@ -24,14 +24,30 @@ Usage:
         'title': 'New policy update',
         'message': 'Please review the updated leave policy.',
     })
+
+Record change events (lead_created, task_updated, ase_data_changed, ...)
+are also written to the company's change feed (change_feed.services) and
+carry its new ``version``; clients that missed events catch up with
+GET /api/changes/?since=<version>. They go through a coalescing buffer:
+changes to the same entity sent to the same group within WS_COALESCE_WINDOW
+seconds are merged into one event listing the actions and record ids.
+
+    notify_company_changed(2, 'task_updated', 'tasks', 'updated', record_id=45, fields=['status'])
+    notify_company_changed(2, 'task_updated', 'tasks', 'bulk_updated', record_ids=[1, 2, 3])
 """
 
+import threading
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Record ids listed in one merged event; beyond this clients just refetch
+MAX_RECORD_IDS = 500
+
 def _send_to_group(group_name, event_type, data):
     """Send a message to a channel layer group."""
     try:
@@ -95,9 +111,138 @@ def notify_broadcast(event_type: str, data: dict) -> bool:
     return _send_to_group("broadcast", event_type, data)
 
 
-def notify_ase_data_changed(entity: str, action: str, record_id=None, extra: dict = None) -> bool:
+def _merge_changes(changes):
+    """
+    Build the payload for buffered ``changes`` of one entity. A single
+    per-record change is sent as is; anything else becomes one summary:
+
+        {'entity': 'leads', 'action': 'deleted' (or 'batch' when mixed),
+         'batched': True, 'count': 12, 'actions': {'deleted': 12},
+         'record_ids': [...], 'truncated': False, 'version': 310}
+    """
+    if len(changes) == 1 and 'record_ids' not in changes[0]:
+        return changes[0]
+
+    actions, record_ids = {}, []
+    for change in changes:
+        ids = change.get('record_ids')
+        if ids is None:
+            ids = [change['record_id']] if change.get('record_id') is not None else []
+        count = change.get('count', len(ids) or 1)
+        actions[change['action']] = actions.get(change['action'], 0) + count
+        record_ids.extend(ids)
+
+    record_ids = list(dict.fromkeys(record_ids))
+    merged = {
+        'entity': changes[0]['entity'],
+        'action': next(iter(actions)) if len(actions) == 1 else 'batch',
+        'batched': True,
+        'count': sum(actions.values()),
+        'actions': actions,
+        'record_ids': record_ids[:MAX_RECORD_IDS],
+        'truncated': len(record_ids) > MAX_RECORD_IDS,
+    }
+    versions = [change['version'] for change in changes if change.get('version')]
+    if versions:
+        merged['version'] = max(versions)
+    return merged
+
+
+class ChangeCoalescer:
     """
-    Notify all ASE Technologies users (company_id=2) that data has changed.
+    Buffers change events per (group, event type, entity) and sends them as
+    one merged event ``window`` seconds after the first one arrived
+    (WS_COALESCE_WINDOW unless given). With a window of 0 every change is
+    sent immediately.
+    """
+
+    def __init__(self, window=None):
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @property
+    def window(self):
+        if self._window is not None:
+            return self._window
+        return getattr(settings, 'WS_COALESCE_WINDOW', 0.5)
+
+    def add(self, group_name, event_type, change):
+        if self.window <= 0:
+            return _send_to_group(group_name, event_type, _merge_changes([change]))
+
+        key = (group_name, event_type, change['entity'])
+        with self._lock:
+            first = key not in self._pending
+            self._pending.setdefault(key, []).append(change)
+        if first:
+            timer = threading.Timer(self.window, self.flush, args=(key,))
+            timer.daemon = True
+            timer.start()
+        return True
+
+    def flush(self, key=None):
+        """Send buffered changes now (all of them, or those of one key)."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._pending)
+            batches = [(k, self._pending.pop(k)) for k in keys if k in self._pending]
+        for (group_name, event_type, _), changes in batches:
+            _send_to_group(group_name, event_type, _merge_changes(changes))
+
+
+change_coalescer = ChangeCoalescer()
+
+
+def _change(company_id, entity, action, record_id=None, record_ids=None, extra=None, fields=None):
+    """Record the change in the company's change feed and build its event payload."""
+    change = {'entity': entity, 'action': action}
+    if record_id is not None:
+        change['record_id'] = record_id
+    if record_ids is not None:
+        change['record_ids'] = list(record_ids)
+        change['count'] = len(change['record_ids'])
+    if extra:
+        change.update(extra)
+
+    if record_ids is not None:
+        feed_ids = change['record_ids']
+    else:
+        feed_ids = [record_id] if record_id is not None else None
+    try:
+        from change_feed.services import record_changes
+        version = record_changes(company_id, entity, action, feed_ids, fields)
+    except Exception as e:
+        logger.warning(f"Failed to record {entity} {action} in the change feed: {e}")
+        version = None
+    if version:
+        change['version'] = version
+    return change
+
+
+def notify_company_changed(company_id: int, event_type: str, entity: str, action: str,
+                           record_id=None, record_ids=None, extra: dict = None, fields=None) -> bool:
+    """
+    Tell a company's clients that records changed (coalesced, see above).
+
+    Args:
+        company_id: The company's ID
+        event_type: Event type (lead_created, task_updated, ...)
+        entity: 'leads', 'tasks', 'customers', ...
+        action: 'created', 'updated', 'deleted', 'bulk_updated', ...
+        record_id: ID of a single affected record
+        record_ids: IDs of the affected records (bulk endpoints)
+        extra: Optional extra data to include
+        fields: Names of the changed fields, when known (change feed)
+    """
+    return change_coalescer.add(
+        f"company_{company_id}", event_type, _change(company_id, entity, action, record_id, record_ids, extra, fields)
+    )
+
+
+def notify_ase_data_changed(entity: str, action: str, record_id=None, extra: dict = None,
+                            record_ids=None, fields=None) -> bool:
+    """
+    Notify all ASE Technologies users that data has changed.
     
     Used for real-time updates on ASE Calls, Leads, and Tasks pages.
     
@@ -106,6 +251,10 @@ def notify_ase_data_changed(entity: str, action: str, record_id=None, extra: dic
         action: 'created', 'updated', 'deleted', 'bulk_deleted', 'converted'
         record_id: Optional ID of the affected record
         extra: Optional extra data to include
+        record_ids: Optional IDs of the affected records (bulk endpoints)
+        fields: Optional names of the changed fields (change feed)
+    
+    Changes are recorded in the change feed and coalesced (see notify_company_changed).
     
     Usage:
         from eswari_crm.ws_utils import notify_ase_data_changed
@@ -113,14 +262,12 @@ def notify_ase_data_changed(entity: str, action: str, record_id=None, extra: dic
         notify_ase_data_changed('tasks', 'updated', record_id=45, extra={'status': 'completed'})
         notify_ase_data_changed('calls', 'bulk_deleted')
     """
-    data = {
-        'entity': entity,
-        'action': action,
-    }
-    if record_id is not None:
-        data['record_id'] = record_id
-    if extra:
-        data.update(extra)
-    
-    # Send to ASE Technologies company group (company_id=2)
-    return _send_to_group("company_2", "ase_data_changed", data)
+    # Send to the ASE Technologies company group
+    from accounts.registry import get_ase_company
+    ase_company = get_ase_company()
+    if not ase_company:
+        return False
+    return change_coalescer.add(
+        f"company_{ase_company.id}", "ase_data_changed",
+        _change(ase_company.id, entity, action, record_id, record_ids, extra, fields),
+    )
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ImportJob
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'created_by', 'company', 'processed_rows', 'created_count', 'error_count', 'created_at']
+    list_filter = ['kind', 'status', 'company']
+    search_fields = ['original_filename', 'created_by__username']
+    readonly_fields = ['created_at', 'started_at', 'heartbeat_at', 'finished_at']
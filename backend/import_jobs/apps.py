@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ImportJobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'import_jobs'
+    verbose_name = 'Import Jobs'
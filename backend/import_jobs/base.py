@@ -0,0 +1,72 @@
+"""
+Base class for batch importers driven by ImportJob.
+
+An importer receives rows lazily (from a streamed sheet or from JSON rows),
+processes them ``batch_size`` at a time and keeps only counters plus the
+first ``max_errors`` error entries in memory.
+
+Subclasses implement ``process_batch`` and ``result``; file importers also
+implement ``map_columns`` to locate their columns in the header row.
+"""
+from utils.spreadsheets import chunked
+
+
+class ImportFailed(ValueError):
+    """Raised when an import cannot start (bad header, empty file, ...)."""
+
+
+class BaseImporter:
+    batch_size = 1000
+    max_rows = 500000
+    max_errors = 20
+
+    def __init__(self, user, company, options=None, batch_size=None, max_rows=None, on_progress=None):
+        self.user = user
+        self.company = company
+        self.options = options or {}
+        self.batch_size = batch_size or self.batch_size
+        self.max_rows = max_rows or self.max_rows
+        self.on_progress = on_progress
+
+        self.total_rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+
+    def map_columns(self, header_row):
+        """Locate columns in the header row. Only needed for file imports."""
+
+    def run(self, rows, first_row_num=2):
+        """Stream ``rows`` through ``process_batch`` and return ``result()``."""
+        row_num = first_row_num
+        for batch in chunked(rows, self.batch_size):
+            if self.total_rows >= self.max_rows:
+                self.add_error(self.row_limit_error(row_num))
+                break
+            batch = batch[:self.max_rows - self.total_rows]
+            self.process_batch(batch, row_num)
+            self.total_rows += len(batch)
+            row_num += len(batch)
+            if self.on_progress:
+                self.on_progress(self)
+        self.finish()
+        return self.result()
+
+    def process_batch(self, batch, first_row_num):
+        raise NotImplementedError
+
+    def finish(self):
+        """Hook called once after the last batch (e.g. to send notifications)."""
+
+    def result(self):
+        raise NotImplementedError
+
+    def add_error(self, error):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+    def row_limit_error(self, row_num):
+        return f'Row {row_num}: Row limit of {self.max_rows} reached, remaining rows were not imported'
@@ -0,0 +1,71 @@
+"""
+Management command that processes queued import jobs.
+
+Usage:
+  python manage.py run_import_worker                 # run forever, 1 job at a time
+  python manage.py run_import_worker --workers 4     # 4 jobs in parallel
+  python manage.py run_import_worker --once          # drain the queue and exit (cron)
+
+Several worker processes can run side by side; jobs are claimed atomically.
+"""
+
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from import_jobs.services import claim_next_job, fail_stale_jobs, run_job, STALE_JOB_MINUTES
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process queued spreadsheet/bulk import jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Jobs processed in parallel')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+        parser.add_argument('--stale-minutes', type=int, default=STALE_JOB_MINUTES,
+                            help='Fail running jobs without a heartbeat for this long')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        base_name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Import worker {base_name} started with {workers} thread(s)')
+
+        failed = fail_stale_jobs(options['stale_minutes'])
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Marked {failed} stale job(s) as failed'))
+
+        if workers == 1:
+            processed = self._loop(f'{base_name}/0', options)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._loop, f'{base_name}/{i}', options) for i in range(workers)]
+                processed = sum(f.result() for f in futures)
+
+        self.stdout.write(self.style.SUCCESS(f'Import worker finished: {processed} job(s) processed'))
+
+    def _loop(self, worker_name, options):
+        processed = 0
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job(worker_name)
+                if job is None:
+                    if options['once']:
+                        return processed
+                    time.sleep(options['poll_interval'])
+                    continue
+                run_job(job)
+                processed += 1
+                logger.info(f"{worker_name} finished import job {job.id}: {job.status}")
+        finally:
+            # Each thread owns its own connections
+            connections.close_all()
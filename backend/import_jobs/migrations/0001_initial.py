@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-17 02:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0022_add_team_to_invitetoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('bre_research', 'BRE Research Data'), ('boe_leads', 'BOE Leads'), ('ase_customers', 'ASE Customers'), ('customers', 'Customers'), ('leads', 'Leads'), ('capital_customers', 'Capital Customers'), ('capital_leads', 'Capital Leads'), ('capital_tasks', 'Capital Tasks'), ('capital_loans', 'Capital Loans'), ('capital_services', 'Capital Services')], max_length=30)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('file', models.FileField(blank=True, null=True, upload_to='import_jobs/%Y/%m/')),
+                ('original_filename', models.CharField(blank=True, default='', max_length=255)),
+                ('payload', models.JSONField(blank=True, help_text='Rows for JSON bulk imports', null=True)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('total_rows', models.PositiveIntegerField(blank=True, help_text='Known up front for JSON imports only', null=True)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('duplicate_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('result', models.JSONField(blank=True, help_text='Endpoint-specific import summary', null=True)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='accounts.company')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='importjob_status_created_idx'), models.Index(fields=['created_by', '-created_at'], name='importjob_user_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+from django.db import models
+from django.conf import settings
+
+
+class ImportJob(models.Model):
+    """
+    A spreadsheet/bulk import processed in batches, either inline or by the
+    `run_import_worker` management command.
+
+    Progress counters are updated after every batch so clients can poll
+    GET /api/imports/<id>/ (or listen for `import_progress` WebSocket events).
+    """
+
+    KIND_CHOICES = [
+        ('bre_research', 'BRE Research Data'),
+        ('boe_leads', 'BOE Leads'),
+        ('ase_customers', 'ASE Customers'),
+        ('customers', 'Customers'),
+        ('leads', 'Leads'),
+        ('capital_customers', 'Capital Customers'),
+        ('capital_leads', 'Capital Leads'),
+        ('capital_tasks', 'Capital Tasks'),
+        ('capital_loans', 'Capital Loans'),
+        ('capital_services', 'Capital Services'),
+    ]
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    company = models.ForeignKey(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='import_jobs',
+    )
+
+    # Source: either an uploaded sheet or JSON rows posted to a bulk_import action
+    file = models.FileField(upload_to='import_jobs/%Y/%m/', null=True, blank=True)
+    original_filename = models.CharField(max_length=255, blank=True, default='')
+    payload = models.JSONField(null=True, blank=True, help_text="Rows for JSON bulk imports")
+    options = models.JSONField(default=dict, blank=True)
+
+    # Progress
+    total_rows = models.PositiveIntegerField(null=True, blank=True, help_text="Known up front for JSON imports only")
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+
+    # Outcome
+    result = models.JSONField(null=True, blank=True, help_text="Endpoint-specific import summary")
+    error_message = models.TextField(blank=True, default='')
+
+    worker = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='importjob_status_created_idx'),
+            models.Index(fields=['created_by', '-created_at'], name='importjob_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} import #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    def progress_data(self):
+        """Compact progress payload shared by the polling endpoint and WebSocket events."""
+        percent = None
+        if self.total_rows:
+            percent = min(100, round(self.processed_rows * 100 / self.total_rows))
+        elif self.status == self.STATUS_COMPLETED:
+            percent = 100
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'processed_rows': self.processed_rows,
+            'created': self.created_count,
+            'duplicates': self.duplicate_count,
+            'errors': self.error_count,
+            'percent': percent,
+            'error_message': self.error_message,
+        }
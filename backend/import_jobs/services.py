@@ -0,0 +1,199 @@
+"""
+Import job orchestration.
+
+    submit_import()   - create an ImportJob and run it inline or queue it
+    run_job()         - execute a job with its importer, batch by batch
+    claim_next_job()  - atomically take the oldest queued job (worker side)
+    fail_stale_jobs() - fail running jobs whose worker stopped heartbeating
+
+Importers are looked up by job kind in IMPORTERS and loaded lazily so this
+module does not import every app's models at startup.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from eswari_crm.ws_utils import notify_user
+from utils.cache_versions import bump_company
+from utils.spreadsheets import open_sheet_rows, UnsupportedFileFormat
+from .base import ImportFailed
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+IMPORTERS = {
+    'bre_research': 'ase_leads.importers.BREResearchImporter',
+    'boe_leads': 'ase_leads.importers.BOELeadImporter',
+    'ase_customers': 'ase_customers.importers.ASECustomerFileImporter',
+    'customers': 'customers.importers.CustomerFileImporter',
+    'leads': 'leads.importers.LeadRowImporter',
+    'capital_customers': 'capital.importers.CapitalCustomerImporter',
+    'capital_leads': 'capital.importers.CapitalLeadImporter',
+    'capital_tasks': 'capital.importers.CapitalTaskImporter',
+    'capital_loans': 'capital.importers.CapitalLoanImporter',
+    'capital_services': 'capital.importers.CapitalServiceImporter',
+}
+
+# Jobs still "running" without a heartbeat for this long are considered dead
+STALE_JOB_MINUTES = getattr(settings, 'IMPORT_JOBS_STALE_MINUTES', 30)
+
+
+def get_importer_class(kind):
+    return import_string(IMPORTERS[kind])
+
+
+def wants_background(request):
+    """
+    True when the client asked for a background import (``?async=true`` or
+    ``async`` in the body), falling back to settings.IMPORT_JOBS_ASYNC.
+    """
+    value = request.query_params.get('async')
+    if value is None and hasattr(request.data, 'get'):
+        value = request.data.get('async')
+    if value is None:
+        return getattr(settings, 'IMPORT_JOBS_ASYNC', False)
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def submit_import(kind, user, company, file=None, rows=None, options=None, background=False):
+    """
+    Create an ImportJob for ``file`` (uploaded sheet) or ``rows`` (JSON rows).
+
+    background=False runs the import inline and returns the finished job;
+    background=True persists the source and returns the queued job for
+    `run_import_worker` to pick up.
+    """
+    job = ImportJob(
+        kind=kind,
+        company=company,
+        created_by=user,
+        options=options or {},
+        original_filename=getattr(file, 'name', '') or '',
+        total_rows=len(rows) if rows is not None else None,
+    )
+    if not background:
+        job.save()
+        return run_job(job, file_obj=file, rows=rows)
+
+    if file is not None:
+        job.file.save(job.original_filename or 'import', file, save=False)
+    else:
+        job.payload = {'rows': rows or []}
+    job.save()
+    notify_user(user.id, 'import_progress', job.progress_data())
+    return job
+
+
+def claim_next_job(worker_name):
+    """Take the oldest queued job; safe to call from many workers at once."""
+    candidates = ImportJob.objects.filter(
+        status=ImportJob.STATUS_QUEUED
+    ).order_by('created_at').values_list('id', flat=True)[:10]
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=job_id, status=ImportJob.STATUS_QUEUED).update(
+            status=ImportJob.STATUS_RUNNING,
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+        )
+        if claimed:
+            return ImportJob.objects.select_related('created_by', 'company').get(id=job_id)
+    return None
+
+
+def fail_stale_jobs(minutes=STALE_JOB_MINUTES):
+    """Mark running jobs whose worker died as failed. Returns the number failed."""
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return ImportJob.objects.filter(
+        status=ImportJob.STATUS_RUNNING, heartbeat_at__lt=cutoff,
+    ).update(
+        status=ImportJob.STATUS_FAILED,
+        error_message='Import worker stopped responding.',
+        finished_at=timezone.now(),
+    )
+
+
+def run_job(job, file_obj=None, rows=None):
+    """
+    Execute ``job`` and record its outcome.
+
+    ``file_obj``/``rows`` are passed for inline runs; background runs read
+    the source persisted on the job.
+    """
+    now = timezone.now()
+    job.status = ImportJob.STATUS_RUNNING
+    job.started_at = job.started_at or now
+    job.heartbeat_at = now
+    job.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+
+    importer = get_importer_class(job.kind)(
+        user=job.created_by,
+        company=job.company,
+        options=job.options,
+        on_progress=lambda imp: _record_progress(job, imp),
+    )
+
+    try:
+        if file_obj is None and job.file:
+            file_obj = job.file.open('rb')
+        if file_obj is not None:
+            with open_sheet_rows(file_obj, job.original_filename) as sheet:
+                header_row = next(sheet, None)
+                if header_row is None:
+                    raise ImportFailed('File is empty.')
+                importer.map_columns(header_row)
+                job.result = importer.run(sheet, first_row_num=2)
+        else:
+            if rows is None:
+                rows = (job.payload or {}).get('rows', [])
+            job.result = importer.run(rows, first_row_num=1)
+    except (ImportFailed, UnsupportedFileFormat) as e:
+        _finish(job, importer, ImportJob.STATUS_FAILED, str(e))
+    except Exception as e:
+        logger.error(f"Import job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+        _finish(job, importer, ImportJob.STATUS_FAILED, f'Failed to process file: {str(e)}')
+    else:
+        _finish(job, importer, ImportJob.STATUS_COMPLETED)
+    return job
+
+
+def _sync_counters(job, importer):
+    job.processed_rows = importer.total_rows
+    job.created_count = importer.created
+    job.duplicate_count = importer.duplicates
+    job.error_count = importer.error_count
+
+
+def _record_progress(job, importer):
+    _sync_counters(job, importer)
+    job.heartbeat_at = timezone.now()
+    ImportJob.objects.filter(pk=job.pk).update(
+        processed_rows=job.processed_rows,
+        created_count=job.created_count,
+        duplicate_count=job.duplicate_count,
+        error_count=job.error_count,
+        heartbeat_at=job.heartbeat_at,
+    )
+    notify_user(job.created_by_id, 'import_progress', job.progress_data())
+
+
+def _finish(job, importer, final_status, error_message=''):
+    _sync_counters(job, importer)
+    job.status = final_status
+    job.error_message = error_message
+    job.finished_at = timezone.now()
+    job.payload = None
+    if job.file:
+        # The source is no longer needed once the rows are in the database
+        job.file.close()
+        job.file.delete(save=False)
+    job.save()
+    if job.created_count:
+        # Rows were bulk-created, bypassing the signals that invalidate caches
+        bump_company(job.company_id)
+    notify_user(job.created_by_id, 'import_finished', job.progress_data())
@@ -0,0 +1,233 @@
+"""
+Unit tests for the import job subsystem.
+
+Tests cover:
+- Inline imports record a completed ImportJob and keep the endpoint's response
+- async=true queues the upload (202) and the worker command processes it
+- Polling endpoint visibility and progress payload
+- Failed jobs (bad header) and stale running jobs
+- Atomic job claiming
+- JSON bulk_import endpoints (leads, capital) run through jobs
+- Rows the database ignores as conflicts are counted as duplicates, not imports
+"""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Company
+from teams.models import Team
+from ase_leads.models.bre_data import BREResearchData
+from capital.models import CapitalCustomer
+from leads.models import Lead
+from import_jobs.models import ImportJob
+from import_jobs.services import claim_next_job, fail_stale_jobs
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_csv(rows, name='leads.csv'):
+    content = '\n'.join(','.join(str(c) for c in row) for row in rows)
+    return SimpleUploadedFile(name, content.encode('utf-8'), content_type='text/csv')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImportJobFlowTest(TestCase):
+    """Tests for queuing, processing and polling import jobs"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.upload_url = reverse('ase-leads-bulk-upload')
+
+        self.ase_company = Company.objects.create(name="ASE Technologies", code="ASE")
+        self.bre_team = Team.objects.create(
+            name="BRE Team",
+            team_type="marketing",
+            marketing_category="bre",
+            company=self.ase_company,
+        )
+        self.bre_user = User.objects.create_user(
+            username="bre_user",
+            email="bre@test.com",
+            password="testpass123",
+            role="employee",
+            company=self.ase_company,
+            team=self.bre_team,
+        )
+        self.other_user = User.objects.create_user(
+            username="other_user",
+            email="other@test.com",
+            password="testpass123",
+            role="employee",
+            company=self.ase_company,
+            team=self.bre_team,
+        )
+        self.client.force_authenticate(user=self.bre_user)
+
+    def _upload(self, rows, **extra):
+        return self.client.post(self.upload_url, {'file': make_csv(rows), **extra}, format='multipart')
+
+    def test_inline_import_records_completed_job(self):
+        response = self._upload([['name', 'phone'], ['John', '9876543210']])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.kind, 'bre_research')
+        self.assertEqual(job.processed_rows, 1)
+        self.assertEqual(job.created_count, 1)
+
+    def test_async_upload_is_queued_then_processed_by_worker(self):
+        response = self._upload([['name', 'phone'], ['John', '9876543210'], ['Jane', '8765432109']], **{'async': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], ImportJob.STATUS_QUEUED)
+        self.assertFalse(BREResearchData.objects.exists())
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        self.assertTrue(job.file)
+
+        call_command('run_import_worker', '--once', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.result['created'], 2)
+        self.assertFalse(job.file)  # source removed once imported
+        self.assertEqual(BREResearchData.objects.filter(created_by=self.bre_user).count(), 2)
+
+    def test_polling_endpoint(self):
+        job_id = self._upload([['name', 'phone'], ['John', '9876543210']]).data['job_id']
+
+        response = self.client.get(reverse('import-job-detail', args=[job_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], ImportJob.STATUS_COMPLETED)
+        self.assertEqual(response.data['percent'], 100)
+        self.assertEqual(response.data['result']['created'], 1)
+
+        listing = self.client.get(reverse('import-job-list'))
+        self.assertEqual([j['job_id'] for j in listing.data['results']], [job_id])
+
+    def test_jobs_are_private_to_their_creator(self):
+        job_id = self._upload([['name', 'phone'], ['John', '9876543210']]).data['job_id']
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(reverse('import-job-detail', args=[job_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bad_header_marks_job_failed(self):
+        response = self._upload([['name', 'location'], ['John', 'Mumbai']])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn('phone', job.error_message)
+
+    def test_claim_is_exclusive(self):
+        job = ImportJob.objects.create(kind='leads', created_by=self.bre_user, payload={'rows': []})
+
+        claimed = claim_next_job('worker-a')
+
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, ImportJob.STATUS_RUNNING)
+        self.assertEqual(claimed.worker, 'worker-a')
+        self.assertIsNone(claim_next_job('worker-b'))
+
+    def test_stale_running_jobs_fail(self):
+        stale = ImportJob.objects.create(
+            kind='leads', created_by=self.bre_user, status=ImportJob.STATUS_RUNNING,
+            heartbeat_at=timezone.now() - timedelta(hours=2),
+        )
+        fresh = ImportJob.objects.create(
+            kind='leads', created_by=self.bre_user, status=ImportJob.STATUS_RUNNING,
+            heartbeat_at=timezone.now(),
+        )
+
+        self.assertEqual(fail_stale_jobs(minutes=30), 1)
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, ImportJob.STATUS_FAILED)
+        self.assertEqual(fresh.status, ImportJob.STATUS_RUNNING)
+
+
+class RowImportEndpointTest(TestCase):
+    """Tests for JSON bulk_import actions running through import jobs"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = Company.objects.create(name="Test Group", code="TEST_GROUP")
+        self.capital, _ = Company.objects.get_or_create(code="ESWARI_CAP", defaults={'name': "Eswari Capital"})
+        self.admin = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="testpass123",
+            role="admin",
+            company=self.company,
+        )
+        self.employees = [
+            User.objects.create_user(
+                username=f"emp{i}",
+                email=f"emp{i}@test.com",
+                password="testpass123",
+                role="employee",
+                company=self.company,
+            )
+            for i in range(2)
+        ]
+        self.client.force_authenticate(user=self.admin)
+
+    def test_leads_bulk_import_round_robin(self):
+        rows = [{'name': f'Lead {i}', 'phone': f'90000000{i:02d}'} for i in range(4)]
+
+        response = self.client.post('/api/leads/bulk_import/', {'leads': rows}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['imported'], 4)
+        for employee in self.employees:
+            self.assertEqual(Lead.objects.filter(assigned_to=employee).count(), 2)
+
+    def test_leads_bulk_import_counts_only_inserted_rows(self):
+        # Same number, but invisible to the normalized pre-check: only the
+        # (phone, company) unique constraint catches it
+        existing = Lead.objects.create(name='Existing', phone='9000000001', company=self.company)
+        Lead.objects.filter(pk=existing.pk).update(normalized_phone='')
+        rows = [{'name': 'New', 'phone': '9000000000'}, {'name': 'Again', 'phone': '9000000001'}]
+
+        response = self.client.post('/api/leads/bulk_import/', {'leads': rows}, format='json')
+
+        self.assertEqual(response.data['imported'], 1)
+        self.assertEqual(response.data['duplicates'], 1)
+        self.assertEqual(ImportJob.objects.get().created_count, 1)
+
+    def test_capital_bulk_import_async(self):
+        rows = [{'name': 'Client', 'phone': '9000000001'}]
+
+        response = self.client.post('/api/capital/customers/bulk_import/', {'customers': rows, 'async': True}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        call_command('run_import_worker', '--once', stdout=StringIO())
+
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.result, {'imported': 1})
+        self.assertIsNone(job.payload)
+        self.assertTrue(CapitalCustomer.objects.filter(company=self.capital, phone='9000000001').exists())
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.import_job_list, name='import-job-list'),
+    path('<int:pk>/', views.import_job_detail, name='import-job-detail'),
+]
@@ -0,0 +1,76 @@
+"""
+Import Jobs API
+
+GET /api/imports/          - Current user's import jobs (admins see all)
+GET /api/imports/<id>/     - Progress / result of one import job
+
+Import endpoints across the apps create jobs through
+import_jobs.services.submit_import and answer with import_response().
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from .models import ImportJob
+
+
+def import_response(job, success_status=status.HTTP_201_CREATED):
+    """
+    Response for an import endpoint.
+
+    Queued jobs answer 202 with a polling URL; finished jobs keep the
+    endpoint's original response body (plus ``job_id``), failures answer
+    400 with ``error`` like the synchronous endpoints always did.
+    """
+    if job.status == ImportJob.STATUS_QUEUED:
+        return Response({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/api/imports/{job.id}/',
+        }, status=status.HTTP_202_ACCEPTED)
+    if job.status == ImportJob.STATUS_FAILED:
+        return Response({'error': job.error_message, 'job_id': job.id}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({**(job.result or {}), 'job_id': job.id}, status=success_status)
+
+
+def _job_data(job):
+    data = job.progress_data()
+    data.update({
+        'original_filename': job.original_filename,
+        'result': job.result if job.is_finished else None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    })
+    return data
+
+
+def _visible_jobs(user):
+    jobs = ImportJob.objects.all()
+    if user.role != 'admin':
+        jobs = jobs.filter(created_by=user)
+    return jobs
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_list(request):
+    """Latest 50 import jobs, optionally filtered by ?status= and ?kind=."""
+    jobs = _visible_jobs(request.user)
+    if request.query_params.get('status'):
+        jobs = jobs.filter(status=request.query_params['status'])
+    if request.query_params.get('kind'):
+        jobs = jobs.filter(kind=request.query_params['kind'])
+    return Response({'results': [_job_data(job) for job in jobs[:50]]})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_detail(request, pk):
+    """Poll a single import job."""
+    job = _visible_jobs(request.user).filter(pk=pk).first()
+    if not job:
+        return Response({'error': 'Import job not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_job_data(job))
@@ -0,0 +1,99 @@
+"""
+Lead importer used by LeadViewSet.bulk_import (runs through import_jobs).
+"""
+from django.db import transaction
+
+from import_jobs.base import BaseImporter
+from search.services import index_created
+from utils.phones import normalize_phone, set_normalized_phones
+from .models import Lead
+
+
+class LeadRowImporter(BaseImporter):
+    """
+    Import JSON lead rows, auto-assigning them round-robin.
+
+    Employees keep their own leads, managers spread them over their team
+    (including themselves), admin/hr over all active employees.
+    """
+
+    batch_size = 500
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.assignees = self._assignee_pool()
+        self.seen_phones = set()
+
+    def _assignee_pool(self):
+        from accounts.models import User as UserModel
+
+        user = self.user
+        if user.role == 'employee':
+            return [user]
+        if user.role == 'manager':
+            team_ids = list(
+                UserModel.objects.filter(
+                    manager=user, company=self.company, is_active=True
+                ).values_list('id', flat=True)
+            )
+            team_ids.append(user.id)
+            return list(UserModel.objects.filter(id__in=team_ids))
+        # admin/hr — assign across all active employees in company
+        assignees = list(
+            UserModel.objects.filter(
+                company=self.company, role='employee', is_active=True
+            )
+        )
+        return assignees or [user]
+
+    def process_batch(self, batch, first_row_num):
+        existing = set(Lead.objects.filter(
+            company=self.company,
+            normalized_phone__in={normalize_phone(row.get('phone')) for row in batch} - {''},
+        ).values_list('normalized_phone', flat=True))
+
+        to_create = []
+        for offset, row in enumerate(batch):
+            row_num = first_row_num + offset
+            normalized = normalize_phone(row.get('phone'))
+            if normalized and (normalized in existing or normalized in self.seen_phones):
+                self.duplicates += 1
+                continue
+            self.seen_phones.add(normalized)
+            try:
+                to_create.append(Lead(
+                    name=row.get('name', ''),
+                    phone=row.get('phone', ''),
+                    email=row.get('email', ''),
+                    address=row.get('address', ''),
+                    requirement_type=row.get('requirement_type', 'apartment'),
+                    bhk_requirement=row.get('bhk_requirement', '2'),
+                    budget_min=row.get('budget_min', 0) or 0,
+                    budget_max=row.get('budget_max', 0) or 0,
+                    preferred_location=row.get('preferred_location', ''),
+                    status=row.get('status', 'new'),
+                    source=row.get('source', 'website'),
+                    description=row.get('description', ''),
+                    company=self.company,
+                    created_by=self.user,
+                    assigned_to=self.assignees[(row_num - 1) % len(self.assignees)],
+                ))
+            except Exception as e:
+                self.add_error({'row': row_num, 'error': str(e)})
+
+        if to_create:
+            batch_rows = Lead.objects.filter(company=self.company, phone__in=[lead.phone for lead in to_create])
+            with transaction.atomic():
+                before = batch_rows.count()
+                created = Lead.objects.bulk_create(
+                    set_normalized_phones(to_create),
+                    ignore_conflicts=True,  # skip duplicate phone+company rows
+                )
+                index_created(created)
+                # Rows the database ignored are duplicates, not imports
+                inserted = batch_rows.count() - before
+            self.created += inserted
+            self.duplicates += len(created) - inserted
+
+    def result(self):
+        return {'imported': self.created, 'duplicates': self.duplicates, 'errors': self.errors}
@@ -1,9 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from utils.phones import NormalizedPhoneModel
+
 User = get_user_model()
 
-class Lead(models.Model):
+class Lead(NormalizedPhoneModel):
     STATUS_CHOICES = [
         ('new', 'New'),
         ('hot', 'Hot'),
@@ -78,6 +80,8 @@ class Lead(models.Model):
         unique_together = [('phone', 'company')]
         indexes = [
             models.Index(fields=['phone']),
+            models.Index(fields=['company', 'normalized_phone'], name='lead_company_norm_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='lead_company_rev_phone_idx'),
             models.Index(fields=['email']),
             models.Index(fields=['status']),
             models.Index(fields=['source']),
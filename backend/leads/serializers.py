@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Lead
 from accounts.serializers import UserSerializer
 from accounts.permissions import should_hide_contact_details
+from utils.phones import normalize_phone
 from utils.validators import CompanyValidationMixin
 
 class CompanyNestedSerializer(serializers.Serializer):
@@ -30,14 +31,14 @@ class LeadSerializer(CompanyValidationMixin, serializers.ModelSerializer):
         
         # For create operation
         if not self.instance and phone and company:
-            if Lead.objects.filter(phone=phone, company=company).exists():
+            if Lead.objects.filter(normalized_phone=normalize_phone(phone), company=company).exists():
                 raise serializers.ValidationError({
                     'phone': f'A lead with phone number "{phone}" already exists in this company.'
                 })
         
         # For update operation
         if self.instance and phone and company:
-            existing = Lead.objects.filter(phone=phone, company=company).exclude(id=self.instance.id)
+            existing = Lead.objects.filter(normalized_phone=normalize_phone(phone), company=company).exclude(id=self.instance.id)
             if existing.exists():
                 raise serializers.ValidationError({
                     'phone': f'A lead with phone number "{phone}" already exists in this company.'
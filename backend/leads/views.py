@@ -10,7 +10,10 @@ from .models import Lead
 from .serializers import LeadSerializer
 from accounts.permissions import filter_by_user_access, can_hr_access_module, CompanyAccessPermission
 from utils.mixins import CompanyFilterMixin
-from eswari_crm.ws_utils import notify_company
+from utils.phones import PhoneSearchFilter
+from eswari_crm.ws_utils import notify_company_changed
+from import_jobs.services import submit_import, wants_background
+from import_jobs.views import import_response
 
 
 class LeadFilter(FilterSet):
@@ -38,7 +41,7 @@ class LeadViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
     serializer_class = LeadSerializer
     permission_classes = [CompanyAccessPermission]
     pagination_class = LeadPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PhoneSearchFilter, filters.OrderingFilter]
     filterset_class = LeadFilter
     search_fields = ['name', 'email', 'phone', 'address', 'description']
     ordering_fields = ['created_at', 'updated_at', 'name']
@@ -77,15 +80,9 @@ class LeadViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         instance = serializer.save(created_by=self.request.user)
         # Send real-time notification to company members
         if instance.company_id:
-            notify_company(
-                company_id=instance.company_id,
-                event_type='lead_created',
-                data={
-                    'entity': 'leads',
-                    'action': 'created',
-                    'record_id': instance.id,
-                    'name': instance.name,
-                }
+            notify_company_changed(
+                instance.company_id, 'lead_created', 'leads', 'created',
+                record_id=instance.id, extra={'name': instance.name},
             )
     
     def perform_destroy(self, instance):
@@ -96,25 +93,18 @@ class LeadViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
             instance.delete()
             # Send real-time notification
             if company_id:
-                notify_company(
-                    company_id=company_id,
-                    event_type='lead_deleted',
-                    data={
-                        'entity': 'leads',
-                        'action': 'deleted',
-                        'record_id': record_id,
-                    }
-                )
+                notify_company_changed(company_id, 'lead_deleted', 'leads', 'deleted', record_id=record_id)
         else:
             raise PermissionDenied("You do not have permission to delete leads.")
     
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
         """
-        Bulk import leads in a single DB transaction.
+        Bulk import leads in batches (see leads.importers.LeadRowImporter).
         Auto-assigns leads round-robin to active employees in the company.
-        Expects: {"leads": [{...}, ...]}
-        Returns: {"imported": N, "errors": [...]}
+        Expects: {"leads": [{...}, ...], "async": false}
+        Returns: {"imported": N, "errors": [...], "job_id": N}, or 202 with
+        job_id/status_url when async is true.
         """
         rows = request.data.get('leads', [])
         if not isinstance(rows, list) or len(rows) == 0:
@@ -125,67 +115,8 @@ class LeadViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         if not company:
             return Response({'error': 'User has no company assigned'}, status=status.HTTP_400_BAD_REQUEST)
 
-        from accounts.models import User as UserModel
-
-        # Build assignee pool for round-robin
-        if user.role == 'employee':
-            assignees = [user]
-        elif user.role == 'manager':
-            team_ids = list(
-                UserModel.objects.filter(
-                    manager=user, company=company, is_active=True
-                ).values_list('id', flat=True)
-            )
-            team_ids.append(user.id)
-            assignees = list(UserModel.objects.filter(id__in=team_ids))
-        else:
-            # admin/hr — assign across all active employees in company
-            assignees = list(
-                UserModel.objects.filter(
-                    company=company, role='employee', is_active=True
-                )
-            )
-            if not assignees:
-                assignees = [user]
-
-        to_create = []
-        errors = []
-
-        for i, row in enumerate(rows):
-            try:
-                assigned_to = assignees[i % len(assignees)]
-                obj = Lead(
-                    name=row.get('name', ''),
-                    phone=row.get('phone', ''),
-                    email=row.get('email', ''),
-                    address=row.get('address', ''),
-                    requirement_type=row.get('requirement_type', 'apartment'),
-                    bhk_requirement=row.get('bhk_requirement', '2'),
-                    budget_min=row.get('budget_min', 0) or 0,
-                    budget_max=row.get('budget_max', 0) or 0,
-                    preferred_location=row.get('preferred_location', ''),
-                    status=row.get('status', 'new'),
-                    source=row.get('source', 'website'),
-                    description=row.get('description', ''),
-                    company=company,
-                    created_by=user,
-                    assigned_to=assigned_to,
-                )
-                to_create.append(obj)
-            except Exception as e:
-                errors.append({'row': i + 1, 'error': str(e)})
-
-        imported = 0
-        if to_create:
-            with transaction.atomic():
-                created = Lead.objects.bulk_create(
-                    to_create,
-                    batch_size=500,
-                    ignore_conflicts=True,  # skip duplicate phone+company rows
-                )
-                imported = len(created)
-
-        return Response({'imported': imported, 'errors': errors}, status=status.HTTP_201_CREATED)
+        job = submit_import('leads', user, company, rows=rows, background=wants_background(request))
+        return import_response(job)
 
     @action(detail=False, methods=['post'])
     def bulk_delete(self, request):
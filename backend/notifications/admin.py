@@ -1,5 +1,5 @@
 ﻿from django.contrib import admin
-from .models import Notification, PushSubscription
+from .models import Notification, PushDelivery, PushSubscription
 
 
 @admin.register(Notification)
@@ -19,3 +19,11 @@ class PushSubscriptionAdmin(admin.ModelAdmin):
     list_filter = ['is_active']
     search_fields = ['user__username', 'endpoint']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(PushDelivery)
+class PushDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'channel', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['channel', 'status']
+    search_fields = ['user__username', 'title']
+    readonly_fields = ['created_at', 'sent_at', 'claimed_at']
@@ -0,0 +1,81 @@
+"""
+Management command that delivers queued push notifications.
+
+Usage:
+  python manage.py run_push_worker                 # run forever, 1 sender thread
+  python manage.py run_push_worker --workers 8     # 8 sender threads
+  python manage.py run_push_worker --once          # drain the outbox and exit (cron)
+
+Several worker processes can run side by side; deliveries are claimed atomically.
+"""
+
+import os
+import socket
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from notifications.outbox import drain, outbox_stats, release_stale, STALE_MINUTES
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued web push and FCM notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Sender threads')
+        parser.add_argument('--batch-size', type=int, default=50, help='Deliveries claimed at a time per thread')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the outbox is empty')
+        parser.add_argument('--stale-minutes', type=int, default=STALE_MINUTES,
+                            help='Requeue deliveries claimed this long ago by a worker that died')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        base_name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Push worker {base_name} started with {workers} thread(s)')
+
+        released = release_stale(options['stale_minutes'])
+        if released:
+            self.stdout.write(self.style.WARNING(f'Requeued {released} stale delivery(ies)'))
+
+        stats = Counter()
+        try:
+            if workers == 1:
+                stats = self._loop(f'{base_name}/0', options)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(self._loop, f'{base_name}/{i}', options) for i in range(workers)]
+                    for future in futures:
+                        stats.update(future.result())
+        except KeyboardInterrupt:
+            pass
+
+        for (channel, outcome), count in sorted(stats.items()):
+            self.stdout.write(f'  {channel} {outcome}: {count}')
+        pending = {channel: counts.get('pending', 0) for channel, counts in outbox_stats().items()}
+        self.stdout.write(self.style.SUCCESS(
+            f'Push worker finished: {sum(stats.values())} delivery attempt(s), pending {pending}'
+        ))
+
+    def _loop(self, worker_name, options):
+        stats = Counter()
+        try:
+            while True:
+                close_old_connections()
+                attempted = sum(stats.values())
+                drain(worker_name, options['batch_size'], stats)
+                if sum(stats.values()) > attempted:
+                    logger.info(f'{worker_name} delivery totals: {dict(stats)}')
+                if options['once']:
+                    return stats
+                time.sleep(options['poll_interval'])
+        finally:
+            # Each thread owns its own connections
+            connections.close_all()
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class PushSubscription(models.Model):
@@ -85,3 +86,64 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
+
+
+class PushDelivery(models.Model):
+    """
+    Push outbox: one message to one device (browser subscription or FCM
+    token). Request handlers only enqueue rows; the `run_push_worker`
+    management command delivers them with retries (notifications.outbox).
+    """
+    CHANNEL_WEBPUSH = 'webpush'
+    CHANNEL_FCM = 'fcm'
+    CHANNEL_CHOICES = [
+        (CHANNEL_WEBPUSH, 'Web Push'),
+        (CHANNEL_FCM, 'Firebase Cloud Messaging'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_DROPPED = 'dropped'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_DROPPED, 'Dropped (device gone)'),
+    ]
+
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='push_deliveries')
+    subscription = models.ForeignKey(
+        PushSubscription, on_delete=models.CASCADE, null=True, blank=True, related_name='deliveries',
+    )
+    fcm_token = models.ForeignKey(
+        FCMToken, on_delete=models.CASCADE, null=True, blank=True, related_name='deliveries',
+    )
+    notification = models.ForeignKey(
+        Notification, on_delete=models.SET_NULL, null=True, blank=True, related_name='push_deliveries',
+    )
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    worker = models.CharField(max_length=100, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'push_deliveries'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='push_delivery_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.user_id} ({self.status})"
@@ -0,0 +1,368 @@
+"""
+Push notification outbox.
+
+Sending a push means one HTTP call per browser subscription and per mobile
+token, so request handlers no longer send: they enqueue PushDelivery rows
+and the `run_push_worker` management command delivers them.
+
+    enqueue_push()       - write one outbox row per active device of the users
+    claim_due()          - atomically take a batch of due rows (worker side)
+    deliver()            - send one row and record the outcome
+    release_stale()      - requeue rows whose worker died mid-send
+    outbox_stats()       - per-channel counts by status
+
+Transient errors are retried with exponential backoff up to
+PUSH_OUTBOX_MAX_ATTEMPTS times. Devices the push service reports as gone
+(Web Push 404/410, FCM unregistered/invalid token) are deactivated and
+their pending rows dropped.
+
+PUSH_DELIVERY_INLINE (off by default; for deployments that cannot run the
+worker) is a fallback: once the transaction commits, the rows a request
+enqueued are handed to a small per-process thread pool, so the request
+thread still only enqueues. They are written already claimed, so a worker
+never sends them twice and the pool sends nothing else; if the process dies
+first, release_stale() hands them to a worker.
+"""
+import json
+import logging
+import random
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import FCMToken, PushDelivery, PushSubscription
+
+logger = logging.getLogger(__name__)
+
+
+MAX_ATTEMPTS = getattr(settings, 'PUSH_OUTBOX_MAX_ATTEMPTS', 5)
+# First retry after this many seconds, doubling per attempt up to the cap
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+# Rows "sending" for longer than this belong to a worker that died
+STALE_MINUTES = getattr(settings, 'PUSH_OUTBOX_STALE_MINUTES', 10)
+
+ENQUEUE_BATCH_SIZE = 500
+# Sender threads per process for PUSH_DELIVERY_INLINE
+INLINE_THREADS = getattr(settings, 'PUSH_DELIVERY_INLINE_THREADS', 4)
+
+# Outcomes of one delivery attempt
+SENT = 'sent'
+RETRY = 'retry'
+GONE = 'gone'
+FAILED = 'failed'
+
+
+class DeliveryError(Exception):
+    """A delivery attempt failed; ``outcome`` says whether to retry."""
+
+    def __init__(self, message, outcome=RETRY):
+        super().__init__(message)
+        self.outcome = outcome
+
+
+# ── Enqueue ──────────────────────────────────────────────────────────────
+
+def enqueue_push(user_ids, title, message, notification_type='other', data=None, notification_ids=None):
+    """
+    Queue a push to every active device of ``user_ids``.
+
+    ``notification_ids`` maps user id to the in-app Notification the push
+    belongs to (sent along as ``notification_id``). Returns the number of
+    rows queued.
+    """
+    user_ids = list(user_ids)
+    notification_ids = notification_ids or {}
+    payload = {'type': notification_type, **(data or {})}
+    inline = getattr(settings, 'PUSH_DELIVERY_INLINE', False)
+    claim = {}
+    if inline:
+        claim = {
+            'status': PushDelivery.STATUS_SENDING,
+            'worker': f'inline-{uuid.uuid4().hex}',
+            'claimed_at': timezone.now(),
+        }
+
+    def row(channel, user_id, **device):
+        return PushDelivery(
+            channel=channel,
+            user_id=user_id,
+            notification_id=notification_ids.get(user_id),
+            title=title,
+            message=message,
+            data=payload,
+            **claim,
+            **device,
+        )
+
+    queued = 0
+    for start in range(0, len(user_ids), ENQUEUE_BATCH_SIZE):
+        chunk = user_ids[start:start + ENQUEUE_BATCH_SIZE]
+        rows = [
+            row(PushDelivery.CHANNEL_WEBPUSH, user_id, subscription_id=subscription_id)
+            for subscription_id, user_id in PushSubscription.objects.filter(
+                user_id__in=chunk, is_active=True
+            ).values_list('id', 'user_id')
+        ]
+        rows += [
+            row(PushDelivery.CHANNEL_FCM, user_id, fcm_token_id=token_id)
+            for token_id, user_id in FCMToken.objects.filter(
+                user_id__in=chunk, is_active=True
+            ).values_list('id', 'user_id')
+        ]
+        PushDelivery.objects.bulk_create(rows, batch_size=ENQUEUE_BATCH_SIZE)
+        queued += len(rows)
+
+    if queued and inline:
+        worker_name = claim['worker']
+        transaction.on_commit(lambda: _inline_executor().submit(_deliver_inline, worker_name))
+    return queued
+
+
+_inline_pool = None
+_inline_pool_lock = threading.Lock()
+
+
+def _inline_executor():
+    """This process's pool of PUSH_DELIVERY_INLINE sender threads."""
+    global _inline_pool
+    with _inline_pool_lock:
+        if _inline_pool is None:
+            _inline_pool = ThreadPoolExecutor(max_workers=INLINE_THREADS, thread_name_prefix='push-inline')
+    return _inline_pool
+
+
+def _deliver_inline(worker_name):
+    try:
+        deliver_claimed(worker_name)
+    except Exception:
+        logger.exception('Inline push delivery failed for %s', worker_name)
+    finally:
+        # Each thread owns its own connections
+        connections.close_all()
+
+
+# ── Worker side ──────────────────────────────────────────────────────────
+
+def claim_due(worker_name, limit=50):
+    """Take up to ``limit`` due rows; safe to call from many workers at once."""
+    now = timezone.now()
+    candidates = list(
+        PushDelivery.objects.filter(
+            status=PushDelivery.STATUS_PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at').values_list('id', flat=True)[:limit]
+    )
+    if not candidates:
+        return []
+    # Only rows still pending are taken; (worker, claimed_at) tells this
+    # claim apart from a concurrent one
+    PushDelivery.objects.filter(id__in=candidates, status=PushDelivery.STATUS_PENDING).update(
+        status=PushDelivery.STATUS_SENDING, worker=worker_name, claimed_at=now,
+    )
+    return list(
+        PushDelivery.objects.filter(
+            id__in=candidates, status=PushDelivery.STATUS_SENDING, worker=worker_name, claimed_at=now,
+        ).select_related('subscription', 'fcm_token')
+    )
+
+
+def release_stale(minutes=STALE_MINUTES):
+    """Requeue rows claimed more than ``minutes`` ago and never finished."""
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return PushDelivery.objects.filter(
+        status=PushDelivery.STATUS_SENDING, claimed_at__lt=cutoff
+    ).update(status=PushDelivery.STATUS_PENDING, worker='')
+
+
+def retry_delay(attempts):
+    """Seconds to wait before retry number ``attempts`` (1-based), with jitter."""
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def deliver(delivery):
+    """Send one claimed row and record the outcome. Returns the outcome."""
+    try:
+        if delivery.channel == PushDelivery.CHANNEL_WEBPUSH:
+            _send_webpush(delivery)
+        else:
+            _send_fcm(delivery)
+        outcome, error = SENT, ''
+    except DeliveryError as e:
+        outcome, error = e.outcome, str(e)
+    except Exception as e:
+        logger.error(f'Unexpected push delivery error for row {delivery.id}: {e}', exc_info=True)
+        outcome, error = RETRY, str(e)
+
+    _record(delivery, outcome, error)
+    return outcome
+
+
+def _record(delivery, outcome, error):
+    now = timezone.now()
+    attempts = delivery.attempts + 1
+    fields = {'attempts': attempts, 'last_error': error[:1000], 'worker': ''}
+
+    if outcome == SENT:
+        fields.update(status=PushDelivery.STATUS_SENT, sent_at=now)
+    elif outcome == GONE:
+        fields.update(status=PushDelivery.STATUS_DROPPED)
+        _prune_device(delivery)
+    elif outcome == RETRY and attempts < MAX_ATTEMPTS:
+        fields.update(
+            status=PushDelivery.STATUS_PENDING,
+            next_attempt_at=now + timedelta(seconds=retry_delay(attempts)),
+        )
+    else:
+        fields.update(status=PushDelivery.STATUS_FAILED)
+
+    PushDelivery.objects.filter(pk=delivery.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(delivery, name, value)
+
+
+def _prune_device(delivery):
+    """Deactivate a device the push service no longer knows and drop its queued rows."""
+    if delivery.subscription_id:
+        PushSubscription.objects.filter(pk=delivery.subscription_id).update(is_active=False)
+        device = {'subscription_id': delivery.subscription_id}
+    else:
+        FCMToken.objects.filter(pk=delivery.fcm_token_id).update(is_active=False)
+        device = {'fcm_token_id': delivery.fcm_token_id}
+    PushDelivery.objects.filter(status=PushDelivery.STATUS_PENDING, **device).update(
+        status=PushDelivery.STATUS_DROPPED, last_error='Device unsubscribed',
+    )
+
+
+def drain(worker_name, batch_size=50, stats=None):
+    """Deliver due rows until none are left. Returns per-channel outcome counts."""
+    stats = stats if stats is not None else Counter()
+    while True:
+        batch = claim_due(worker_name, batch_size)
+        if not batch:
+            return stats
+        for delivery in batch:
+            stats[(delivery.channel, deliver(delivery))] += 1
+
+
+def deliver_claimed(worker_name):
+    """Deliver the rows claimed by ``worker_name`` (an inline enqueue). Returns per-channel outcome counts."""
+    stats = Counter()
+    claimed = PushDelivery.objects.filter(
+        status=PushDelivery.STATUS_SENDING, worker=worker_name
+    ).select_related('subscription', 'fcm_token')
+    for delivery in claimed:
+        stats[(delivery.channel, deliver(delivery))] += 1
+    return stats
+
+
+def outbox_stats():
+    """``{channel: {status: count}}`` over the whole outbox (one grouped query)."""
+    stats = {channel: {} for channel, _ in PushDelivery.CHANNEL_CHOICES}
+    for row in PushDelivery.objects.values('channel', 'status').annotate(count=Count('id')):
+        stats.setdefault(row['channel'], {})[row['status']] = row['count']
+    return stats
+
+
+def purge_finished(days):
+    """Delete sent/dropped/failed rows older than ``days``."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = PushDelivery.objects.filter(
+        status__in=[PushDelivery.STATUS_SENT, PushDelivery.STATUS_DROPPED, PushDelivery.STATUS_FAILED],
+        created_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+# ── Channels ─────────────────────────────────────────────────────────────
+
+def _payload_data(delivery):
+    return {
+        'notification_id': str(delivery.notification_id or ''),
+        **delivery.data,
+    }
+
+
+def _send_webpush(delivery):
+    """Send one Web Push message via pywebpush (no Firebase needed)."""
+    from pywebpush import webpush, WebPushException
+    from .utils import _normalize_vapid_private_key
+
+    subscription = delivery.subscription
+    if subscription is None or not subscription.is_active:
+        raise DeliveryError('Subscription removed', GONE)
+
+    raw_key = getattr(settings, 'VAPID_PRIVATE_KEY', '')
+    if not raw_key:
+        raise DeliveryError('VAPID_PRIVATE_KEY not configured in settings', FAILED)
+    vapid_claims_email = getattr(settings, 'VAPID_CLAIMS_EMAIL', 'admin@eswaricrm.com')
+
+    payload = json.dumps({
+        'title': delivery.title,
+        'body': delivery.message,
+        'icon': '/favicon.ico',
+        'badge': '/favicon.ico',
+        'data': _payload_data(delivery),
+    })
+    try:
+        webpush(
+            subscription_info={
+                'endpoint': subscription.endpoint,
+                'keys': {
+                    'p256dh': subscription.p256dh,
+                    'auth': subscription.auth,
+                },
+            },
+            data=payload,
+            vapid_private_key=_normalize_vapid_private_key(raw_key),
+            vapid_claims={'sub': f'mailto:{vapid_claims_email}'},
+        )
+    except WebPushException as e:
+        status_code = getattr(e.response, 'status_code', None)
+        if status_code in (404, 410):
+            raise DeliveryError(f'Subscription expired ({status_code})', GONE)
+        if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+            raise DeliveryError(f'Rejected by push service ({status_code}): {e}', FAILED)
+        raise DeliveryError(str(e))
+
+
+def _send_fcm(delivery):
+    """Send one FCM message to one mobile token."""
+    from .fcm_utils import _is_firebase_initialized
+
+    token = delivery.fcm_token
+    if token is None or not token.is_active:
+        raise DeliveryError('Token removed', GONE)
+    if not _is_firebase_initialized():
+        raise DeliveryError('Firebase Admin SDK not initialized', FAILED)
+
+    from firebase_admin import messaging
+
+    message = messaging.Message(
+        notification=messaging.Notification(title=delivery.title, body=delivery.message),
+        # FCM data values must be strings
+        data={key: str(value) for key, value in _payload_data(delivery).items()},
+        token=token.token,
+        android=messaging.AndroidConfig(
+            priority='high',
+            notification=messaging.AndroidNotification(
+                channel_id='high_importance_channel',
+                sound='default',
+                priority='high',
+            ),
+        ),
+    )
+    try:
+        messaging.send(message)
+    except Exception as e:
+        code = getattr(e, 'code', None)
+        if code in ('NOT_FOUND', 'INVALID_ARGUMENT', 'UNREGISTERED'):
+            raise DeliveryError(f'Token invalid ({code})', GONE)
+        raise DeliveryError(str(e))
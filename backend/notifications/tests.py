@@ -1,3 +1,244 @@
-from django.test import TestCase
+"""
+Tests for the push notification outbox.
 
-# Create your tests here.
+Tests cover:
+- send_push_notification / send_bulk_push_notification only enqueue
+- One outbox row per active browser subscription and mobile token
+- run_push_worker delivers due rows and reports per-channel counts
+- Expired subscriptions (410) are deactivated and their queued rows dropped
+- Transient failures back off and give up after the maximum attempts
+- A row claimed by one worker is not claimed again
+- Inline delivery runs off the request thread and only sends the rows its
+  own request queued
+- send_bulk_notification writes notifications in batched inserts from
+  querysets, users or ids, and returns their ids
+- Without ids from bulk inserts (MySQL), each user's notification is read
+  back by a per-batch tag, not confused with a concurrent identical fan-out
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from pywebpush import WebPushException
+
+from accounts.models import Company
+from notifications import outbox
+from notifications.models import FCMToken, Notification, PushDelivery, PushSubscription
+from notifications.utils import send_bulk_notification, send_bulk_push_notification, send_push_notification
+
+User = get_user_model()
+
+
+@override_settings(VAPID_PRIVATE_KEY='test-key', PUSH_DELIVERY_INLINE=False)
+class PushOutboxTestCase(TestCase):
+    """Tests for notifications.outbox and the run_push_worker command"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.user = self._user('alice')
+        self.other = self._user('bob')
+        self.subscription = self._subscribe(self.user, 'a1')
+        self._subscribe(self.user, 'a2')
+        self._subscribe(self.other, 'b1')
+        PushSubscription.objects.create(
+            user=self.other, endpoint='https://push.example.com/old', p256dh='k', auth='a', is_active=False,
+        )
+        FCMToken.objects.create(user=self.other, token='token-b')
+
+    def _user(self, username):
+        return User.objects.create_user(
+            username=username, password='testpass123', role='employee', company=self.company,
+        )
+
+    def _subscribe(self, user, name):
+        return PushSubscription.objects.create(
+            user=user, endpoint=f'https://push.example.com/{name}', p256dh='k', auth='a',
+        )
+
+    def _webpush_error(self, status_code):
+        return WebPushException('push failed', response=mock.Mock(status_code=status_code))
+
+    def test_send_only_enqueues(self):
+        with mock.patch('pywebpush.webpush') as webpush:
+            self.assertTrue(send_push_notification(self.user, 'Hello', 'World', 'lead_assigned', {'lead_id': 7}))
+        webpush.assert_not_called()
+
+        notification = Notification.objects.get(user=self.user)
+        deliveries = PushDelivery.objects.filter(user=self.user)
+        self.assertEqual(deliveries.count(), 2)
+        for delivery in deliveries:
+            self.assertEqual(delivery.status, PushDelivery.STATUS_PENDING)
+            self.assertEqual(delivery.notification_id, notification.id)
+            self.assertEqual(delivery.data, {'type': 'lead_assigned', 'lead_id': 7})
+
+    def test_bulk_send_queues_every_device(self):
+        sent = send_bulk_push_notification(User.objects.filter(id__in=[self.user.id, self.other.id]), 'Hi', 'All')
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(
+            sorted(PushDelivery.objects.values_list('user__username', 'channel')),
+            [('alice', 'webpush'), ('alice', 'webpush'), ('bob', 'fcm'), ('bob', 'webpush')],
+        )
+
+    def test_worker_delivers_due_rows(self):
+        outbox.enqueue_push([self.user.id], 'Hello', 'World')
+        out = StringIO()
+
+        with mock.patch('pywebpush.webpush') as webpush:
+            call_command('run_push_worker', '--once', '--workers', '1', stdout=out)
+
+        self.assertEqual(webpush.call_count, 2)
+        self.assertEqual(PushDelivery.objects.filter(status=PushDelivery.STATUS_SENT).count(), 2)
+        self.assertIn('webpush sent: 2', out.getvalue())
+
+    def test_expired_subscription_is_pruned(self):
+        outbox.enqueue_push([self.user.id], 'First', 'Message')
+        outbox.enqueue_push([self.user.id], 'Second', 'Message')
+        first = PushDelivery.objects.filter(subscription=self.subscription).first()
+        first.status = PushDelivery.STATUS_SENDING
+        first.save()
+
+        with mock.patch('pywebpush.webpush', side_effect=self._webpush_error(410)):
+            self.assertEqual(outbox.deliver(first), outbox.GONE)
+
+        self.subscription.refresh_from_db()
+        self.assertFalse(self.subscription.is_active)
+        self.assertFalse(
+            PushDelivery.objects.filter(subscription=self.subscription, status=PushDelivery.STATUS_PENDING).exists()
+        )
+        # The user's other browser is untouched
+        self.assertEqual(PushDelivery.objects.filter(status=PushDelivery.STATUS_PENDING).count(), 2)
+
+    def test_transient_failure_backs_off(self):
+        outbox.enqueue_push([self.other.id], 'Hello', 'World')
+        delivery = PushDelivery.objects.get(subscription__user=self.other)
+
+        with mock.patch('pywebpush.webpush', side_effect=self._webpush_error(503)):
+            for attempt in range(1, outbox.MAX_ATTEMPTS + 1):
+                self.assertEqual(outbox.deliver(delivery), outbox.RETRY)
+                delivery.refresh_from_db()
+                self.assertEqual(delivery.attempts, attempt)
+                if attempt < outbox.MAX_ATTEMPTS:
+                    self.assertEqual(delivery.status, PushDelivery.STATUS_PENDING)
+                    self.assertGreater(delivery.next_attempt_at, timezone.now())
+                    self.assertNotIn(delivery, outbox.claim_due('worker'))
+                    delivery.next_attempt_at = timezone.now()
+                    delivery.save()
+
+        self.assertEqual(delivery.status, PushDelivery.STATUS_FAILED)
+        self.assertIn('push failed', delivery.last_error)
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        outbox.enqueue_push([self.user.id, self.other.id], 'Hello', 'World')
+
+        first = outbox.claim_due('worker-1', limit=2)
+        second = outbox.claim_due('worker-2', limit=10)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({d.id for d in first} & {d.id for d in second})
+        self.assertEqual(outbox.claim_due('worker-3'), [])
+
+        PushDelivery.objects.filter(worker='worker-1').update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(outbox.release_stale(), 2)
+        self.assertEqual(len(outbox.claim_due('worker-3')), 2)
+
+    def test_inline_delivery_sends_only_its_own_rows(self):
+        outbox.enqueue_push([self.other.id], 'Earlier', 'Queued for the worker')
+        pool = mock.Mock()
+
+        with override_settings(PUSH_DELIVERY_INLINE=True), mock.patch('pywebpush.webpush') as webpush, \
+                mock.patch.object(outbox, '_inline_executor', return_value=pool):
+            with self.captureOnCommitCallbacks(execute=True):
+                outbox.enqueue_push([self.user.id], 'Hello', 'World')
+            # The request only hands the rows to the pool
+            webpush.assert_not_called()
+            (job, worker_name), _ = pool.submit.call_args
+            self.assertIs(job, outbox._deliver_inline)
+            outbox.deliver_claimed(worker_name)
+
+        self.assertEqual(webpush.call_count, 2)
+        self.assertEqual(
+            sorted(PushDelivery.objects.values_list('title', 'status')),
+            [('Earlier', 'pending'), ('Earlier', 'pending'), ('Hello', 'sent'), ('Hello', 'sent')],
+        )
+
+    def test_stats_by_channel(self):
+        outbox.enqueue_push([self.user.id, self.other.id], 'Hello', 'World')
+
+        self.assertEqual(outbox.outbox_stats(), {'webpush': {'pending': 3}, 'fcm': {'pending': 1}})
+
+
+class BulkNotificationTestCase(TestCase):
+    """Tests for notifications.utils.send_bulk_notification"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.other_company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.users = [
+            User.objects.create_user(
+                username=f'user{i}', password='testpass123', role='employee',
+                company=self.company if i % 2 else self.other_company,
+            )
+            for i in range(5)
+        ]
+
+    def test_queryset_is_written_in_batches(self):
+        recipients = User.objects.filter(id__in=[user.id for user in self.users])
+
+        # One streamed read of the recipients, one insert per batch of two
+        with self.assertNumQueries(4):
+            ids = send_bulk_notification(recipients, 'Hello', 'World', 'system_alert', {'k': 1}, batch_size=2)
+
+        notifications = Notification.objects.filter(id__in=ids)
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(
+            sorted(notifications.values_list('user_id', flat=True)), sorted(user.id for user in self.users)
+        )
+        self.assertEqual(
+            {(n.user.company_id, n.company_id) for n in notifications},
+            {(self.company.id, self.company.id), (self.other_company.id, self.other_company.id)},
+        )
+
+    def test_ids_and_users_are_deduplicated(self):
+        ids = send_bulk_notification(
+            [self.users[0].id, self.users[0].id, self.users[1], self.users[1]], 'Hello', 'World',
+            company=self.company,
+        )
+
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(set(Notification.objects.values_list('company_id', flat=True)), {self.company.id})
+
+    def test_push_references_created_notifications(self):
+        PushSubscription.objects.create(
+            user=self.users[0], endpoint='https://push.example.com/u0', p256dh='k', auth='a',
+        )
+
+        ids = send_bulk_notification(User.objects.all(), 'Hello', 'World', push=True)
+
+        delivery = PushDelivery.objects.get()
+        self.assertIn(delivery.notification_id, ids)
+        self.assertEqual(delivery.notification.user, self.users[0])
+
+    def test_ids_read_back_without_returning_inserts(self):
+        # An identical fan-out to the same user, as a concurrent request would write
+        other = Notification.objects.create(user=self.users[0], title='Hello', message='World')
+        PushSubscription.objects.create(
+            user=self.users[0], endpoint='https://push.example.com/u0', p256dh='k', auth='a',
+        )
+
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            ids = send_bulk_notification(self.users[:2], 'Hello', 'World', data={'k': 1}, push=True)
+
+        self.assertEqual(len(ids), 2)
+        self.assertNotIn(other.id, ids)
+        notifications = Notification.objects.filter(id__in=ids)
+        self.assertEqual(sorted(n.user_id for n in notifications), sorted(u.id for u in self.users[:2]))
+        self.assertTrue(all(n.data == {'k': 1} for n in notifications))
+        self.assertEqual(PushDelivery.objects.get().notification.user, self.users[0])
+        self.assertIn(PushDelivery.objects.get().notification_id, ids)
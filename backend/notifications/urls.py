@@ -15,6 +15,9 @@ urlpatterns = [
     path('fcm/register/', views.register_fcm_token, name='fcm-register'),
     path('fcm/unregister/', views.unregister_fcm_token, name='fcm-unregister'),
     
+    # Push outbox
+    path('outbox-stats/', views.push_outbox_stats, name='push-outbox-stats'),
+
     # Testing
     path('test/', views.send_test_notification, name='test-notification'),
     
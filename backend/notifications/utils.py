@@ -1,11 +1,21 @@
-﻿import json
-import logging
-from django.conf import settings
-from django.utils import timezone
-from .models import PushSubscription, Notification
+﻿import logging
+import uuid
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from .models import Notification
+from .outbox import enqueue_push
 
 logger = logging.getLogger(__name__)
 
+# Notifications written per INSERT (and recipients held in memory) by
+# send_bulk_notification
+NOTIFY_BATCH_SIZE = 1000
+
+# Key briefly added to ``data`` to read a bulk insert back where the
+# database does not return the new ids
+BATCH_TAG_KEY = '_bulk_batch'
+
 
 def _normalize_vapid_private_key(key: str) -> str:
     """Return VAPID private key in the format pywebpush expects."""
@@ -15,51 +25,6 @@ def _normalize_vapid_private_key(key: str) -> str:
     return key
 
 
-def _send_webpush(subscription: PushSubscription, title: str, body: str, data: dict = None) -> bool:
-    """Send a single Web Push notification via pywebpush (no Firebase needed)."""
-    try:
-        from pywebpush import webpush, WebPushException
-
-        raw_key = getattr(settings, 'VAPID_PRIVATE_KEY', '')
-        vapid_claims_email = getattr(settings, 'VAPID_CLAIMS_EMAIL', 'admin@eswaricrm.com')
-
-        if not raw_key:
-            logger.error('VAPID_PRIVATE_KEY not configured in settings')
-            return False
-
-        vapid_private_key = _normalize_vapid_private_key(raw_key)
-
-        payload = json.dumps({
-            'title': title,
-            'body': body,
-            'icon': '/favicon.ico',
-            'badge': '/favicon.ico',
-            'data': data or {},
-        })
-
-        webpush(
-            subscription_info={
-                'endpoint': subscription.endpoint,
-                'keys': {
-                    'p256dh': subscription.p256dh,
-                    'auth': subscription.auth,
-                },
-            },
-            data=payload,
-            vapid_private_key=vapid_private_key,
-            vapid_claims={'sub': f'mailto:{vapid_claims_email}'},
-        )
-        return True
-
-    except Exception as e:
-        err_str = str(e)
-        logger.error(f'Web push send error for {subscription.endpoint[:40]}...: {err_str}')
-        if '410' in err_str or '404' in err_str:
-            subscription.is_active = False
-            subscription.save(update_fields=['is_active'])
-        return False
-
-
 def send_notification(user, title, message, notification_type='other', data=None, company=None):
     """Create an in-app Notification DB record."""
     try:
@@ -81,43 +46,19 @@ def send_notification(user, title, message, notification_type='other', data=None
 
 def send_push_notification(user, title, message, notification_type='other', data=None, company=None):
     """
-    Create a DB notification AND send push notifications to all devices.
-    Sends BOTH web push (browser) and FCM (mobile) notifications.
-    Falls back gracefully if either service is unavailable.
+    Create a DB notification AND queue push notifications to all devices.
+    Web push (browser) and FCM (mobile) deliveries are written to the push
+    outbox and sent by the `run_push_worker` process (notifications.outbox).
     """
     try:
         # 1. Create in-app notification
         notification = send_notification(user, title, message, notification_type, data, company)
 
-        # 2. Send Web Push (Browser)
-        subscriptions = PushSubscription.objects.filter(user=user, is_active=True)
-        if subscriptions.exists():
-            push_data = {
-                'notification_id': str(notification.id) if notification else '',
-                'type': notification_type,
-                **(data or {}),
-            }
-            for sub in subscriptions:
-                _send_webpush(sub, title, message, push_data)
-        else:
-            logger.info(f'No active web push subscriptions for user {user.username}')
-
-        # 3. Send FCM (Mobile)
-        try:
-            from .fcm_utils import send_fcm_notification
-            fcm_data = {
-                'notification_id': str(notification.id) if notification else '',
-                'type': notification_type,
-                **(data or {}),
-            }
-            # Convert all data values to strings (FCM requirement)
-            fcm_data = {k: str(v) for k, v in fcm_data.items()}
-            send_fcm_notification(user, title, message, fcm_data)
-        except ImportError:
-            logger.debug('FCM utils not available, skipping mobile notifications')
-        except Exception as e:
-            logger.error(f'Error sending FCM notification: {e}')
-
+        # 2. Queue Web Push (Browser) and FCM (Mobile)
+        enqueue_push(
+            [user.id], title, message, notification_type, data,
+            notification_ids={user.id: notification.id} if notification else None,
+        )
         return True
 
     except Exception as e:
@@ -125,18 +66,117 @@ def send_push_notification(user, title, message, notification_type='other', data
         return False
 
 
+def _recipient_batches(recipients, batch_size):
+    """
+    Yield lists of (user_id, company_id) of at most ``batch_size`` recipients.
+    ``recipients`` is a User queryset (streamed, never loaded whole), or an
+    iterable of users or user ids.
+    """
+    if isinstance(recipients, QuerySet):
+        rows = recipients.order_by().values_list('id', 'company_id').iterator(chunk_size=batch_size)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+    seen, pending_ids, batch = set(), [], []
+    for recipient in recipients:
+        user_id = getattr(recipient, 'pk', recipient)
+        if user_id in seen:
+            continue
+        seen.add(user_id)
+        if hasattr(recipient, 'company_id'):
+            batch.append((user_id, recipient.company_id))
+        else:
+            pending_ids.append(user_id)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+    User = get_user_model()
+    for start in range(0, len(pending_ids), batch_size):
+        yield list(User.objects.filter(id__in=pending_ids[start:start + batch_size]).values_list('id', 'company_id'))
+
+
+def _create_notifications(rows):
+    """bulk_create ``rows`` (one per user) and return ``{user_id: notification id}``."""
+    if connection.features.can_return_rows_from_bulk_insert:
+        return {notification.user_id: notification.id for notification in Notification.objects.bulk_create(rows)}
+
+    # MySQL does not return ids from bulk inserts: tag the batch, read it
+    # back by the tag and drop the tag, in one transaction so nobody else
+    # sees it. A concurrent fan-out with the same title has another tag.
+    tag = uuid.uuid4().hex
+    data = rows[0].data
+    for row in rows:
+        row.data = {**row.data, BATCH_TAG_KEY: tag}
+    with transaction.atomic():
+        latest = Notification.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        Notification.objects.bulk_create(rows)
+        ids = dict(
+            Notification.objects.filter(id__gt=latest, **{f'data__{BATCH_TAG_KEY}': tag})
+            .values_list('user_id', 'id')
+        )
+        Notification.objects.filter(id__in=ids.values()).update(data=data)
+    for row in rows:
+        row.data = data
+    return ids
+
+
+def send_bulk_notification(recipients, title, message, notification_type='other', data=None, company=None,
+                           push=False, batch_size=NOTIFY_BATCH_SIZE):
+    """
+    Create the same in-app Notification for many users, ``batch_size`` rows
+    per INSERT. ``recipients`` is a User queryset, or users or user ids;
+    querysets are streamed so memory stays bounded however many users match.
+    Each row's company is ``company`` or else the recipient's own company.
+    With ``push`` the recipients' devices are queued in the push outbox too.
+
+    Returns the ids of the created notifications.
+    """
+    company_id = getattr(company, 'pk', company)
+    created = []
+    for batch in _recipient_batches(recipients, batch_size):
+        rows = [
+            Notification(
+                user_id=user_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                data=data or {},
+                company_id=company_id or user_company_id,
+            )
+            for user_id, user_company_id in batch
+        ]
+        ids = _create_notifications(rows)
+        created.extend(ids.values())
+        if push:
+            enqueue_push(
+                [user_id for user_id, _ in batch], title, message, notification_type, data,
+                notification_ids=ids,
+            )
+    return created
+
+
 def send_bulk_push_notification(users, title, message, notification_type='other', data=None, company=None):
     """
-    Send push notification to multiple users.
-    Sends BOTH web push (browser) and FCM (mobile) notifications.
+    Send push notification to multiple users: one batched insert of in-app
+    notifications and one outbox write per batch (see send_bulk_notification).
+    Returns the number of users notified.
     """
-    user_list = list(users)
-    
-    # Send web push notifications
-    success_count = sum(
-        1 for user in user_list
-        if send_push_notification(user, title, message, notification_type, data, company)
-    )
-    
-    logger.info(f'Sent push notifications to {success_count}/{len(user_list)} users')
-    return success_count
+    try:
+        notified = len(send_bulk_notification(
+            users, title, message, notification_type, data, company, push=True,
+        ))
+    except Exception as e:
+        logger.error(f'Error in send_bulk_push_notification: {e}')
+        return 0
+
+    logger.info(f'Notified {notified} users')
+    return notified
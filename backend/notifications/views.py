@@ -160,6 +160,16 @@ def send_test_notification(request):
     return Response({'message': 'Test notification sent'})
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def push_outbox_stats(request):
+    """Per-channel push outbox counts by status (admin only)."""
+    if request.user.role != 'admin':
+        return Response({'error': 'Only administrators can view push delivery stats'}, status=403)
+    from .outbox import outbox_stats
+    return Response(outbox_stats())
+
+
 class NotificationViewSet(viewsets.ModelViewSet):
     """CRUD + actions for in-app notifications."""
     serializer_class = NotificationSerializer
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ['entity', 'record_id', 'title', 'company', 'normalized_phone', 'updated_at']
+    list_filter = ['entity', 'company']
+    search_fields = ['title', 'normalized_phone']
+    readonly_fields = ['updated_at']
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+    verbose_name = 'Search Index'
+
+    def ready(self):
+        """Keep the index in sync with the searchable models"""
+        from .signals import connect_sources
+        connect_sources()
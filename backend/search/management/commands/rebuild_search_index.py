@@ -0,0 +1,29 @@
+"""
+Build or repair the cross-entity search index.
+
+Usage:
+  python manage.py rebuild_search_index                    # reindex everything (after deploy)
+  python manage.py rebuild_search_index --entity lead,customer
+  python manage.py rebuild_search_index --missing          # only rows without an entry (cron)
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.services import SEARCH_SOURCES, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cross-entity search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entity', default='', help=f"Comma-separated: {', '.join(SEARCH_SOURCES)}")
+        parser.add_argument('--missing', action='store_true', help='Only index rows that have no entry yet')
+
+    def handle(self, *args, **options):
+        entities = [e for e in options['entity'].split(',') if e]
+        unknown = set(entities) - SEARCH_SOURCES.keys()
+        if unknown:
+            raise CommandError(f"Unknown entity: {', '.join(sorted(unknown))}")
+
+        written = rebuild(entities or None, missing=options['missing'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {sum(written.values())} record(s)'))
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.16 on 2026-10-17 06:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Full-text index over name, email and company_name, per backend. SQLite
+# uses an external-content FTS5 table kept in sync by triggers.
+SQLITE_FULLTEXT = [
+    "CREATE VIRTUAL TABLE search_entries_fts USING fts5("
+    "name, email, company_name, content='search_entries', content_rowid='id')",
+    "CREATE TRIGGER search_entries_ai AFTER INSERT ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(rowid, name, email, company_name) "
+    "VALUES (new.id, new.name, new.email, new.company_name); END",
+    "CREATE TRIGGER search_entries_ad AFTER DELETE ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(search_entries_fts, rowid, name, email, company_name) "
+    "VALUES ('delete', old.id, old.name, old.email, old.company_name); END",
+    "CREATE TRIGGER search_entries_au AFTER UPDATE ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(search_entries_fts, rowid, name, email, company_name) "
+    "VALUES ('delete', old.id, old.name, old.email, old.company_name); "
+    "INSERT INTO search_entries_fts(rowid, name, email, company_name) "
+    "VALUES (new.id, new.name, new.email, new.company_name); END",
+]
+
+FULLTEXT = {
+    'sqlite': (
+        SQLITE_FULLTEXT,
+        [
+            "DROP TRIGGER IF EXISTS search_entries_ai",
+            "DROP TRIGGER IF EXISTS search_entries_ad",
+            "DROP TRIGGER IF EXISTS search_entries_au",
+            "DROP TABLE IF EXISTS search_entries_fts",
+        ],
+    ),
+    'mysql': (
+        ["ALTER TABLE search_entries ADD FULLTEXT INDEX search_entries_fulltext (name, email, company_name)"],
+        ["ALTER TABLE search_entries DROP INDEX search_entries_fulltext"],
+    ),
+    'postgresql': (
+        [
+            "CREATE INDEX search_entries_tsv ON search_entries USING GIN "
+            "(to_tsvector('simple', name || ' ' || email || ' ' || company_name))"
+        ],
+        ["DROP INDEX IF EXISTS search_entries_tsv"],
+    ),
+}
+
+
+def create_fulltext(apps, schema_editor):
+    for statement in FULLTEXT.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext(apps, schema_editor):
+    for statement in FULLTEXT.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0022_add_team_to_invitetoken'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(help_text='Key of search.services.SEARCH_SOURCES', max_length=30)),
+                ('record_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, default='', help_text='Display name', max_length=255)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('email', models.CharField(blank=True, default='', max_length=254)),
+                ('company_name', models.CharField(blank=True, default='', max_length=255)),
+                ('normalized_phone', models.CharField(blank=True, default='', max_length=20)),
+                ('reversed_phone', models.CharField(blank=True, default='', max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='accounts.company')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Search entries',
+                'db_table': 'search_entries',
+                'indexes': [models.Index(fields=['company', 'normalized_phone'], name='search_company_phone_idx'), models.Index(fields=['company', 'reversed_phone'], name='search_company_rev_phone_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('entity', 'record_id'), name='search_entry_record_uniq'),
+        ),
+        migrations.RunPython(create_fulltext, drop_fulltext),
+    ]
@@ -0,0 +1,80 @@
+"""
+Fills the search index for rows that existed before it, so /api/search/
+returns hits straight after deploy instead of after a manual
+rebuild_search_index.
+
+Works on the historical models with a frozen copy of SEARCH_SOURCES and
+build_entry (search.services), so later changes to the source models do not
+break this migration.
+"""
+from django.db import migrations
+
+from utils.phones import normalize_phone
+
+
+BATCH_SIZE = 1000
+
+# entity -> (model label, name, phone, email, company name, assignee field)
+SOURCES = {
+    'lead': ('leads.Lead', 'name', 'phone', 'email', None, 'assigned_to'),
+    'customer': ('customers.Customer', 'name', 'phone', None, None, 'assigned_to'),
+    'ase_lead': ('ase_leads.ASELead', 'contact_person', 'phone', 'email', 'company_name', 'assigned_to'),
+    'ase_customer': ('ase_customers.ASECustomer', 'name', 'phone', 'email', 'company_name', 'assigned_to'),
+    'boe_lead': ('ase_leads.BOELead', 'name', 'phone_number', None, None, 'assigned_to_cre'),
+    'bre_research': ('ase_leads.BREResearchData', 'name', 'phone_number', None, None, 'assigned_to'),
+    'capital_customer': ('capital.CapitalCustomer', 'name', 'phone', 'email', 'company_name', 'assigned_to'),
+    'capital_lead': ('capital.CapitalLead', 'name', 'phone', 'email', None, 'assigned_to'),
+    'capital_loan': ('capital.CapitalLoan', 'applicant_name', 'phone', 'email', 'bank_name', 'assigned_to'),
+}
+
+
+def _text(value):
+    return ' '.join(str(value or '').split()).lower()
+
+
+def backfill_search_index(apps, schema_editor):
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    for entity, (label, name_field, phone_field, email_field, company_name_field, assignee_field) in SOURCES.items():
+        fields = [name_field, phone_field, email_field, company_name_field]
+        fields = ['pk', 'company_id', 'created_by_id', f'{assignee_field}_id'] + [f for f in fields if f]
+        rows = apps.get_model(label).objects.exclude(
+            pk__in=SearchEntry.objects.filter(entity=entity).values('record_id'),
+        ).order_by('pk').values(*fields)
+
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            title = ' '.join(str(row[name_field] or '').split())
+            phone = normalize_phone(row[phone_field])
+            batch.append(SearchEntry(
+                entity=entity,
+                record_id=row['pk'],
+                company_id=row['company_id'],
+                title=title[:255],
+                name=_text(title)[:255],
+                email=_text(row[email_field] if email_field else '')[:254],
+                company_name=_text(row[company_name_field] if company_name_field else '')[:255],
+                normalized_phone=phone,
+                reversed_phone=phone[::-1],
+                created_by_id=row['created_by_id'],
+                assigned_to_id=row[f'{assignee_field}_id'],
+            ))
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('leads', '0018_reversed_phone'),
+        ('customers', '0013_reversed_phone'),
+        ('ase_leads', '0028_reversed_phone'),
+        ('ase_customers', '0011_reversed_phone'),
+        ('capital', '0012_reversed_phone'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
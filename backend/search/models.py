@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable record (lead, customer, BOE/BRE data, capital customer,
+    lead or loan) in the cross-entity search index. Text columns hold the
+    normalized (lower-cased, single-spaced) values the backend's full-text
+    index covers; see search.services.
+    """
+    entity = models.CharField(max_length=30, help_text="Key of search.services.SEARCH_SOURCES")
+    record_id = models.BigIntegerField()
+    company = models.ForeignKey(
+        'accounts.Company',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='search_entries',
+    )
+    title = models.CharField(max_length=255, blank=True, default='', help_text="Display name")
+    name = models.CharField(max_length=255, blank=True, default='')
+    email = models.CharField(max_length=254, blank=True, default='')
+    company_name = models.CharField(max_length=255, blank=True, default='')
+    normalized_phone = models.CharField(max_length=20, blank=True, default='')
+    reversed_phone = models.CharField(max_length=20, blank=True, default='')
+    # Access scoping (accounts.scopes): the record's owner and assignee
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_entries'
+        constraints = [
+            models.UniqueConstraint(fields=['entity', 'record_id'], name='search_entry_record_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'normalized_phone'], name='search_company_phone_idx'),
+            models.Index(fields=['company', 'reversed_phone'], name='search_company_rev_phone_idx'),
+        ]
+        verbose_name_plural = 'Search entries'
+
+    def __str__(self):
+        return f"{self.entity}#{self.record_id} {self.title}"
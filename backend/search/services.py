@@ -0,0 +1,270 @@
+"""
+Cross-entity search index.
+
+Every searchable record (SEARCH_SOURCES) has one SearchEntry holding its
+normalized name, email, company name and phone digits, plus the owner and
+assignee used for access scoping. ``search()`` answers a query across all
+entities in one statement:
+
+    hits = search(request.user, 'ravi acme')     # full-text, ranked
+    hits = search(request.user, '43210')         # first/last digits of a phone
+
+Text goes through the backend's full-text index, created by the 0001
+migration: FULLTEXT on MySQL, a GIN tsvector index on Postgres and an FTS5
+table (kept in sync by triggers) on SQLite. Digit-only queries use the
+reversed-digits phone ranges of utils.phones.
+
+Entries are written by post_save/post_delete signals (search.signals) after
+the transaction commits. ``.update()`` and ``bulk_create`` skip signals, so
+those paths call reindex()/index_created() themselves. ``bulk_create``
+returns no ids on MySQL or with ``ignore_conflicts=True``; index_created()
+reads those rows back by company and phone. ``manage.py
+rebuild_search_index --missing`` repairs anything else that escaped.
+"""
+import re
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from accounts.scopes import access_scope
+from utils.phones import NormalizedPhoneModel, normalize_phone, phone_search_q
+
+from .models import SearchEntry
+
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+BATCH_SIZE = 1000
+
+TOKENS = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """Where a searchable model keeps the indexed values."""
+    label: str
+    name_field: str
+    phone_field: str
+    email_field: str | None = None
+    company_name_field: str | None = None
+    assignee_field: str = 'assigned_to'
+
+
+SEARCH_SOURCES = {
+    'lead': SearchSource('leads.Lead', 'name', 'phone', 'email'),
+    'customer': SearchSource('customers.Customer', 'name', 'phone'),
+    'ase_lead': SearchSource('ase_leads.ASELead', 'contact_person', 'phone', 'email', 'company_name'),
+    'ase_customer': SearchSource('ase_customers.ASECustomer', 'name', 'phone', 'email', 'company_name'),
+    'boe_lead': SearchSource('ase_leads.BOELead', 'name', 'phone_number', assignee_field='assigned_to_cre'),
+    'bre_research': SearchSource('ase_leads.BREResearchData', 'name', 'phone_number'),
+    'capital_customer': SearchSource('capital.CapitalCustomer', 'name', 'phone', 'email', 'company_name'),
+    'capital_lead': SearchSource('capital.CapitalLead', 'name', 'phone', 'email'),
+    'capital_loan': SearchSource('capital.CapitalLoan', 'applicant_name', 'phone', 'email', 'bank_name'),
+}
+
+
+def source_model(entity):
+    return apps.get_model(SEARCH_SOURCES[entity].label)
+
+
+def entity_of(model):
+    """SEARCH_SOURCES key of ``model``, or None if it is not searchable."""
+    label = model._meta.label
+    return next((entity for entity, source in SEARCH_SOURCES.items() if source.label == label), None)
+
+
+def _text(value):
+    return ' '.join(str(value or '').split()).lower()
+
+
+def build_entry(entity, obj):
+    source = SEARCH_SOURCES[entity]
+    title = ' '.join(str(getattr(obj, source.name_field) or '').split())
+    phone = normalize_phone(getattr(obj, source.phone_field))
+    return SearchEntry(
+        entity=entity,
+        record_id=obj.pk,
+        company_id=obj.company_id,
+        title=title[:255],
+        name=_text(title)[:255],
+        email=_text(getattr(obj, source.email_field) if source.email_field else '')[:254],
+        company_name=_text(getattr(obj, source.company_name_field) if source.company_name_field else '')[:255],
+        normalized_phone=phone,
+        reversed_phone=phone[::-1],
+        created_by_id=obj.created_by_id,
+        assigned_to_id=getattr(obj, f'{source.assignee_field}_id'),
+    )
+
+
+def index_objects(objs):
+    """
+    (Re)write the entries of saved model instances, all of one model.
+    Instances without a primary key are skipped. Returns the entry count.
+    """
+    objs = [obj for obj in objs if obj.pk is not None]
+    if not objs:
+        return 0
+    entity = entity_of(type(objs[0]))
+    if entity is None:
+        return 0
+    written = 0
+    for start in range(0, len(objs), BATCH_SIZE):
+        batch = [build_entry(entity, obj) for obj in objs[start:start + BATCH_SIZE]]
+        with transaction.atomic():
+            SearchEntry.objects.filter(entity=entity, record_id__in=[entry.record_id for entry in batch]).delete()
+            SearchEntry.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def remove_records(model, pks):
+    return SearchEntry.objects.filter(entity=entity_of(model), record_id__in=list(pks)).delete()[0]
+
+
+def index_records(model, pks):
+    """Re-read rows ``pks`` of ``model`` and rewrite their entries (dropping deleted rows)."""
+    pks = list(pks)
+    rows = list(model.objects.filter(pk__in=pks))
+    found = {row.pk for row in rows}
+    remove_records(model, [pk for pk in pks if pk not in found])
+    return index_objects(rows)
+
+
+def reindex(model, pks):
+    """index_records() once the current transaction commits (for ``.update()`` paths)."""
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: index_records(model, pks))
+
+
+def index_created(objs):
+    """
+    index_objects() once the current transaction commits (for ``bulk_create``
+    paths). Instances left without a primary key are read back first.
+    """
+    objs = list(objs)
+    if not objs:
+        return
+    saved = [obj for obj in objs if obj.pk is not None]
+    unsaved = [obj for obj in objs if obj.pk is None]
+
+    def run():
+        index_objects(saved)
+        if unsaved:
+            index_objects(_read_back(unsaved))
+
+    transaction.on_commit(run)
+
+
+def _read_back(objs):
+    """
+    The rows ``bulk_create`` inserted for unsaved instances of one model:
+    rows of their companies with no entry yet, matched by normalized_phone
+    where the model has one.
+    """
+    model = type(objs[0])
+    entity = entity_of(model)
+    if entity is None:
+        return []
+    rows = model.objects.filter(company_id__in={obj.company_id for obj in objs}).exclude(
+        pk__in=SearchEntry.objects.filter(entity=entity).values('record_id'),
+    )
+    if not issubclass(model, NormalizedPhoneModel):
+        return list(rows)
+    phones = sorted({obj.normalized_phone for obj in objs})
+    found = []
+    for start in range(0, len(phones), BATCH_SIZE):
+        found += rows.filter(normalized_phone__in=phones[start:start + BATCH_SIZE])
+    return found
+
+
+def rebuild(entities=None, missing=False, stdout=None):
+    """
+    Index every row of ``entities`` (all by default). With ``missing``,
+    only rows that have no entry yet. Returns {entity: entries written}.
+    """
+    written = {}
+    for entity in entities or SEARCH_SOURCES:
+        model = source_model(entity)
+        rows = model.objects.all()
+        if missing:
+            rows = rows.exclude(pk__in=SearchEntry.objects.filter(entity=entity).values('record_id'))
+        else:
+            SearchEntry.objects.filter(entity=entity).delete()
+        count, batch = 0, []
+        for row in rows.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                count += index_objects(batch)
+                batch = []
+        count += index_objects(batch)
+        written[entity] = count
+        if stdout:
+            stdout.write(f'{entity}: {count} indexed')
+    return written
+
+
+# ── Querying ─────────────────────────────────────────────────────────────────
+
+def _match_text(queryset, terms):
+    """Filter ``queryset`` to full-text matches of every term (as a prefix) and annotate ``rank``."""
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL('SELECT rowid FROM search_entries_fts WHERE search_entries_fts MATCH %s', [match]),
+        ).annotate(rank=RawSQL(
+            'SELECT -bm25(search_entries_fts) FROM search_entries_fts '
+            'WHERE search_entries_fts MATCH %s AND rowid = search_entries.id', [match], output_field=FloatField(),
+        ))
+    if vendor == 'mysql':
+        match = ' '.join(f'+{term}*' for term in terms)
+        return queryset.annotate(rank=RawSQL(
+            'MATCH (search_entries.name, search_entries.email, search_entries.company_name) '
+            'AGAINST (%s IN BOOLEAN MODE)', [match], output_field=FloatField(),
+        )).filter(rank__gt=0)
+    if vendor == 'postgresql':
+        match = ' & '.join(f'{term}:*' for term in terms)
+        document = "to_tsvector('simple', search_entries.name || ' ' || search_entries.email || ' ' || search_entries.company_name)"
+        return queryset.annotate(
+            matched=RawSQL(f"{document} @@ to_tsquery('simple', %s)", [match], output_field=BooleanField()),
+            rank=RawSQL(f"ts_rank({document}, to_tsquery('simple', %s))", [match], output_field=FloatField()),
+        ).filter(matched=True)
+    # Other backends: unranked substring match
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__contains=term) | Q(email__contains=term) | Q(company_name__contains=term)
+        )
+    return queryset.annotate(rank=Value(1, output_field=IntegerField()))
+
+
+def search(user, query, entities=None, limit=SEARCH_LIMIT):
+    """
+    Ranked entries matching ``query`` that ``user`` may see: their
+    company's records (all companies for admins) they own or are assigned
+    (through their team or reports for team leads and managers).
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    scope = access_scope(user)
+    entries = SearchEntry.objects.filter(scope.company_q(), scope.q('created_by', 'assigned_to'))
+    if entities:
+        entries = entries.filter(entity__in=entities)
+
+    phone = phone_search_q(query)
+    if phone is not None:
+        entries = entries.filter(phone).annotate(rank=Case(
+            When(normalized_phone=normalize_phone(query), then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ))
+    else:
+        terms = TOKENS.findall(query.lower())
+        if not terms:
+            return []
+        entries = _match_text(entries, terms)
+    return list(entries.order_by('-rank', '-updated_at')[:limit])
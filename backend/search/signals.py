@@ -0,0 +1,26 @@
+"""
+Signal handlers keeping the search index in sync with the searchable models.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .services import SEARCH_SOURCES, index_objects, remove_records, source_model
+
+
+def index_saved(sender, instance, raw=False, **kwargs):
+    """(Re)index a saved record once its transaction commits."""
+    if raw:
+        return
+    transaction.on_commit(lambda: index_objects([instance]))
+
+
+def remove_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: remove_records(sender, [pk]))
+
+
+def connect_sources():
+    for entity in SEARCH_SOURCES:
+        model = source_model(entity)
+        post_save.connect(index_saved, sender=model, dispatch_uid=f'search_index:{entity}')
+        post_delete.connect(remove_deleted, sender=model, dispatch_uid=f'search_unindex:{entity}')
@@ -0,0 +1,212 @@
+"""
+Tests for the cross-entity search index.
+
+Tests cover:
+- Saving and deleting a searchable record updates its entry after commit
+- Bulk assignment (.update()) reindexes the affected records
+- Text queries match name, email and company name prefixes across entities, ranked
+- Digit queries match the first or last digits of a phone number
+- Employees only see their own or assigned records in their company; admins see all
+- GET /api/search/ validation and HR access
+- Bulk-created rows without ids (MySQL, ignore_conflicts) are read back and indexed
+- rebuild_search_index --missing indexes rows written without signals
+- The search migration indexes rows that predate it
+"""
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Company
+from ase_customers.models import ASECustomer
+from customers.models import Customer
+from leads.models import Lead
+from search.models import SearchEntry
+from search.services import index_created, reindex, search
+from utils.phones import set_normalized_phones
+
+User = get_user_model()
+
+
+class SearchIndexTest(TestCase):
+    """Tests for index maintenance and search.services.search"""
+
+    def setUp(self):
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.other_company, _ = Company.objects.get_or_create(code='ASE', defaults={'name': 'ASE Technologies'})
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin', company=self.company)
+        self.employee = User.objects.create_user(
+            username='employee', password='testpass123', role='employee', company=self.company,
+        )
+        self.colleague = User.objects.create_user(
+            username='colleague', password='testpass123', role='employee', company=self.company,
+        )
+
+    def _lead(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Lead.objects.create(company=self.company, created_by=self.employee, **fields)
+
+    def test_saved_records_are_indexed_after_commit(self):
+        lead = self._lead(name='Ravi  Kumar', email='Ravi@Example.com', phone='+91 98765 43210')
+
+        entry = SearchEntry.objects.get(entity='lead', record_id=lead.id)
+        self.assertEqual(entry.title, 'Ravi Kumar')
+        self.assertEqual(entry.name, 'ravi kumar')
+        self.assertEqual(entry.email, 'ravi@example.com')
+        self.assertEqual(entry.normalized_phone, '9876543210')
+        self.assertEqual(entry.reversed_phone, '0123456789')
+        self.assertEqual(entry.company_id, self.company.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.name = 'Ravi Shankar'
+            lead.save()
+        self.assertEqual(SearchEntry.objects.get(entity='lead', record_id=lead.id).name, 'ravi shankar')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.delete()
+        self.assertFalse(SearchEntry.objects.filter(entity='lead', record_id=lead.id).exists())
+
+    def test_update_paths_reindex(self):
+        lead = self._lead(name='Ravi Kumar', phone='9876543210')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(id=lead.id).update(assigned_to=self.colleague)
+            reindex(Lead, [lead.id])
+        self.assertEqual(SearchEntry.objects.get(entity='lead', record_id=lead.id).assigned_to_id, self.colleague.id)
+
+    def test_text_search_spans_entities_and_ranks(self):
+        lead = self._lead(name='Ravi Kumar', phone='9876543210')
+        other = self._lead(name='Kumar Traders', email='ravi@kumar.in', phone='9000000001')
+        with self.captureOnCommitCallbacks(execute=True):
+            customer = ASECustomer.objects.create(
+                name='Meena', company_name='Ravi Textiles', phone='9123456780',
+                company=self.company, created_by=self.employee,
+            )
+
+        hits = search(self.employee, 'ravi')
+        self.assertEqual(
+            {(hit.entity, hit.record_id) for hit in hits},
+            {('lead', lead.id), ('lead', other.id), ('ase_customer', customer.id)},
+        )
+        self.assertEqual([hit.record_id for hit in search(self.employee, 'ravi kum')][0], lead.id)
+        self.assertEqual(search(self.employee, 'ravi', entities=['ase_customer'])[0].record_id, customer.id)
+        self.assertEqual(search(self.employee, 'nobody'), [])
+
+    def test_phone_search_matches_prefix_and_suffix(self):
+        lead = self._lead(name='Ravi Kumar', phone='+91 98765 43210')
+        self._lead(name='Someone Else', phone='9000000001')
+
+        for query in ('98765', '43210', '9876543210'):
+            self.assertEqual([hit.record_id for hit in search(self.employee, query)], [lead.id], query)
+        self.assertEqual(search(self.employee, '65432'), [])
+
+    def test_results_are_scoped_to_visible_records(self):
+        own = self._lead(name='Ravi Kumar', phone='9876543210')
+        assigned = self._lead(name='Ravi Das', phone='9876500000')
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(id=assigned.id).update(created_by=self.colleague, assigned_to=self.employee)
+            reindex(Lead, [assigned.id])
+            colleagues = Lead.objects.create(name='Ravi Rao', phone='9876511111', company=self.company, created_by=self.colleague)
+            elsewhere = Customer.objects.create(
+                name='Ravi Menon', phone='9876522222', company=self.other_company, created_by=self.admin,
+            )
+
+        self.assertEqual({hit.record_id for hit in search(self.employee, 'ravi')}, {own.id, assigned.id})
+        self.assertEqual(
+            {(hit.entity, hit.record_id) for hit in search(self.admin, 'ravi')},
+            {('lead', own.id), ('lead', assigned.id), ('lead', colleagues.id), ('customer', elsewhere.id)},
+        )
+
+    def test_bulk_created_rows_without_ids_are_indexed(self):
+        existing = self._lead(name='Ravi Kumar', phone='9876543210')
+        SearchEntry.objects.filter(record_id=existing.id).update(name='stale')
+
+        features = type(connection.features)
+        with mock.patch.object(features, 'can_return_rows_from_bulk_insert', False), \
+                self.captureOnCommitCallbacks(execute=True):
+            created = Lead.objects.bulk_create(set_normalized_phones([
+                Lead(name='Imported', phone='9000000002', company=self.company, created_by=self.employee),
+                Lead(name='Also Imported', phone='', company=self.company, created_by=self.employee),
+            ]))
+            self.assertIsNone(created[0].pk)
+            index_created(created)
+
+        self.assertEqual(
+            sorted(SearchEntry.objects.filter(entity='lead').values_list('name', flat=True)),
+            ['also imported', 'imported', 'stale'],
+        )
+
+    def test_rebuild_missing_indexes_unsignalled_rows(self):
+        lead = self._lead(name='Ravi Kumar', phone='9876543210')
+        Lead.objects.bulk_create([Lead(name='Imported', phone='9000000002', company=self.company)])
+        SearchEntry.objects.filter(record_id=lead.id).update(name='stale')
+
+        out = StringIO()
+        call_command('rebuild_search_index', '--missing', stdout=out)
+
+        self.assertIn('lead: 1 indexed', out.getvalue())
+        self.assertTrue(SearchEntry.objects.filter(entity='lead', name='imported').exists())
+        self.assertEqual(SearchEntry.objects.get(record_id=lead.id, entity='lead').name, 'stale')
+
+        call_command('rebuild_search_index', '--entity', 'lead', stdout=StringIO())
+        self.assertEqual(SearchEntry.objects.get(record_id=lead.id, entity='lead').name, 'ravi kumar')
+
+    def test_migration_backfills_existing_rows(self):
+        lead = self._lead(name='Ravi Kumar', phone='9876543210')
+        SearchEntry.objects.all().delete()
+        migration = import_module('search.migrations.0002_backfill_search_index')
+        state = MigrationLoader(connection).project_state(('search', '0002_backfill_search_index'))
+
+        migration.backfill_search_index(state.apps, None)
+
+        self.assertEqual([hit.record_id for hit in search(self.employee, 'ravi')], [lead.id])
+        entry = SearchEntry.objects.get(entity='lead', record_id=lead.id)
+        self.assertEqual((entry.title, entry.normalized_phone), ('Ravi Kumar', '9876543210'))
+
+
+class SearchAPITest(TestCase):
+    """Tests for GET /api/search/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company, _ = Company.objects.get_or_create(code='ESWARI', defaults={'name': 'Eswari Group'})
+        self.employee = User.objects.create_user(
+            username='employee', password='testpass123', role='employee', company=self.company,
+        )
+        self.client.force_authenticate(user=self.employee)
+        self.url = '/api/search/'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead = Lead.objects.create(
+                name='Ravi Kumar', email='ravi@example.com', phone='9876543210',
+                company=self.company, created_by=self.employee,
+            )
+
+    def test_returns_ranked_hits(self):
+        response = self.client.get(self.url, {'q': 'ravi', 'limit': 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['query'], 'ravi')
+        hit = response.data['results'][0]
+        self.assertEqual((hit['entity'], hit['id'], hit['title']), ('lead', self.lead.id, 'Ravi Kumar'))
+        self.assertEqual(hit['phone'], '9876543210')
+        self.assertEqual(hit['company_id'], self.company.id)
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'ravi', 'entity': 'invoice'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'ravi', 'limit': 'all'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+    def test_hr_is_denied(self):
+        hr = User.objects.create_user(username='hr', password='testpass123', role='hr')
+        self.client.force_authenticate(user=hr)
+
+        self.assertEqual(self.client.get(self.url, {'q': 'ravi'}).status_code, status.HTTP_403_FORBIDDEN)
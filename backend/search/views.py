@@ -0,0 +1,60 @@
+"""
+Search API
+
+GET /api/search/?q=<text or digits>   - Ranked hits across leads, customers,
+                                        BOE/BRE data and capital records
+
+Optional: ?entity=lead,ase_customer (keys of search.services.SEARCH_SOURCES),
+?limit=<n> (default 20, at most 50). Hits are limited to the records the
+user may see (accounts.scopes); digit-only queries match the first or last
+digits of a phone number.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from .services import MAX_SEARCH_LIMIT, SEARCH_LIMIT, SEARCH_SOURCES, search
+
+
+def _hit_data(entry):
+    return {
+        'entity': entry.entity,
+        'id': entry.record_id,
+        'title': entry.title,
+        'phone': entry.normalized_phone,
+        'email': entry.email,
+        'company_name': entry.company_name,
+        'company_id': entry.company_id,
+        'assigned_to_id': entry.assigned_to_id,
+        'rank': entry.rank,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_view(request):
+    """Search the records visible to the user."""
+    if request.user.role == 'hr':
+        return Response(
+            {'error': 'Access denied. HR users do not have permission to access this module.'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    entities = [e for e in request.query_params.get('entity', '').split(',') if e]
+    unknown = sorted(set(entities) - SEARCH_SOURCES.keys())
+    if unknown:
+        return Response({'error': f"Unknown entity: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', SEARCH_LIMIT)), 1), MAX_SEARCH_LIMIT)
+    except ValueError:
+        return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    hits = search(request.user, query, entities=entities, limit=limit)
+    return Response({'query': query, 'results': [_hit_data(entry) for entry in hits]})
@@ -9,10 +9,11 @@ from .models import Task
 from .serializers import TaskSerializer
 from accounts.permissions import filter_by_user_access, can_hr_access_module, CompanyAccessPermission
 from utils.mixins import CompanyFilterMixin
-from eswari_crm.ws_utils import notify_company
+from utils.pagination import KeysetPaginationMixin
+from eswari_crm.ws_utils import notify_company_changed
 
 
-class TaskPagination(PageNumberPagination):
+class TaskPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 10000
@@ -58,29 +59,18 @@ class TaskViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         instance = serializer.save(created_by=self.request.user)
         # Send real-time notification
         if instance.company_id:
-            notify_company(
-                company_id=instance.company_id,
-                event_type='task_created',
-                data={
-                    'entity': 'tasks',
-                    'action': 'created',
-                    'record_id': instance.id,
-                    'title': instance.title,
-                }
+            notify_company_changed(
+                instance.company_id, 'task_created', 'tasks', 'created',
+                record_id=instance.id, extra={'title': instance.title},
             )
     
     def perform_update(self, serializer):
         instance = serializer.save()
         # Send real-time notification
         if instance.company_id:
-            notify_company(
-                company_id=instance.company_id,
-                event_type='task_updated',
-                data={
-                    'entity': 'tasks',
-                    'action': 'updated',
-                    'record_id': instance.id,
-                }
+            notify_company_changed(
+                instance.company_id, 'task_updated', 'tasks', 'updated',
+                record_id=instance.id, fields=serializer.validated_data,
             )
     
     def perform_destroy(self, instance):
@@ -89,15 +79,7 @@ class TaskViewSet(CompanyFilterMixin, viewsets.ModelViewSet):
         instance.delete()
         # Send real-time notification
         if company_id:
-            notify_company(
-                company_id=company_id,
-                event_type='task_deleted',
-                data={
-                    'entity': 'tasks',
-                    'action': 'deleted',
-                    'record_id': record_id,
-                }
-            )
+            notify_company_changed(company_id, 'task_deleted', 'tasks', 'deleted', record_id=record_id)
 
     @action(detail=False, methods=['post'])
     def bulk_import(self, request):
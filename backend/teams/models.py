@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from accounts.directory import user_directory
+
 
 class Team(models.Model):
     """
@@ -108,6 +110,4 @@ class Team(models.Model):
     @property
     def team_lead_name(self):
         """Return team lead's full name"""
-        if self.team_lead:
-            return f"{self.team_lead.first_name} {self.team_lead.last_name}".strip() or self.team_lead.username
-        return None
+        return user_directory.name(self.team_lead_id)
@@ -0,0 +1,117 @@
+"""
+Generation-versioned cache keys.
+
+Every company (and every user) has a generation counter in the cache. Keys
+built with ``versioned_key`` embed the current generations, so bumping a
+generation makes every entry derived from it unreachable at once, with no
+need to know or delete the individual keys. With a cache shared between
+worker processes (Redis/Memcached) entries can therefore be cached for hours
+and still change right after a write. A per-process cache (LocMemCache, the
+default) only sees the bumps of its own process, so there VERSIONED_CACHE_TTL
+stays short: other workers catch up when their entries expire.
+
+    key = versioned_key(f'ase_dashboard_stats_{user.id}', company=user.company_id, user=user.id)
+    key = versioned_key('analytics_overview_month', all_companies=True)
+
+Writes bump generations through track_model() signal hooks (registered in
+analytics.signals); paths that bypass model signals (``.update()``,
+``bulk_create``) call bump_company() themselves. Bumps run after the
+transaction commits, so a concurrent reader cannot cache pre-commit data
+under the new generation.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+# Cache backends whose entries (and generation counters) live in one process
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared():
+    """True when the default cache is shared between worker processes."""
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+VERSIONED_CACHE_TTL = (
+    getattr(settings, 'VERSIONED_CACHE_TTL', 0)
+    or (6 * 60 * 60 if cache_is_shared() else 5 * 60)
+)
+
+ALL_COMPANIES = 'all'
+
+
+def _generation_key(scope, ident):
+    return f'cache_generation:{scope}:{ident}'
+
+
+def _fresh_generation():
+    # Not 1: if a counter is evicted, restarting from a small number could
+    # make old entries reachable again.
+    return int(time.time() * 1000)
+
+
+def _generations(keys):
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _fresh_generation(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def versioned_key(base, company=None, user=None, all_companies=False):
+    """``base`` suffixed with the current generation of each given scope."""
+    keys = []
+    if all_companies:
+        keys.append(_generation_key('company', ALL_COMPANIES))
+    if company is not None:
+        keys.append(_generation_key('company', company))
+    if user is not None:
+        keys.append(_generation_key('user', user))
+    if not keys:
+        return base
+    return f"{base}:g{'.'.join(str(g) for g in _generations(keys))}"
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_generation(), None)
+
+
+def bump_company(company_id):
+    """Invalidate everything cached for ``company_id`` (and cross-company views)."""
+    def bump():
+        if company_id is not None:
+            _bump(_generation_key('company', company_id))
+        _bump(_generation_key('company', ALL_COMPANIES))
+    transaction.on_commit(bump)
+
+
+def bump_user(user_id):
+    """Invalidate everything cached for ``user_id``."""
+    transaction.on_commit(lambda: _bump(_generation_key('user', user_id)))
+
+
+def track_model(model, company_of=None):
+    """
+    Bump the owning company's generation whenever ``model`` is saved or
+    deleted. ``company_of(instance)`` returns the company id; by default
+    ``instance.company_id``.
+    """
+    company_of = company_of or (lambda instance: instance.company_id)
+
+    def changed(sender, instance, **kwargs):
+        bump_company(company_of(instance))
+
+    uid = f'cache_versions:{model._meta.label}'
+    post_save.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(changed, sender=model, weak=False, dispatch_uid=uid)
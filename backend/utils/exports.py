@@ -0,0 +1,160 @@
+"""
+Streaming spreadsheet exports.
+
+Rows are read with ``queryset.iterator(chunk_size=...)`` and written straight
+into a CSV generator or a write-only openpyxl workbook, so exporting a whole
+customer book keeps worker memory flat.
+
+Usage:
+    COLUMNS = [
+        ExportColumn('name', 'Name'),
+        ExportColumn('phone', 'Phone', text=True),
+        ExportColumn('assigned_to', 'Assigned To', lambda c: c.assigned_to_name or ''),
+    ]
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, self.get_queryset(), COLUMNS, 'customers', 'Customers')
+
+Clients pick the format with ``?file_format=xlsx|csv`` (default xlsx) and a
+subset/order of columns with ``?columns=name,phone``.
+"""
+import csv
+import tempfile
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class ExportColumn:
+    """
+    One exported column.
+
+    ``value`` is a callable taking the model instance; when omitted the
+    attribute named ``key`` is exported. ``text=True`` stores the cell as text
+    in Excel (phone numbers).
+    """
+
+    def __init__(self, key, header, value=None, width=20, text=False):
+        self.key = key
+        self.header = header
+        self.value = value
+        self.width = width
+        self.text = text
+
+    def get(self, obj):
+        value = self.value(obj) if self.value else getattr(obj, self.key)
+        return '' if value is None else value
+
+
+def select_columns(columns, requested=None):
+    """
+    Return the columns named in ``requested`` (comma separated keys, in that
+    order), or all columns when nothing was requested.
+    """
+    if not requested:
+        return list(columns)
+    by_key = {column.key: column for column in columns}
+    keys = [key.strip() for key in requested.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in by_key]
+    if unknown:
+        raise ValueError(
+            f'Unknown export columns: {", ".join(unknown)}. '
+            f'Available columns: {", ".join(by_key)}'
+        )
+    return [by_key[key] for key in keys]
+
+
+class _Echo:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_chunks(queryset, columns, chunk_size):
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens UTF-8 names correctly
+    yield '\ufeff' + writer.writerow([column.header for column in columns])
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield writer.writerow([column.get(obj) for column in columns])
+
+
+def _xlsx_chunks(queryset, columns, sheet_title, chunk_size):
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    for idx, column in enumerate(columns, 1):
+        sheet.column_dimensions[get_column_letter(idx)].width = column.width
+
+    header_fill = PatternFill(start_color='1E40AF', end_color='1E40AF', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True)
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=column.header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+        header.append(cell)
+    sheet.append(header)
+
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        row = []
+        for column in columns:
+            value = column.get(obj)
+            if column.text:
+                value = WriteOnlyCell(sheet, value=str(value))
+                value.number_format = '@'
+            row.append(value)
+        sheet.append(row)
+
+    # Write-only workbooks spool rows to disk; the finished file is sent in chunks
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            data = output.read(64 * 1024)
+            if not data:
+                break
+            yield data
+
+
+def stream_export(queryset, columns, filename, file_format='xlsx', sheet_title='Sheet1',
+                  chunk_size=EXPORT_CHUNK_SIZE):
+    """StreamingHttpResponse with ``queryset`` exported as ``filename``.xlsx/.csv."""
+    if file_format == 'csv':
+        response = StreamingHttpResponse(
+            _csv_chunks(queryset, columns, chunk_size),
+            content_type='text/csv; charset=utf-8',
+        )
+    elif file_format == 'xlsx':
+        response = StreamingHttpResponse(
+            _xlsx_chunks(queryset, columns, sheet_title, chunk_size),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+    else:
+        raise ValueError('Unsupported export format. Use "xlsx" or "csv".')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+def export_response(request, queryset, columns, filename, sheet_title='Sheet1'):
+    """
+    Export endpoint body: reads ``file_format`` and ``columns`` from the query
+    string and returns the streaming download, or a 400 for bad parameters.
+    """
+    file_format = request.query_params.get('file_format', 'xlsx').lower()
+    try:
+        selected = select_columns(columns, request.query_params.get('columns'))
+        return stream_export(queryset, selected, filename, file_format, sheet_title)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -2,8 +2,7 @@
 Mixins for company-based filtering and access control.
 """
 from rest_framework.exceptions import ValidationError
-from django.core.exceptions import ObjectDoesNotExist
-from accounts.models import Company
+from accounts.scopes import access_scope
 
 
 class CompanyFilterMixin:
@@ -25,10 +24,10 @@ class CompanyFilterMixin:
             QuerySet: Filtered queryset based on user's role and company
         """
         queryset = super().get_queryset()
-        user = self.request.user
+        scope = access_scope(self.request.user)
         
         # Admin and HR can see all companies
-        if user.role in ['admin', 'hr']:
+        if scope.is_global or scope.company_wide:
             # Check for company filter parameter
             company_id = self.request.query_params.get('company')
             if company_id:
@@ -37,7 +36,7 @@ class CompanyFilterMixin:
             return queryset
         
         # Managers and Employees see only their company
-        return queryset.filter(company=user.company)
+        return queryset.filter(company_id=scope.company_id)
     
     def perform_create(self, serializer):
         """
@@ -66,19 +65,13 @@ class CompanyFilterMixin:
                     'company': 'This field is required for admin/hr users'
                 })
             
-            # Validate company exists and is active
+            # The serializer has just loaded the company from the database,
+            # so it exists and its is_active flag is current
             company = serializer.validated_data.get('company')
             if company:
-                try:
-                    # Refresh from database to ensure we have latest data
-                    company_obj = Company.objects.get(id=company.id)
-                    if not company_obj.is_active:
-                        raise ValidationError({
-                            'company': 'Company is not active'
-                        })
-                except ObjectDoesNotExist:
+                if not company.is_active:
                     raise ValidationError({
-                        'company': 'Company does not exist'
+                        'company': 'Company is not active'
                     })
             
             # Save with the specified company
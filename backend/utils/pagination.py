@@ -0,0 +1,184 @@
+"""
+Keyset (cursor) pagination.
+
+Page-number pagination runs a COUNT(*) and an OFFSET for every page, so deep
+pages of large books (page 400 of 200k customers) get slower the further
+the user scrolls. Keyset pagination continues from the last row seen
+instead: the cursor holds the ordering values of that row, and the next
+page is one indexed range query with no count.
+
+It is opt-in per request. List endpoints whose paginator includes
+KeysetPaginationMixin keep their page-number responses, and switch to
+cursor mode when the request carries a ``cursor`` parameter (empty for the
+first page):
+
+    GET /api/customers/?cursor=&page_size=100
+    -> {"next": ".../?cursor=eyJvIjpb...", "count": null, "results": [...]}
+
+    class CustomerPagination(KeysetPaginationMixin, PageNumberPagination): ...
+
+    page = keyset_page(queryset, request, page_size=20)   # hand-rolled helpers
+
+Cursors are opaque and tied to the ordering they were issued for. Only
+orderings on CURSOR_ORDERING_FIELDS (non-null, indexed) are accepted; the
+primary key is always appended as tie-breaker, so rows sharing a
+``created_at`` are neither skipped nor repeated. ``count=true`` adds a total
+that is cached per filter signature for PAGINATION_COUNT_CACHE_TTL seconds,
+so it may lag recent writes.
+"""
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+CURSOR_ORDERING_FIELDS = ('created_at', 'updated_at', 'id')
+
+DEFAULT_CURSOR_ORDERING = ('-created_at',)
+
+COUNT_CACHE_TTL = getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 60)
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows and the cursor of the next page (None on the last)."""
+    objects: list
+    next_cursor: str | None
+    count: int | None
+
+
+def _ordering(queryset, allowed_fields, default_ordering):
+    ordering = queryset.query.order_by or queryset.query.get_meta().ordering or default_ordering
+    keys = []
+    for term in ordering:
+        if not isinstance(term, str):
+            raise ValidationError({'ordering': 'This ordering is not supported with cursor pagination.'})
+        name = term.lstrip('-')
+        if name == 'pk':
+            name = 'id'
+        if name not in allowed_fields:
+            raise ValidationError({'ordering': f"Ordering by '{name}' is not supported with cursor pagination."})
+        keys.append((name, term.startswith('-')))
+    if not any(name == 'id' for name, _ in keys):
+        # Tie-breaker in the direction of the last key
+        keys.append(('id', keys[-1][1] if keys else True))
+    return keys
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(keys, values):
+    payload = {'o': [f"{'-' if desc else ''}{name}" for name, desc in keys], 'v': [_encode_value(v) for v in values]}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keys):
+    """Ordering values stored in ``cursor``; NotFound if it is malformed or for another ordering."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        ordering, values = payload['o'], payload['v']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise NotFound('Invalid cursor')
+    if ordering != [f"{'-' if desc else ''}{name}" for name, desc in keys] or len(values) != len(keys):
+        raise NotFound('Invalid cursor')
+    return values
+
+
+def _after(keys, values):
+    """Rows strictly after ``values`` in the ``keys`` ordering (row-value comparison)."""
+    condition = Q()
+    for index, (name, desc) in enumerate(keys):
+        step = Q(**{f"{name}__{'lt' if desc else 'gt'}": values[index]})
+        for prior, (prior_name, _) in enumerate(keys[:index]):
+            step &= Q(**{prior_name: values[prior]})
+        condition |= step
+    return condition
+
+
+def approximate_count(queryset):
+    """COUNT(*) of ``queryset``, cached per SQL signature for COUNT_CACHE_TTL seconds."""
+    sql, params = queryset.query.sql_with_params()
+    signature = hashlib.sha1(f'{sql}|{params!r}'.encode()).hexdigest()
+    key = f'pagination_count:{queryset.model._meta.label_lower}:{signature}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.order_by().count()
+        cache.set(key, count, COUNT_CACHE_TTL)
+    return count
+
+
+def _wants_count(request, param='count'):
+    return request.query_params.get(param, '').lower() in ('1', 'true', 'yes')
+
+
+def keyset_page(queryset, request, page_size, cursor_param='cursor', allowed_fields=CURSOR_ORDERING_FIELDS,
+                default_ordering=DEFAULT_CURSOR_ORDERING):
+    """The page of ``queryset`` after the request's cursor."""
+    keys = _ordering(queryset, allowed_fields, default_ordering)
+    count = approximate_count(queryset) if _wants_count(request) else None
+
+    queryset = queryset.order_by(*(f"{'-' if desc else ''}{name}" for name, desc in keys))
+    cursor = request.query_params.get(cursor_param)
+    if cursor:
+        queryset = queryset.filter(_after(keys, decode_cursor(cursor, keys)))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(keys, [getattr(last, name) for name, _ in keys])
+    return KeysetPage(rows, next_cursor, count)
+
+
+class KeysetPaginationMixin:
+    """
+    Adds the opt-in cursor mode to a PageNumberPagination subclass (list it
+    first). ``cursor_ordering_fields`` whitelists the sortable fields.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering_fields = CURSOR_ORDERING_FIELDS
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keyset = keyset_page(
+            queryset, request, self.get_page_size(request),
+            cursor_param=self.cursor_query_param, allowed_fields=self.cursor_ordering_fields,
+        )
+        return self.keyset.objects
+
+    def get_next_link(self):
+        if self.keyset is None:
+            return super().get_next_link()
+        if self.keyset.next_cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.keyset.next_cursor)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'count': self.keyset.count,
+            'results': data,
+        })
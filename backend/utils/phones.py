@@ -0,0 +1,269 @@
+"""
+Phone number normalization, partial-number search and cross-entity
+ownership lookup.
+
+Every table that stores contact numbers also stores ``normalized_phone``
+(see NormalizedPhoneModel) with a ``(company, normalized_phone)`` index, so
+"9876543210", "+91 98765-43210" and Excel's 9876543210.0 are the same
+number for duplicate checks.
+
+    normalize_phone('+91 98765-43210')          -> '9876543210'
+    find_phone_owners('098765 43210', company)  -> [{'entity': 'ase_customer', ...}, ...]
+
+Telecallers search by the first or (mostly) last few digits of a number.
+``phone__icontains`` scans every row of the company, so the same tables also
+store ``reversed_phone`` with a ``(company, reversed_phone)`` index: a suffix
+of the number is a prefix of the reversed digits. phone_search_q() turns a
+digits-only search into two index range scans (prefix of normalized_phone,
+prefix of reversed_phone); ranges rather than LIKE 'x%' so MySQL, Postgres
+(any collation) and SQLite all use the index:
+
+    qs.filter(phone_search_q('43210'))   # ...43210 and 43210...
+    qs.filter(phone_or_text_q(search, 'phone', 'name'))  # a search box
+    filter_backends = [PhoneSearchFilter, ...]   # same for DRF ?search=
+
+Digit-only searches match only the first or last digits of the phone
+number: not digits in the middle of it, nor numbers in names or notes,
+since any ``icontains`` alongside the ranges makes the query a scan again.
+``manage.py benchmark_phone_search`` times the search the list views run.
+"""
+import operator
+import re
+from functools import lru_cache, reduce
+
+from django.apps import apps
+from django.db import models
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Coalesce
+from rest_framework.filters import SearchFilter
+
+
+NON_DIGITS = re.compile(r'\D')
+# Characters a typed phone number may contain besides digits
+PHONE_SEARCH = re.compile(r'^[\d\s+().-]+$')
+INDIA_CODE = '91'
+LOCAL_NUMBER_LENGTH = 10
+
+
+def normalize_phone(value):
+    """
+    Canonical digits-only form of a phone number.
+
+    Strips formatting, the +91 / 0 prefixes of Indian numbers and the
+    ``.0`` Excel adds to numeric cells. Returns '' when there are no digits.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return _normalize(str(value))
+
+
+@lru_cache(maxsize=65536)
+def _normalize(raw):
+    raw = raw.strip()
+    if raw.endswith('.0'):
+        raw = raw[:-2]
+    digits = NON_DIGITS.sub('', raw)
+    if len(digits) == LOCAL_NUMBER_LENGTH + 2 and digits.startswith(INDIA_CODE):
+        digits = digits[2:]
+    elif len(digits) == LOCAL_NUMBER_LENGTH + 1 and digits.startswith('0'):
+        digits = digits[1:]
+    return digits[:20]
+
+
+class NormalizedPhoneModel(models.Model):
+    """
+    Abstract base that keeps ``normalized_phone`` in sync with ``phone_field``
+    on every save(). ``bulk_create`` skips save(), so bulk paths call
+    set_normalized_phones(objs) first.
+    """
+
+    phone_field = 'phone'
+
+    normalized_phone = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Digits-only phone used for duplicate detection",
+    )
+    reversed_phone = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="normalized_phone reversed, for indexed last-digits search",
+    )
+
+    class Meta:
+        abstract = True
+
+    def sync_normalized_phone(self):
+        self.normalized_phone = normalize_phone(getattr(self, self.phone_field))
+        self.reversed_phone = self.normalized_phone[::-1]
+
+    def save(self, *args, **kwargs):
+        self.sync_normalized_phone()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.phone_field in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'normalized_phone', 'reversed_phone'}
+        super().save(*args, **kwargs)
+
+
+def set_normalized_phones(objs):
+    """Fill ``normalized_phone`` on unsaved instances before bulk_create."""
+    for obj in objs:
+        obj.sync_normalized_phone()
+    return objs
+
+
+def backfill_normalized_phones(model, phone_field, batch_size=2000):
+    """Populate ``normalized_phone`` for existing rows (used by data migrations)."""
+    batch = []
+    for obj in model.objects.only('id', phone_field).iterator(chunk_size=batch_size):
+        obj.normalized_phone = normalize_phone(getattr(obj, phone_field))
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ['normalized_phone'])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ['normalized_phone'])
+
+
+def backfill_reversed_phones(model, batch_size=2000):
+    """Populate ``reversed_phone`` from ``normalized_phone`` (used by data migrations)."""
+    batch = []
+    for obj in model.objects.only('id', 'normalized_phone').iterator(chunk_size=batch_size):
+        obj.reversed_phone = obj.normalized_phone[::-1]
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, ['reversed_phone'])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ['reversed_phone'])
+
+
+# ── Partial-number search ────────────────────────────────────────────────────
+
+def _starts_with(field, digits):
+    """``field`` starts with ``digits``, as a range an index can serve."""
+    condition = Q(**{f'{field}__gte': digits})
+    # Smallest string above every value with this prefix: bump the last
+    # digit that is not a 9 ('4399' -> '44'); all 9s has no upper bound
+    head = digits.rstrip('9')
+    if head:
+        condition &= Q(**{f'{field}__lt': head[:-1] + str(int(head[-1]) + 1)})
+    return condition
+
+
+def phone_search_q(search):
+    """
+    Q matching numbers that start or end with the digits of ``search``, or
+    None when ``search`` does not look like (part of) a phone number.
+    """
+    if not search or not PHONE_SEARCH.match(search):
+        return None
+    digits = normalize_phone(search)
+    if not digits:
+        return None
+    return _starts_with('normalized_phone', digits) | _starts_with('reversed_phone', digits[::-1])
+
+
+def phone_or_text_q(search, phone_field, *text_fields):
+    """
+    Q for a free-text search box: phone_search_q() when ``search`` looks like
+    a number, otherwise ``icontains`` on ``phone_field`` and ``text_fields``.
+
+    The two are never ORed: an ``icontains`` on any column turns the two
+    index range scans into a scan of the company's rows.
+    """
+    phone = phone_search_q(search)
+    if phone is not None:
+        return phone
+    fields = (phone_field,) + text_fields
+    return reduce(operator.or_, (Q(**{f'{field}__icontains': search}) for field in fields))
+
+
+class PhoneSearchFilter(SearchFilter):
+    """
+    SearchFilter that answers a digits-only ``?search=`` on a
+    NormalizedPhoneModel with phone_search_q() alone, so it stays two index
+    range scans; other searches are unchanged.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if issubclass(queryset.model, NormalizedPhoneModel):
+            condition = phone_search_q(' '.join(terms))
+            if condition is not None:
+                return queryset.filter(condition)
+        return super().filter_queryset(request, queryset, view)
+
+
+# ── Cross-entity lookup ──────────────────────────────────────────────────────
+
+# entity key -> (model label, record name field, assignee field)
+PHONE_ENTITIES = {
+    'bre_research': ('ase_leads.BREResearchData', 'name', 'assigned_to'),
+    'boe_lead': ('ase_leads.BOELead', 'name', 'assigned_to_cre'),
+    'ase_lead': ('ase_leads.ASELead', 'contact_person', 'assigned_to'),
+    'ase_customer': ('ase_customers.ASECustomer', 'name', 'assigned_to'),
+    'customer': ('customers.Customer', 'name', 'assigned_to'),
+    'lead': ('leads.Lead', 'name', 'assigned_to'),
+    'capital_customer': ('capital.CapitalCustomer', 'name', 'assigned_to'),
+}
+
+
+def _owner_query(entity, phone, company):
+    label, name_field, assignee_field = PHONE_ENTITIES[entity]
+    qs = apps.get_model(label).objects.filter(normalized_phone=phone)
+    if company is not None:
+        qs = qs.filter(company=company)
+    # Same annotation names and order for every entity so the querysets can be UNIONed
+    return qs.order_by().annotate(
+        entity=Value(entity, output_field=CharField()),
+        record_id=F('id'),
+        record_name=Coalesce(F(name_field), Value(''), output_field=CharField()),
+        owner_id=F('created_by_id'),
+        owner_first_name=F('created_by__first_name'),
+        owner_last_name=F('created_by__last_name'),
+        owner_username=F('created_by__username'),
+        assignee_id=F(f'{assignee_field}_id'),
+        record_company_id=F('company_id'),
+    ).values(
+        'entity', 'record_id', 'record_name', 'owner_id', 'owner_first_name',
+        'owner_last_name', 'owner_username', 'assignee_id', 'record_company_id',
+    )
+
+
+def find_phone_owners(phone, company=None, entities=None):
+    """
+    Every record, across all contact tables, that already holds ``phone``.
+
+    One UNION ALL query over the ``(company, normalized_phone)`` indexes.
+    ``company=None`` searches all companies; ``entities`` limits the tables
+    (keys of PHONE_ENTITIES).
+
+    Returns a list of dicts: entity, id, name, company_id, created_by_id,
+    created_by_name, assigned_to_id.
+    """
+    normalized = normalize_phone(phone)
+    if not normalized:
+        return []
+    queries = [_owner_query(entity, normalized, company) for entity in (entities or PHONE_ENTITIES)]
+    combined = queries[0].union(*queries[1:], all=True) if len(queries) > 1 else queries[0]
+
+    owners = []
+    for row in combined:
+        owner_name = f"{row['owner_first_name'] or ''} {row['owner_last_name'] or ''}".strip()
+        owners.append({
+            'entity': row['entity'],
+            'id': row['record_id'],
+            'name': row['record_name'],
+            'company_id': row['record_company_id'],
+            'created_by_id': row['owner_id'],
+            'created_by_name': owner_name or row['owner_username'] or 'Unknown',
+            'assigned_to_id': row['assignee_id'],
+        })
+    return owners
@@ -0,0 +1,66 @@
+"""
+Streaming readers for spreadsheet uploads.
+
+Rows are yielded one at a time straight from the uploaded file so importers
+never hold a whole sheet in memory, no matter how large the upload is.
+"""
+import codecs
+import csv
+from contextlib import contextmanager
+from itertools import islice
+
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+class UnsupportedFileFormat(ValueError):
+    """Raised when an upload is not an Excel or CSV file."""
+
+
+@contextmanager
+def open_sheet_rows(file_obj, filename=None):
+    """
+    Open an uploaded .xlsx/.xls/.csv file and yield an iterator over its rows.
+
+    Each row is a tuple (Excel) or list (CSV) of raw cell values, header row
+    included. Excel files are opened in read-only mode so openpyxl streams
+    the sheet XML instead of building the full cell tree.
+
+    Usage:
+        with open_sheet_rows(request.FILES['file']) as rows:
+            headers = next(rows, None)
+            for row in rows:
+                ...
+    """
+    name = (filename or getattr(file_obj, 'name', '') or '').lower()
+
+    if name.endswith('.xlsx') or name.endswith('.xls'):
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            yield workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif name.endswith('.csv'):
+        if hasattr(file_obj, 'seek'):
+            file_obj.seek(0)
+        yield csv.reader(codecs.iterdecode(file_obj, 'utf-8'))
+    else:
+        raise UnsupportedFileFormat(
+            'Unsupported file format. Please upload .xlsx, .xls, or .csv file.'
+        )
+
+
+def chunked(iterable, size):
+    """Yield successive lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def is_blank_row(row):
+    """True when every cell in the row is empty."""
+    return not row or all(cell is None or str(cell).strip() == '' for cell in row)
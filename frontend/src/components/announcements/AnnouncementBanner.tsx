@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Announcement } from '@/types';
 import { X, Megaphone, AlertTriangle, FileText, Download, Eye, Bell, ChevronRight } from 'lucide-react';
 import { cn } from '@/lib/utils';
@@ -15,6 +15,9 @@ interface AnnouncementBannerProps {
   maxDisplay?: number; // Maximum number of announcements to display
 }
 
+// The server caches the unread count for up to a minute per worker
+const UNREAD_COUNT_POLL_MS = 60 * 1000;
+
 export default function AnnouncementBanner({ userRole, maxDisplay = 3 }: AnnouncementBannerProps) {
   const [unreadAnnouncements, setUnreadAnnouncements] = useState<Announcement[]>([]);
   const [loading, setLoading] = useState(true);
@@ -24,6 +27,7 @@ export default function AnnouncementBanner({ userRole, maxDisplay = 3 }: Announc
     title: string;
   } | null>(null);
   const [showAll, setShowAll] = useState(false);
+  const lastUnreadCount = useRef<number | null>(null);
 
   useEffect(() => {
     const fetchUnreadAnnouncements = async () => {
@@ -56,12 +60,30 @@ export default function AnnouncementBanner({ userRole, maxDisplay = 3 }: Announc
       } catch (error) {
         logger.error('❌ [AnnouncementBanner] Error fetching unread announcements:', error);
         setUnreadAnnouncements([]);
+      }
+    };
+
+    // Poll the (cached) count; only fetch the list when the count changes
+    const checkUnreadCount = async () => {
+      try {
+        const { count } = await apiClient.getUnreadAnnouncementCount();
+        if (count === lastUnreadCount.current) return;
+        lastUnreadCount.current = count;
+        if (count === 0) {
+          setUnreadAnnouncements([]);
+        } else {
+          await fetchUnreadAnnouncements();
+        }
+      } catch (error) {
+        logger.error('❌ [AnnouncementBanner] Error fetching unread announcement count:', error);
       } finally {
         setLoading(false);
       }
     };
 
-    fetchUnreadAnnouncements();
+    checkUnreadCount();
+    const interval = setInterval(checkUnreadCount, UNREAD_COUNT_POLL_MS);
+    return () => clearInterval(interval);
   }, []);
 
   const dismiss = async (id: string) => {
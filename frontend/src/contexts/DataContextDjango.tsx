@@ -504,6 +504,13 @@ export function DataProvider({ children }: { children: React.ReactNode }) {
           })
         );
 
+        unsubscribers.push(
+          websocketService.on('lead_updated', () => {
+            logger.log('🔔 Leads updated - refreshing leads...');
+            fetchLeads();
+          })
+        );
+
         unsubscribers.push(
           websocketService.on('lead_deleted', () => {
             logger.log('🔔 Lead deleted - refreshing leads...');
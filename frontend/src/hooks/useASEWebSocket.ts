@@ -11,15 +11,28 @@ import { useWebSocket } from '@/contexts/WebSocketContext';
 
 const POLL_INTERVAL = 30000;
 
+/**
+ * Changes that arrive close together are merged server-side into one event
+ * with `batched: true`, the affected `record_ids` and per-action counts.
+ */
+export interface ASEDataChangedPayload {
+  entity: string;
+  action: string;
+  record_id?: number;
+  record_ids?: number[];
+  batched?: boolean;
+  count?: number;
+}
+
 function isASEDataChangedPayload(
   data: Record<string, unknown> | undefined
-): data is { entity: string; action: string; record_id?: number } {
+): data is ASEDataChangedPayload {
   return typeof data?.entity === 'string' && typeof data.action === 'string';
 }
 
 export function useASEWebSocket(
   entity: 'calls' | 'leads' | 'tasks' | null,
-  onDataChanged: (data: { entity: string; action: string; record_id?: number }) => void
+  onDataChanged: (data: ASEDataChangedPayload) => void
 ) {
   const { isConnected, subscribe } = useWebSocket();
   const callbackRef = useRef(onDataChanged);
@@ -886,6 +886,10 @@ class ApiClient {
     return this.request('/announcements/unread/');
   }
 
+  async getUnreadAnnouncementCount(): Promise<{ count: number }> {
+    return this.request('/announcements/unread_count/');
+  }
+
   async createAnnouncement(announcementData: FormData | any) {
     const options: RequestInit = {
       method: 'POST',
@@ -448,7 +448,7 @@ function ScorecardsTab({ scorecards }: { scorecards: any }) {
     <div className="space-y-4">
       <div className="flex items-center justify-between">
         <p className="text-sm text-gray-500">
-          Showing top {scorecards.scorecards.length} employees by activity score
+          Showing top {scorecards.scorecards.length} of {scorecards.total_employees} employees by activity score
         </p>
       </div>
 
@@ -10,6 +10,7 @@ import { logger } from '@/lib/logger';
 export type WebSocketEventType =
   | 'connection_established'
   | 'lead_created'
+  | 'lead_updated'
   | 'lead_deleted'
   | 'customer_created'
   | 'customer_updated'